@@ -0,0 +1,54 @@
+"""rank_pending_keywords_by_priority
+
+Revision ID: a1b2c3d4e5f6
+Revises: f0a1b2c3d4e5
+Create Date: 2026-10-20 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1b2c3d4e5f6'
+down_revision: Union[str, Sequence[str], None] = 'f0a1b2c3d4e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEX_NAME = 'ix_keywords_pending_priority_created_at'
+PENDING = "status = 'PENDING'"
+# Igual que Keyword.priority_rank: el Enum se ordenaría por nombre
+PRIORITY_RANK = (
+    "(CASE WHEN (priority = 'HIGH') THEN 3 WHEN (priority = 'MEDIUM') THEN 2 "
+    "WHEN (priority = 'LOW') THEN 1 ELSE 0 END) DESC"
+)
+
+
+def _replace_index(columns, **kwargs) -> None:
+    op.drop_index(INDEX_NAME, table_name='keywords', **kwargs)
+    op.create_index(
+        INDEX_NAME, 'keywords', columns, unique=False,
+        postgresql_where=sa.text(PENDING), sqlite_where=sa.text(PENDING), **kwargs
+    )
+
+
+def _run(columns) -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        # Sin bloquear escrituras (fuera de la transacción)
+        with op.get_context().autocommit_block():
+            _replace_index(columns, postgresql_concurrently=True)
+    else:
+        _replace_index(columns)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _run([sa.text(PRIORITY_RANK), 'created_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _run(['priority', 'created_at'])
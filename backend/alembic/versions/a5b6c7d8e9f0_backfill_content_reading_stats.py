@@ -0,0 +1,64 @@
+"""backfill_content_reading_stats
+
+Revision ID: a5b6c7d8e9f0
+Revises: f4a5b6c7d8e9
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5b6c7d8e9f0'
+down_revision: Union[str, Sequence[str], None] = 'f4a5b6c7d8e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+WORDS_PER_MINUTE = 200
+
+content = sa.table(
+    'content',
+    sa.column('id', sa.Integer),
+    sa.column('content', sa.Text),
+    sa.column('word_count', sa.Integer),
+    sa.column('reading_time', sa.Integer),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Los listados ya no cargan el cuerpo: word_count/reading_time deben
+    # estar calculados en todas las filas (las nuevas los calcula el modelo)
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(content.c.id, content.c.content)
+            .where(content.c.reading_time.is_(None), content.c.id > last_id)
+            .order_by(content.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+
+        for row in rows:
+            words = len((row.content or "").split())
+            bind.execute(
+                content.update()
+                .where(content.c.id == row.id)
+                .values(
+                    word_count=words,
+                    reading_time=max(1, round(words / WORDS_PER_MINUTE)) if words else 0
+                )
+            )
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Solo datos derivados: no hay nada que deshacer
+    pass
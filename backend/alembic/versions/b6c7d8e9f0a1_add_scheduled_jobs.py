@@ -0,0 +1,82 @@
+"""add_scheduled_jobs
+
+Revision ID: b6c7d8e9f0a1
+Revises: a5b6c7d8e9f0
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6c7d8e9f0a1'
+down_revision: Union[str, Sequence[str], None] = 'a5b6c7d8e9f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'scheduled_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('job_type', sa.String(length=100), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('payload', sa.JSON(), nullable=True),
+        sa.Column('idempotency_key', sa.String(length=200), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('next_execution', sa.DateTime(), nullable=False),
+        sa.Column('scheduled_for', sa.DateTime(), nullable=False),
+        sa.Column('interval', sa.String(length=20), nullable=True),
+        sa.Column('schedule_time', sa.String(length=5), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('max_attempts', sa.Integer(), nullable=False),
+        sa.Column('lease_owner', sa.String(length=100), nullable=True),
+        sa.Column('lease_expires_at', sa.DateTime(), nullable=True),
+        sa.Column('last_run_at', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('last_result', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('idempotency_key')
+    )
+    op.create_index(op.f('ix_scheduled_jobs_id'), 'scheduled_jobs', ['id'], unique=False)
+    op.create_index(op.f('ix_scheduled_jobs_user_id'), 'scheduled_jobs', ['user_id'], unique=False)
+    op.create_index('ix_scheduled_jobs_status_next_execution', 'scheduled_jobs', ['status', 'next_execution'], unique=False)
+    op.create_index('ix_scheduled_jobs_status_lease_expires_at', 'scheduled_jobs', ['status', 'lease_expires_at'], unique=False)
+
+    op.create_table(
+        'scheduled_job_runs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('run_key', sa.String(length=200), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('worker_id', sa.String(length=100), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['job_id'], ['scheduled_jobs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('run_key')
+    )
+    op.create_index(op.f('ix_scheduled_job_runs_id'), 'scheduled_job_runs', ['id'], unique=False)
+    op.create_index(op.f('ix_scheduled_job_runs_job_id'), 'scheduled_job_runs', ['job_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_scheduled_job_runs_job_id'), table_name='scheduled_job_runs')
+    op.drop_index(op.f('ix_scheduled_job_runs_id'), table_name='scheduled_job_runs')
+    op.drop_table('scheduled_job_runs')
+    op.drop_index('ix_scheduled_jobs_status_lease_expires_at', table_name='scheduled_jobs')
+    op.drop_index('ix_scheduled_jobs_status_next_execution', table_name='scheduled_jobs')
+    op.drop_index(op.f('ix_scheduled_jobs_user_id'), table_name='scheduled_jobs')
+    op.drop_index(op.f('ix_scheduled_jobs_id'), table_name='scheduled_jobs')
+    op.drop_table('scheduled_jobs')
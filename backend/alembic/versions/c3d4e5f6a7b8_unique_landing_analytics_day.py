@@ -0,0 +1,101 @@
+"""unique_landing_analytics_day
+
+Revision ID: c3d4e5f6a7b8
+Revises: b2c3d4e5f6a7
+Create Date: 2026-10-22 09:00:00.000000
+
+"""
+from collections import defaultdict
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.hyperloglog import merge_sketches
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d4e5f6a7b8'
+down_revision: Union[str, Sequence[str], None] = 'b2c3d4e5f6a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX_NAME = 'ix_landing_analytics_landing_page_id_date'
+COUNTER_COLUMNS = ('page_views', 'conversions')
+BREAKDOWN_COLUMNS = ('traffic_sources', 'device_types', 'browser_stats')
+
+landing_analytics = sa.table(
+    'landing_analytics',
+    sa.column('id', sa.Integer),
+    sa.column('landing_page_id', sa.Integer),
+    sa.column('date', sa.DateTime),
+    sa.column('page_views', sa.Integer),
+    sa.column('unique_visitors', sa.Integer),
+    sa.column('visitor_sketch', sa.LargeBinary),
+    sa.column('conversions', sa.Integer),
+    sa.column('conversion_rate', sa.Integer),
+    sa.column('traffic_sources', sa.JSON),
+    sa.column('device_types', sa.JSON),
+    sa.column('browser_stats', sa.JSON),
+)
+
+
+def _merge_day(rows) -> dict:
+    """Valores de la fila única de un día a partir de sus filas actuales"""
+    values = {column: sum(getattr(row, column) or 0 for row in rows) for column in COUNTER_COLUMNS}
+    for column in BREAKDOWN_COLUMNS:
+        merged = {}
+        for row in rows:
+            for key, count in (getattr(row, column) or {}).items():
+                merged[key] = merged.get(key, 0) + count
+        values[column] = merged or None
+
+    sketches = [row.visitor_sketch for row in rows if row.visitor_sketch]
+    if sketches:
+        sketch = merge_sketches(sketches)
+        values['visitor_sketch'] = sketch.to_bytes()
+        values['unique_visitors'] = sketch.count()
+    else:
+        values['unique_visitors'] = sum(row.unique_visitors or 0 for row in rows)
+
+    views = values['page_views']
+    values['conversion_rate'] = round(values['conversions'] / views * 100) if views else 0
+    return values
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Una fila por landing y día con `date` a las 00:00: las filas creadas
+    # a la vez por la primera vista del día se combinan antes del índice único
+    bind = op.get_bind()
+    days = defaultdict(list)
+    for row in bind.execute(sa.select(landing_analytics).order_by(landing_analytics.c.id)):
+        days[(row.landing_page_id, row.date.date())].append(row)
+
+    for (landing_id, day), rows in days.items():
+        start = datetime.combine(day, datetime.min.time())
+        keep, extra = rows[0], rows[1:]
+        if not extra and keep.date == start:
+            continue
+
+        values = _merge_day(rows) if extra else {}
+        bind.execute(
+            landing_analytics.update()
+            .where(landing_analytics.c.id == keep.id)
+            .values(date=start, **values)
+        )
+        if extra:
+            bind.execute(
+                landing_analytics.delete()
+                .where(landing_analytics.c.id.in_([row.id for row in extra]))
+            )
+
+    op.drop_index(INDEX_NAME, table_name='landing_analytics')
+    op.create_index(INDEX_NAME, 'landing_analytics', ['landing_page_id', 'date'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(INDEX_NAME, table_name='landing_analytics')
+    op.create_index(INDEX_NAME, 'landing_analytics', ['landing_page_id', 'date'], unique=False)
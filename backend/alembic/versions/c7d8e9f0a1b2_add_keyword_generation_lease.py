@@ -0,0 +1,32 @@
+"""add_keyword_generation_lease
+
+Revision ID: c7d8e9f0a1b2
+Revises: b6c7d8e9f0a1
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d8e9f0a1b2'
+down_revision: Union[str, Sequence[str], None] = 'b6c7d8e9f0a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('keywords', sa.Column('lease_owner', sa.String(length=100), nullable=True))
+    op.add_column('keywords', sa.Column('lease_expires_at', sa.DateTime(), nullable=True))
+    op.create_index('ix_keywords_status_lease_expires_at', 'keywords', ['status', 'lease_expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_keywords_status_lease_expires_at', table_name='keywords')
+    op.drop_column('keywords', 'lease_expires_at')
+    op.drop_column('keywords', 'lease_owner')
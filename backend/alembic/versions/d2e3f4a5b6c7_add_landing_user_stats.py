@@ -0,0 +1,61 @@
+"""add_landing_user_stats
+
+Revision ID: d2e3f4a5b6c7
+Revises: c1d2e3f4a5b6
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2e3f4a5b6c7'
+down_revision: Union[str, Sequence[str], None] = 'c1d2e3f4a5b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('landing_pages', sa.Column('total_views', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('landing_pages', sa.Column('total_conversions', sa.Integer(), nullable=False, server_default='0'))
+    op.create_index('ix_landing_pages_user_id_total_views', 'landing_pages', ['user_id', 'total_views'], unique=False)
+
+    op.create_table('landing_user_stats',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('total_landing_pages', sa.Integer(), nullable=False),
+    sa.Column('active_landing_pages', sa.Integer(), nullable=False),
+    sa.Column('published_landing_pages', sa.Integer(), nullable=False),
+    sa.Column('total_visits', sa.Integer(), nullable=False),
+    sa.Column('total_conversions', sa.Integer(), nullable=False),
+    sa.Column('top_pages', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_landing_user_stats_id'), 'landing_user_stats', ['id'], unique=False)
+    op.create_index(op.f('ix_landing_user_stats_user_id'), 'landing_user_stats', ['user_id'], unique=True)
+
+    # Inicializar contadores acumulados desde el histórico de analytics
+    op.execute(
+        "UPDATE landing_pages SET "
+        "total_views = COALESCE((SELECT SUM(page_views) FROM landing_analytics "
+        "WHERE landing_analytics.landing_page_id = landing_pages.id), 0), "
+        "total_conversions = COALESCE((SELECT SUM(conversions) FROM landing_analytics "
+        "WHERE landing_analytics.landing_page_id = landing_pages.id), 0)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_landing_user_stats_user_id'), table_name='landing_user_stats')
+    op.drop_index(op.f('ix_landing_user_stats_id'), table_name='landing_user_stats')
+    op.drop_table('landing_user_stats')
+    op.drop_index('ix_landing_pages_user_id_total_views', table_name='landing_pages')
+    op.drop_column('landing_pages', 'total_conversions')
+    op.drop_column('landing_pages', 'total_views')
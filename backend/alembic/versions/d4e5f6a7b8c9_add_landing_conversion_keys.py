@@ -0,0 +1,43 @@
+"""add_landing_conversion_keys
+
+Revision ID: d4e5f6a7b8c9
+Revises: c3d4e5f6a7b8
+Create Date: 2026-10-22 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e5f6a7b8c9'
+down_revision: Union[str, Sequence[str], None] = 'c3d4e5f6a7b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'landing_conversion_keys',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('landing_page_id', sa.Integer(), nullable=False),
+        sa.Column('visitor_hash', sa.String(length=64), nullable=False),
+        sa.Column('counted_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['landing_page_id'], ['landing_pages.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_landing_conversion_keys_id'), 'landing_conversion_keys', ['id'], unique=False)
+    op.create_index(op.f('ix_landing_conversion_keys_counted_at'), 'landing_conversion_keys', ['counted_at'], unique=False)
+    op.create_index('ix_landing_conversion_keys_landing_visitor', 'landing_conversion_keys',
+                    ['landing_page_id', 'visitor_hash'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_landing_conversion_keys_landing_visitor', table_name='landing_conversion_keys')
+    op.drop_index(op.f('ix_landing_conversion_keys_counted_at'), table_name='landing_conversion_keys')
+    op.drop_index(op.f('ix_landing_conversion_keys_id'), table_name='landing_conversion_keys')
+    op.drop_table('landing_conversion_keys')
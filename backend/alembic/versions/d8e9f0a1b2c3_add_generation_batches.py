@@ -0,0 +1,74 @@
+"""add_generation_batches
+
+Revision ID: d8e9f0a1b2c3
+Revises: c7d8e9f0a1b2
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8e9f0a1b2c3'
+down_revision: Union[str, Sequence[str], None] = 'c7d8e9f0a1b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'generation_batches',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('settings', sa.JSON(), nullable=True),
+        sa.Column('concurrency', sa.Integer(), nullable=False),
+        sa.Column('total_items', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_generation_batches_id'), 'generation_batches', ['id'], unique=False)
+    op.create_index(op.f('ix_generation_batches_user_id'), 'generation_batches', ['user_id'], unique=False)
+
+    op.create_table(
+        'generation_batch_items',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('batch_id', sa.Integer(), nullable=False),
+        sa.Column('keyword_id', sa.Integer(), nullable=False),
+        sa.Column('content_id', sa.Integer(), nullable=True),
+        sa.Column('position', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('lease_owner', sa.String(length=100), nullable=True),
+        sa.Column('lease_expires_at', sa.DateTime(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['batch_id'], ['generation_batches.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['content_id'], ['content.id'], ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['keyword_id'], ['keywords.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('batch_id', 'keyword_id', name='uq_generation_batch_items_batch_keyword')
+    )
+    op.create_index(op.f('ix_generation_batch_items_id'), 'generation_batch_items', ['id'], unique=False)
+    op.create_index(
+        'ix_generation_batch_items_batch_status_position', 'generation_batch_items',
+        ['batch_id', 'status', 'position'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_generation_batch_items_batch_status_position', table_name='generation_batch_items')
+    op.drop_index(op.f('ix_generation_batch_items_id'), table_name='generation_batch_items')
+    op.drop_table('generation_batch_items')
+    op.drop_index(op.f('ix_generation_batches_user_id'), table_name='generation_batches')
+    op.drop_index(op.f('ix_generation_batches_id'), table_name='generation_batches')
+    op.drop_table('generation_batches')
@@ -0,0 +1,57 @@
+"""add_composite_indexes_for_hot_queries
+
+Revision ID: e3f4a5b6c7d8
+Revises: d2e3f4a5b6c7
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3f4a5b6c7d8'
+down_revision: Union[str, Sequence[str], None] = 'd2e3f4a5b6c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (nombre, tabla, columnas, condición del índice parcial)
+INDEXES = [
+    ('ix_content_status_created_at', 'content', ['status', 'created_at'], None),
+    ('ix_content_category_id_status_created_at', 'content', ['category_id', 'status', 'created_at'], None),
+    ('ix_content_user_id_created_at', 'content', ['user_id', 'created_at'], None),
+    ('ix_content_published_created_at', 'content', ['created_at'], "status = 'PUBLISHED'"),
+    ('ix_keywords_status_priority_created_at', 'keywords', ['status', 'priority', 'created_at'], None),
+    ('ix_keywords_pending_priority_created_at', 'keywords', ['priority', 'created_at'], "status = 'PENDING'"),
+    ('ix_landing_analytics_landing_page_id_date', 'landing_analytics', ['landing_page_id', 'date'], None),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    is_postgresql = bind.dialect.name == 'postgresql'
+
+    def create_indexes(**kwargs):
+        for name, table, columns, where in INDEXES:
+            options = {}
+            if where is not None:
+                options['postgresql_where'] = sa.text(where)
+                options['sqlite_where'] = sa.text(where)
+            op.create_index(name, table, columns, unique=False, **options, **kwargs)
+
+    if is_postgresql:
+        # En PostgreSQL se crean sin bloquear escrituras (fuera de la transacción)
+        with op.get_context().autocommit_block():
+            create_indexes(postgresql_concurrently=True)
+    else:
+        create_indexes()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,35 @@
+"""tags_usage_count_not_null
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-22 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f6a7b8c9d0'
+down_revision: Union[str, Sequence[str], None] = 'd4e5f6a7b8c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # El listado de tags pagina por (usage_count, id): un NULL rompería el
+    # orden y la comparación con el cursor
+    op.execute("UPDATE tags SET usage_count = 0 WHERE usage_count IS NULL")
+    with op.batch_alter_table('tags') as batch_op:
+        batch_op.alter_column('usage_count', existing_type=sa.Integer(),
+                              nullable=False, server_default='0')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('tags') as batch_op:
+        batch_op.alter_column('usage_count', existing_type=sa.Integer(),
+                              nullable=True, server_default=None)
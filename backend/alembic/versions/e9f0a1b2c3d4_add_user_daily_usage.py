@@ -0,0 +1,76 @@
+"""add_user_daily_usage
+
+Revision ID: e9f0a1b2c3d4
+Revises: d8e9f0a1b2c3
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from datetime import datetime, timedelta
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9f0a1b2c3d4'
+down_revision: Union[str, Sequence[str], None] = 'd8e9f0a1b2c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    usage = op.create_table(
+        'user_daily_usage',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('generated_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('published_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'day', name='uq_user_daily_usage_user_day')
+    )
+    op.create_index(op.f('ix_user_daily_usage_id'), 'user_daily_usage', ['id'], unique=False)
+
+    # Inicializar el uso de hoy (UTC) para no reabrir cuotas ya consumidas
+    now = datetime.utcnow()
+    start = datetime(now.year, now.month, now.day)
+    end = start + timedelta(days=1)
+    content = sa.table(
+        'content',
+        sa.column('user_id', sa.Integer()),
+        sa.column('created_at', sa.DateTime()),
+        sa.column('published_at', sa.DateTime())
+    )
+    bind = op.get_bind()
+    generated = dict(bind.execute(
+        sa.select(content.c.user_id, sa.func.count())
+        .where(content.c.user_id.isnot(None), content.c.created_at >= start, content.c.created_at < end)
+        .group_by(content.c.user_id)
+    ).all())
+    published = dict(bind.execute(
+        sa.select(content.c.user_id, sa.func.count())
+        .where(content.c.user_id.isnot(None), content.c.published_at >= start, content.c.published_at < end)
+        .group_by(content.c.user_id)
+    ).all())
+    rows = [
+        {
+            'user_id': user_id,
+            'day': start.date(),
+            'generated_count': generated.get(user_id, 0),
+            'published_count': published.get(user_id, 0),
+            'updated_at': now
+        }
+        for user_id in set(generated) | set(published)
+    ]
+    if rows:
+        op.bulk_insert(usage, rows)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_user_daily_usage_id'), table_name='user_daily_usage')
+    op.drop_table('user_daily_usage')
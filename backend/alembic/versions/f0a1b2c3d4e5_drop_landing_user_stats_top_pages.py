@@ -0,0 +1,31 @@
+"""drop_landing_user_stats_top_pages
+
+Revision ID: f0a1b2c3d4e5
+Revises: e9f0a1b2c3d4
+Create Date: 2026-10-20 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f0a1b2c3d4e5'
+down_revision: Union[str, Sequence[str], None] = 'e9f0a1b2c3d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # El ranking del dashboard se lee del índice (user_id, total_views)
+    with op.batch_alter_table('landing_user_stats') as batch_op:
+        batch_op.drop_column('top_pages')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('landing_user_stats') as batch_op:
+        batch_op.add_column(sa.Column('top_pages', sa.JSON(), nullable=True))
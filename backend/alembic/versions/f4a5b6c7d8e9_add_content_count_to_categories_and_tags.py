@@ -0,0 +1,40 @@
+"""add_content_count_to_categories_and_tags
+
+Revision ID: f4a5b6c7d8e9
+Revises: e3f4a5b6c7d8
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a5b6c7d8e9'
+down_revision: Union[str, Sequence[str], None] = 'e3f4a5b6c7d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('categories', sa.Column('content_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('tags', sa.Column('content_count', sa.Integer(), nullable=False, server_default='0'))
+
+    # Inicializar contadores; a partir de aquí los mantiene app.models.counters
+    op.execute(
+        "UPDATE categories SET content_count = "
+        "(SELECT COUNT(*) FROM content WHERE content.category_id = categories.id)"
+    )
+    op.execute(
+        "UPDATE tags SET content_count = "
+        "(SELECT COUNT(*) FROM content_tags WHERE content_tags.tag_id = tags.id)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('tags', 'content_count')
+    op.drop_column('categories', 'content_count')
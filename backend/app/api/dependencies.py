@@ -12,20 +12,27 @@ def get_current_active_user(
     db: Session = Depends(get_db)
 ) -> User:
     """Obtener usuario actual autenticado y activo"""
-    try:
-        user = get_current_user(db, token)
-        
-        if not user.is_active:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Usuario inactivo"
-            )
-        
-        return user
+    # get_current_user ya lanza 401 si el token o el usuario no son válidos;
+    # los errores de base de datos se propagan en lugar de convertirse en 401
+    user = get_current_user(db, token)
     
-    except Exception as e:
+    if not user.is_active:
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="No se pudo validar las credenciales",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
\ No newline at end of file
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Usuario inactivo"
+        )
+    
+    return user
+
+
+def get_current_admin_user(
+    current_user: User = Depends(get_current_active_user)
+) -> User:
+    """Obtener usuario actual con permisos de administrador"""
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Se requieren permisos de administrador"
+        )
+    
+    return current_user
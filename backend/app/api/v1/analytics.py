@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
-from app.core.database import get_db
+from app.core.database import get_read_db
 from app.services.analytics_service import AnalyticsService
 from app.api.dependencies import get_current_active_user
 from app.models.user import User
@@ -15,9 +15,9 @@ class DateRange(BaseModel):
     end_date: datetime
 
 @router.get("/dashboard", response_model=None)
-async def get_dashboard_stats(
+def get_dashboard_stats(
     days: int = Query(30, ge=1, le=365),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -36,12 +36,12 @@ async def get_dashboard_stats(
         )
 
 @router.get("/keywords", response_model=None)
-async def get_keyword_analytics(
+def get_keyword_analytics(
     keyword_id: Optional[int] = None,
     days: int = Query(30, ge=1, le=365),
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -61,12 +61,12 @@ async def get_keyword_analytics(
         )
 
 @router.get("/content", response_model=None)
-async def get_content_analytics(
+def get_content_analytics(
     content_id: Optional[int] = None,
     days: int = Query(30, ge=1, le=365),
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -83,9 +83,9 @@ async def get_content_analytics(
         )
 
 @router.get("/usage", response_model=None)
-async def get_usage_analytics(
+def get_usage_analytics(
     days: int = Query(30, ge=1, le=365),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -102,9 +102,9 @@ async def get_usage_analytics(
         )
 
 @router.get("/performance", response_model=None)
-async def get_performance_report(
+def get_performance_report(
     days: int = Query(30, ge=1, le=365),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -121,11 +121,11 @@ async def get_performance_report(
         )
 
 @router.get("/trends", response_model=None)
-async def get_trends(
+def get_trends(
     metric: str = Query(..., regex="^(keywords|content|usage|performance)$"),
     period: str = Query("daily", regex="^(hourly|daily|weekly|monthly)$"),
     days: int = Query(30, ge=1, le=365),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -142,11 +142,11 @@ async def get_trends(
         )
 
 @router.get("/top-keywords", response_model=None)
-async def get_top_keywords(
+def get_top_keywords(
     limit: int = Query(10, ge=1, le=50),
     metric: str = Query("usage", regex="^(usage|performance|recent)$"),
     days: int = Query(30, ge=1, le=365),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -168,12 +168,12 @@ async def get_top_keywords(
         )
 
 @router.get("/content-performance", response_model=None)
-async def get_content_performance(
+def get_content_performance(
     sort_by: str = Query("created_at", regex="^(created_at|word_count|performance)$"),
     order: str = Query("desc", regex="^(asc|desc)$"),
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -190,11 +190,11 @@ async def get_content_performance(
         )
 
 @router.post("/export", response_model=None)
-async def export_analytics(
+def export_analytics(
     export_type: str = Query(..., regex="^(keywords|content|usage|full)$"),
     format: str = Query("json", regex="^(json|csv)$"),
     date_range: Optional[DateRange] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -227,11 +227,11 @@ async def export_analytics(
         )
 
 @router.get("/comparison", response_model=None)
-async def get_comparison_analytics(
+def get_comparison_analytics(
     compare_periods: bool = Query(True),
     current_days: int = Query(30, ge=1, le=365),
     previous_days: int = Query(30, ge=1, le=365),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -248,10 +248,10 @@ async def get_comparison_analytics(
         )
 
 @router.get("/alerts", response_model=None)
-async def get_analytics_alerts(
+def get_analytics_alerts(
     severity: Optional[str] = Query(None, regex="^(low|medium|high|critical)$"),
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -273,8 +273,8 @@ async def get_analytics_alerts(
         )
 
 @router.get("/summary", response_model=None)
-async def get_analytics_summary(
-    db: Session = Depends(get_db),
+def get_analytics_summary(
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
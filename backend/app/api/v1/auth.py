@@ -1,24 +1,26 @@
-from datetime import timedelta
+from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
-from app.api.dependencies import get_db, get_current_active_user
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.dependencies import get_current_active_user
 from app.core.config import settings
+from app.core.database import get_async_db
 from app.models.user import User
 from app.schemas.user import UserCreate, User as UserSchema, Token, UserLogin
 from app.services.auth import (
-    authenticate_user,
-    create_access_token,
-    get_password_hash
+    aauthenticate_user,
+    aget_password_hash,
+    create_access_token
 )
 
 router = APIRouter()
 
 @router.post("/register", response_model=UserSchema)
-def register_user(user: UserCreate, db: Session = Depends(get_db)):
+async def register_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Registrar nuevo usuario"""
     # Verificar si el usuario ya existe
-    db_user = db.query(User).filter(User.username == user.username).first()
+    db_user = (await db.execute(select(User.id).where(User.username == user.username))).first()
     if db_user:
         raise HTTPException(
             status_code=400,
@@ -26,15 +28,15 @@ def register_user(user: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Verificar si el email ya existe
-    db_user = db.query(User).filter(User.email == user.email).first()
+    db_user = (await db.execute(select(User.id).where(User.email == user.email))).first()
     if db_user:
         raise HTTPException(
             status_code=400,
             detail="El email ya está registrado"
         )
     
-    # Crear nuevo usuario
-    hashed_password = get_password_hash(user.password)
+    # Crear nuevo usuario (bcrypt en el pool acotado, sin ocupar hilos del threadpool)
+    hashed_password = await aget_password_hash(user.password)
     db_user = User(
         username=user.username,
         email=user.email,
@@ -45,15 +47,14 @@ def register_user(user: UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
     return db_user
 
-@router.post("/login", response_model=Token)
-def login_user(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    """Autenticar usuario y devolver token"""
-    user = authenticate_user(db, form_data.username, form_data.password)
+async def _login(db: AsyncSession, username: str, password: str) -> dict:
+    """Autenticar y emitir el token de acceso"""
+    user = await aauthenticate_user(db, username, password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -66,35 +67,21 @@ def login_user(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = D
         data={"sub": user.username}, expires_delta=access_token_expires
     )
     
-    # Actualizar último login
-    from datetime import datetime
+    # Actualizar último login (y el hash, si se regeneró)
     user.last_login = datetime.utcnow()
-    db.commit()
+    await db.commit()
     
     return {"access_token": access_token, "token_type": "bearer"}
 
+@router.post("/login", response_model=Token)
+async def login_user(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+    """Autenticar usuario y devolver token"""
+    return await _login(db, form_data.username, form_data.password)
+
 @router.post("/login-json", response_model=Token)
-def login_user_json(user_login: UserLogin, db: Session = Depends(get_db)):
+async def login_user_json(user_login: UserLogin, db: AsyncSession = Depends(get_async_db)):
     """Autenticar usuario con JSON y devolver token"""
-    user = authenticate_user(db, user_login.username, user_login.password)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Credenciales incorrectas",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
-    )
-    
-    # Actualizar último login
-    from datetime import datetime
-    user.last_login = datetime.utcnow()
-    db.commit()
-    
-    return {"access_token": access_token, "token_type": "bearer"}
+    return await _login(db, user_login.username, user_login.password)
 
 @router.get("/me", response_model=UserSchema)
 def read_users_me(current_user: User = Depends(get_current_active_user)):
@@ -0,0 +1,159 @@
+import asyncio
+import json
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from sqlalchemy.orm import Session
+
+from app.api.dependencies import get_current_active_user
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, get_db
+from app.models.generation_batch import BatchStatus, GenerationBatch
+from app.models.user import User
+from app.services.batch_generation import BatchGenerationService, aget_batch_progress
+
+router = APIRouter()
+
+
+class BatchCreateRequest(BaseModel):
+    keyword_ids: List[int] = Field(..., min_length=1)
+    provider: str = "auto"
+    content_type: str = "article"
+    additional_keywords: Optional[List[int]] = []
+    concurrency: Optional[int] = None
+
+
+@router.post("/", response_model=None, status_code=status.HTTP_202_ACCEPTED)
+def create_batch(
+    request: BatchCreateRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Crear un lote de generación: una keyword por artículo, con concurrencia limitada"""
+    try:
+        service = BatchGenerationService(db)
+        return service.create_batch(
+            current_user.id,
+            request.keyword_ids,
+            {
+                "provider": request.provider,
+                "content_type": request.content_type,
+                "additional_keywords": request.additional_keywords or []
+            },
+            request.concurrency
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error creando el lote: {str(e)}"
+        )
+
+
+@router.get("/", response_model=None)
+def list_batches(
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Lotes recientes del usuario con su progreso"""
+    return BatchGenerationService(db).list_batches(current_user.id, limit)
+
+
+@router.get("/{batch_id}", response_model=None)
+def get_batch(
+    batch_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Estado y progreso de un lote"""
+    progress = BatchGenerationService(db).get_progress(batch_id, current_user.id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Lote no encontrado")
+    return progress
+
+
+@router.get("/{batch_id}/items", response_model=None)
+def get_batch_items(
+    batch_id: int,
+    item_status: Optional[str] = Query(None, alias="status"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Elementos de un lote (opcionalmente filtrados por estado)"""
+    service = BatchGenerationService(db)
+    if service.get_batch(batch_id, current_user.id) is None:
+        raise HTTPException(status_code=404, detail="Lote no encontrado")
+    return service.list_items(batch_id, item_status)
+
+
+@router.post("/{batch_id}/retry", response_model=None)
+def retry_batch(
+    batch_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Reanudar los elementos fallidos sin repetir los ya generados"""
+    try:
+        return BatchGenerationService(db).retry_failed(batch_id, current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post("/{batch_id}/cancel", response_model=None)
+def cancel_batch(
+    batch_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Cancelar los elementos pendientes de un lote"""
+    try:
+        return BatchGenerationService(db).cancel(batch_id, current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/{batch_id}/events")
+async def stream_batch_events(
+    batch_id: int,
+    request: Request,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Progreso del lote como Server-Sent Events.
+
+    Emite un evento `progress` cada vez que cambian los conteos (con un
+    comentario de keepalive entre medias) y un evento `done` al terminar.
+    """
+    async with AsyncSessionLocal() as session:
+        batch = await session.get(GenerationBatch, batch_id)
+        if batch is None or batch.user_id != current_user.id:
+            raise HTTPException(status_code=404, detail="Lote no encontrado")
+
+    async def events():
+        last = None
+        while not await request.is_disconnected():
+            async with AsyncSessionLocal() as session:
+                progress = await aget_batch_progress(session, batch_id)
+            if progress is None:
+                break
+
+            if progress != last:
+                yield f"event: progress\ndata: {json.dumps(progress)}\n\n"
+                last = progress
+            else:
+                yield ": keepalive\n\n"
+
+            if progress["status"] in BatchStatus.FINISHED:
+                yield f"event: done\ndata: {json.dumps(progress)}\n\n"
+                break
+            await asyncio.sleep(settings.BATCH_PROGRESS_INTERVAL_SECONDS)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
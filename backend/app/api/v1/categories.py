@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.api.dependencies import get_db, get_current_active_user
@@ -11,6 +11,8 @@ from app.schemas.category import (
     CategoryWithContent
 )
 from app.schemas.user import User
+from app.utils.pagination import paginate, cached_count, set_pagination_headers
+from app.utils.slugs import allocate_slug, assign_unique_slug
 import re
 
 router = APIRouter()
@@ -23,32 +25,27 @@ def create_slug(name: str) -> str:
 
 @router.get("/", response_model=List[CategoryWithContent])
 def get_categories(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    include_total: bool = Query(False),
     active_only: bool = Query(True),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Obtener lista de categorías"""
+    """Obtener lista de categorías (paginada por cursor, ver X-Next-Cursor)"""
     query = db.query(CategoryModel)
     
     if active_only:
         query = query.filter(CategoryModel.is_active == True)
     
-    categories = query.offset(skip).limit(limit).all()
+    total = cached_count(query) if include_total else None
+    categories, next_cursor = paginate(query, [(CategoryModel.id, False)], limit, cursor=cursor, skip=skip)
+    set_pagination_headers(response, next_cursor, total)
     
-    # Agregar conteo de contenido para cada categoría
-    result = []
-    for category in categories:
-        content_count = db.query(ContentModel).filter(
-            ContentModel.category_id == category.id
-        ).count()
-        
-        category_dict = category.__dict__.copy()
-        category_dict['content_count'] = content_count
-        result.append(CategoryWithContent(**category_dict))
-    
-    return result
+    # content_count es una columna desnormalizada (app.models.counters)
+    return categories
 
 @router.get("/{category_id}", response_model=CategoryWithContent)
 def get_category(
@@ -61,14 +58,7 @@ def get_category(
     if not category:
         raise HTTPException(status_code=404, detail="Categoría no encontrada")
     
-    content_count = db.query(ContentModel).filter(
-        ContentModel.category_id == category.id
-    ).count()
-    
-    category_dict = category.__dict__.copy()
-    category_dict['content_count'] = content_count
-    
-    return CategoryWithContent(**category_dict)
+    return category
 
 @router.post("/", response_model=Category)
 def create_category(
@@ -87,14 +77,6 @@ def create_category(
             detail="Ya existe una categoría con ese nombre"
         )
     
-    # Crear slug único
-    base_slug = create_slug(category.name)
-    slug = base_slug
-    counter = 1
-    while db.query(CategoryModel).filter(CategoryModel.slug == slug).first():
-        slug = f"{base_slug}-{counter}"
-        counter += 1
-    
     # Verificar categoría padre si se especifica
     if category.parent_id:
         parent = db.query(CategoryModel).filter(
@@ -108,7 +90,6 @@ def create_category(
     
     db_category = CategoryModel(
         name=category.name,
-        slug=slug,
         description=category.description,
         parent_id=category.parent_id,
         seo_title=category.seo_title,
@@ -116,7 +97,8 @@ def create_category(
         is_active=category.is_active
     )
     
-    db.add(db_category)
+    # Slug único (reintenta si otra petición se queda el mismo a la vez)
+    assign_unique_slug(db, db_category, create_slug(category.name))
     db.commit()
     db.refresh(db_category)
     
@@ -149,15 +131,7 @@ def update_category(
             )
         
         # Actualizar slug
-        new_slug = create_slug(category_update.name)
-        counter = 1
-        while db.query(CategoryModel).filter(
-            CategoryModel.slug == new_slug,
-            CategoryModel.id != category_id
-        ).first():
-            new_slug = f"{create_slug(category_update.name)}-{counter}"
-            counter += 1
-        db_category.slug = new_slug
+        db_category.slug = allocate_slug(db, CategoryModel, create_slug(category_update.name), exclude_id=category_id)
     
     # Verificar categoría padre si se especifica
     if category_update.parent_id:
@@ -239,11 +213,4 @@ def get_category_by_slug(
     if not category:
         raise HTTPException(status_code=404, detail="Categoría no encontrada")
     
-    content_count = db.query(ContentModel).filter(
-        ContentModel.category_id == category.id
-    ).count()
-    
-    category_dict = category.__dict__.copy()
-    category_dict['content_count'] = content_count
-    
-    return CategoryWithContent(**category_dict)
\ No newline at end of file
+    return category
\ No newline at end of file
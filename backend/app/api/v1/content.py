@@ -1,23 +1,41 @@
+from datetime import datetime
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Response
+from sqlalchemy.orm import Session, selectinload
 from pydantic import BaseModel
 from app.api.dependencies import get_db, get_current_active_user
 from app.models.user import User
 from app.models.content import Content
 from app.models.keyword import Keyword
-from app.models.image_config import ImageConfig
 from app.schemas.content import (
     ContentCreate,
     ContentUpdate,
     Content as ContentSchema,
     ContentWithKeyword,
+    ContentSummaryWithKeyword,
     ContentStatus
 )
-from app.services.content_generator import ContentGenerator
+from app.services.content_generation import generate_content_task
+from app.services.quota_service import QuotaService
+from app.services.content_bulk import ContentBulkService, add_tags_stmt
+from app.models.counters import recount_content_counts
+from app.utils.pagination import paginate, cached_count, set_pagination_headers
+from app.utils.projections import content_summary
+from app.utils.slugs import assign_unique_slug
 
 router = APIRouter()
 
+
+def _flush_within_daily_limit(db: Session, quota: QuotaService, user: User) -> None:
+    """Hacer flush del contenido nuevo (que lo suma al uso del día) y deshacerlo si supera el límite"""
+    db.flush()
+    try:
+        quota.enforce_daily_limit(user)
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.post("/", response_model=ContentSchema)
 def create_content(
     content: ContentCreate,
@@ -52,36 +70,18 @@ def create_content(
                 slug = re.sub(r'[^a-zA-Z0-9\s]', '', category_name.lower())
                 slug = re.sub(r'\s+', '-', slug.strip())
                 
-                # Verificar que el slug sea único
-                base_slug = slug
-                counter = 1
-                while db.query(Category).filter(Category.slug == slug).first():
-                    slug = f"{base_slug}-{counter}"
-                    counter += 1
-                
-                category = Category(
-                    name=category_name,
-                    slug=slug
-                )
-                db.add(category)
+                category = Category(name=category_name)
+                assign_unique_slug(db, category, slug)
                 db.commit()
                 db.refresh(category)
             category_id = category.id
     
-    # Verificar límite diario del usuario (simplificado por ahora)
-    # TODO: Implementar contador diario real
-    from datetime import datetime, date
-    today = date.today()
-    daily_content_count = db.query(Content).filter(
-        Content.user_id == current_user.id,
-        Content.created_at >= datetime.combine(today, datetime.min.time())
-    ).count()
-    
-    if daily_content_count >= current_user.daily_limit:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Has alcanzado tu límite diario de contenido ({current_user.daily_limit})"
-        )
+    # Verificar límite diario del usuario (contador de uso diario)
+    quota = QuotaService(db)
+    try:
+        quota.check_daily_limit(current_user)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     # Generar slug automáticamente
     import re
@@ -90,13 +90,6 @@ def create_content(
     slug = re.sub(r'[^a-zA-Z0-9\s]', '', content.title.lower())
     slug = re.sub(r'\s+', '-', slug.strip())
     
-    # Verificar que el slug sea único
-    base_slug = slug
-    counter = 1
-    while db.query(Content).filter(Content.slug == slug).first():
-        slug = f"{base_slug}-{counter}"
-        counter += 1
-    
     # Determinar el estado basado en la entrada del usuario
     status = content.status
     if status == ContentStatus.PUBLISHED:
@@ -112,7 +105,6 @@ def create_content(
         title=content.title,
         content=content.content or "",
         excerpt=content.excerpt,
-        slug=slug,
         meta_title=content.meta_title,
         meta_description=content.meta_description,
         focus_keyword=content.focus_keyword,
@@ -130,40 +122,47 @@ def create_content(
         word_count=len((content.content or "").split()) if content.content else 0
     )
     
-    db.add(db_content)
-    db.commit()
-    db.refresh(db_content)
+    # Slug único (reintenta si otra petición se queda el mismo a la vez)
+    assign_unique_slug(db, db_content, slug)
+    _flush_within_daily_limit(db, quota, current_user)
     
-    # Manejar tags si se proporcionan
+    # Etiquetas en un solo INSERT … SELECT (los ids inexistentes se ignoran)
     if content.tag_ids:
-        from app.models.tag import Tag
-        from app.models.content_tag import ContentTag
-        
-        for tag_id in content.tag_ids:
-            tag = db.query(Tag).filter(Tag.id == tag_id).first()
-            if tag:
-                content_tag = ContentTag(content_id=db_content.id, tag_id=tag_id)
-                db.add(content_tag)
-        
-        db.commit()
+        db.execute(add_tags_stmt([db_content.id], content.tag_ids))
+        recount_content_counts(db.connection(), tag_ids=content.tag_ids)
+    
+    db.commit()
+    db.refresh(db_content)
     
     return db_content
 
-@router.get("/", response_model=List[ContentWithKeyword])
+@router.get("/", response_model=List[ContentSummaryWithKeyword])
 def read_content(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     user_only: bool = True,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Obtener lista de contenido"""
-    query = db.query(Content)
+    """
+    Obtener lista de contenido (más reciente primero).
+    
+    La página siguiente se pide con el cursor de la cabecera X-Next-Cursor.
+    Devuelve resúmenes sin el cuerpo; el artículo completo está en /{content_id}.
+    """
+    query = db.query(Content).options(*content_summary(), selectinload(Content.keyword))
     
     if user_only:
         query = query.filter(Content.user_id == current_user.id)
     
-    content = query.offset(skip).limit(limit).all()
+    total = cached_count(query) if include_total else None
+    content, next_cursor = paginate(
+        query, [(Content.created_at, True), (Content.id, True)], limit, cursor=cursor, skip=skip
+    )
+    set_pagination_headers(response, next_cursor, total)
     return content
 
 @router.get("/{content_id}", response_model=ContentWithKeyword)
@@ -226,18 +225,8 @@ def update_content(
                 slug = re.sub(r'[^a-zA-Z0-9\s]', '', category_name.lower())
                 slug = re.sub(r'\s+', '-', slug.strip())
                 
-                # Verificar que el slug sea único
-                base_slug = slug
-                counter = 1
-                while db.query(Category).filter(Category.slug == slug).first():
-                    slug = f"{base_slug}-{counter}"
-                    counter += 1
-                
-                category = Category(
-                    name=category_name,
-                    slug=slug
-                )
-                db.add(category)
+                category = Category(name=category_name)
+                assign_unique_slug(db, category, slug)
                 db.commit()
                 db.refresh(category)
             update_data['category_id'] = category.id
@@ -285,6 +274,49 @@ def delete_content(
     
     return {"message": "Contenido eliminado exitosamente"}
 
+class BulkContentFilter(BaseModel):
+    status: Optional[ContentStatus] = None
+    category_id: Optional[int] = None
+    keyword_id: Optional[int] = None
+    tag_id: Optional[int] = None
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+
+class BulkContentRequest(BaseModel):
+    action: str  # publish, unpublish, set_category, add_tags, remove_tags, delete
+    ids: Optional[List[int]] = None
+    filters: Optional[BulkContentFilter] = None
+    category_id: Optional[int] = None
+    tag_ids: Optional[List[int]] = None
+
+@router.post("/bulk", response_model=None)
+def bulk_content_operation(
+    request: BulkContentRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Aplicar una operación a varios contenidos del usuario (por ids o filtro)
+    en una sola transacción. Las transiciones de estado no permitidas se
+    omiten y se devuelven en `skipped`.
+    """
+    try:
+        return ContentBulkService(db).apply(
+            current_user.id,
+            request.action,
+            content_ids=request.ids,
+            filters=request.filters.dict(exclude_none=True) if request.filters else None,
+            category_id=request.category_id,
+            tag_ids=request.tag_ids
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error en la operación masiva: {str(e)}"
+        )
+
 class GenerateContentRequest(BaseModel):
     provider: str = "auto"
     content_type: str = "article"
@@ -304,36 +336,26 @@ def generate_content(
     if not keyword:
         raise HTTPException(status_code=404, detail="Palabra clave no encontrada")
     
-    # Verificar límite diario del usuario
-    from datetime import datetime, date
-    today = date.today()
-    daily_content_count = db.query(Content).filter(
-        Content.user_id == current_user.id,
-        Content.created_at >= datetime.combine(today, datetime.min.time())
-    ).count()
-    
-    if daily_content_count >= current_user.daily_limit:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Has alcanzado tu límite diario de contenido ({current_user.daily_limit})"
-        )
+    # Verificar límite diario del usuario (contador de uso diario)
+    quota = QuotaService(db)
+    try:
+        quota.check_daily_limit(current_user)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    # Generar slug único
-    from app.utils.helpers import generate_unique_slug
+    # Crear contenido en estado "generando" con un slug único
+    from app.utils.helpers import generate_slug
     base_title = f"Generando contenido para: {keyword.keyword}"
-    unique_slug = generate_unique_slug(db, base_title)
-    
-    # Crear contenido en estado "generando"
     db_content = Content(
         title=base_title,
-        slug=unique_slug,
         content="",
         status=ContentStatus.GENERATING,
         keyword_id=keyword_id,
         user_id=current_user.id
     )
     
-    db.add(db_content)
+    assign_unique_slug(db, db_content, generate_slug(base_title))
+    _flush_within_daily_limit(db, quota, current_user)
     db.commit()
     db.refresh(db_content)
     
@@ -344,16 +366,27 @@ def generate_content(
             Keyword.id.in_(request.additional_keywords)
         ).all()
     
-    # Agregar tarea en segundo plano para generar contenido
-    background_tasks.add_task(
-        generate_content_task,
-        db_content.id,
-        keyword_id,
-        current_user.id,
-        request.provider,
-        request.content_type,
-        [kw.id for kw in additional_keywords]
-    )
+    from app.core.config import settings
+    if settings.CONTENT_PIPELINE_BACKEND == "celery":
+        # Pipeline por etapas en los workers de Celery (texto, imágenes y publicación por separado)
+        from app.tasks.pipeline_tasks import start_content_pipeline
+        start_content_pipeline(
+            db_content.id,
+            provider=request.provider,
+            content_type=request.content_type,
+            additional_keyword_ids=[kw.id for kw in additional_keywords]
+        )
+    else:
+        # Agregar tarea en segundo plano para generar contenido
+        background_tasks.add_task(
+            generate_content_task,
+            db_content.id,
+            keyword_id,
+            current_user.id,
+            request.provider,
+            request.content_type,
+            [kw.id for kw in additional_keywords]
+        )
     
     return {
         "message": "Generación de contenido iniciada",
@@ -361,247 +394,6 @@ def generate_content(
         "status": "generating"
     }
 
-async def generate_content_task(
-    content_id: int,
-    keyword_id: int,
-    user_id: int,
-    provider: str,
-    content_type: str,
-    additional_keyword_ids: Optional[List[int]] = None
-):
-    """Tarea en segundo plano para generar contenido e imágenes"""
-    from app.core.database import SessionLocal
-    import logging
-    
-    # Configurar logging específico para generación
-    logger = logging.getLogger("content_generation")
-    
-    db = SessionLocal()
-    try:
-        content = db.query(Content).filter(Content.id == content_id).first()
-        keyword = db.query(Keyword).filter(Keyword.id == keyword_id).first()
-        user = db.query(User).filter(User.id == user_id).first()
-        
-        if not all([content, keyword, user]):
-            logger.error(f"Datos faltantes: content={content}, keyword={keyword}, user={user}")
-            return
-        
-        logger.info(f"Iniciando generación de contenido para keyword: {keyword.keyword} (ID: {content_id})")
-        
-        # Actualizar estado de la palabra clave
-        keyword.status = "processing"
-        db.commit()
-        
-        try:
-            # Verificar que el usuario tenga API keys configuradas
-            if not user.api_key_openai and not user.api_key_deepseek:
-                # Verificar si hay API keys globales en settings
-                from app.core.config import settings
-                if not hasattr(settings, 'OPENAI_API_KEY') and not hasattr(settings, 'DEEPSEEK_API_KEY'):
-                    raise ValueError("No hay API keys configuradas. Por favor configura tus API keys en la sección de Configuración.")
-            
-            # Obtener keywords adicionales si se proporcionaron
-            additional_keywords = []
-            if additional_keyword_ids:
-                additional_keywords = db.query(Keyword).filter(
-                    Keyword.id.in_(additional_keyword_ids)
-                ).all()
-                logger.info(f"Keywords adicionales encontradas: {len(additional_keywords)}")
-            
-            # FASE 1: Generar contenido de texto
-            logger.info("FASE 1: Iniciando generación de contenido de texto...")
-            generator = ContentGenerator(user)
-            
-            # Si hay keywords adicionales, las incluimos en el contexto
-            if additional_keywords:
-                # Crear un contexto con todas las keywords
-                all_keywords = [keyword] + additional_keywords
-                keyword_context = ", ".join([kw.keyword for kw in all_keywords])
-                
-                # Modificar temporalmente la keyword principal para incluir el contexto
-                original_keyword = keyword.keyword
-                keyword.keyword = f"{original_keyword} (relacionado con: {keyword_context})"
-                
-                generated = await generator.generate_content(keyword, provider, content_type)
-                
-                # Restaurar la keyword original
-                keyword.keyword = original_keyword
-            else:
-                generated = await generator.generate_content(keyword, provider, content_type)
-            
-            logger.info("Contenido de texto generado exitosamente")
-            
-            # Actualizar contenido
-            from app.utils.helpers import generate_unique_slug, calculate_reading_time, extract_excerpt
-            
-            new_title = generated.get("title", f"Artículo sobre {keyword.keyword}")
-            new_content = generated.get("content", "")
-            
-            content.title = new_title
-            content.slug = generate_unique_slug(db, new_title, content.id)
-            content.content = new_content
-            content.excerpt = extract_excerpt(new_content)
-            content.meta_description = generated.get("meta_description", extract_excerpt(new_content, 160))
-            content.word_count = len(new_content.split())
-            content.reading_time = calculate_reading_time(new_content)
-            content.status = ContentStatus.DRAFT
-            content.focus_keyword = keyword.keyword
-            
-            # Actualizar campos Schema.org
-            content.author_name = generated.get("author_name", "Redactor IA")
-            content.publisher_name = generated.get("publisher_name", "Mi Sitio Web")
-            content.schema_type = generated.get("schema_type", "Article")
-            content.article_section = generated.get("article_section", "General")
-            
-            # Guardar cambios del contenido
-            db.commit()
-            logger.info(f"Contenido actualizado: {new_title} ({content.word_count} palabras)")
-            
-            # FASE 2: Verificar configuración de imágenes y generar si está habilitado
-            logger.info("FASE 2: Verificando configuración de imágenes...")
-            
-            # Verificar si la generación automática de imágenes está habilitada
-            should_generate_images = check_auto_image_generation(user_id, keyword_id, db)
-            
-            if should_generate_images:
-                logger.info("Generación automática de imágenes habilitada. Iniciando generación...")
-                
-                # Cambiar estado para indicar que se están generando imágenes
-                content.status = ContentStatus.GENERATING  # Temporal para mostrar progreso
-                db.commit()
-                
-                try:
-                    from app.services.image_generator import ImageGenerator
-                    image_generator = ImageGenerator(user)
-                    
-                    # Obtener configuración de imágenes
-                    image_config = get_image_config_for_content(user_id, keyword_id, db)
-                    num_images = image_config.get('num_images', 2)
-                    
-                    logger.info(f"Generando {num_images} imágenes para el contenido...")
-                    
-                    # Generar imágenes
-                    generated_images = image_generator.generate_images_for_content(content_id, num_images)
-                    
-                    if generated_images:
-                        logger.info(f"Se generaron {len(generated_images)} imágenes exitosamente")
-                        
-                        # Generar imagen destacada si está configurado
-                        if image_config.get('include_featured', True):
-                            logger.info("Generando imagen destacada...")
-                            featured_image = image_generator.generate_featured_image(content_id)
-                            if featured_image:
-                                logger.info("Imagen destacada generada exitosamente")
-                            else:
-                                logger.warning("No se pudo generar la imagen destacada")
-                    else:
-                        logger.warning("No se generaron imágenes")
-                        
-                except Exception as img_error:
-                    logger.error(f"Error generando imágenes: {str(img_error)}")
-                    # No fallar todo el proceso por errores de imágenes
-                    import traceback
-                    logger.error(f"Traceback de error de imágenes: {traceback.format_exc()}")
-                
-                # Restaurar estado final del contenido
-                content.status = ContentStatus.DRAFT
-                db.commit()
-                
-            else:
-                logger.info("Generación automática de imágenes deshabilitada")
-            
-            # Actualizar estado de la palabra clave
-            keyword.status = "completed"
-            logger.info(f"Generación completada exitosamente para: {keyword.keyword}")
-            
-        except Exception as e:
-            # Logging detallado del error
-            import traceback
-            error_details = f"Error generando contenido: {str(e)}\n\nTraceback:\n{traceback.format_exc()}"
-            logger.error(f"ERROR EN GENERACIÓN: {error_details}")
-            
-            # Manejar errores
-            content.status = ContentStatus.FAILED
-            content.content = error_details
-            keyword.status = "failed"
-        
-        db.commit()
-        
-    finally:
-        db.close()
-
-
-def check_auto_image_generation(user_id: int, keyword_id: int, db: Session) -> bool:
-    """
-    Verifica si la generación automática de imágenes está habilitada
-    """
-    try:
-        # Verificar configuración global del usuario
-        global_config = db.query(ImageConfig).filter(
-            ImageConfig.user_id == user_id,
-            ImageConfig.keyword_id.is_(None)
-        ).first()
-        
-        if global_config:
-            return global_config.auto_generate
-        else:
-            # Por defecto, la generación automática está habilitada
-            return True
-    except Exception as e:
-        logger.error(f"Error checking auto image generation: {e}")
-        return False
-
-
-def get_image_config_for_content(user_id: int, keyword_id: int, db: Session) -> dict:
-    """
-    Obtiene la configuración de imágenes para el contenido
-    """
-    try:
-        # Buscar configuración específica de la keyword
-        keyword_config = db.query(ImageConfig).filter(
-            ImageConfig.user_id == user_id,
-            ImageConfig.keyword_id == keyword_id
-        ).first()
-        
-        # Buscar configuración global del usuario
-        global_config = db.query(ImageConfig).filter(
-            ImageConfig.user_id == user_id,
-            ImageConfig.keyword_id.is_(None)
-        ).first()
-        
-        # Configuración por defecto
-        config = {
-            "num_images": 2,
-            "style": "realistic",
-            "include_featured": True,
-            "custom_prompt": None
-        }
-        
-        # Aplicar configuración global si existe
-        if global_config:
-            config["num_images"] = global_config.images_per_content
-            config["style"] = global_config.image_style.value
-            config["include_featured"] = global_config.include_featured
-        
-        # Aplicar configuración específica de keyword si existe (tiene prioridad)
-        if keyword_config:
-            if keyword_config.keyword_count is not None:
-                config["num_images"] = keyword_config.keyword_count
-            if keyword_config.keyword_style is not None:
-                config["style"] = keyword_config.keyword_style.value
-            if keyword_config.custom_prompt is not None:
-                config["custom_prompt"] = keyword_config.custom_prompt
-        
-        return config
-    except Exception as e:
-        logger.error(f"Error getting image config: {e}")
-        return {
-            "num_images": 2,
-            "style": "realistic",
-            "include_featured": True,
-            "custom_prompt": None
-        }
-
 
 @router.get("/status/{status}", response_model=List[ContentSchema])
 def get_content_by_status(
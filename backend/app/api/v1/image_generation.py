@@ -71,7 +71,7 @@ class DalleImageRequest(BaseModel):
     quality: Optional[str] = "standard"
 
 @router.post("/generate", response_model=None)
-async def generate_image(
+def generate_image(
     request: ImageGenerationRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -106,7 +106,7 @@ async def generate_image(
         )
 
 @router.post("/generate-for-content", response_model=None)
-async def generate_images_for_content(
+def generate_images_for_content(
     request: ContentImageRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -131,7 +131,7 @@ async def generate_images_for_content(
     
     try:
         image_generator = ImageGenerator(db)
-        result = await image_generator.generate_images_for_content(
+        result = image_generator.generate_images_for_content(
             content_id=request.content_id,
             num_images=request.num_images,
             style=request.style,
@@ -152,7 +152,7 @@ async def generate_images_for_content(
         )
 
 @router.post("/bulk-generate", response_model=None)
-async def bulk_generate_images(
+def bulk_generate_images(
     request: BulkImageRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -203,7 +203,7 @@ async def bulk_generate_images(
         )
 
 @router.get("/content/{content_id}/images", response_model=None)
-async def get_content_images(
+def get_content_images(
     content_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -248,7 +248,7 @@ async def get_content_images(
     }
 
 @router.delete("/images/{image_id}", response_model=None)
-async def delete_image(
+def delete_image(
     image_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -274,7 +274,7 @@ async def delete_image(
     try:
         # Eliminar archivo físico
         image_generator = ImageGenerator(db)
-        await image_generator.delete_image(image.image_path)
+        image_generator.delete_image(image.image_path)
         
         # Eliminar de la base de datos
         db.delete(image)
@@ -289,7 +289,7 @@ async def delete_image(
         )
 
 @router.get("/stats", response_model=None)
-async def get_image_stats(
+def get_image_stats(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -298,7 +298,7 @@ async def get_image_stats(
     """
     try:
         image_generator = ImageGenerator(db)
-        stats = await image_generator.get_image_stats(db, current_user.id)
+        stats = image_generator.get_image_stats(db, current_user.id)
         return stats
     except Exception as e:
         raise HTTPException(
@@ -307,7 +307,7 @@ async def get_image_stats(
         )
 
 @router.post("/optimize-alt-text/{image_id}", response_model=None)
-async def optimize_alt_text(
+def optimize_alt_text(
     image_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -332,7 +332,7 @@ async def optimize_alt_text(
     
     try:
         image_generator = ImageGenerator(db)
-        optimized_alt = await image_generator.generate_alt_text(
+        optimized_alt = image_generator.generate_alt_text(
             image.image_path, content.title, content.keyword.keyword if content.keyword else None
         )
         
@@ -353,7 +353,7 @@ async def optimize_alt_text(
         )
 
 @router.post("/config", response_model=None)
-async def save_image_config(
+def save_image_config(
     request: ImageConfigRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -415,7 +415,7 @@ async def save_image_config(
         )
 
 @router.get("/config", response_model=None)
-async def get_image_config(
+def get_image_config(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -465,7 +465,7 @@ async def get_image_config(
         )
 
 @router.post("/keyword-config", response_model=None)
-async def save_keyword_image_config(
+def save_keyword_image_config(
     request: KeywordImageConfigRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -529,7 +529,7 @@ async def save_keyword_image_config(
         )
 
 @router.get("/keyword-configs", response_model=None)
-async def get_keyword_image_configs(
+def get_keyword_image_configs(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -559,7 +559,7 @@ async def get_keyword_image_configs(
         )
 
 @router.get("/images", response_model=None)
-async def get_all_images(
+def get_all_images(
     limit: int = 50,
     offset: int = 0,
     db: Session = Depends(get_db),
@@ -661,7 +661,7 @@ async def get_all_images(
         )
 
 @router.get("/manual-images/{filename}", response_class=FileResponse)
-async def get_manual_image(
+def get_manual_image(
     filename: str,
     db: Session = Depends(get_db)
 ):
@@ -711,7 +711,7 @@ async def get_manual_image(
         )
 
 @router.post("/generate-manual", response_model=None)
-async def generate_manual_images(
+def generate_manual_images(
     request: ManualImageGenerationRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -771,7 +771,7 @@ async def generate_manual_images(
         )
 
 @router.post("/upload-manual", response_model=None)
-async def upload_manual_image(
+def upload_manual_image(
     file: UploadFile = File(...),
     keyword_id: int = None,
     alt_text: str = None,
@@ -791,7 +791,7 @@ async def upload_manual_image(
         
         # Validar tamaño de archivo (máximo 10MB)
         max_size = 10 * 1024 * 1024  # 10MB
-        file_content = await file.read()
+        file_content = file.file.read()
         if len(file_content) > max_size:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -884,7 +884,7 @@ async def upload_manual_image(
         )
 
 @router.delete("/manual/{image_id}", response_model=None)
-async def delete_manual_image(
+def delete_manual_image(
     image_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -928,7 +928,7 @@ async def delete_manual_image(
         )
 
 @router.post("/dalle-generate", response_model=None)
-async def generate_dalle_image(
+def generate_dalle_image(
     request: DalleImageRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -984,7 +984,7 @@ async def generate_dalle_image(
         )
 
 @router.get("/dalle-gallery", response_model=None)
-async def get_dalle_gallery(
+def get_dalle_gallery(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -1025,7 +1025,7 @@ async def get_dalle_gallery(
         )
 
 @router.delete("/dalle-delete/{filename}", response_model=None)
-async def delete_dalle_image(
+def delete_dalle_image(
     filename: str,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -20,7 +20,7 @@ from app.models.user import User
 router = APIRouter()
 
 @router.post("/analyze-cannibalization", response_model=KeywordAnalysisResponse)
-async def analyze_cannibalization(
+def analyze_cannibalization(
     request: KeywordAnalysisRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -44,7 +44,7 @@ async def analyze_cannibalization(
         )
 
 @router.post("/analyze-seo-potential", response_model=SEOAnalysisResponse)
-async def analyze_seo_potential(
+def analyze_seo_potential(
     request: KeywordAnalysisRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -69,7 +69,7 @@ async def analyze_seo_potential(
         )
 
 @router.post("/bulk-analyze", response_model=BulkAnalysisResponse)
-async def bulk_analyze_keywords(
+def bulk_analyze_keywords(
     request: BulkKeywordAnalysisRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -116,7 +116,7 @@ async def bulk_analyze_keywords(
         )
 
 @router.get("/similarity-matrix", response_model=SimilarityMatrixResponse)
-async def get_similarity_matrix(
+def get_similarity_matrix(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -172,7 +172,7 @@ async def get_similarity_matrix(
         )
 
 @router.get("/recommendations/{keyword_id}", response_model=KeywordRecommendationsResponse)
-async def get_keyword_recommendations(
+def get_keyword_recommendations(
     keyword_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response, UploadFile, File, Form
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.api.dependencies import get_db, get_current_active_user
 from app.models.keyword import Keyword as KeywordModel
 from app.models.content import Content as ContentModel
+from app.models.keyword import KeywordPriority
 from app.schemas.keyword import Keyword, KeywordCreate, KeywordUpdate, KeywordWithContent
 from app.schemas.user import User
+from app.utils.pagination import paginate, cached_count, set_pagination_headers
+from app.services.keyword_import import KeywordImporter
 
 router = APIRouter()
 
@@ -34,15 +37,48 @@ def create_keyword(
     
     return db_keyword
 
+@router.post("/import", response_model=None)
+def import_keywords(
+    file: UploadFile = File(...),
+    category: Optional[str] = Form(None),
+    priority: KeywordPriority = Form(KeywordPriority.MEDIUM),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Importar keywords desde un archivo txt (una por línea), csv (columna
+    `keyword` o la primera) o json (lista de strings u objetos).
+    
+    Las keywords existentes o repetidas se omiten; devuelve los conteos de
+    insertadas, duplicadas e inválidas.
+    """
+    try:
+        return KeywordImporter(db).import_file(file.file, file.filename or "", category, priority)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error importando keywords: {str(e)}"
+        )
+
 @router.get("/", response_model=List[Keyword])
 def read_keywords(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Obtener lista de palabras clave"""
-    keywords = db.query(KeywordModel).offset(skip).limit(limit).all()
+    """Obtener lista de palabras clave (paginada por cursor, ver X-Next-Cursor)"""
+    query = db.query(KeywordModel)
+    total = cached_count(query) if include_total else None
+    keywords, next_cursor = paginate(
+        query, [(KeywordModel.created_at, True), (KeywordModel.id, True)], limit, cursor=cursor, skip=skip
+    )
+    set_pagination_headers(response, next_cursor, total)
     return keywords
 
 @router.get("/{keyword_id}", response_model=KeywordWithContent)
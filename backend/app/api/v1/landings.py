@@ -1,3 +1,4 @@
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any
@@ -60,7 +61,7 @@ class LandingGenerateRequest(BaseModel):
 # ============================================================================
 
 @router.get("/creador/templates", response_model=None)
-async def get_templates(
+def get_templates(
     category: Optional[str] = None,
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
@@ -85,7 +86,7 @@ async def get_templates(
         )
 
 @router.post("/creador/landing-pages", response_model=None)
-async def create_landing_page(
+def create_landing_page(
     landing_data: LandingPageCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -107,7 +108,7 @@ async def create_landing_page(
         )
 
 @router.post("/creador/generate", response_model=None)
-async def generate_landing_page_with_ai(
+def generate_landing_page_with_ai(
     request: LandingGenerateRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -145,7 +146,7 @@ async def generate_landing_page_with_ai(
         generator = LandingPageGenerator(db, current_user)
         
         # Generar landing page
-        result = await generator.generate_landing_page(
+        result = asyncio.run(generator.generate_landing_page(
             keywords=request.keywords,
             phone_number=request.phone_number,
             ai_provider=request.ai_provider,
@@ -160,7 +161,7 @@ async def generate_landing_page_with_ai(
             separator_style=request.separator_style,
             responsive_menu=request.responsive_menu,
             testimonial_length=request.testimonial_length
-        )
+        ))
         
         return {
             "success": True,
@@ -188,9 +189,10 @@ async def generate_landing_page_with_ai(
         )
 
 @router.get("/creador/landing-pages", response_model=None)
-async def get_user_landing_pages(
+def get_user_landing_pages(
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -201,10 +203,11 @@ async def get_user_landing_pages(
         from app.services.landing_service import LandingPageService
         
         service = LandingPageService(db)
-        landing_pages = service.get_landing_pages_by_user(
+        landing_pages, next_cursor = service.paginate_landing_pages_by_user(
             user_id=current_user.id,
-            skip=offset,
-            limit=limit
+            limit=limit,
+            cursor=cursor,
+            skip=offset
         )
         
         # Convertir a formato de respuesta
@@ -230,8 +233,11 @@ async def get_user_landing_pages(
             "landing_pages": landing_pages_data,
             "total": len(landing_pages_data),
             "limit": limit,
-            "offset": offset
+            "offset": offset,
+            "next_cursor": next_cursor
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -239,7 +245,7 @@ async def get_user_landing_pages(
         )
 
 @router.get("/creador/landing-pages/{landing_id}", response_model=None)
-async def get_landing_page_details(
+def get_landing_page_details(
     landing_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -288,7 +294,7 @@ async def get_landing_page_details(
         )
 
 @router.put("/creador/landing-pages/{landing_id}", response_model=None)
-async def update_landing_page(
+def update_landing_page(
     landing_id: int,
     update_data: LandingPageUpdateSchema,
     db: Session = Depends(get_db),
@@ -333,7 +339,7 @@ async def update_landing_page(
         )
 
 @router.put("/creador/landing-pages/{landing_id}/publish", response_model=None)
-async def publish_landing_page(
+def publish_landing_page(
     landing_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -371,7 +377,7 @@ async def publish_landing_page(
         )
 
 @router.put("/creador/landing-pages/{landing_id}/unpublish", response_model=None)
-async def unpublish_landing_page(
+def unpublish_landing_page(
     landing_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -407,7 +413,7 @@ async def unpublish_landing_page(
         )
 
 @router.delete("/creador/landing-pages/{landing_id}", response_model=None)
-async def delete_landing_page(
+def delete_landing_page(
     landing_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -447,7 +453,7 @@ async def delete_landing_page(
 # ============================================================================
 
 @router.get("/seo/analysis/{landing_page_id}", response_model=None)
-async def analyze_seo(
+def analyze_seo(
     landing_page_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -471,7 +477,7 @@ async def analyze_seo(
         )
 
 @router.post("/seo/optimize/{landing_page_id}", response_model=None)
-async def optimize_seo(
+def optimize_seo(
     landing_page_id: int,
     seo_data: dict,
     db: Session = Depends(get_db),
@@ -494,7 +500,7 @@ async def optimize_seo(
         )
 
 @router.get("/seo/keywords/suggestions", response_model=None)
-async def get_keyword_suggestions(
+def get_keyword_suggestions(
     topic: str = Query(..., min_length=2),
     limit: int = Query(10, ge=1, le=50),
     db: Session = Depends(get_db),
@@ -522,7 +528,7 @@ async def get_keyword_suggestions(
 # ============================================================================
 
 @router.get("/temas/categories", response_model=None)
-async def get_theme_categories(
+def get_theme_categories(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -549,7 +555,7 @@ async def get_theme_categories(
         )
 
 @router.get("/temas/templates", response_model=None)
-async def get_theme_templates(
+def get_theme_templates(
     category_id: Optional[int] = None,
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
@@ -574,7 +580,7 @@ async def get_theme_templates(
         )
 
 @router.post("/temas/customize", response_model=None)
-async def customize_theme(
+def customize_theme(
     template_id: int,
     customizations: dict,
     db: Session = Depends(get_db),
@@ -609,7 +615,7 @@ class AIAssistantRequest(BaseModel):
     landing_page_id: Optional[int] = None
 
 @router.post("/ai-assistant", response_model=None)
-async def ai_assistant(
+def ai_assistant(
     request: AIAssistantRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -634,12 +640,12 @@ async def ai_assistant(
         ai_service = AIAssistantService(user=current_user)
         
         # Generar código con IA
-        result = await ai_service.generate_code_elements(
+        result = asyncio.run(ai_service.generate_code_elements(
             prompt=request.prompt,
             current_html=request.current_html,
             current_css=request.current_css,
             current_js=request.current_js
-        )
+        ))
         
         return {
             "success": True,
@@ -665,27 +671,29 @@ async def ai_assistant(
 # ============================================================================
 
 @router.get("/dashboard", response_model=None)
-async def get_landings_dashboard(
+def get_landings_dashboard(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
     Obtiene estadísticas generales del dashboard de landings
+    
+    Lee el resumen precalculado del usuario, por lo que el coste no depende
+    del número de landings ni de días de analytics acumulados.
     """
     try:
-        # Placeholder - implementar dashboard de landings
+        from app.services.landing_service import LandingPageService
+        
+        service = LandingPageService(db)
+        stats = service.get_dashboard_stats(current_user.id)
+        
         return {
             "success": True,
-            "message": "Dashboard de Landings - En desarrollo",
-            "stats": {
-                "total_landing_pages": 0,
-                "active_landing_pages": 0,
-                "total_visits": 0,
-                "conversion_rate": 0.0
-            }
+            "message": "Dashboard de Landings obtenido exitosamente",
+            "stats": stats
         }
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error al obtener dashboard: {str(e)}"
-        )
\ No newline at end of file
+        )
@@ -1,13 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, Request, Response, Query
 from fastapi.responses import HTMLResponse, PlainTextResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import or_, and_, desc, func
 from typing import Optional, List
 import os
 from datetime import datetime, timedelta
 from collections import defaultdict
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.models.content import Content
 from app.models.category import Category
 from app.models.tag import Tag
@@ -15,6 +15,8 @@ from app.models.keyword import Keyword
 from app.services.publication_engine import PublicationEngine
 from app.core.config import settings
 from app.api.dependencies import get_current_active_user
+from app.utils.pagination import paginate, cached_count
+from app.utils.projections import content_summary
 from app.models.user import User
 
 router = APIRouter()
@@ -39,17 +41,17 @@ def get_site_theme(db: Session) -> str:
 # Rutas públicas del sitio web
 
 @router.get("/", response_class=HTMLResponse)
-async def homepage(request: Request, db: Session = Depends(get_db)):
+def homepage(request: Request, db: Session = Depends(get_read_db)):
     """Página principal del sitio público"""
     try:
         publication_engine = PublicationEngine(db)
         
         # Obtener contenido para la homepage
-        recent_posts = db.query(Content).filter(
+        recent_posts = db.query(Content).options(*content_summary()).filter(
             Content.status == "published"
         ).order_by(Content.created_at.desc()).limit(6).all()
         
-        popular_posts = db.query(Content).filter(
+        popular_posts = db.query(Content).options(*content_summary()).filter(
             Content.status == "published"
         ).order_by(Content.word_count.desc()).limit(3).all()
         
@@ -81,7 +83,7 @@ async def homepage(request: Request, db: Session = Depends(get_db)):
 
 
 @router.get("/posts/{slug}", response_class=HTMLResponse)
-async def post_detail(slug: str, request: Request, db: Session = Depends(get_db)):
+def post_detail(slug: str, request: Request, db: Session = Depends(get_read_db)):
     """Página de detalle de un post"""
     try:
         publication_engine = PublicationEngine(db)
@@ -98,24 +100,24 @@ async def post_detail(slug: str, request: Request, db: Session = Depends(get_db)
         # Posts relacionados (misma categoría)
         related_posts = []
         if post.category:
-            related_posts = db.query(Content).filter(
+            related_posts = db.query(Content).options(*content_summary()).filter(
                 Content.category_id == post.category.id,
                 Content.id != post.id,
                 Content.status == "published"
             ).limit(3).all()
         
         # Posts populares para sidebar
-        popular_posts = db.query(Content).filter(
+        popular_posts = db.query(Content).options(*content_summary()).filter(
             Content.status == "published"
         ).order_by(Content.word_count.desc()).limit(5).all()
         
         # Navegación anterior/siguiente
-        prev_post = db.query(Content).filter(
+        prev_post = db.query(Content).options(*content_summary(preview=False)).filter(
             Content.created_at < post.created_at,
             Content.status == "published"
         ).order_by(Content.created_at.desc()).first()
         
-        next_post = db.query(Content).filter(
+        next_post = db.query(Content).options(*content_summary(preview=False)).filter(
             Content.created_at > post.created_at,
             Content.status == "published"
         ).order_by(Content.created_at.asc()).first()
@@ -141,7 +143,13 @@ async def post_detail(slug: str, request: Request, db: Session = Depends(get_db)
 
 
 @router.get("/categories/{slug}", response_class=HTMLResponse)
-async def category_detail(slug: str, request: Request, db: Session = Depends(get_db), page: int = 1):
+def category_detail(
+    slug: str,
+    request: Request,
+    db: Session = Depends(get_read_db),
+    page: int = 1,
+    cursor: Optional[str] = None
+):
     """Página de categoría"""
     try:
         publication_engine = PublicationEngine(db)
@@ -162,8 +170,11 @@ async def category_detail(slug: str, request: Request, db: Session = Depends(get
             Content.status == "published"
         )
         
-        total_posts = posts_query.count()
-        posts = posts_query.order_by(Content.created_at.desc()).offset(offset).limit(per_page).all()
+        total_posts = cached_count(posts_query)
+        posts, next_cursor = paginate(
+            posts_query.options(*content_summary(), selectinload(Content.tags), selectinload(Content.images)),
+            [(Content.created_at, True), (Content.id, True)], per_page, cursor=cursor, skip=offset
+        )
         
         # Calcular paginación
         total_pages = (total_posts + per_page - 1) // per_page
@@ -180,6 +191,7 @@ async def category_detail(slug: str, request: Request, db: Session = Depends(get
             "category": category,
             "posts": posts,
             "related_categories": related_categories,
+            "next_cursor": next_cursor,
             "current_page": page,
             "total_pages": total_pages,
             "has_prev": has_prev,
@@ -201,7 +213,13 @@ async def category_detail(slug: str, request: Request, db: Session = Depends(get
 
 
 @router.get("/tags/{slug}", response_class=HTMLResponse)
-async def tag_detail(slug: str, request: Request, db: Session = Depends(get_db), page: int = 1):
+def tag_detail(
+    slug: str,
+    request: Request,
+    db: Session = Depends(get_read_db),
+    page: int = 1,
+    cursor: Optional[str] = None
+):
     """Página de tag"""
     try:
         publication_engine = PublicationEngine(db)
@@ -217,15 +235,16 @@ async def tag_detail(slug: str, request: Request, db: Session = Depends(get_db),
         offset = (page - 1) * per_page
         
         # Posts del tag
-        posts = db.query(Content).join(Content.tags).filter(
+        posts_query = db.query(Content).join(Content.tags).filter(
             Tag.id == tag.id,
             Content.status == "published"
-        ).order_by(Content.created_at.desc()).offset(offset).limit(per_page).all()
+        )
+        posts, next_cursor = paginate(
+            posts_query.options(*content_summary(), selectinload(Content.tags), selectinload(Content.images)),
+            [(Content.created_at, True), (Content.id, True)], per_page, cursor=cursor, skip=offset
+        )
         
-        total_posts = db.query(Content).join(Content.tags).filter(
-            Tag.id == tag.id,
-            Content.status == "published"
-        ).count()
+        total_posts = cached_count(posts_query)
         
         # Calcular paginación
         total_pages = (total_posts + per_page - 1) // per_page
@@ -242,6 +261,7 @@ async def tag_detail(slug: str, request: Request, db: Session = Depends(get_db),
             "tag": tag,
             "posts": posts,
             "related_tags": related_tags,
+            "next_cursor": next_cursor,
             "current_page": page,
             "total_pages": total_pages,
             "has_prev": has_prev,
@@ -265,13 +285,18 @@ async def tag_detail(slug: str, request: Request, db: Session = Depends(get_db),
 # Rutas SEO
 
 @router.get("/sitemap.xml", response_class=Response)
-async def sitemap(request: Request, db: Session = Depends(get_db)):
+def sitemap(request: Request, db: Session = Depends(get_read_db)):
     """Sitemap XML para SEO"""
     try:
         publication_engine = PublicationEngine(db)
         
-        # Obtener todos los posts publicados
-        posts = db.query(Content).filter(
+        # Obtener todos los posts publicados (sin el cuerpo)
+        posts = db.query(Content).options(
+            *content_summary(preview=False),
+            selectinload(Content.keyword),
+            selectinload(Content.tags),
+            selectinload(Content.images)
+        ).filter(
             Content.status == "published"
         ).order_by(Content.updated_at.desc()).all()
         
@@ -300,13 +325,13 @@ async def sitemap(request: Request, db: Session = Depends(get_db)):
 
 
 @router.get("/rss.xml", response_class=Response)
-async def rss_feed(request: Request, db: Session = Depends(get_db)):
+def rss_feed(request: Request, db: Session = Depends(get_read_db)):
     """RSS Feed para sindicación"""
     try:
         publication_engine = PublicationEngine(db)
         
-        # Obtener los últimos 50 posts
-        posts = db.query(Content).filter(
+        # Obtener los últimos 50 posts (el feed incluye el cuerpo completo)
+        posts = db.query(Content).options(selectinload(Content.images)).filter(
             Content.status == "published"
         ).order_by(Content.created_at.desc()).limit(50).all()
         
@@ -331,7 +356,7 @@ async def rss_feed(request: Request, db: Session = Depends(get_db)):
 
 
 @router.get("/robots.txt", response_class=PlainTextResponse)
-async def robots_txt(request: Request, db: Session = Depends(get_db)):
+def robots_txt(request: Request, db: Session = Depends(get_read_db)):
     """Robots.txt para SEO"""
     try:
         publication_engine = PublicationEngine(db)
@@ -353,7 +378,12 @@ async def robots_txt(request: Request, db: Session = Depends(get_db)):
 
 
 @router.get("/archivo", response_class=HTMLResponse)
-async def archive_page(request: Request, db: Session = Depends(get_db), page: int = Query(1, ge=1)):
+def archive_page(
+    request: Request,
+    db: Session = Depends(get_read_db),
+    page: int = Query(1, ge=1),
+    cursor: Optional[str] = Query(None)
+):
     """Página de archivo de posts"""
     try:
         publication_engine = PublicationEngine(db)
@@ -364,13 +394,17 @@ async def archive_page(request: Request, db: Session = Depends(get_db), page: in
         
         # Obtener todos los posts publicados
         posts_query = db.query(Content).filter(Content.status == "published")
-        total_posts = posts_query.count()
-        all_posts = posts_query.order_by(Content.created_at.desc()).offset(offset).limit(per_page).all()
+        total_posts = cached_count(posts_query)
+        all_posts, next_cursor = paginate(
+            posts_query.options(*content_summary(), selectinload(Content.tags)),
+            [(Content.created_at, True), (Content.id, True)], per_page, cursor=cursor, skip=offset
+        )
         
-        # Organizar posts por año y mes
+        # Organizar posts por año y mes (todos los publicados: sin cuerpo ni vista previa)
         posts_by_year = defaultdict(lambda: {"count": 0, "months": defaultdict(list)})
         
-        for post in posts_query.order_by(Content.created_at.desc()).all():
+        index_query = posts_query.options(*content_summary(preview=False), selectinload(Content.tags))
+        for post in index_query.order_by(Content.created_at.desc()).all():
             year = post.created_at.year
             month = post.created_at.strftime("%Y-%m")
             posts_by_year[year]["count"] += 1
@@ -379,7 +413,7 @@ async def archive_page(request: Request, db: Session = Depends(get_db), page: in
         # Estadísticas
         total_categories = db.query(Category).count()
         total_tags = db.query(Tag).count()
-        months_count = len(set(post.created_at.strftime("%Y-%m") for post in posts_query.all()))
+        months_count = sum(len(year_data["months"]) for year_data in posts_by_year.values())
         
         # Paginación
         total_pages = (total_posts + per_page - 1) // per_page
@@ -390,6 +424,7 @@ async def archive_page(request: Request, db: Session = Depends(get_db), page: in
             "request": request,
             "posts_by_year": dict(posts_by_year),
             "all_posts": all_posts,
+            "next_cursor": next_cursor,
             "total_posts": total_posts,
             "total_categories": total_categories,
             "total_tags": total_tags,
@@ -407,21 +442,24 @@ async def archive_page(request: Request, db: Session = Depends(get_db), page: in
         
         return publication_engine.render_template("archive.html", context)
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error rendering archive: {str(e)}")
 
 
 @router.get("/buscar", response_class=HTMLResponse)
-async def search_page(
+def search_page(
     request: Request, 
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     q: Optional[str] = Query(None, description="Término de búsqueda"),
     category: Optional[str] = Query(None, description="Filtrar por categoría"),
     date_from: Optional[str] = Query(None, description="Fecha desde (YYYY-MM-DD)"),
     date_to: Optional[str] = Query(None, description="Fecha hasta (YYYY-MM-DD)"),
     sort: Optional[str] = Query("relevance", description="Ordenar por: relevance, date_desc, date_asc, title"),
     tags: Optional[str] = Query(None, description="Filtrar por tags (separados por comas)"),
-    page: int = Query(1, ge=1)
+    page: int = Query(1, ge=1),
+    cursor: Optional[str] = Query(None, description="Cursor de la página siguiente")
 ):
     """Página de búsqueda"""
     try:
@@ -429,6 +467,7 @@ async def search_page(
         
         results = []
         total_results = 0
+        next_cursor = None
         
         # Obtener categorías para el formulario
         categories = db.query(Category).all()
@@ -481,22 +520,22 @@ async def search_page(
                         Tag.name.in_(tag_names)
                     )
             
-            # Ordenamiento
-            if sort == "date_desc":
-                search_query = search_query.order_by(Content.created_at.desc())
-            elif sort == "date_asc":
-                search_query = search_query.order_by(Content.created_at.asc())
+            # Ordenamiento (claves del cursor; el id desempata)
+            if sort == "date_asc":
+                sort_keys = [(Content.created_at, False), (Content.id, False)]
             elif sort == "title":
-                search_query = search_query.order_by(Content.title.asc())
-            else:  # relevance (por defecto)
-                search_query = search_query.order_by(Content.created_at.desc())
+                sort_keys = [(Content.title, False), (Content.id, False)]
+            else:  # relevance y date_desc
+                sort_keys = [(Content.created_at, True), (Content.id, True)]
             
             # Paginación
             per_page = 10
             offset = (page - 1) * per_page
             
-            total_results = search_query.count()
-            results = search_query.offset(offset).limit(per_page).all()
+            total_results = cached_count(search_query)
+            results, next_cursor = paginate(
+                search_query.options(*content_summary()), sort_keys, per_page, cursor=cursor, skip=offset
+            )
             
             # Calcular paginación
             total_pages = (total_results + per_page - 1) // per_page
@@ -514,6 +553,7 @@ async def search_page(
             "request": request,
             "query": q,
             "results": results,
+            "next_cursor": next_cursor,
             "total_results": total_results,
             "categories": categories,
             "selected_category": category,
@@ -536,12 +576,14 @@ async def search_page(
         
         return publication_engine.render_template("search.html", context)
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error rendering search: {str(e)}")
 
 
 @router.get("/404", response_class=HTMLResponse)
-async def error_404_page(request: Request, db: Session = Depends(get_db)):
+def error_404_page(request: Request, db: Session = Depends(get_read_db)):
     """Página de error 404"""
     try:
         publication_engine = PublicationEngine(db)
@@ -582,7 +624,7 @@ async def error_404_page(request: Request, db: Session = Depends(get_db)):
 # Rutas administrativas para el motor de publicación
 
 @router.post("/admin/generate-site")
-async def generate_full_site(
+def generate_full_site(
     request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -603,7 +645,7 @@ async def generate_full_site(
 
 
 @router.post("/admin/regenerate-post/{post_id}")
-async def regenerate_post(
+def regenerate_post(
     post_id: int,
     request: Request,
     db: Session = Depends(get_db),
@@ -628,7 +670,7 @@ async def regenerate_post(
 
 
 @router.get("/admin/site-stats")
-async def get_site_stats(
+def get_site_stats(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -643,7 +685,7 @@ async def get_site_stats(
 
 
 @router.get("/admin/publication-status")
-async def get_publication_status(
+def get_publication_status(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
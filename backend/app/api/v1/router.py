@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1 import auth, keywords, content, keyword_analysis, image_generation, scheduler, analytics, categories, tags, seo_schemas, users, security, publication, templates, visual_config, landings, themes
+from app.api.v1 import auth, keywords, content, keyword_analysis, image_generation, scheduler, analytics, categories, tags, seo_schemas, users, security, publication, templates, visual_config, landings, themes, system, batches
 
 api_router = APIRouter()
 
@@ -103,4 +103,16 @@ api_router.include_router(
     themes.router,
     prefix="/themes",
     tags=["temas"]
-)
\ No newline at end of file
+)
+
+api_router.include_router(
+    system.router,
+    prefix="/system",
+    tags=["sistema"]
+)
+
+api_router.include_router(
+    batches.router,
+    prefix="/batches",
+    tags=["lotes-generación"]
+)
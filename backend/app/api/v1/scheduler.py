@@ -51,7 +51,7 @@ class QueueItem(BaseModel):
     generate_images: Optional[bool] = True
 
 @router.get("/status", response_model=None)
-async def get_scheduler_status(
+def get_scheduler_status(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -69,7 +69,7 @@ async def get_scheduler_status(
         )
 
 @router.post("/configure")
-async def configure_scheduler(
+def configure_scheduler(
     config: SchedulerConfig,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -77,14 +77,14 @@ async def configure_scheduler(
     """Configurar el programador automático"""
     try:
         scheduler_service = SchedulerService(db)
-        result = await scheduler_service.configure_scheduler(current_user.id, config.dict())
+        result = scheduler_service.configure_scheduler(current_user.id, config.dict())
         return {"message": "Scheduler configurado exitosamente", "config": result}
     except Exception as e:
         logger.error(f"Error configurando scheduler: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/start", response_model=None)
-async def start_scheduler(
+def start_scheduler(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -106,7 +106,7 @@ async def start_scheduler(
         )
 
 @router.post("/stop", response_model=None)
-async def stop_scheduler(
+def stop_scheduler(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -127,7 +127,7 @@ async def stop_scheduler(
         )
 
 @router.get("/queue", response_model=None)
-async def get_queue(
+def get_queue(
     limit: int = 50,
     offset: int = 0,
     db: Session = Depends(get_db),
@@ -138,7 +138,7 @@ async def get_queue(
     """
     try:
         scheduler_service = SchedulerService(db)
-        queue_items = await scheduler_service.get_queue(
+        queue_items = scheduler_service.get_queue(
             user_id=current_user.id,
             limit=limit,
             offset=offset,
@@ -159,7 +159,7 @@ async def get_queue(
         )
 
 @router.post("/queue/add", response_model=None)
-async def add_to_queue(
+def add_to_queue(
     item: QueueItem,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -169,7 +169,7 @@ async def add_to_queue(
     """
     try:
         scheduler_service = SchedulerService(db)
-        result = await scheduler_service.add_to_queue(
+        result = scheduler_service.add_to_queue(
             user_id=current_user.id,
             keyword_id=item.keyword_id,
             scheduled_for=item.scheduled_for,
@@ -193,7 +193,7 @@ async def add_to_queue(
         )
 
 @router.delete("/queue/{item_id}", response_model=None)
-async def remove_from_queue(
+def remove_from_queue(
     item_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -203,7 +203,7 @@ async def remove_from_queue(
     """
     try:
         scheduler_service = SchedulerService(db)
-        await scheduler_service.remove_from_queue(
+        scheduler_service.remove_from_queue(
             item_id=item_id,
             user_id=current_user.id,
             db=db
@@ -219,7 +219,7 @@ async def remove_from_queue(
         )
 
 @router.post("/queue/{item_id}/retry", response_model=None)
-async def retry_queue_item(
+def retry_queue_item(
     item_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -229,7 +229,7 @@ async def retry_queue_item(
     """
     try:
         scheduler_service = SchedulerService(db)
-        result = await scheduler_service.retry_queue_item(
+        result = scheduler_service.retry_queue_item(
             item_id=item_id,
             user_id=current_user.id,
             db=db
@@ -246,7 +246,7 @@ async def retry_queue_item(
         )
 
 @router.get("/logs", response_model=None)
-async def get_scheduler_logs(
+def get_scheduler_logs(
     limit: int = 100,
     offset: int = 0,
     level: Optional[str] = None,  # info, warning, error
@@ -258,7 +258,7 @@ async def get_scheduler_logs(
     """
     try:
         scheduler_service = SchedulerService(db)
-        logs = await scheduler_service.get_logs(
+        logs = scheduler_service.get_logs(
             user_id=current_user.id,
             limit=limit,
             offset=offset,
@@ -275,7 +275,7 @@ async def get_scheduler_logs(
         )
 
 @router.get("/statistics", response_model=None)
-async def get_scheduler_statistics(
+def get_scheduler_statistics(
     days: int = 30,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -285,7 +285,7 @@ async def get_scheduler_statistics(
     """
     try:
         scheduler_service = SchedulerService(db)
-        stats = await scheduler_service.get_statistics(
+        stats = scheduler_service.get_statistics(
             user_id=current_user.id,
             days=days
         )
@@ -297,7 +297,7 @@ async def get_scheduler_statistics(
         )
 
 @router.post("/test-run", response_model=None)
-async def test_scheduler(
+def test_scheduler(
     keyword_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -307,7 +307,7 @@ async def test_scheduler(
     """
     try:
         scheduler_service = SchedulerService(db)
-        result = await scheduler_service.test_generation(
+        result = scheduler_service.test_generation(
             user_id=current_user.id,
             keyword_id=keyword_id,
             db=db
@@ -327,7 +327,7 @@ async def test_scheduler(
         )
 
 @router.get("/next-execution", response_model=None)
-async def get_next_execution(
+def get_next_execution(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -336,7 +336,7 @@ async def get_next_execution(
     """
     try:
         scheduler_service = SchedulerService(db)
-        next_exec = await scheduler_service.get_next_execution(current_user.id)
+        next_exec = scheduler_service.get_next_execution(current_user.id)
         return next_exec
     except Exception as e:
         raise HTTPException(
@@ -1,11 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from fastapi.responses import JSONResponse
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 from app.core.security_config import SecurityConfig
+from app.middleware.injection_detector import injection_detector
+from app.utils.security_log import SecurityLogReader
 from app.api.dependencies import get_current_active_user
 from app.schemas.user import User
-import os
 import json
 from collections import defaultdict
 
@@ -23,44 +24,42 @@ security_stats = {
 recent_attacks = []
 blocked_ips_temp = set()
 
+log_reader = SecurityLogReader(
+    SecurityConfig.SECURITY_LOG_FILE,
+    backup_count=SecurityConfig.SECURITY_LOG_BACKUP_COUNT
+)
+
+# Las rutas que leen el log de seguridad son `def`: FastAPI las ejecuta en el
+# threadpool y la lectura del archivo no bloquea el event loop
+
 @router.get("/status", response_model=None)
-async def get_security_status(current_user: User = Depends(get_current_active_user)):
+def get_security_status(current_user: User = Depends(get_current_active_user)):
     """Obtener estado general de seguridad"""
     try:
-        # Leer logs de seguridad recientes
-        security_log_path = SecurityConfig.SECURITY_LOG_FILE
-        recent_logs = []
-        
-        if os.path.exists(security_log_path):
-            with open(security_log_path, 'r') as f:
-                lines = f.readlines()
-                # Obtener las últimas 50 líneas
-                recent_logs = lines[-50:] if len(lines) > 50 else lines
+        # Leer solo los últimos registros de seguridad (lectura inversa desde el final)
+        recent_logs = log_reader.tail(50)
         
         # Analizar logs para estadísticas
         attack_types = defaultdict(int)
         hourly_stats = defaultdict(int)
         
-        for log_line in recent_logs:
-            if "injection attempt" in log_line.lower():
+        for record in recent_logs:
+            message = record.get("message", "").lower()
+            if "injection attempt" in message:
                 attack_types["SQL Injection"] += 1
-            elif "xss attempt" in log_line.lower():
+            elif "xss attempt" in message:
                 attack_types["XSS"] += 1
-            elif "path traversal" in log_line.lower():
+            elif "path traversal" in message:
                 attack_types["Path Traversal"] += 1
-            elif "rate limit" in log_line.lower():
+            elif "rate limit" in message:
                 attack_types["Rate Limiting"] += 1
-            elif "blocked ip" in log_line.lower():
+            elif "blocked ip" in message:
                 attack_types["IP Blocking"] += 1
             
             # Extraer hora para estadísticas por hora
-            try:
-                timestamp_str = log_line.split(' - ')[0]
-                timestamp = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S,%f')
-                hour_key = timestamp.strftime('%Y-%m-%d %H:00')
+            if record.get("ts"):
+                hour_key = datetime.fromtimestamp(record["ts"]).strftime('%Y-%m-%d %H:00')
                 hourly_stats[hour_key] += 1
-            except:
-                pass
         
         return {
             "status": "active",
@@ -73,6 +72,7 @@ async def get_security_status(current_user: User = Depends(get_current_active_us
             "blocked_ips_count": len(SecurityConfig.get_blocked_ips()) + len(blocked_ips_temp),
             "recent_attacks": recent_attacks[-10:],  # Últimos 10 ataques
             "last_reset": security_stats["last_reset"].isoformat(),
+            "waf_scan_stats": injection_detector.stats(),
             "security_config": {
                 "max_requests_per_minute": SecurityConfig.MAX_REQUESTS_PER_MINUTE,
                 "max_requests_per_hour": SecurityConfig.MAX_REQUESTS_PER_HOUR,
@@ -88,51 +88,42 @@ async def get_security_status(current_user: User = Depends(get_current_active_us
         )
 
 @router.get("/logs", response_model=None)
-async def get_security_logs(
-    lines: int = 100,
+def get_security_logs(
+    lines: int = Query(100, ge=1, le=5000),
+    ip: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    level: Optional[str] = None,
     current_user: User = Depends(get_current_active_user)
 ):
-    """Obtener logs de seguridad recientes"""
+    """
+    Obtener logs de seguridad recientes
+    
+    Sin filtros lee solo los últimos registros desde el final del archivo; con
+    filtros de IP o de tiempo usa el índice auxiliar para saltar bloques.
+    """
     try:
-        security_log_path = SecurityConfig.SECURITY_LOG_FILE
+        if ip or since or until or level:
+            records = log_reader.query(limit=lines, ip=ip, since=since, until=until, level=level)
+        else:
+            records = log_reader.tail(lines)
         
-        if not os.path.exists(security_log_path):
+        if not records:
             return {"logs": [], "message": "No hay logs de seguridad disponibles"}
         
-        with open(security_log_path, 'r') as f:
-            all_lines = f.readlines()
-            recent_lines = all_lines[-lines:] if len(all_lines) > lines else all_lines
-        
-        # Formatear logs para mejor legibilidad
-        formatted_logs = []
-        for line in recent_lines:
-            try:
-                parts = line.strip().split(' - ')
-                if len(parts) >= 4:
-                    formatted_logs.append({
-                        "timestamp": parts[0],
-                        "logger": parts[1],
-                        "level": parts[2],
-                        "message": ' - '.join(parts[3:])
-                    })
-                else:
-                    formatted_logs.append({
-                        "timestamp": "",
-                        "logger": "unknown",
-                        "level": "INFO",
-                        "message": line.strip()
-                    })
-            except:
-                formatted_logs.append({
-                    "timestamp": "",
-                    "logger": "unknown",
-                    "level": "INFO",
-                    "message": line.strip()
-                })
+        formatted_logs = [
+            {
+                "timestamp": record.get("timestamp", ""),
+                "logger": record.get("logger", "unknown"),
+                "level": record.get("level", "INFO"),
+                "message": record.get("message", ""),
+                "ip": record.get("ip")
+            }
+            for record in records
+        ]
         
         return {
             "logs": formatted_logs,
-            "total_lines": len(all_lines),
             "showing_lines": len(formatted_logs)
         }
     
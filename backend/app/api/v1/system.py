@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends
+from app.api.dependencies import get_current_admin_user
+from app.core.config import settings
+from app.core.database import engine, async_engine, read_router
+from app.core.db_config import get_pool_metrics
+from app.models.user import User
+
+router = APIRouter()
+
+@router.get("/database/pool", response_model=None)
+def get_database_pool_stats(current_user: User = Depends(get_current_admin_user)):
+    """Métricas en vivo de los pools de conexiones (solo administradores)"""
+    return {
+        "environment": settings.ENVIRONMENT,
+        "pgbouncer_mode": settings.DB_PGBOUNCER,
+        "pools": {
+            "sync": get_pool_metrics(engine),
+            "async": get_pool_metrics(async_engine.sync_engine)
+        },
+        "read_replicas": read_router.stats()
+    }
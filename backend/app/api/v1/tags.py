@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.api.dependencies import get_db, get_current_active_user
@@ -11,6 +11,8 @@ from app.schemas.tag import (
     TagWithContent
 )
 from app.schemas.user import User
+from app.utils.pagination import paginate, cached_count, set_pagination_headers
+from app.utils.slugs import allocate_slug, assign_unique_slug
 import re
 
 router = APIRouter()
@@ -23,8 +25,11 @@ def create_slug(name: str) -> str:
 
 @router.get("/", response_model=List[TagWithContent])
 def get_tags(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    include_total: bool = Query(False),
     active_only: bool = Query(True),
     search: Optional[str] = Query(None),
     db: Session = Depends(get_db),
@@ -39,21 +44,15 @@ def get_tags(
     if search:
         query = query.filter(TagModel.name.contains(search.lower()))
     
-    # Ordenar por uso (más usadas primero)
-    query = query.order_by(TagModel.usage_count.desc())
-    
-    tags = query.offset(skip).limit(limit).all()
-    
-    # Agregar conteo de contenido para cada etiqueta
-    result = []
-    for tag in tags:
-        content_count = len(tag.content_items) if tag.content_items else 0
-        
-        tag_dict = tag.__dict__.copy()
-        tag_dict['content_count'] = content_count
-        result.append(TagWithContent(**tag_dict))
+    # Ordenar por uso (más usadas primero), paginando por cursor
+    total = cached_count(query) if include_total else None
+    tags, next_cursor = paginate(
+        query, [(TagModel.usage_count, True), (TagModel.id, True)], limit, cursor=cursor, skip=skip
+    )
+    set_pagination_headers(response, next_cursor, total)
     
-    return result
+    # content_count es una columna desnormalizada (app.models.counters)
+    return tags
 
 @router.get("/popular", response_model=List[TagWithContent])
 def get_popular_tags(
@@ -62,19 +61,12 @@ def get_popular_tags(
     current_user: User = Depends(get_current_active_user)
 ):
     """Obtener etiquetas más populares"""
-    tags = db.query(TagModel).filter(
+    # Por uso, como el listado: content_count incluye borradores y contenidos
+    # fallidos o en generación, así que no mide popularidad
+    return db.query(TagModel).filter(
         TagModel.is_active == True,
         TagModel.usage_count > 0
-    ).order_by(TagModel.usage_count.desc()).limit(limit).all()
-    
-    result = []
-    for tag in tags:
-        content_count = len(tag.content_items) if tag.content_items else 0
-        tag_dict = tag.__dict__.copy()
-        tag_dict['content_count'] = content_count
-        result.append(TagWithContent(**tag_dict))
-    
-    return result
+    ).order_by(TagModel.usage_count.desc(), TagModel.id.desc()).limit(limit).all()
 
 @router.get("/{tag_id}", response_model=TagWithContent)
 def get_tag(
@@ -87,11 +79,7 @@ def get_tag(
     if not tag:
         raise HTTPException(status_code=404, detail="Etiqueta no encontrada")
     
-    content_count = len(tag.content_items) if tag.content_items else 0
-    tag_dict = tag.__dict__.copy()
-    tag_dict['content_count'] = content_count
-    
-    return TagWithContent(**tag_dict)
+    return tag
 
 @router.post("/", response_model=Tag)
 def create_tag(
@@ -110,23 +98,15 @@ def create_tag(
             detail="Ya existe una etiqueta con ese nombre"
         )
     
-    # Crear slug único
-    base_slug = create_slug(tag.name)
-    slug = base_slug
-    counter = 1
-    while db.query(TagModel).filter(TagModel.slug == slug).first():
-        slug = f"{base_slug}-{counter}"
-        counter += 1
-    
     db_tag = TagModel(
         name=tag.name.lower(),
-        slug=slug,
         description=tag.description,
         color=tag.color,
         is_active=tag.is_active
     )
     
-    db.add(db_tag)
+    # Slug único (reintenta si otra petición se queda el mismo a la vez)
+    assign_unique_slug(db, db_tag, create_slug(tag.name))
     db.commit()
     db.refresh(db_tag)
     
@@ -152,21 +132,12 @@ def create_tags_bulk(
             created_tags.append(existing)
             continue
         
-        # Crear slug único
-        base_slug = create_slug(name)
-        slug = base_slug
-        counter = 1
-        while db.query(TagModel).filter(TagModel.slug == slug).first():
-            slug = f"{base_slug}-{counter}"
-            counter += 1
-        
+        # Slug único; el flush lo hace visible para las siguientes del lote
         db_tag = TagModel(
             name=name,
-            slug=slug,
             is_active=True
         )
-        
-        db.add(db_tag)
+        assign_unique_slug(db, db_tag, create_slug(name))
         created_tags.append(db_tag)
     
     db.commit()
@@ -203,15 +174,7 @@ def update_tag(
             )
         
         # Actualizar slug
-        new_slug = create_slug(tag_update.name)
-        counter = 1
-        while db.query(TagModel).filter(
-            TagModel.slug == new_slug,
-            TagModel.id != tag_id
-        ).first():
-            new_slug = f"{create_slug(tag_update.name)}-{counter}"
-            counter += 1
-        db_tag.slug = new_slug
+        db_tag.slug = allocate_slug(db, TagModel, create_slug(tag_update.name), exclude_id=tag_id)
         db_tag.name = tag_update.name.lower()
     
     # Actualizar otros campos
@@ -237,7 +200,7 @@ def delete_tag(
         raise HTTPException(status_code=404, detail="Etiqueta no encontrada")
     
     # Verificar si tiene contenido asociado
-    content_count = len(db_tag.content_items) if db_tag.content_items else 0
+    content_count = db_tag.content_count
     
     if content_count > 0 and not force:
         raise HTTPException(
@@ -264,11 +227,7 @@ def get_tag_by_slug(
     if not tag:
         raise HTTPException(status_code=404, detail="Etiqueta no encontrada")
     
-    content_count = len(tag.content_items) if tag.content_items else 0
-    tag_dict = tag.__dict__.copy()
-    tag_dict['content_count'] = content_count
-    
-    return TagWithContent(**tag_dict)
+    return tag
 
 @router.post("/search", response_model=List[Tag])
 def search_tags(
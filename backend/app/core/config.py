@@ -1,4 +1,5 @@
 import os
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -9,17 +10,41 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./autopublicador.db")
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    # Pool de conexiones (si no se definen se usan los valores del perfil de ENVIRONMENT)
+    DB_POOL_SIZE: Optional[int] = int(os.getenv("DB_POOL_SIZE")) if os.getenv("DB_POOL_SIZE") else None
+    DB_MAX_OVERFLOW: Optional[int] = int(os.getenv("DB_MAX_OVERFLOW")) if os.getenv("DB_MAX_OVERFLOW") else None
+    DB_POOL_RECYCLE: Optional[int] = int(os.getenv("DB_POOL_RECYCLE")) if os.getenv("DB_POOL_RECYCLE") else None
+    DB_POOL_TIMEOUT: Optional[int] = int(os.getenv("DB_POOL_TIMEOUT")) if os.getenv("DB_POOL_TIMEOUT") else None
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+    DB_PGBOUNCER: bool = os.getenv("DB_PGBOUNCER", "False").lower() == "true"
+    # Réplicas de lectura (URLs separadas por comas) para el tráfico público
+    DATABASE_REPLICA_URLS: str = os.getenv("DATABASE_REPLICA_URLS", "")
+    REPLICA_MAX_LAG_SECONDS: float = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+    REPLICA_HEALTH_CHECK_INTERVAL: float = float(os.getenv("REPLICA_HEALTH_CHECK_INTERVAL", "10"))
+    # Consultas de sesiones síncronas dentro del event loop: warn, raise u off
+    SYNC_SESSION_GUARD: str = os.getenv("SYNC_SESSION_GUARD", "warn")
+    DB_SQLITE_MMAP_SIZE: int = int(os.getenv("DB_SQLITE_MMAP_SIZE", "268435456"))  # 256MB
     
     # Security
     SECRET_KEY: str = os.getenv("SECRET_KEY", "tu-clave-secreta-muy-segura-aqui-cambiar-en-produccion")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "480"))  # 8 horas
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+    PASSWORD_HASH_TIMEOUT: float = float(os.getenv("PASSWORD_HASH_TIMEOUT", "10"))
+    AUTH_TOKEN_CACHE_SIZE: int = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))
+    AUTH_USER_CACHE_SIZE: int = int(os.getenv("AUTH_USER_CACHE_SIZE", "1000"))
+    AUTH_USER_CACHE_TTL: int = int(os.getenv("AUTH_USER_CACHE_TTL", "60"))  # segundos
     
     # Logging
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     
     # Rate Limiting
     REQUESTS_PER_MINUTE: int = int(os.getenv("REQUESTS_PER_MINUTE", "60"))
+    REQUESTS_PER_HOUR: int = int(os.getenv("REQUESTS_PER_HOUR", "1000"))
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory")  # memory, redis
+    RATE_LIMIT_MAX_KEYS: int = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
     
     # Content Generation
     DEFAULT_CONTENT_PROVIDER: str = os.getenv("DEFAULT_CONTENT_PROVIDER", "deepseek")
@@ -66,10 +91,42 @@ class Settings(BaseSettings):
     DEFAULT_SCHEDULE_INTERVAL: int = int(os.getenv("DEFAULT_SCHEDULE_INTERVAL", "60"))  # minutes
     MAX_DAILY_POSTS: int = int(os.getenv("MAX_DAILY_POSTS", "10"))
     SCHEDULER_TIMEZONE: str = os.getenv("SCHEDULER_TIMEZONE", "UTC")
+    SCHEDULER_WORKERS: int = int(os.getenv("SCHEDULER_WORKERS", "2"))  # hilos por proceso
+    SCHEDULER_LEASE_SECONDS: int = int(os.getenv("SCHEDULER_LEASE_SECONDS", "900"))
+    SCHEDULER_MAX_IDLE_SECONDS: float = float(os.getenv("SCHEDULER_MAX_IDLE_SECONDS", "30"))
+    SCHEDULER_MAX_ATTEMPTS: int = int(os.getenv("SCHEDULER_MAX_ATTEMPTS", "3"))
+    KEYWORD_LEASE_SECONDS: int = int(os.getenv("KEYWORD_LEASE_SECONDS", "1800"))  # generación por keyword
+    
+    # Generación de contenido: "background" (en el proceso de la API) o "celery" (pipeline por etapas)
+    CONTENT_PIPELINE_BACKEND: str = os.getenv("CONTENT_PIPELINE_BACKEND", "background")
+    
+    # Generación por lotes
+    BATCH_MAX_ITEMS: int = int(os.getenv("BATCH_MAX_ITEMS", "500"))
+    BATCH_DEFAULT_CONCURRENCY: int = int(os.getenv("BATCH_DEFAULT_CONCURRENCY", "2"))
+    BATCH_MAX_CONCURRENCY: int = int(os.getenv("BATCH_MAX_CONCURRENCY", "10"))
+    BATCH_PROGRESS_INTERVAL_SECONDS: float = float(os.getenv("BATCH_PROGRESS_INTERVAL_SECONDS", "2"))
+    
+    # Operaciones masivas sobre contenido
+    CONTENT_BULK_MAX_ITEMS: int = int(os.getenv("CONTENT_BULK_MAX_ITEMS", "5000"))
+    SITE_REBUILD_ON_CHANGE: bool = os.getenv("SITE_REBUILD_ON_CHANGE", "true").lower() == "true"
+    SITE_REBUILD_DELAY_SECONDS: int = int(os.getenv("SITE_REBUILD_DELAY_SECONDS", "60"))  # agrupa cambios seguidos
+    COUNT_CACHE_BACKEND: str = os.getenv("COUNT_CACHE_BACKEND", "memory")  # memory, redis (versión compartida)
+    
+    # Recursos por proceso de los workers de Celery
+    WORKER_HTTP_POOL_SIZE: int = int(os.getenv("WORKER_HTTP_POOL_SIZE", "10"))
+    WORKER_CACHE_TTL_SECONDS: int = int(os.getenv("WORKER_CACHE_TTL_SECONDS", "300"))
+    WORKER_STATS_INTERVAL_SECONDS: float = float(os.getenv("WORKER_STATS_INTERVAL_SECONDS", "15"))
+    PROVIDER_HTTP_TIMEOUT_SECONDS: float = float(os.getenv("PROVIDER_HTTP_TIMEOUT_SECONDS", "120"))
     
     # Analytics
     ENABLE_ANALYTICS: bool = os.getenv("ENABLE_ANALYTICS", "true").lower() == "true"
     ANALYTICS_RETENTION_DAYS: int = int(os.getenv("ANALYTICS_RETENTION_DAYS", "365"))
+    # Conversiones públicas: una por visitante y landing en la ventana, y tope por IP
+    LANDING_CONVERSION_DEDUP_SECONDS: int = int(os.getenv("LANDING_CONVERSION_DEDUP_SECONDS", "86400"))
+    LANDING_CONVERSIONS_PER_IP_HOUR: int = int(os.getenv("LANDING_CONVERSIONS_PER_IP_HOUR", "20"))
+    # Visitantes únicos de landings: volcado por lotes del sketch (por proceso)
+    LANDING_ANALYTICS_FLUSH_SECONDS: float = float(os.getenv("LANDING_ANALYTICS_FLUSH_SECONDS", "10"))
+    LANDING_ANALYTICS_FLUSH_VIEWS: int = int(os.getenv("LANDING_ANALYTICS_FLUSH_VIEWS", "500"))
     
     # Keyword Analysis
     SIMILARITY_THRESHOLD: float = float(os.getenv("SIMILARITY_THRESHOLD", "0.8"))
@@ -78,11 +135,17 @@ class Settings(BaseSettings):
     # File Upload
     MAX_FILE_SIZE: int = int(os.getenv("MAX_FILE_SIZE", "10485760"))  # 10MB
     ALLOWED_FILE_TYPES: list = ["txt", "csv", "json"]
+    KEYWORD_IMPORT_BATCH_SIZE: int = int(os.getenv("KEYWORD_IMPORT_BATCH_SIZE", "500"))  # filas por INSERT
     
     # Development
     ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
     DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
     
+    @property
+    def replica_urls(self) -> list:
+        """Lista de URLs de réplicas configuradas"""
+        return [url.strip() for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+    
     class Config:
         env_file = ".env"
         extra = "allow"
@@ -3,24 +3,41 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from .config import settings
+from .db_config import build_engine_options, configure_engine, install_sync_session_guard, to_async_url
+from .replicas import ReplicaRouter
 from typing import Generator, AsyncGenerator
 
 # Configuración de base de datos síncrona
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
-engine = create_engine(SQLALCHEMY_DATABASE_URL, pool_pre_ping=True)
+engine = configure_engine(
+    create_engine(SQLALCHEMY_DATABASE_URL, **build_engine_options(SQLALCHEMY_DATABASE_URL)),
+    "sync"
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Configuración de base de datos asíncrona
-if settings.DATABASE_URL.startswith("postgresql://"):
-    ASYNC_DATABASE_URL = settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
-else:
-    ASYNC_DATABASE_URL = settings.DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://")
+ASYNC_DATABASE_URL = to_async_url(settings.DATABASE_URL)
 
-async_engine = create_async_engine(ASYNC_DATABASE_URL)
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **build_engine_options(ASYNC_DATABASE_URL, async_engine=True))
+configure_engine(async_engine.sync_engine, "async")
 AsyncSessionLocal = sessionmaker(
     async_engine, class_=AsyncSession, expire_on_commit=False
 )
 
+# Réplicas de solo lectura para el tráfico público (vacío = todo va al primario)
+read_router = ReplicaRouter(
+    settings.replica_urls,
+    primary_factory=SessionLocal,
+    async_primary_factory=AsyncSessionLocal,
+    max_lag=settings.REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.REPLICA_HEALTH_CHECK_INTERVAL
+)
+
+# Avisar (o fallar) si una ruta async usa una sesión síncrona
+install_sync_session_guard(SessionLocal, settings.SYNC_SESSION_GUARD)
+for replica in read_router.replicas:
+    install_sync_session_guard(replica.session_factory, settings.SYNC_SESSION_GUARD)
+
 Base = declarative_base()
 
 
@@ -33,10 +50,34 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def get_read_db() -> Generator[Session, None, None]:
+    """
+    Dependency para lecturas públicas y de analytics.
+    
+    Devuelve una sesión sobre una réplica sana y al día, o sobre el primario
+    si no hay réplicas disponibles. No usar para escrituras ni para leer
+    datos recién escritos en la misma solicitud.
+    """
+    db = read_router.read_session()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
     """Dependency para obtener sesión de base de datos asíncrona"""
     async with AsyncSessionLocal() as session:
         try:
             yield session
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
+
+
+async def get_async_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency asíncrona para lecturas públicas (réplica o primario, como get_read_db)"""
+    session = await read_router.async_read_session()
+    try:
+        yield session
+    finally:
+        await session.close()
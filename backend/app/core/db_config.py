@@ -0,0 +1,263 @@
+import time
+import asyncio
+import logging
+import threading
+import traceback
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# PERFILES DE CONEXIÓN POR ENTORNO
+# ============================================================================
+
+# Valores por defecto del pool; cada uno puede sobrescribirse con DB_* en el entorno
+ENGINE_PROFILES: Dict[str, Dict[str, int]] = {
+    "development": {"pool_size": 5, "max_overflow": 5, "pool_recycle": 1800, "pool_timeout": 30},
+    "testing": {"pool_size": 2, "max_overflow": 0, "pool_recycle": 1800, "pool_timeout": 10},
+    "staging": {"pool_size": 10, "max_overflow": 10, "pool_recycle": 1800, "pool_timeout": 15},
+    "production": {"pool_size": 20, "max_overflow": 10, "pool_recycle": 900, "pool_timeout": 10},
+}
+
+# Pragmas aplicados a cada conexión SQLite
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+    "temp_store": "MEMORY",
+}
+
+
+def is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def to_async_url(url: str) -> str:
+    """URL equivalente con driver asíncrono (asyncpg / aiosqlite)"""
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+
+
+def get_engine_profile(environment: Optional[str] = None) -> Dict[str, int]:
+    """Parámetros del pool para el entorno, con las sobrescrituras de la configuración"""
+    environment = (environment or settings.ENVIRONMENT).lower()
+    profile = dict(ENGINE_PROFILES.get(environment, ENGINE_PROFILES["development"]))
+
+    overrides = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+    profile.update({key: value for key, value in overrides.items() if value is not None})
+    return profile
+
+
+# ============================================================================
+# MÉTRICAS DEL POOL
+# ============================================================================
+
+class PoolMetrics:
+    """Contadores de checkouts, tiempos de espera y desbordamiento de un pool"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.peak_overflow = 0
+
+    def record_wait(self, wait: float, overflow: int, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+                self.total_wait += wait
+            if wait > self.max_wait:
+                self.max_wait = wait
+            if overflow > self.peak_overflow:
+                self.peak_overflow = overflow
+
+    def snapshot(self, pool: Any) -> Dict[str, Any]:
+        data = {
+            "pool_class": pool.__class__.__name__,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 3),
+            "peak_overflow": max(self.peak_overflow, 0),
+        }
+        if isinstance(pool, QueuePool):
+            data.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": pool._max_overflow,
+                "timeout": pool.timeout(),
+            })
+        return data
+
+
+class _InstrumentedPoolMixin:
+    """Mide cuánto espera cada checkout hasta obtener una conexión del pool"""
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            self.metrics.record_wait(time.perf_counter() - start, self.overflow(), timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - start, self.overflow())
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+# ============================================================================
+# CONSTRUCCIÓN DE ENGINES
+# ============================================================================
+
+def build_engine_options(url: str, async_engine: bool = False) -> Dict[str, Any]:
+    """
+    Argumentos de `create_engine`/`create_async_engine` para la URL dada.
+
+    - SQLite: pool instrumentado para archivos (el pool por defecto en
+      memoria y en aiosqlite); los pragmas se aplican con
+      `install_sqlite_pragmas`.
+    - PostgreSQL: pool dimensionado por entorno, con recycle, pre-ping y
+      `statement_timeout`.
+    - PostgreSQL detrás de PgBouncer (modo transacción): sin pool propio
+      (NullPool), sin caché de sentencias preparadas y sin parámetros de
+      arranque, que PgBouncer no admite; el timeout se configura en el rol.
+    """
+    options: Dict[str, Any] = {"pool_pre_ping": True}
+
+    if is_sqlite(url):
+        if not async_engine and ":memory:" not in url:
+            options.update(get_engine_profile())
+            options["poolclass"] = InstrumentedQueuePool
+            options["connect_args"] = {"check_same_thread": False}
+        return options
+
+    if settings.DB_PGBOUNCER:
+        options["poolclass"] = NullPool
+        if async_engine:
+            options["connect_args"] = {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+        return options
+
+    options.update(get_engine_profile())
+    options["poolclass"] = InstrumentedAsyncQueuePool if async_engine else InstrumentedQueuePool
+
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        timeout = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        if async_engine:
+            options["connect_args"] = {"server_settings": {"statement_timeout": timeout}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+
+    return options
+
+
+def install_sqlite_pragmas(engine: Engine) -> None:
+    """Aplicar WAL, synchronous=NORMAL, mmap y demás pragmas a cada conexión nueva"""
+    pragmas = dict(SQLITE_PRAGMAS)
+    if settings.DB_SQLITE_MMAP_SIZE:
+        pragmas["mmap_size"] = settings.DB_SQLITE_MMAP_SIZE
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def configure_engine(engine: Engine, name: str) -> Engine:
+    """Completar la configuración de un engine ya creado (pragmas y métricas)"""
+    if engine.dialect.name == "sqlite":
+        install_sqlite_pragmas(engine)
+
+    engine.pool.metrics = getattr(engine.pool, "metrics", None) or PoolMetrics(name)
+    return engine
+
+
+# ============================================================================
+# GUARDIA CONTRA SESIONES SÍNCRONAS EN EL EVENT LOOP
+# ============================================================================
+
+_reported_locations = set()
+
+
+def install_sync_session_guard(session_factory: sessionmaker, mode: str = "warn") -> None:
+    """
+    Detectar consultas de una sesión síncrona ejecutadas en el hilo del event loop.
+
+    Ocurre cuando una ruta `async def` usa `get_db`/`get_read_db`: la E/S de
+    base de datos bloquea el loop y todas las demás solicitudes del worker.
+    `mode` puede ser "warn" (registrar un aviso), "raise" o "off".
+    """
+    mode = (mode or "off").lower()
+    if mode == "off":
+        return
+
+    @event.listens_for(session_factory, "do_orm_execute")
+    def _check_event_loop(orm_execute_state):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return  # Hilo del threadpool o worker: correcto
+
+        frames = traceback.extract_stack()
+        origin = next(
+            (f for f in reversed(frames) if "sqlalchemy" not in f.filename and f.filename != __file__),
+            None
+        )
+        location = f"{origin.filename}:{origin.lineno}" if origin else "desconocida"
+        message = (
+            f"Sesión síncrona usada dentro del event loop ({location}); "
+            "use get_async_db/get_async_read_db o declare la ruta con 'def'"
+        )
+        if mode == "raise":
+            raise RuntimeError(message)
+        # Un aviso por línea de código para no inundar el log
+        if location not in _reported_locations:
+            _reported_locations.add(location)
+            logger.warning(message)
+
+
+def get_pool_metrics(engine: Engine) -> Dict[str, Any]:
+    """Métricas en vivo del pool de un engine"""
+    pool = engine.pool
+    metrics = getattr(pool, "metrics", None) or PoolMetrics(engine.url.get_backend_name())
+    data = metrics.snapshot(pool)
+    data["engine"] = metrics.name
+    data["dialect"] = engine.dialect.name
+    return data
@@ -34,4 +34,9 @@ class ExternalServiceError(HTTPException):
 class RateLimitError(HTTPException):
     """Excepción para límites de tasa excedidos"""
     def __init__(self, detail: str = "Límite de tasa excedido", status_code: int = 429):
-        super().__init__(status_code=status_code, detail=detail)
\ No newline at end of file
+        super().__init__(status_code=status_code, detail=detail)
+
+class ServiceUnavailableError(HTTPException):
+    """Excepción para servicios internos saturados o sin respuesta a tiempo"""
+    def __init__(self, detail: str = "Servicio temporalmente no disponible", status_code: int = 503):
+        super().__init__(status_code=status_code, detail=detail)
@@ -0,0 +1,175 @@
+import time
+import asyncio
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from .db_config import build_engine_options, configure_engine, get_pool_metrics, to_async_url
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# ENRUTADO DE LECTURAS A RÉPLICAS
+# ============================================================================
+
+# Retraso de replicación en segundos; 0 si la réplica ya aplicó todo lo recibido
+POSTGRES_LAG_QUERY = text("""
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+class Replica:
+    """Réplica de solo lectura con su engine y el resultado del último health check"""
+
+    def __init__(self, name: str, url: str):
+        self.name = name
+        self.url = url
+        self.engine = configure_engine(create_engine(url, **build_engine_options(url)), name)
+        self.session_factory = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        async_url = to_async_url(url)
+        self.async_engine = create_async_engine(async_url, **build_engine_options(async_url, async_engine=True))
+        configure_engine(self.async_engine.sync_engine, f"{name}-async")
+        self.async_session_factory = sessionmaker(self.async_engine, class_=AsyncSession, expire_on_commit=False)
+        self.healthy = True
+        self.lag: Optional[float] = None
+        self.checked_at = 0.0
+        self.last_error: Optional[str] = None
+
+    def check(self) -> None:
+        """Comprobar conectividad y retraso de replicación"""
+        try:
+            with self.engine.connect() as connection:
+                if self.engine.dialect.name == "postgresql":
+                    lag = connection.execute(POSTGRES_LAG_QUERY).scalar()
+                    self.lag = float(lag or 0)
+                else:
+                    connection.execute(text("SELECT 1"))
+                    self.lag = 0.0
+            self.healthy = True
+            self.last_error = None
+        except Exception as e:
+            if self.healthy:
+                logger.warning(f"Réplica {self.name} no disponible: {str(e)}")
+            self.healthy = False
+            self.lag = None
+            self.last_error = str(e)
+        finally:
+            self.checked_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "healthy": self.healthy,
+            "lag_seconds": self.lag,
+            "last_error": self.last_error,
+            "pool": get_pool_metrics(self.engine),
+            "async_pool": get_pool_metrics(self.async_engine.sync_engine)
+        }
+
+
+class ReplicaRouter:
+    """
+    Reparte las sesiones de solo lectura entre las réplicas disponibles.
+
+    Las réplicas se comprueban como mucho cada `check_interval` segundos, de
+    forma perezosa en la propia solicitud (sin hilos en segundo plano). Se
+    usa round-robin entre las réplicas sanas cuyo retraso no supera
+    `max_lag`; si no queda ninguna, las lecturas vuelven al primario. Las
+    escrituras nunca pasan por aquí: siguen usando `get_db`.
+    """
+
+    def __init__(
+        self,
+        replica_urls: Sequence[str],
+        primary_factory: sessionmaker,
+        async_primary_factory: Optional[sessionmaker] = None,
+        max_lag: float = 5.0,
+        check_interval: float = 10.0,
+    ):
+        self.primary_factory = primary_factory
+        self.async_primary_factory = async_primary_factory
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.replicas: List[Replica] = [
+            Replica(f"replica-{i}", url) for i, url in enumerate(replica_urls, start=1)
+        ]
+        self._lock = threading.Lock()
+        self._next = 0
+        self.replica_sessions = 0
+        self.primary_fallbacks = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    def _needs_check(self) -> bool:
+        now = time.monotonic()
+        return any(now - r.checked_at >= self.check_interval for r in self.replicas)
+
+    def _refresh_health(self) -> None:
+        now = time.monotonic()
+        stale = [r for r in self.replicas if now - r.checked_at >= self.check_interval]
+        if not stale:
+            return
+        # Solo un hilo comprueba; los demás usan el último resultado conocido
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            for replica in stale:
+                replica.check()
+        finally:
+            self._lock.release()
+
+    def _available(self) -> List[Replica]:
+        return [
+            r for r in self.replicas
+            if r.healthy and (r.lag is None or r.lag <= self.max_lag)
+        ]
+
+    def choose(self, refresh: bool = True) -> Optional[Replica]:
+        """Elegir una réplica válida o None si hay que leer del primario"""
+        if not self.replicas:
+            return None
+
+        if refresh:
+            self._refresh_health()
+        available = self._available()
+        if not available:
+            self.primary_fallbacks += 1
+            return None
+
+        self._next = (self._next + 1) % len(available)
+        self.replica_sessions += 1
+        return available[self._next]
+
+    def read_session(self) -> Session:
+        """Sesión de solo lectura: réplica si hay alguna válida, primario si no"""
+        replica = self.choose()
+        if replica is None:
+            return self.primary_factory()
+        return replica.session_factory()
+
+    async def async_read_session(self) -> AsyncSession:
+        """Versión asíncrona de `read_session`; el health check corre en un hilo aparte"""
+        if self.replicas and self._needs_check():
+            await asyncio.get_running_loop().run_in_executor(None, self._refresh_health)
+
+        replica = self.choose(refresh=False)
+        if replica is None:
+            return self.async_primary_factory()
+        return replica.async_session_factory()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "max_lag_seconds": self.max_lag,
+            "replica_sessions": self.replica_sessions,
+            "primary_fallbacks": self.primary_fallbacks,
+            "replicas": {r.name: r.stats() for r in self.replicas}
+        }
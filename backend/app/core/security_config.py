@@ -48,28 +48,28 @@ class SecurityConfig:
         )
     }
     
-    # Patrones de ataques comunes
+    # Patrones de ataques comunes (se compilan una sola vez en InjectionDetector)
     SQL_INJECTION_PATTERNS = [
-        r"('|(\-\-)|(;)|(\||\|)|(\*|\*))",
-        r"((\%27)|(\'))(\%6F|o|\%4F)(\%72|r|\%52)",
-        r"union\s+select",
+        r"'\s*(or|and)\s+['\"\w]+\s*(=|like\b)",
+        r"'\s*(--|;)",
+        r";\s*(drop|delete|insert|update|truncate|alter|create|shutdown)\s",
+        r"exec(\s|\+)+(s|x)p\w+",
+        r"union(\s+all)?\s+select",
         r"drop\s+table",
         r"insert\s+into",
         r"delete\s+from",
-        r"update\s+set",
+        r"update\s+\w+\s+set",
         r"create\s+table",
         r"alter\s+table",
         r"truncate\s+table"
     ]
     
     XSS_PATTERNS = [
-        r"<script[^>]*>.*?</script>",
+        r"<script\b",
         r"javascript:",
-        r"on\w+\s*=",
-        r"<iframe[^>]*>.*?</iframe>",
-        r"<object[^>]*>.*?</object>",
-        r"<embed[^>]*>.*?</embed>",
         r"vbscript:",
+        r"<\w+[^>]*\s+on\w+\s*=",
+        r"<(iframe|object|embed|link|meta)\b",
         r"expression\s*\(",
         r"@import"
     ]
@@ -77,13 +77,26 @@ class SecurityConfig:
     PATH_TRAVERSAL_PATTERNS = [
         r"\.\./",
         r"\.\.\\",
-        r"%2e%2e%2f",
-        r"%2e%2e%5c"
+        r"%2e%2e(%2f|%5c|/|\\)",
+        r"\.\.%(2f|5c)"
     ]
     
+    # Rutas de archivos estáticos que no se inspeccionan
+    STATIC_PATH_PREFIXES = ("/static/", "/images/")
+    STATIC_FILE_EXTENSIONS = (
+        ".css", ".js", ".map", ".png", ".jpg", ".jpeg", ".gif", ".webp",
+        ".svg", ".ico", ".woff", ".woff2", ".ttf"
+    )
+    
+    # Headers que no se inspeccionan (tokens opacos que generan falsos positivos)
+    INJECTION_SKIP_HEADERS = ("authorization",)
+    
     # Configuración de logging de seguridad
-    SECURITY_LOG_FILE = "logs/security.log"
-    SECURITY_LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    SECURITY_LOG_FILE = "logs/security.log"  # JSON lines
+    SECURITY_LOG_MAX_BYTES = 50 * 1024 * 1024  # Rotar al llegar a 50MB
+    SECURITY_LOG_ROTATION_INTERVAL = 86400  # Rotar además cada día (segundos)
+    SECURITY_LOG_BACKUP_COUNT = 10
+    SECURITY_LOG_INDEX_BLOCK_SIZE = 500  # Registros por bloque del índice auxiliar
     
     # Configuración de alertas
     ALERT_THRESHOLD_SUSPICIOUS_ACTIVITY = 5
@@ -0,0 +1,128 @@
+import re
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+from urllib.parse import unquote
+
+from app.core.security_config import SecurityConfig
+
+# ============================================================================
+# DETECTOR DE INYECCIONES (SQL, XSS, PATH TRAVERSAL)
+# ============================================================================
+
+ATTACK_TYPES = {
+    "sql": "SQL injection",
+    "xss": "XSS",
+    "traversal": "Path traversal",
+}
+
+
+class InjectionDetector:
+    """
+    Detector de inyecciones con todos los patrones compilados en una sola
+    alternancia.
+
+    Cada categoría es un grupo con nombre, de modo que una única pasada de
+    `re.search` sobre la entrada decodificada indica si hay ataque y de qué
+    tipo. En las rutas de archivos estáticos la ruta solo se revisa en busca
+    de path traversal; la query y los headers se inspeccionan siempre.
+    """
+
+    def __init__(
+        self,
+        sql_patterns: Optional[Iterable[str]] = None,
+        xss_patterns: Optional[Iterable[str]] = None,
+        traversal_patterns: Optional[Iterable[str]] = None,
+        static_prefixes: Tuple[str, ...] = SecurityConfig.STATIC_PATH_PREFIXES,
+        static_extensions: Tuple[str, ...] = SecurityConfig.STATIC_FILE_EXTENSIONS,
+        skip_headers: Iterable[str] = SecurityConfig.INJECTION_SKIP_HEADERS,
+    ):
+        groups = {
+            "sql": sql_patterns or SecurityConfig.SQL_INJECTION_PATTERNS,
+            "xss": xss_patterns or SecurityConfig.XSS_PATTERNS,
+            "traversal": traversal_patterns or SecurityConfig.PATH_TRAVERSAL_PATTERNS,
+        }
+        combined = "|".join(
+            f"(?P<{name}>{'|'.join(f'(?:{p})' for p in patterns)})"
+            for name, patterns in groups.items()
+        )
+        # Los patrones se escriben en minúsculas y la entrada se pasa a minúsculas
+        # una sola vez: es bastante más rápido que compilar con re.IGNORECASE
+        self._regex = re.compile(combined, re.DOTALL)
+        self._traversal_regex = re.compile("|".join(f"(?:{p})" for p in groups["traversal"]), re.DOTALL)
+
+        self.static_prefixes = tuple(static_prefixes)
+        self.static_extensions = tuple(static_extensions)
+        self.skip_headers = {h.lower() for h in skip_headers}
+
+        # Métricas acumuladas del proceso
+        self._scans = 0
+        self._detections = 0
+        self._total_ns = 0
+        self._max_ns = 0
+
+    def is_static_path(self, path: str) -> bool:
+        """Verificar si la ruta corresponde a un archivo estático"""
+        return path.startswith(self.static_prefixes) or path.lower().endswith(self.static_extensions)
+
+    def scan_text(self, text: str) -> Optional[Tuple[str, str]]:
+        """Buscar un ataque en un texto ya decodificado; devuelve (tipo, fragmento)"""
+        match = self._regex.search(text.lower())
+        if not match:
+            return None
+        return match.lastgroup, match.group(0)
+
+    def scan_traversal(self, text: str) -> Optional[Tuple[str, str]]:
+        """Buscar solo path traversal (rutas de archivos estáticos)"""
+        match = self._traversal_regex.search(text.lower())
+        return ("traversal", match.group(0)) if match else None
+
+    def inspect(
+        self,
+        path: str,
+        query: str = "",
+        headers: Iterable[Tuple[str, str]] = (),
+    ) -> Dict[str, Any]:
+        """
+        Inspeccionar una solicitud en una sola pasada.
+
+        Devuelve un diccionario con `attack_type` (None si no hay ataque),
+        `match`, `skipped` (True si la ruta es estática y solo se revisó en
+        busca de path traversal) y `scan_time_us`.
+        """
+        start = time.perf_counter_ns()
+
+        static = self.is_static_path(path)
+        parts = [query]
+        parts.extend(value for name, value in headers if name.lower() not in self.skip_headers)
+        if static:
+            result = self.scan_traversal(unquote(path)) or self.scan_text(unquote("\n".join(parts)))
+        else:
+            result = self.scan_text(unquote("\n".join([path] + parts)))
+
+        elapsed = time.perf_counter_ns() - start
+        self._scans += 1
+        self._total_ns += elapsed
+        if elapsed > self._max_ns:
+            self._max_ns = elapsed
+        if result:
+            self._detections += 1
+
+        return {
+            "attack_type": result[0] if result else None,
+            "match": result[1] if result else None,
+            "skipped": static,
+            "scan_time_us": elapsed / 1000,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Métricas de escaneo del proceso actual"""
+        return {
+            "scans": self._scans,
+            "detections": self._detections,
+            "avg_scan_time_us": round(self._total_ns / self._scans / 1000, 2) if self._scans else 0.0,
+            "max_scan_time_us": round(self._max_ns / 1000, 2),
+        }
+
+
+# Instancia compartida por el middleware y el endpoint de estado de seguridad
+injection_detector = InjectionDetector()
@@ -0,0 +1,199 @@
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Tuple
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+from app.core.config import settings
+
+security_logger = logging.getLogger("security")
+
+# Un límite es (número máximo de solicitudes, ventana en segundos)
+RateLimit = Tuple[int, int]
+
+
+# ============================================================================
+# INTERFAZ DE BACKENDS DE RATE LIMITING
+# ============================================================================
+
+class RateLimitBackend:
+    """
+    Backend de rate limiting con contadores de ventana deslizante.
+
+    `hit` registra una solicitud para la clave y devuelve True si alguno de los
+    límites ya se alcanzó (en ese caso la solicitud no se contabiliza).
+    """
+
+    async def hit(self, key: str, limits: Sequence[RateLimit]) -> bool:
+        raise NotImplementedError
+
+    async def reset(self, key: str) -> None:
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        return {"backend": self.__class__.__name__}
+
+
+# ============================================================================
+# BACKEND EN MEMORIA (POR PROCESO)
+# ============================================================================
+
+class InMemoryRateLimiter(RateLimitBackend):
+    """
+    Contador de ventana deslizante en memoria del proceso.
+
+    Cada clave guarda tres enteros por ventana (inicio de ventana, contador
+    actual y contador anterior), por lo que la memoria por IP es fija. Las
+    claves se mantienen en orden LRU y las menos recientes se descartan al
+    superar `max_keys`.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, List[List[int]]]" = OrderedDict()
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def _estimate(bucket: List[int], window: int, now: float) -> float:
+        """Actualizar la ventana del bucket y estimar las solicitudes en la ventana deslizante"""
+        current_window = int(now // window)
+        window_start, current, previous = bucket
+
+        if current_window != window_start:
+            # Si solo avanzó una ventana, la actual pasa a ser la anterior
+            previous = current if current_window == window_start + 1 else 0
+            current = 0
+            bucket[:] = [current_window, current, previous]
+
+        elapsed = (now % window) / window
+        return previous * (1 - elapsed) + current
+
+    async def hit(self, key: str, limits: Sequence[RateLimit]) -> bool:
+        now = time.time()
+
+        async with self._lock:
+            buckets = self._buckets.get(key)
+            if buckets is None:
+                buckets = [[int(now // window), 0, 0] for _, window in limits]
+                self._buckets[key] = buckets
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+
+            # Verificar todos los límites antes de contabilizar la solicitud
+            for bucket, (limit, window) in zip(buckets, limits):
+                if self._estimate(bucket, window, now) >= limit:
+                    return True
+
+            for bucket in buckets:
+                bucket[1] += 1
+
+        return False
+
+    async def reset(self, key: str) -> None:
+        async with self._lock:
+            self._buckets.pop(key, None)
+
+    def stats(self) -> dict:
+        return {
+            "backend": "memory",
+            "tracked_keys": len(self._buckets),
+            "max_keys": self.max_keys
+        }
+
+
+# ============================================================================
+# BACKEND REDIS (COMPARTIDO ENTRE WORKERS Y NODOS)
+# ============================================================================
+
+# Verifica y contabiliza todas las ventanas en una sola operación atómica.
+# KEYS[1]: prefijo de la clave; ARGV: pares (límite, ventana en segundos).
+# Devuelve 0 si se permite la solicitud o el índice del límite superado.
+SLIDING_WINDOW_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local n = #ARGV / 2
+local current_keys = {}
+
+for i = 1, n do
+    local limit = tonumber(ARGV[2 * i - 1])
+    local window = tonumber(ARGV[2 * i])
+    local current_window = math.floor(now / window)
+    local current_key = KEYS[1] .. ':' .. window .. ':' .. current_window
+    local previous_key = KEYS[1] .. ':' .. window .. ':' .. (current_window - 1)
+    local current = tonumber(redis.call('GET', current_key) or '0')
+    local previous = tonumber(redis.call('GET', previous_key) or '0')
+    local elapsed = (now % window) / window
+
+    if previous * (1 - elapsed) + current >= limit then
+        return i
+    end
+    current_keys[i] = {current_key, window}
+end
+
+for i = 1, n do
+    redis.call('INCR', current_keys[i][1])
+    redis.call('EXPIRE', current_keys[i][1], current_keys[i][2] * 2)
+end
+
+return 0
+"""
+
+
+class RedisRateLimiter(RateLimitBackend):
+    """
+    Contador de ventana deslizante en Redis mediante un script Lua atómico.
+
+    Los límites se aplican de forma consistente entre todos los workers de
+    uvicorn y todos los nodos que comparten la misma instancia de Redis.
+    """
+
+    def __init__(self, redis_url: str, prefix: str = "ratelimit"):
+        if aioredis is None:
+            raise RuntimeError("El paquete 'redis' es necesario para el rate limiting distribuido")
+
+        self.prefix = prefix
+        self._client = aioredis.from_url(redis_url)
+        self._script = self._client.register_script(SLIDING_WINDOW_SCRIPT)
+
+    def _key(self, key: str) -> str:
+        # Hash tag para que todas las ventanas de una clave caigan en el mismo slot
+        return f"{self.prefix}:{{{key}}}"
+
+    async def hit(self, key: str, limits: Sequence[RateLimit]) -> bool:
+        args = [value for limit in limits for value in limit]
+        try:
+            result = await self._script(keys=[self._key(key)], args=args)
+        except Exception as e:
+            # Si Redis no responde se deja pasar la solicitud en lugar de tumbar la API
+            security_logger.error(f"Redis rate limiter error: {str(e)}")
+            return False
+        return int(result) != 0
+
+    async def reset(self, key: str) -> None:
+        async for redis_key in self._client.scan_iter(match=f"{self._key(key)}:*"):
+            await self._client.delete(redis_key)
+
+    def stats(self) -> dict:
+        return {"backend": "redis", "prefix": self.prefix}
+
+
+def create_rate_limiter(backend: Optional[str] = None) -> RateLimitBackend:
+    """
+    Crear el backend de rate limiting configurado (memory o redis)
+    """
+    backend = (backend or settings.RATE_LIMIT_BACKEND).lower()
+
+    if backend == "redis":
+        try:
+            return RedisRateLimiter(settings.REDIS_URL)
+        except Exception as e:
+            security_logger.error(f"Redis rate limiter unavailable, falling back to memory: {str(e)}")
+
+    return InMemoryRateLimiter(max_keys=settings.RATE_LIMIT_MAX_KEYS)
@@ -1,166 +1,188 @@
-import re
 import time
+import atexit
+import queue
 import hashlib
 import secrets
 from typing import Dict, List, Optional
-from fastapi import Request, Response, HTTPException
+from fastapi import Request, HTTPException
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import logging
-from collections import defaultdict, deque
+import logging.handlers
+from collections import defaultdict
 from datetime import datetime, timedelta
 import html
 try:
     import bleach
 except ImportError:
     bleach = None
-from urllib.parse import unquote
+from app.core.config import settings
+from app.core.security_config import SecurityConfig
+from app.middleware.rate_limit import RateLimitBackend, create_rate_limiter
+from app.middleware.injection_detector import ATTACK_TYPES, injection_detector
+from app.utils.security_log import IndexedRotatingFileHandler
 
 # Configurar logging de seguridad
 security_logger = logging.getLogger("security")
 security_logger.setLevel(logging.INFO)
 
-# Crear handler para archivo de logs de seguridad
-handler = logging.FileHandler("logs/security.log")
-formatter = logging.Formatter(
-    "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+# Crear handler para archivo de logs de seguridad (JSON lines, rotación e índice auxiliar)
+handler = IndexedRotatingFileHandler(
+    SecurityConfig.SECURITY_LOG_FILE,
+    max_bytes=SecurityConfig.SECURITY_LOG_MAX_BYTES,
+    backup_count=SecurityConfig.SECURITY_LOG_BACKUP_COUNT,
+    rotation_interval=SecurityConfig.SECURITY_LOG_ROTATION_INTERVAL,
+    block_size=SecurityConfig.SECURITY_LOG_INDEX_BLOCK_SIZE
 )
-handler.setFormatter(formatter)
-security_logger.addHandler(handler)
 
-class SecurityMiddleware(BaseHTTPMiddleware):
+# Las solicitudes solo encolan el registro; un hilo en segundo plano escribe en disco
+log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+security_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+log_listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+class SecurityMiddleware:
+    """
+    Middleware ASGI puro de seguridad.
+
+    Aplica las verificaciones de seguridad (IPs bloqueadas, rate limiting,
+    tamaño del contenido, detección de inyecciones) sin envolver la respuesta
+    en tareas ni streams intermedios: los headers de seguridad se añaden
+    interceptando el mensaje `http.response.start`, por lo que las respuestas
+    en streaming se transmiten sin cambios.
+    """
+
     def __init__(
         self,
         app: ASGIApp,
-        max_requests_per_minute: int = 60,
-        max_requests_per_hour: int = 1000,
+        max_requests_per_minute: Optional[int] = None,
+        max_requests_per_hour: Optional[int] = None,
         blocked_ips: Optional[List[str]] = None,
         allowed_file_types: Optional[List[str]] = None,
         max_content_length: int = 10 * 1024 * 1024,  # 10MB
+        rate_limiter: Optional[RateLimitBackend] = None,
     ):
-        super().__init__(app)
-        self.max_requests_per_minute = max_requests_per_minute
-        self.max_requests_per_hour = max_requests_per_hour
+        self.app = app
+        # Límites de la configuración (REQUESTS_PER_MINUTE / REQUESTS_PER_HOUR) salvo que se indiquen
+        self.max_requests_per_minute = max_requests_per_minute or settings.REQUESTS_PER_MINUTE
+        self.max_requests_per_hour = max_requests_per_hour or settings.REQUESTS_PER_HOUR
         self.blocked_ips = set(blocked_ips or [])
         self.allowed_file_types = allowed_file_types or [
             'jpg', 'jpeg', 'png', 'gif', 'webp', 'txt', 'csv', 'json'
         ]
         self.max_content_length = max_content_length
         
-        # Rate limiting storage
-        self.request_counts_minute: Dict[str, deque] = defaultdict(deque)
-        self.request_counts_hour: Dict[str, deque] = defaultdict(deque)
+        # Rate limiting (memoria por proceso o Redis compartido, según configuración)
+        self.rate_limiter = rate_limiter or create_rate_limiter()
+        self.rate_limits = [
+            (self.max_requests_per_minute, 60),
+            (self.max_requests_per_hour, 3600),
+        ]
         
         # Suspicious activity tracking
         self.suspicious_ips: Dict[str, int] = defaultdict(int)
         self.blocked_until: Dict[str, datetime] = {}
         
-        # SQL injection patterns
-        self.sql_injection_patterns = [
-            r"('|(\-\-)|(;)|(\||\|)|(\*|\*))",
-            r"((\%27)|(\'))((\%6F|o|\%4F))(\%72|r|\%52)",
-            r"((\%27)|(\'))((\%75|u|\%55))(\%6E|n|\%4E)(\%69|i|\%49)(\%6F|o|\%4F)(\%6E|n|\%4E)",
-            r"((\%27)|(\'))((\%73|s|\%53))(\%65|e|\%45)(\%6C|l|\%4C)(\%65|e|\%45)(\%63|c|\%43)(\%74|t|\%54)",
-            r"exec(\s|\+)+(s|x)p\w+",
-            r"union\s+select",
-            r"drop\s+table",
-            r"insert\s+into",
-            r"delete\s+from",
-            r"update\s+set",
-            r"create\s+table",
-            r"alter\s+table",
-            r"truncate\s+table"
-        ]
-        
-        # XSS patterns
-        self.xss_patterns = [
-            r"<script[^>]*>.*?</script>",
-            r"javascript:",
-            r"on\w+\s*=",
-            r"<iframe[^>]*>.*?</iframe>",
-            r"<object[^>]*>.*?</object>",
-            r"<embed[^>]*>.*?</embed>",
-            r"<link[^>]*>.*?</link>",
-            r"<meta[^>]*>.*?</meta>",
-            r"vbscript:",
-            r"expression\s*\(",
-            r"@import",
-            r"<\w+[^>]*\s+on\w+\s*="
-        ]
+        # Detector de inyecciones precompilado (una pasada por solicitud)
+        self.injection_detector = injection_detector
         
-        # Path traversal patterns
-        self.path_traversal_patterns = [
-            r"\.\./",
-            r"\.\.\\",
-            r"%2e%2e%2f",
-            r"%2e%2e%5c",
-            r"\.\.\%2f",
-            r"\.\.\%5c"
-        ]
+        # Headers de seguridad
+        self.security_headers = dict(SecurityConfig.SECURITY_HEADERS)
 
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
         start_time = time.time()
+        request = Request(scope)
         client_ip = self._get_client_ip(request)
+        response_started = False
         
         try:
             # 1. Verificar IP bloqueada
             if await self._is_ip_blocked(client_ip):
-                security_logger.warning(f"Blocked IP attempted access: {client_ip}")
-                return JSONResponse(
-                    status_code=403,
-                    content={"detail": "Access denied"}
+                security_logger.warning(
+                    f"Blocked IP attempted access: {client_ip}",
+                    extra={"ip": client_ip, "event": "blocked_ip"}
                 )
+                await self._reject(scope, receive, send, 403, "Access denied")
+                return
             
             # 2. Rate limiting
             if await self._check_rate_limit(client_ip):
-                security_logger.warning(f"Rate limit exceeded for IP: {client_ip}")
-                return JSONResponse(
-                    status_code=429,
-                    content={"detail": "Too many requests"}
+                security_logger.warning(
+                    f"Rate limit exceeded for IP: {client_ip}",
+                    extra={"ip": client_ip, "event": "rate_limit"}
                 )
+                await self._reject(scope, receive, send, 429, "Too many requests")
+                return
             
             # 3. Validar tamaño del contenido
             if await self._check_content_length(request):
-                security_logger.warning(f"Content too large from IP: {client_ip}")
-                return JSONResponse(
-                    status_code=413,
-                    content={"detail": "Content too large"}
+                security_logger.warning(
+                    f"Content too large from IP: {client_ip}",
+                    extra={"ip": client_ip, "event": "content_too_large"}
                 )
+                await self._reject(scope, receive, send, 413, "Content too large")
+                return
             
             # 4. Detectar ataques de inyección
-            if await self._detect_injection_attacks(request):
+            scan = await self._detect_injection_attacks(request)
+            if scan["attack_type"]:
                 await self._log_suspicious_activity(client_ip, "injection_attempt")
-                return JSONResponse(
-                    status_code=400,
-                    content={"detail": "Invalid request"}
-                )
+                await self._reject(scope, receive, send, 400, "Invalid request")
+                return
             
             # 5. Sanitizar entrada
             await self._sanitize_request(request)
             
-            # Procesar la solicitud
-            response = await call_next(request)
+            # 6. Agregar headers de seguridad al iniciar la respuesta
+            server_timing = f"waf;dur={scan['scan_time_us'] / 1000:.3f}"
             
-            # 6. Agregar headers de seguridad
-            response = await self._add_security_headers(response)
+            async def send_with_headers(message: Message) -> None:
+                nonlocal response_started
+                if message["type"] == "http.response.start":
+                    response_started = True
+                    headers = MutableHeaders(scope=message)
+                    self._apply_security_headers(headers)
+                    headers.append("Server-Timing", server_timing)
+                await send(message)
             
-            # Log de solicitud exitosa
+            # Procesar la solicitud
+            await self.app(scope, receive, send_with_headers)
+            
+            # Log de solicitud exitosa (se encola, no bloquea)
             process_time = time.time() - start_time
             security_logger.info(
                 f"Request processed - IP: {client_ip}, "
                 f"Method: {request.method}, Path: {request.url.path}, "
-                f"Time: {process_time:.3f}s"
+                f"Time: {process_time:.3f}s",
+                extra={
+                    "ip": client_ip,
+                    "event": "request",
+                    "method": request.method,
+                    "path": request.url.path,
+                    "duration_ms": round(process_time * 1000, 2)
+                }
             )
             
-            return response
-            
         except Exception as e:
-            security_logger.error(f"Security middleware error: {str(e)}")
-            return JSONResponse(
-                status_code=500,
-                content={"detail": "Internal server error"}
+            security_logger.error(
+                f"Security middleware error: {str(e)}",
+                extra={"ip": client_ip, "event": "error"}
             )
+            if response_started:
+                raise
+            await self._reject(scope, receive, send, 500, "Internal server error")
+
+    async def _reject(self, scope: Scope, receive: Receive, send: Send, status_code: int, detail: str) -> None:
+        """Responder directamente sin pasar la solicitud a la aplicación"""
+        response = JSONResponse(status_code=status_code, content={"detail": detail})
+        self._apply_security_headers(response.headers)
+        await response(scope, receive, send)
 
     def _get_client_ip(self, request: Request) -> str:
         """Obtener la IP real del cliente considerando proxies"""
@@ -190,35 +212,8 @@ class SecurityMiddleware(BaseHTTPMiddleware):
         return False
 
     async def _check_rate_limit(self, ip: str) -> bool:
-        """Verificar límites de velocidad"""
-        now = datetime.now()
-        
-        # Limpiar solicitudes antiguas
-        minute_ago = now - timedelta(minutes=1)
-        hour_ago = now - timedelta(hours=1)
-        
-        # Filtrar solicitudes del último minuto
-        while (self.request_counts_minute[ip] and 
-               self.request_counts_minute[ip][0] < minute_ago):
-            self.request_counts_minute[ip].popleft()
-        
-        # Filtrar solicitudes de la última hora
-        while (self.request_counts_hour[ip] and 
-               self.request_counts_hour[ip][0] < hour_ago):
-            self.request_counts_hour[ip].popleft()
-        
-        # Verificar límites
-        if len(self.request_counts_minute[ip]) >= self.max_requests_per_minute:
-            return True
-        
-        if len(self.request_counts_hour[ip]) >= self.max_requests_per_hour:
-            return True
-        
-        # Agregar solicitud actual
-        self.request_counts_minute[ip].append(now)
-        self.request_counts_hour[ip].append(now)
-        
-        return False
+        """Verificar límites de velocidad (coste constante por solicitud)"""
+        return await self.rate_limiter.hit(ip, self.rate_limits)
 
     async def _check_content_length(self, request: Request) -> bool:
         """Verificar tamaño del contenido"""
@@ -227,40 +222,21 @@ class SecurityMiddleware(BaseHTTPMiddleware):
             return True
         return False
 
-    async def _detect_injection_attacks(self, request: Request) -> bool:
+    async def _detect_injection_attacks(self, request: Request) -> dict:
         """Detectar intentos de inyección SQL, XSS y path traversal"""
-        # Obtener datos para analizar
-        url_path = str(request.url.path).lower()
-        query_params = str(request.url.query).lower() if request.url.query else ""
-        
-        # Analizar headers
-        headers_str = " ".join([f"{k}:{v}" for k, v in request.headers.items()]).lower()
-        
-        # Combinar todos los datos
-        data_to_check = f"{url_path} {query_params} {headers_str}"
-        
-        # Decodificar URL encoding
-        data_to_check = unquote(data_to_check)
-        
-        # Verificar patrones de inyección SQL
-        for pattern in self.sql_injection_patterns:
-            if re.search(pattern, data_to_check, re.IGNORECASE):
-                security_logger.warning(f"SQL injection attempt detected: {pattern}")
-                return True
-        
-        # Verificar patrones XSS
-        for pattern in self.xss_patterns:
-            if re.search(pattern, data_to_check, re.IGNORECASE):
-                security_logger.warning(f"XSS attempt detected: {pattern}")
-                return True
+        scan = self.injection_detector.inspect(
+            request.url.path,
+            request.url.query or "",
+            request.headers.items()
+        )
         
-        # Verificar path traversal
-        for pattern in self.path_traversal_patterns:
-            if re.search(pattern, data_to_check, re.IGNORECASE):
-                security_logger.warning(f"Path traversal attempt detected: {pattern}")
-                return True
+        if scan["attack_type"]:
+            security_logger.warning(
+                f"{ATTACK_TYPES[scan['attack_type']]} attempt detected: {scan['match'][:100]}",
+                extra={"ip": self._get_client_ip(request), "event": f"{scan['attack_type']}_attempt"}
+            )
         
-        return False
+        return scan
 
     async def _sanitize_request(self, request: Request):
         """Sanitizar datos de entrada"""
@@ -268,42 +244,10 @@ class SecurityMiddleware(BaseHTTPMiddleware):
         # los datos del request body si es necesario
         pass
 
-    async def _add_security_headers(self, response: Response) -> Response:
-        """Agregar headers de seguridad"""
-        # Prevenir XSS
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        
-        # Prevenir clickjacking
-        response.headers["X-Frame-Options"] = "DENY"
-        
-        # Prevenir MIME sniffing
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        
-        # Política de referrer
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        
-        # Content Security Policy
-        response.headers["Content-Security-Policy"] = (
-            "default-src 'self'; "
-            "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "
-            "style-src 'self' 'unsafe-inline'; "
-            "img-src 'self' data: https:; "
-            "font-src 'self'; "
-            "connect-src 'self'; "
-            "frame-ancestors 'none';"
-        )
-        
-        # Strict Transport Security (solo en HTTPS)
-        response.headers["Strict-Transport-Security"] = (
-            "max-age=31536000; includeSubDomains"
-        )
-        
-        # Permissions Policy
-        response.headers["Permissions-Policy"] = (
-            "geolocation=(), microphone=(), camera=()"
-        )
-        
-        return response
+    def _apply_security_headers(self, headers: MutableHeaders) -> None:
+        """Agregar headers de seguridad (XSS, clickjacking, MIME sniffing, CSP, HSTS...)"""
+        for name, value in self.security_headers.items():
+            headers[name] = value
 
     async def _log_suspicious_activity(self, ip: str, activity_type: str):
         """Registrar actividad sospechosa y bloquear IP si es necesario"""
@@ -311,13 +255,14 @@ class SecurityMiddleware(BaseHTTPMiddleware):
         
         security_logger.warning(
             f"Suspicious activity detected - IP: {ip}, "
-            f"Type: {activity_type}, Count: {self.suspicious_ips[ip]}"
+            f"Type: {activity_type}, Count: {self.suspicious_ips[ip]}",
+            extra={"ip": ip, "event": "suspicious_activity"}
         )
         
         # Bloquear IP temporalmente después de 5 intentos sospechosos
         if self.suspicious_ips[ip] >= 5:
             self.blocked_until[ip] = datetime.now() + timedelta(hours=1)
-            security_logger.error(f"IP blocked for 1 hour: {ip}")
+            security_logger.error(f"IP blocked for 1 hour: {ip}", extra={"ip": ip, "event": "ip_blocked"})
 
 
 class InputSanitizer:
@@ -8,13 +8,19 @@ from .category import Category
 from .tag import Tag
 from .seo_schema import SEOSchema
 from .image_config import ImageConfig
-from .landing_page import LandingPage, LandingTemplate, LandingAnalytics, LandingSEOConfig
+from .landing_page import LandingPage, LandingTemplate, LandingAnalytics, LandingConversionKey, LandingSEOConfig, LandingUserStats
 from .theme import Theme
 from .scheduler_config import SchedulerConfig
+from .scheduled_job import ScheduledJob, ScheduledJobRun
+from .generation_batch import GenerationBatch, GenerationBatchItem
+from .user_usage import UserDailyUsage
+from . import counters  # noqa: F401  (mantenimiento de contadores desnormalizados)
+from . import quotas  # noqa: F401  (uso diario por usuario)
 
 __all__ = [
     'Base', 'Keyword', 'Content', 'User', 'ContentImage', 'ManualImage', 
     'Category', 'Tag', 'SEOSchema', 'ImageConfig', 'LandingPage', 
-    'LandingTemplate', 'LandingAnalytics', 'LandingSEOConfig', 'Theme',
-    'SchedulerConfig'
+    'LandingTemplate', 'LandingAnalytics', 'LandingConversionKey', 'LandingSEOConfig', 'LandingUserStats',
+    'Theme', 'SchedulerConfig', 'ScheduledJob', 'ScheduledJobRun',
+    'GenerationBatch', 'GenerationBatchItem', 'UserDailyUsage'
 ]
\ No newline at end of file
@@ -15,6 +15,7 @@ class Category(Base):
     is_active = Column(Boolean, default=True)
     seo_title = Column(String(60))  # Título SEO optimizado
     seo_description = Column(String(160))  # Meta descripción
+    content_count = Column(Integer, default=0, nullable=False, server_default="0")  # Mantenido por app.models.counters
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, ForeignKey, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, ForeignKey, Boolean, Index, event, inspect
+from sqlalchemy.orm import relationship, query_expression, column_property
 from datetime import datetime
 from app.core.database import Base
 from .tag import content_tags
@@ -50,7 +50,9 @@ class Content(Base):
     # Relaciones
     keyword_id = Column(Integer, ForeignKey("keywords.id"))
     user_id = Column(Integer, ForeignKey("users.id"))
-    category_id = Column(Integer, ForeignKey("categories.id"))
+    # active_history: el valor anterior se carga al reasignar aunque el objeto
+    # esté expirado, para que los contadores descuenten la categoría antigua
+    category_id = column_property(Column(Integer, ForeignKey("categories.id")), active_history=True)
     
     # Fechas
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -61,7 +63,52 @@ class Content(Base):
     # Relaciones
     keyword = relationship("Keyword", back_populates="content_items")
     user = relationship("User", back_populates="content_items")
-    category = relationship("Category", back_populates="content_items")
+    category = relationship("Category", back_populates="content_items", active_history=True)
     tags = relationship("Tag", secondary=content_tags, back_populates="content_items")
     images = relationship("ContentImage", back_populates="content")
-    seo_schemas = relationship("SEOSchema", back_populates="content")
\ No newline at end of file
+    seo_schemas = relationship("SEOSchema", back_populates="content")
+    
+    # Inicio del cuerpo calculado en SQL para listados (ver app.utils.projections)
+    preview_text = query_expression()
+    
+    # Índices compuestos para los listados más frecuentes
+    __table_args__ = (
+        Index("ix_content_status_created_at", status, created_at),
+        Index("ix_content_category_id_status_created_at", category_id, status, created_at),
+        Index("ix_content_user_id_created_at", user_id, created_at),
+        # Parcial: solo contenido publicado (inicio, sitemap, RSS, archivo)
+        Index(
+            "ix_content_published_created_at", created_at,
+            sqlite_where=status == ContentStatus.PUBLISHED,
+            postgresql_where=status == ContentStatus.PUBLISHED
+        ),
+    )
+    
+    @property
+    def preview(self) -> str:
+        """
+        Inicio del cuerpo, cargado con content_summary(). Sin él solo se usa
+        `content` si ya está en memoria: nunca se lanza una carga perezosa
+        (en sesiones async fallaría y en las síncronas traería el cuerpo)
+        """
+        if self.preview_text is not None:
+            return self.preview_text
+        if "content" in inspect(self).unloaded:
+            return ""
+        return (self.content or "")[:PREVIEW_LENGTH]
+
+
+# Caracteres del cuerpo que cargan los listados en lugar del artículo completo
+PREVIEW_LENGTH = 1000
+WORDS_PER_MINUTE = 200
+
+
+@event.listens_for(Content, "before_insert")
+@event.listens_for(Content, "before_update")
+def _update_reading_stats(mapper, connection, target):
+    """Mantener word_count/reading_time para que los listados no necesiten el cuerpo"""
+    if not inspect(target).attrs.content.history.has_changes():
+        return
+    words = len((target.content or "").split())
+    target.word_count = words
+    target.reading_time = max(1, round(words / WORDS_PER_MINUTE)) if words else 0
@@ -0,0 +1,120 @@
+from typing import Iterable, Optional, Set
+
+from sqlalchemy import event, func, inspect, select, update
+from sqlalchemy.orm import Session
+
+from .category import Category
+from .content import Content
+from .tag import Tag, content_tags
+
+# ============================================================================
+# CONTADORES DESNORMALIZADOS (categories.content_count, tags.content_count)
+# ============================================================================
+#
+# Antes de cada flush se anotan las categorías y etiquetas afectadas por
+# contenidos nuevos, eliminados o modificados; al terminar el flush se
+# recalculan sus contadores con un UPDATE ... SET content_count = (SELECT
+# COUNT(*) ...) dentro de la misma transacción. Recalcular (en lugar de
+# sumar/restar) hace que el contador se corrija solo si alguna escritura
+# lo hubiera dejado desfasado.
+
+_PENDING_KEY = "content_counter_targets"
+
+
+def recount_content_counts(
+    connection,
+    category_ids: Optional[Iterable[int]] = None,
+    tag_ids: Optional[Iterable[int]] = None,
+) -> None:
+    """Recalcular content_count de las categorías/etiquetas indicadas"""
+    categories = Category.__table__
+    tags = Tag.__table__
+    content = Content.__table__
+
+    category_ids = {i for i in (category_ids or ()) if i is not None}
+    tag_ids = {i for i in (tag_ids or ()) if i is not None}
+
+    if category_ids:
+        connection.execute(
+            update(categories)
+            .where(categories.c.id.in_(category_ids))
+            .values(content_count=(
+                select(func.count(content.c.id))
+                .where(content.c.category_id == categories.c.id)
+                .scalar_subquery()
+            ))
+        )
+    if tag_ids:
+        connection.execute(
+            update(tags)
+            .where(tags.c.id.in_(tag_ids))
+            .values(content_count=(
+                select(func.count())
+                .select_from(content_tags)
+                .where(content_tags.c.tag_id == tags.c.id)
+                .scalar_subquery()
+            ))
+        )
+
+
+def _history_values(state, key: str, load: bool = False) -> list:
+    """
+    Valores añadidos/quitados de un atributo. Con `load` se incluyen
+    también los que no cambian, cargando la colección si hace falta; sin
+    él nunca se emite SQL (un atributo no cargado no tiene cambios).
+    """
+    if load:
+        history = state.attrs[key].load_history()
+        return list(history.added or ()) + list(history.deleted or ()) + list(history.unchanged or ())
+    history = state.attrs[key].history
+    return list(history.added or ()) + list(history.deleted or ())
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_counter_targets(session, flush_context, instances):
+    """Anotar categorías y etiquetas cuyos contadores cambian en este flush"""
+    categories: Set = set()
+    tags: Set = set()
+
+    for obj in list(session.new) + list(session.deleted):
+        if not isinstance(obj, Content):
+            continue
+        state = inspect(obj)
+        categories.add(obj.category_id)
+        categories.update(_history_values(state, "category"))
+        # Al borrar, las filas de content_tags se eliminan con el contenido
+        tags.update(_history_values(state, "tags", load=obj in session.deleted))
+
+    for obj in session.dirty:
+        state = inspect(obj)
+        if isinstance(obj, Content):
+            categories.update(_history_values(state, "category_id"))
+            categories.update(_history_values(state, "category"))
+            tags.update(_history_values(state, "tags"))
+        elif isinstance(obj, Category) and _history_values(state, "content_items"):
+            categories.add(obj)
+        elif isinstance(obj, Tag) and _history_values(state, "content_items"):
+            tags.add(obj)
+
+    categories.discard(None)
+    if categories or tags:
+        pending = session.info.setdefault(_PENDING_KEY, (set(), set()))
+        pending[0].update(categories)
+        pending[1].update(tags)
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _apply_counter_targets(session, flush_context):
+    """Recalcular los contadores anotados y expirar las copias en memoria"""
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+
+    # Las entradas pueden ser ids o instancias (nuevas hasta este flush)
+    category_ids = {c.id if isinstance(c, Category) else c for c in pending[0]}
+    tag_ids = {t.id if isinstance(t, Tag) else t for t in pending[1]}
+    recount_content_counts(session.connection(), category_ids, tag_ids)
+
+    for obj in list(session.identity_map.values()):
+        if (isinstance(obj, Category) and obj.id in category_ids) or (isinstance(obj, Tag) and obj.id in tag_ids):
+            session.expire(obj, ["content_count"])
@@ -0,0 +1,107 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Index, UniqueConstraint
+from sqlalchemy.orm import relationship
+from datetime import datetime
+
+from app.core.database import Base
+
+# ============================================================================
+# LOTES DE GENERACIÓN DE CONTENIDO
+# ============================================================================
+
+class BatchStatus:
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"    # Todos los elementos generados
+    PARTIAL = "partial"        # Terminado con elementos fallidos (reanudable)
+    CANCELLED = "cancelled"
+
+    FINISHED = (COMPLETED, PARTIAL, CANCELLED)
+
+
+class BatchItemStatus:
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class GenerationBatch(Base):
+    """
+    Lote de generación: una lista de keywords con la misma configuración.
+
+    Se reparte en `concurrency` trabajos del dispatcher (ver
+    app.services.batch_generation); cada uno reclama elementos de uno en uno
+    hasta vaciar el lote.
+    """
+    __tablename__ = "generation_batches"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    status = Column(String(20), nullable=False, default=BatchStatus.PENDING)
+    settings = Column(JSON, nullable=True)  # provider, content_type, additional_keywords
+    concurrency = Column(Integer, nullable=False, default=2)
+    total_items = Column(Integer, nullable=False, default=0)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    items = relationship("GenerationBatchItem", back_populates="batch", cascade="all, delete-orphan")
+
+    def to_dict(self):
+        """Convertir a diccionario"""
+        return {
+            "id": self.id,
+            "user_id": self.user_id,
+            "status": self.status,
+            "settings": self.settings or {},
+            "concurrency": self.concurrency,
+            "total_items": self.total_items,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None
+        }
+
+
+class GenerationBatchItem(Base):
+    """Elemento de un lote: una keyword y el contenido generado para ella"""
+    __tablename__ = "generation_batch_items"
+
+    id = Column(Integer, primary_key=True, index=True)
+    batch_id = Column(Integer, ForeignKey("generation_batches.id", ondelete="CASCADE"), nullable=False)
+    keyword_id = Column(Integer, ForeignKey("keywords.id"), nullable=False)
+    content_id = Column(Integer, ForeignKey("content.id", ondelete="SET NULL"), nullable=True)
+    position = Column(Integer, nullable=False, default=0)
+
+    status = Column(String(20), nullable=False, default=BatchItemStatus.PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+    lease_owner = Column(String(100), nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    batch = relationship("GenerationBatch", back_populates="items")
+
+    __table_args__ = (
+        UniqueConstraint("batch_id", "keyword_id", name="uq_generation_batch_items_batch_keyword"),
+        # Reclamar el siguiente elemento y contar el progreso por estado
+        Index("ix_generation_batch_items_batch_status_position", batch_id, status, position),
+    )
+
+    def to_dict(self):
+        """Convertir a diccionario"""
+        return {
+            "id": self.id,
+            "batch_id": self.batch_id,
+            "keyword_id": self.keyword_id,
+            "content_id": self.content_id,
+            "position": self.position,
+            "status": self.status,
+            "attempts": self.attempts,
+            "error": self.error,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None
+        }
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime, Enum, Text, Float
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, Enum, Text, Float, Index, case, literal
+from sqlalchemy.orm import relationship, column_property
 from datetime import datetime
 from app.core.database import Base
 import enum
@@ -15,6 +15,21 @@ class KeywordPriority(str, enum.Enum):
     MEDIUM = "medium"
     HIGH = "high"
 
+# Orden de la cola: la columna Enum se ordenaría por nombre (HIGH < LOW < MEDIUM)
+PRIORITY_RANK = {KeywordPriority.HIGH: 3, KeywordPriority.MEDIUM: 2, KeywordPriority.LOW: 1}
+
+def _priority_rank(priority):
+    """
+    CASE con el rango de la prioridad. Los valores van como literales (no
+    parámetros) para que el ORDER BY coincida con el índice de expresión.
+    """
+    def const(value, type_):
+        return literal(value, type_, literal_execute=True)
+    return case(
+        *[(priority == const(value, priority.type), const(rank, Integer())) for value, rank in PRIORITY_RANK.items()],
+        else_=const(0, Integer())
+    )
+
 class Keyword(Base):
     __tablename__ = "keywords"
     id = Column(Integer, primary_key=True, index=True)
@@ -28,8 +43,27 @@ class Keyword(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     used_at = Column(DateTime)
+    # Lease de generación (ver app.services.keyword_queue)
+    lease_owner = Column(String(100), nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    # Rango numérico de `priority` para ordenar (no se carga con la fila)
+    priority_rank = column_property(_priority_rank(priority), deferred=True)
     # Relaciones
     content_items = relationship("Content", back_populates="keyword")
     image_configs = relationship("ImageConfig", back_populates="keyword")
     manual_images = relationship("ManualImage", back_populates="keyword")
-    # analytics = relationship("KeywordAnalytics", back_populates="keyword")
\ No newline at end of file
+    # analytics = relationship("KeywordAnalytics", back_populates="keyword")
+    
+    # Índices compuestos para la cola de keywords
+    __table_args__ = (
+        Index("ix_keywords_status_priority_created_at", status, priority, created_at),
+        # Parcial: keywords pendientes de procesar, por prioridad y antigüedad
+        # (misma expresión que el ORDER BY de KeywordQueue.claim)
+        Index(
+            "ix_keywords_pending_priority_created_at", priority_rank.expression.desc(), created_at,
+            sqlite_where=status == KeywordStatus.PENDING,
+            postgresql_where=status == KeywordStatus.PENDING
+        ),
+        # Leases de generación caducados (workers caídos)
+        Index("ix_keywords_status_lease_expires_at", status, lease_expires_at),
+    )
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, JSON, LargeBinary, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -33,6 +33,10 @@ class LandingPage(Base):
     is_active = Column(Boolean, default=True, index=True)
     is_published = Column(Boolean, default=False, index=True)
     
+    # Contadores acumulados (desnormalizados desde LandingAnalytics)
+    total_views = Column(Integer, default=0, nullable=False, server_default="0")
+    total_conversions = Column(Integer, default=0, nullable=False, server_default="0")
+    
     # Configuraciones adicionales (JSON)
     settings = Column(JSON, nullable=True)  # Configuraciones específicas de la landing
     
@@ -51,6 +55,12 @@ class LandingPage(Base):
     template = relationship("LandingTemplate", back_populates="landing_pages")
     theme = relationship("Theme", back_populates="landing_pages")
     analytics = relationship("LandingAnalytics", back_populates="landing_page", cascade="all, delete-orphan")
+    conversion_keys = relationship("LandingConversionKey", cascade="all, delete-orphan", passive_deletes=True)
+    
+    # Índices compuestos
+    __table_args__ = (
+        Index("ix_landing_pages_user_id_total_views", user_id, total_views),
+    )
     
     def __repr__(self):
         return f"<LandingPage(id={self.id}, title='{self.title}', user_id={self.user_id})>"
@@ -115,6 +125,7 @@ class LandingAnalytics(Base):
     # Métricas básicas
     page_views = Column(Integer, default=0, index=True)
     unique_visitors = Column(Integer, default=0)
+    visitor_sketch = Column(LargeBinary, nullable=True)  # HyperLogLog serializado de visitantes del día
     bounce_rate = Column(Integer, default=0)  # Porcentaje (0-100)
     avg_time_on_page = Column(Integer, default=0)  # Segundos
     
@@ -140,9 +151,70 @@ class LandingAnalytics(Base):
     # Relaciones ORM
     landing_page = relationship("LandingPage", back_populates="analytics")
     
+    # Índices compuestos: series diarias de una landing
+    __table_args__ = (
+        # Una fila por landing y día (`date` a las 00:00 UTC): permite crearla con upsert
+        Index("ix_landing_analytics_landing_page_id_date", landing_page_id, date, unique=True),
+    )
+    
     def __repr__(self):
         return f"<LandingAnalytics(id={self.id}, landing_page_id={self.landing_page_id}, date={self.date})>"
 
+# ============================================================================
+# MODELO PARA DEDUPLICAR CONVERSIONES
+# ============================================================================
+
+class LandingConversionKey(Base):
+    """
+    Última conversión contada de cada visitante en una landing: la clave
+    única hace exacta la regla de una conversión por visitante y ventana
+    entre todos los procesos
+    """
+    __tablename__ = "landing_conversion_keys"
+
+    id = Column(Integer, primary_key=True, index=True)
+    landing_page_id = Column(Integer, ForeignKey("landing_pages.id", ondelete="CASCADE"), nullable=False)
+    visitor_hash = Column(String(64), nullable=False)  # SHA-256 de IP + user agent
+    counted_at = Column(DateTime, nullable=False, index=True)
+
+    __table_args__ = (
+        Index("ix_landing_conversion_keys_landing_visitor", landing_page_id, visitor_hash, unique=True),
+    )
+
+    def __repr__(self):
+        return f"<LandingConversionKey(landing_page_id={self.landing_page_id}, counted_at={self.counted_at})>"
+
+# ============================================================================
+# MODELO PARA ESTADÍSTICAS PRECALCULADAS POR USUARIO
+# ============================================================================
+
+class LandingUserStats(Base):
+    """
+    Resumen de landing pages por usuario, mantenido de forma incremental
+    desde el CRUD de landings y el registro de analytics
+    """
+    __tablename__ = "landing_user_stats"
+
+    # Campos principales
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, unique=True, index=True)
+    
+    # Contadores de landing pages
+    total_landing_pages = Column(Integer, default=0, nullable=False)
+    active_landing_pages = Column(Integer, default=0, nullable=False)
+    published_landing_pages = Column(Integer, default=0, nullable=False)
+    
+    # Métricas agregadas
+    total_visits = Column(Integer, default=0, nullable=False)
+    total_conversions = Column(Integer, default=0, nullable=False)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    def __repr__(self):
+        return f"<LandingUserStats(user_id={self.user_id}, total_landing_pages={self.total_landing_pages})>"
+
 # ============================================================================
 # MODELO PARA CONFIGURACIONES SEO
 # ============================================================================
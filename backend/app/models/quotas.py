@@ -0,0 +1,126 @@
+from datetime import date, datetime
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event, inspect, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .content import Content
+from .user_usage import UserDailyUsage
+
+# ============================================================================
+# CUOTAS DIARIAS (user_daily_usage)
+# ============================================================================
+#
+# Antes de cada flush se anotan los contenidos creados y los que pasan a
+# publicados; al terminar el flush se suman a la fila (usuario, día) con un
+# UPDATE atómico (o un upsert si es la primera del día) dentro de la misma
+# transacción. La fila queda bloqueada hasta el commit, así que dos
+# creaciones concurrentes del mismo usuario se serializan y cada una ve el
+# total que incluye a la otra. El día cambia solo: no hay que resetear nada.
+
+_PENDING_KEY = "daily_usage_deltas"
+
+
+def usage_day(now: Optional[datetime] = None) -> date:
+    """Día (UTC) al que se imputa el uso"""
+    return (now or datetime.utcnow()).date()
+
+
+def bump_daily_usage(connection, user_id: int, day: date, generated: int = 0, published: int = 0) -> None:
+    """Sumar al uso diario de un usuario creando la fila si no existe"""
+    table = UserDailyUsage.__table__
+    now = datetime.utcnow()
+    dialect = connection.dialect.name
+
+    if dialect in ("postgresql", "sqlite"):
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = insert(table).values(
+            user_id=user_id, day=day, generated_count=generated,
+            published_count=published, updated_at=now
+        )
+        connection.execute(stmt.on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c.day],
+            set_={
+                "generated_count": table.c.generated_count + generated,
+                "published_count": table.c.published_count + published,
+                "updated_at": now
+            }
+        ))
+        return
+
+    values = {
+        "generated_count": table.c.generated_count + generated,
+        "published_count": table.c.published_count + published,
+        "updated_at": now
+    }
+    where = (table.c.user_id == user_id) & (table.c.day == day)
+    if connection.execute(update(table).where(where).values(values)).rowcount:
+        return
+    try:
+        with connection.begin_nested():
+            connection.execute(table.insert().values(
+                user_id=user_id, day=day, generated_count=generated,
+                published_count=published, updated_at=now
+            ))
+    except IntegrityError:
+        # Otra transacción creó la fila entre medias
+        connection.execute(update(table).where(where).values(values))
+
+
+@event.listens_for(Content.published_at, "set", active_history=True)
+def _keep_published_at_history(target, value, oldvalue, initiator):
+    """Cargar el valor previo al asignarlo, para distinguir la primera publicación"""
+    return value
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_usage_deltas(session, flush_context, instances):
+    """Anotar contenidos creados y publicados en este flush"""
+    deltas: Dict[Tuple[int, date], list] = {}
+    day = usage_day()
+
+    for obj in session.new:
+        if isinstance(obj, Content) and obj.user_id is not None:
+            delta = deltas.setdefault((obj.user_id, day), [0, 0])
+            delta[0] += 1
+            if obj.published_at is not None:
+                delta[1] += 1
+
+    for obj in session.dirty:
+        if not isinstance(obj, Content) or obj.user_id is None:
+            continue
+        # Primera publicación: published_at pasa de vacío a una fecha
+        history = inspect(obj).attrs["published_at"].history
+        if history.added and history.added[0] is not None and not any(history.deleted or ()):
+            deltas.setdefault((obj.user_id, day), [0, 0])[1] += 1
+
+    if deltas:
+        pending = session.info.setdefault(_PENDING_KEY, {})
+        for key, (generated, published) in deltas.items():
+            current = pending.setdefault(key, [0, 0])
+            current[0] += generated
+            current[1] += published
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _apply_usage_deltas(session, flush_context):
+    """Aplicar los incrementos anotados"""
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+
+    connection = session.connection()
+    for (user_id, day), (generated, published) in sorted(pending.items()):
+        bump_daily_usage(connection, user_id, day, generated, published)
+
+    for obj in list(session.identity_map.values()):
+        if isinstance(obj, UserDailyUsage) and (obj.user_id, obj.day) in pending:
+            session.expire(obj)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_usage_deltas(session, previous_transaction):
+    """Un flush fallido no debe imputar uso en el siguiente"""
+    session.info.pop(_PENDING_KEY, None)
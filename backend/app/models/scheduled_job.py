@@ -0,0 +1,109 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Index
+from datetime import datetime
+
+from app.core.database import Base
+
+# ============================================================================
+# TRABAJOS PROGRAMADOS PERSISTENTES
+# ============================================================================
+
+class JobStatus:
+    PENDING = "pending"        # Esperando a next_execution
+    RUNNING = "running"        # Reclamado por un worker (lease vigente)
+    COMPLETED = "completed"    # Trabajo único terminado
+    FAILED = "failed"          # Sin más reintentos
+    CANCELLED = "cancelled"
+    DEAD = "dead"              # Lease caducado en todos los intentos (worker caído); se reactiva al reprogramarlo
+
+
+class ScheduledJob(Base):
+    """
+    Trabajo programado compartido por todos los workers.
+
+    `next_execution` es el momento del próximo intento y `scheduled_for` el
+    de la ejecución que representa (no cambia con los reintentos); de ahí
+    sale la clave de idempotencia de cada ejecución. Un worker reclama el
+    trabajo con un lease (`lease_owner`, `lease_expires_at`); si muere, el
+    lease caduca y otro worker lo retoma. Si se reprograma mientras se
+    ejecuta, `rerun_at` guarda la nueva ejecución hasta que termine la actual.
+    """
+    __tablename__ = "scheduled_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_type = Column(String(100), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    payload = Column(JSON, nullable=True)
+
+    # Clave única del trabajo: encolar dos veces la misma clave devuelve el existente
+    idempotency_key = Column(String(200), unique=True, nullable=True)
+
+    status = Column(String(20), nullable=False, default=JobStatus.PENDING)
+    next_execution = Column(DateTime, nullable=False)
+    scheduled_for = Column(DateTime, nullable=False)
+
+    # Recurrencia (None = una sola vez); mismos valores que ScheduleInterval
+    interval = Column(String(20), nullable=True)
+    schedule_time = Column(String(5), nullable=True)  # HH:MM (UTC)
+
+    # Reintentos y lease
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    lease_owner = Column(String(100), nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+
+    # Reprogramado mientras se ejecutaba: al terminar vuelve a PENDING para este momento
+    rerun_at = Column(DateTime, nullable=True)
+
+    last_run_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    last_result = Column(JSON, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        # Trabajos vencidos y próximo despertar del dispatcher
+        Index("ix_scheduled_jobs_status_next_execution", status, next_execution),
+        # Leases caducados (workers caídos)
+        Index("ix_scheduled_jobs_status_lease_expires_at", status, lease_expires_at),
+    )
+
+    def to_dict(self):
+        """Convertir a diccionario"""
+        return {
+            "id": self.id,
+            "job_type": self.job_type,
+            "user_id": self.user_id,
+            "status": self.status,
+            "interval": self.interval,
+            "schedule_time": self.schedule_time,
+            "next_execution": self.next_execution.isoformat() if self.next_execution else None,
+            "scheduled_for": self.scheduled_for.isoformat() if self.scheduled_for else None,
+            "attempts": self.attempts,
+            "lease_owner": self.lease_owner,
+            "lease_expires_at": self.lease_expires_at.isoformat() if self.lease_expires_at else None,
+            "rerun_at": self.rerun_at.isoformat() if self.rerun_at else None,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "last_error": self.last_error,
+            "last_result": self.last_result
+        }
+
+
+class ScheduledJobRun(Base):
+    """
+    Registro de cada ejecución, único por `run_key` (trabajo + ejecución
+    programada). Si un worker cae después de terminar pero antes de liberar
+    el trabajo, el siguiente encuentra la ejecución completada y no la repite.
+    """
+    __tablename__ = "scheduled_job_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(Integer, ForeignKey("scheduled_jobs.id", ondelete="CASCADE"), nullable=False, index=True)
+    run_key = Column(String(200), unique=True, nullable=False)
+    status = Column(String(20), nullable=False, default=JobStatus.RUNNING)
+    worker_id = Column(String(100), nullable=True)
+    attempts = Column(Integer, nullable=False, default=1)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    started_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
@@ -21,7 +21,8 @@ class Tag(Base):
     description = Column(Text)
     color = Column(String(7), default="#007bff")  # Color hex para la etiqueta
     is_active = Column(Boolean, default=True)
-    usage_count = Column(Integer, default=0)  # Contador de uso
+    usage_count = Column(Integer, default=0, nullable=False, server_default="0")  # Contador de uso (clave del cursor de /tags)
+    content_count = Column(Integer, default=0, nullable=False, server_default="0")  # Mantenido por app.models.counters
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, Date, DateTime, ForeignKey, UniqueConstraint
+from datetime import datetime
+from app.core.database import Base
+
+# ============================================================================
+# USO DIARIO POR USUARIO (CUOTAS)
+# ============================================================================
+
+class UserDailyUsage(Base):
+    """
+    Contadores de contenido generado y publicado por usuario y día (UTC).
+
+    Los mantiene app.models.quotas en la misma transacción que crea o
+    publica el contenido; el límite diario se comprueba leyendo una fila.
+    """
+    __tablename__ = "user_daily_usage"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    day = Column(Date, nullable=False)
+    generated_count = Column(Integer, nullable=False, default=0, server_default="0")
+    published_count = Column(Integer, nullable=False, default=0, server_default="0")
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "day", name="uq_user_daily_usage_user_day"),
+    )
+
+    def to_dict(self):
+        """Convertir a diccionario"""
+        return {
+            "user_id": self.user_id,
+            "day": self.day.isoformat() if self.day else None,
+            "generated_count": self.generated_count,
+            "published_count": self.published_count
+        }
@@ -15,7 +15,9 @@ from .content import (
     ContentUpdate,
     Content,
     ContentWithKeyword,
-    ContentWithUser
+    ContentWithUser,
+    ContentSummary,
+    ContentSummaryWithKeyword
 )
 from .user import (
     UserBase,
@@ -32,6 +34,7 @@ from .user import (
 KeywordWithContent.model_rebuild()
 ContentWithKeyword.model_rebuild()
 ContentWithUser.model_rebuild()
+ContentSummaryWithKeyword.model_rebuild()
 UserWithContent.model_rebuild()
 
 __all__ = [
@@ -51,6 +54,8 @@ __all__ = [
     "Content",
     "ContentWithKeyword",
     "ContentWithUser",
+    "ContentSummary",
+    "ContentSummaryWithKeyword",
     # User schemas
     "UserBase",
     "UserCreate",
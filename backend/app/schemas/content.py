@@ -292,6 +292,42 @@ class ContentWithUser(Content):
     class Config:
         from_attributes = True
 
+# Esquemas ligeros para listados (sin el cuerpo del artículo)
+class ContentSummary(BaseModel):
+    id: int
+    title: str
+    slug: str
+    excerpt: Optional[str] = None
+    preview: Optional[str] = None  # Inicio del cuerpo (HTML sin procesar)
+    meta_title: Optional[str] = None
+    meta_description: Optional[str] = None
+    focus_keyword: Optional[str] = None
+    featured_image_url: Optional[str] = None
+    featured_image_alt: Optional[str] = None
+    status: ContentStatus = ContentStatus.DRAFT
+    content_type: str = "post"
+    template_theme: str = "default"
+    is_featured: bool = False
+    is_indexed: bool = True
+    word_count: Optional[int] = None
+    reading_time: Optional[int] = None
+    keyword_id: Optional[int] = None
+    category_id: Optional[int] = None
+    user_id: int
+    created_at: datetime
+    updated_at: datetime
+    published_at: Optional[datetime] = None
+    scheduled_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+class ContentSummaryWithKeyword(ContentSummary):
+    keyword: Optional['Keyword'] = None
+    
+    class Config:
+        from_attributes = True
+
 # Esquemas para el editor visual
 class ContentBlock(BaseModel):
     type: str  # paragraph, heading, image, list, etc.
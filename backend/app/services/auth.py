@@ -1,21 +1,35 @@
+import hashlib
+import time
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import event, inspect as sa_inspect, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
 from app.core.config import settings
 from app.models.user import User
 from app.schemas.user import TokenData
+from app.services.password_hasher import password_hasher
+from app.utils.cache import TTLCache
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Claims de tokens ya decodificados (clave: hash del token, válidos hasta su expiración)
+token_claims_cache = TTLCache(maxsize=settings.AUTH_TOKEN_CACHE_SIZE, ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+# Columnas de usuarios autenticados recientemente (clave: username)
+user_cache = TTLCache(maxsize=settings.AUTH_USER_CACHE_SIZE, ttl=settings.AUTH_USER_CACHE_TTL)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verificar contraseña plana contra hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    valid, _ = password_hasher.verify_and_update(plain_password, hashed_password)
+    return valid
 
 def get_password_hash(password: str) -> str:
     """Generar hash de contraseña"""
-    return pwd_context.hash(password)
+    return password_hasher.hash(password)
+
+async def aget_password_hash(password: str) -> str:
+    """Generar hash de contraseña sin bloquear el event loop"""
+    return await password_hasher.ahash(password)
 
 def authenticate_user(db: Session, username: str, password: str) -> Optional[User]:
     """Autenticar usuario con username/email y contraseña"""
@@ -26,8 +40,29 @@ def authenticate_user(db: Session, username: str, password: str) -> Optional[Use
     
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    
+    valid, new_hash = password_hasher.verify_and_update(password, user.hashed_password)
+    if not valid:
+        return None
+    if new_hash:
+        # El coste de bcrypt cambió: se guarda el nuevo hash con el commit del login
+        user.hashed_password = new_hash
+    return user
+
+async def aauthenticate_user(db: AsyncSession, username: str, password: str) -> Optional[User]:
+    """Autenticar usuario (versión async para las rutas de login)"""
+    user = (await db.execute(
+        select(User).where(or_(User.username == username, User.email == username))
+    )).scalars().first()
+    
+    if not user:
+        return None
+    
+    valid, new_hash = await password_hasher.averify_and_update(password, user.hashed_password)
+    if not valid:
         return None
+    if new_hash:
+        user.hashed_password = new_hash
     return user
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -42,10 +77,29 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
+def decode_token_claims(token: str) -> Dict[str, Any]:
+    """
+    Decodificar un token JWT reutilizando los claims ya verificados.
+    
+    Lanza JWTError si el token no es válido o ha expirado.
+    """
+    token_hash = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    claims = token_claims_cache.get(token_hash)
+    if claims is not None:
+        if claims.get("exp") is None or claims["exp"] > time.time():
+            return claims
+        token_claims_cache.delete(token_hash)
+        raise JWTError("Token expirado")
+    
+    claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    ttl = claims["exp"] - time.time() if claims.get("exp") else None
+    token_claims_cache.set(token_hash, claims, ttl=ttl)
+    return claims
+
 def verify_token(token: str, credentials_exception) -> TokenData:
     """Verificar y decodificar token JWT"""
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = decode_token_claims(token)
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
@@ -54,6 +108,44 @@ def verify_token(token: str, credentials_exception) -> TokenData:
         raise credentials_exception
     return token_data
 
+def _get_user_by_username(db: Session, username: str) -> Optional[User]:
+    """
+    Obtener un usuario usando la caché de filas.
+    
+    Las columnas cacheadas se adjuntan a la sesión actual con
+    `merge(load=False)`, sin consultar la base de datos; las relaciones
+    siguen cargándose de forma perezosa y los cambios se persisten con
+    normalidad al hacer commit.
+    """
+    columns = user_cache.get(username)
+    if columns is None:
+        user = db.query(User).filter(User.username == username).first()
+        if user is not None:
+            user_cache.set(username, {
+                attr.key: getattr(user, attr.key) for attr in sa_inspect(User).column_attrs
+            })
+        return user
+    
+    cached_user = User(**columns)
+    make_transient_to_detached(cached_user)
+    return db.merge(cached_user, load=False)
+
+def invalidate_user_cache(username: Optional[str] = None) -> None:
+    """Invalidar la caché de un usuario (o de todos si no se indica)"""
+    if username is None:
+        user_cache.clear()
+    else:
+        user_cache.delete(username)
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_user_on_change(mapper, connection, target: User) -> None:
+    """Invalidar la caché al actualizar (perfil, API keys, desactivación) o borrar un usuario"""
+    history = sa_inspect(target).attrs.username.history
+    for username in list(history.deleted or []) + [target.username]:
+        if username:
+            invalidate_user_cache(username)
+
 def get_current_user(db: Session, token: str) -> User:
     """Obtener usuario actual desde token"""
     from fastapi import HTTPException, status
@@ -65,7 +157,7 @@ def get_current_user(db: Session, token: str) -> User:
     )
     
     token_data = verify_token(token, credentials_exception)
-    user = db.query(User).filter(User.username == token_data.username).first()
+    user = _get_user_by_username(db, token_data.username)
     if user is None:
         raise credentials_exception
     return user
\ No newline at end of file
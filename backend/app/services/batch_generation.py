@@ -0,0 +1,487 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.content import Content, ContentStatus
+from app.models.generation_batch import BatchItemStatus, BatchStatus, GenerationBatch, GenerationBatchItem
+from app.models.keyword import Keyword
+from app.models.user import User
+from app.services.content_generation import ContentGenerationService, keyword_heartbeat
+from app.services.job_scheduler import get_job_store, job_handler, notify_dispatcher
+from app.services.keyword_queue import KeywordQueue, LeaseLostError
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# ============================================================================
+# GENERACIÓN POR LOTES
+# ============================================================================
+#
+# Un lote se reparte en `concurrency` trabajos del dispatcher persistente
+# (job_scheduler). Cada trabajo reclama elementos de uno en uno con un lease
+# y los genera con el mismo flujo que /content/generate (la keyword se
+# reclama en KeywordQueue y ambos leases se renuevan mientras se genera);
+# el estado de cada elemento queda en generation_batch_items, así que un
+# lote interrumpido o con fallos se reanuda sin repetir lo ya generado.
+
+BATCH_SLOT_JOB = "generation_batch_slot"
+
+
+def batch_counts_stmt(batch_id: int):
+    """Elementos del lote por estado"""
+    return select(GenerationBatchItem.status, func.count(GenerationBatchItem.id)).where(
+        GenerationBatchItem.batch_id == batch_id
+    ).group_by(GenerationBatchItem.status)
+
+
+def batch_timing_stmt(batch_id: int):
+    """Primer inicio y última finalización de los elementos completados"""
+    return select(
+        func.count(GenerationBatchItem.id),
+        func.min(GenerationBatchItem.started_at),
+        func.max(GenerationBatchItem.finished_at)
+    ).where(
+        GenerationBatchItem.batch_id == batch_id,
+        GenerationBatchItem.status == BatchItemStatus.COMPLETED
+    )
+
+
+def summarize_progress(batch: Dict[str, Any], counts: Dict[str, int], timing: Tuple) -> Dict[str, Any]:
+    """
+    Progreso de un lote a partir de los conteos por estado.
+
+    La ETA usa el ritmo observado del lote (elementos completados entre el
+    primer inicio y la última finalización), que ya refleja la concurrencia.
+    """
+    done = counts.get(BatchItemStatus.COMPLETED, 0)
+    failed = counts.get(BatchItemStatus.FAILED, 0)
+    in_flight = counts.get(BatchItemStatus.RUNNING, 0)
+    pending = counts.get(BatchItemStatus.PENDING, 0)
+    cancelled = counts.get(BatchItemStatus.CANCELLED, 0)
+    total = batch["total_items"] or sum(counts.values())
+    remaining = pending + in_flight
+
+    eta_seconds = None
+    completed, first_start, last_finish = timing
+    if completed and first_start and last_finish and remaining:
+        elapsed = (last_finish - first_start).total_seconds()
+        if elapsed > 0:
+            eta_seconds = int(elapsed / completed * remaining)
+
+    return {
+        "batch_id": batch["id"],
+        "status": batch["status"],
+        "total": total,
+        "done": done,
+        "failed": failed,
+        "in_flight": in_flight,
+        "pending": pending,
+        "cancelled": cancelled,
+        "percent": round((done + failed + cancelled) / total * 100, 1) if total else 100.0,
+        "eta_seconds": eta_seconds
+    }
+
+
+async def aget_batch_progress(session, batch_id: int) -> Optional[Dict[str, Any]]:
+    """Progreso de un lote con una AsyncSession (streaming de eventos)"""
+    batch = await session.get(GenerationBatch, batch_id)
+    if batch is None:
+        return None
+    counts = dict((await session.execute(batch_counts_stmt(batch_id))).all())
+    timing = (await session.execute(batch_timing_stmt(batch_id))).one()
+    return summarize_progress(batch.to_dict(), counts, tuple(timing))
+
+
+class BatchGenerationService:
+    """Servicio de lotes de generación de contenido"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    # ---- API ----
+
+    def create_batch(
+        self,
+        user_id: int,
+        keyword_ids: List[int],
+        generation_settings: Optional[Dict[str, Any]] = None,
+        concurrency: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Crear un lote y repartirlo entre los workers"""
+        # Sin duplicados, conservando el orden pedido
+        keyword_ids = list(dict.fromkeys(keyword_ids))
+        if not keyword_ids:
+            raise ValueError("El lote debe incluir al menos una keyword")
+        if len(keyword_ids) > settings.BATCH_MAX_ITEMS:
+            raise ValueError(f"Un lote admite como máximo {settings.BATCH_MAX_ITEMS} keywords")
+
+        found = {row.id for row in self.db.query(Keyword.id).filter(Keyword.id.in_(keyword_ids))}
+        missing = [keyword_id for keyword_id in keyword_ids if keyword_id not in found]
+        if missing:
+            raise ValueError(f"Keywords no encontradas: {missing}")
+
+        concurrency = max(1, min(concurrency or settings.BATCH_DEFAULT_CONCURRENCY, settings.BATCH_MAX_CONCURRENCY))
+
+        try:
+            batch = GenerationBatch(
+                user_id=user_id,
+                settings=generation_settings or {},
+                concurrency=concurrency,
+                total_items=len(keyword_ids)
+            )
+            batch.items = [
+                GenerationBatchItem(keyword_id=keyword_id, position=position)
+                for position, keyword_id in enumerate(keyword_ids)
+            ]
+            self.db.add(batch)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        self._dispatch(batch)
+        logger.info(f"Lote {batch.id} creado: {len(keyword_ids)} keywords, concurrencia {concurrency}")
+        return self.get_progress(batch.id, user_id)
+
+    def get_batch(self, batch_id: int, user_id: int) -> Optional[GenerationBatch]:
+        return self.db.query(GenerationBatch).filter(
+            GenerationBatch.id == batch_id,
+            GenerationBatch.user_id == user_id
+        ).first()
+
+    def get_progress(self, batch_id: int, user_id: int) -> Optional[Dict[str, Any]]:
+        """Progreso del lote: hechos, fallidos, en curso y ETA"""
+        batch = self.get_batch(batch_id, user_id)
+        if batch is None:
+            return None
+        counts = dict(self.db.execute(batch_counts_stmt(batch_id)).all())
+        timing = tuple(self.db.execute(batch_timing_stmt(batch_id)).one())
+        return {**batch.to_dict(), **summarize_progress(batch.to_dict(), counts, timing)}
+
+    def list_batches(self, user_id: int, limit: int = 20) -> List[Dict[str, Any]]:
+        """Lotes recientes del usuario con sus conteos (una consulta agrupada)"""
+        batches = self.db.query(GenerationBatch).filter(
+            GenerationBatch.user_id == user_id
+        ).order_by(GenerationBatch.created_at.desc()).limit(limit).all()
+        if not batches:
+            return []
+
+        counts: Dict[int, Dict[str, int]] = {batch.id: {} for batch in batches}
+        rows = self.db.query(
+            GenerationBatchItem.batch_id, GenerationBatchItem.status, func.count(GenerationBatchItem.id)
+        ).filter(
+            GenerationBatchItem.batch_id.in_(counts.keys())
+        ).group_by(GenerationBatchItem.batch_id, GenerationBatchItem.status).all()
+        for batch_id, status, count in rows:
+            counts[batch_id][status] = count
+
+        return [
+            {**batch.to_dict(), **summarize_progress(batch.to_dict(), counts[batch.id], (0, None, None))}
+            for batch in batches
+        ]
+
+    def list_items(self, batch_id: int, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        query = self.db.query(GenerationBatchItem).filter(GenerationBatchItem.batch_id == batch_id)
+        if status:
+            query = query.filter(GenerationBatchItem.status == status)
+        return [item.to_dict() for item in query.order_by(GenerationBatchItem.position).all()]
+
+    def retry_failed(self, batch_id: int, user_id: int) -> Dict[str, Any]:
+        """Reanudar un lote: los elementos fallidos vuelven a la cola, los completados no se repiten"""
+        batch = self.get_batch(batch_id, user_id)
+        if batch is None:
+            raise ValueError(f"Lote {batch_id} no encontrado")
+        if batch.status == BatchStatus.CANCELLED:
+            raise ValueError("No se puede reanudar un lote cancelado")
+
+        retried = self.db.query(GenerationBatchItem).filter(
+            GenerationBatchItem.batch_id == batch_id,
+            GenerationBatchItem.status == BatchItemStatus.FAILED
+        ).update({
+            "status": BatchItemStatus.PENDING,
+            "error": None
+        }, synchronize_session=False)
+
+        if retried:
+            batch.status = BatchStatus.RUNNING
+            batch.finished_at = None
+        self.db.commit()
+
+        if retried:
+            self._dispatch(batch)
+        logger.info(f"Lote {batch_id}: {retried} elementos reencolados")
+        return {**self.get_progress(batch_id, user_id), "retried": retried}
+
+    def cancel(self, batch_id: int, user_id: int) -> Dict[str, Any]:
+        """Cancelar un lote; los elementos en curso terminan, los pendientes no se generan"""
+        batch = self.get_batch(batch_id, user_id)
+        if batch is None:
+            raise ValueError(f"Lote {batch_id} no encontrado")
+
+        self.db.query(GenerationBatchItem).filter(
+            GenerationBatchItem.batch_id == batch_id,
+            GenerationBatchItem.status == BatchItemStatus.PENDING
+        ).update({"status": BatchItemStatus.CANCELLED}, synchronize_session=False)
+        batch.status = BatchStatus.CANCELLED
+        batch.finished_at = datetime.utcnow()
+        self.db.commit()
+
+        store = get_job_store()
+        for slot in range(batch.concurrency):
+            store.cancel(self._slot_key(batch_id, slot))
+        return self.get_progress(batch_id, user_id)
+
+    # ---- workers ----
+
+    @staticmethod
+    def _slot_key(batch_id: int, slot: int) -> str:
+        return f"batch:{batch_id}:slot:{slot}"
+
+    def _dispatch(self, batch: GenerationBatch) -> None:
+        """Encolar (o reactivar) un trabajo por hueco de concurrencia"""
+        store = get_job_store()
+        for slot in range(batch.concurrency):
+            store.enqueue(
+                BATCH_SLOT_JOB,
+                payload={"batch_id": batch.id, "slot": slot},
+                user_id=batch.user_id,
+                idempotency_key=self._slot_key(batch.id, slot),
+                replace=True
+            )
+        notify_dispatcher()
+
+    def claim_item(self, batch_id: int, worker_id: str) -> Tuple[Optional[GenerationBatchItem], Optional[str]]:
+        """
+        Reclamar el siguiente elemento pendiente del lote (o uno cuyo lease
+        caducó). Devuelve el elemento y el token de su lease.
+        """
+        now = datetime.utcnow()
+        token = f"{worker_id}:{uuid.uuid4().hex[:12]}"
+        claimable = or_(
+            GenerationBatchItem.status == BatchItemStatus.PENDING,
+            (GenerationBatchItem.status == BatchItemStatus.RUNNING) & (GenerationBatchItem.lease_expires_at < now)
+        )
+
+        try:
+            row = self.db.query(GenerationBatchItem.id).filter(
+                GenerationBatchItem.batch_id == batch_id, claimable
+            ).order_by(GenerationBatchItem.position).limit(1).with_for_update(skip_locked=True).first()
+            if row is None:
+                self.db.rollback()
+                return None, None
+
+            claimed = self.db.query(GenerationBatchItem).filter(
+                GenerationBatchItem.id == row.id, claimable
+            ).update({
+                "status": BatchItemStatus.RUNNING,
+                "lease_owner": token,
+                "lease_expires_at": now + timedelta(seconds=settings.KEYWORD_LEASE_SECONDS),
+                "attempts": GenerationBatchItem.attempts + 1,
+                "started_at": now
+            }, synchronize_session=False)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        if not claimed:
+            # Otro worker se lo llevó entre la lectura y el UPDATE
+            return self.claim_item(batch_id, worker_id)
+        return self.db.get(GenerationBatchItem, row.id), token
+
+    @staticmethod
+    def renew_item_lease(db: Session, item_id: int, token: str) -> bool:
+        """Extender el lease de un elemento (sin commit); False si ya no es nuestro"""
+        return bool(db.query(GenerationBatchItem).filter(
+            GenerationBatchItem.id == item_id,
+            GenerationBatchItem.lease_owner == token,
+            GenerationBatchItem.status == BatchItemStatus.RUNNING
+        ).update({
+            "lease_expires_at": datetime.utcnow() + timedelta(seconds=settings.KEYWORD_LEASE_SECONDS)
+        }, synchronize_session=False))
+
+    def finish_item(
+        self,
+        item: GenerationBatchItem,
+        token: str,
+        status: str,
+        content_id: Optional[int] = None,
+        error: Optional[str] = None
+    ) -> bool:
+        """Registrar el resultado de un elemento si el lease sigue siendo nuestro"""
+        values = {
+            "status": status,
+            "error": error,
+            "lease_owner": None,
+            "lease_expires_at": None,
+            "finished_at": datetime.utcnow()
+        }
+        if content_id is not None:
+            values["content_id"] = content_id
+
+        updated = self.db.query(GenerationBatchItem).filter(
+            GenerationBatchItem.id == item.id,
+            GenerationBatchItem.lease_owner == token
+        ).update(values, synchronize_session=False)
+        self.db.commit()
+        return bool(updated)
+
+    def finalize(self, batch_id: int) -> Optional[str]:
+        """Cerrar el lote cuando no quedan elementos pendientes ni en curso"""
+        batch = self.db.get(GenerationBatch, batch_id)
+        if batch is None or batch.status in BatchStatus.FINISHED:
+            return batch.status if batch else None
+
+        counts = dict(self.db.execute(batch_counts_stmt(batch_id)).all())
+        if counts.get(BatchItemStatus.PENDING) or counts.get(BatchItemStatus.RUNNING):
+            return batch.status
+
+        batch.status = BatchStatus.PARTIAL if counts.get(BatchItemStatus.FAILED) else BatchStatus.COMPLETED
+        batch.finished_at = datetime.utcnow()
+        self.db.commit()
+        logger.info(f"Lote {batch_id} terminado: {batch.status}")
+        return batch.status
+
+    def generate_item(
+        self,
+        batch: GenerationBatch,
+        item: GenerationBatchItem,
+        token: str
+    ) -> Tuple[Optional[int], Optional[str]]:
+        """
+        Generar el contenido de un elemento con el flujo de /content/generate.
+
+        Si el elemento ya tiene un contenido generado (el worker anterior cayó
+        antes de registrarlo) se reutiliza; si falló, se regenera sobre él.
+        Devuelve `(content_id, error)`; lanza LeaseLostError si otro worker
+        se quedó el elemento o la keyword mientras se generaba.
+        """
+        generation_settings = batch.settings or {}
+        content = self.db.get(Content, item.content_id) if item.content_id else None
+
+        if content is not None and content.status not in (ContentStatus.GENERATING, ContentStatus.FAILED):
+            return content.id, None
+
+        user = self.db.get(User, batch.user_id)
+        if user is None:
+            return None, "Usuario eliminado"
+        if self.db.get(Keyword, item.keyword_id) is None:
+            return None, "Keyword eliminada"
+
+        queue = KeywordQueue(self.db)
+        keyword = queue.claim_keyword(item.keyword_id, worker_id=f"batch:{batch.id}")
+        if keyword is None:
+            return item.content_id, "La keyword se está generando en otro proceso"
+
+        service = ContentGenerationService(self.db)
+        if content is None:
+            try:
+                content = service.create_placeholder(keyword, user)
+            except ValueError as e:
+                # Cuota diaria agotada: la keyword vuelve a la cola sin generarse
+                queue.release(keyword)
+                return None, str(e)
+            except Exception:
+                self.db.rollback()
+                queue.release(keyword)
+                raise
+            # Registrar el contenido en el elemento antes de generar (reanudación)
+            self.db.query(GenerationBatchItem).filter(
+                GenerationBatchItem.id == item.id
+            ).update({"content_id": content.id}, synchronize_session=False)
+        else:
+            content.status = ContentStatus.GENERATING
+        self.db.commit()
+        content_id = content.id
+
+        try:
+            item_id = item.id
+            with keyword_heartbeat(
+                queue, keyword, extra=lambda db: self.renew_item_lease(db, item_id, token)
+            ) as heartbeat:
+                asyncio.run(service.generate(
+                    content,
+                    keyword,
+                    user,
+                    generation_settings.get("provider", "auto"),
+                    generation_settings.get("content_type", "article"),
+                    generation_settings.get("additional_keywords") or [],
+                    heartbeat
+                ))
+        except LeaseLostError:
+            self.db.rollback()
+            raise
+        except Exception as e:
+            self.db.rollback()
+            if content_id is not None:
+                self.db.query(Content).filter(Content.id == content_id).update({
+                    "status": ContentStatus.FAILED,
+                    "content": f"Error generando contenido: {str(e)}"
+                }, synchronize_session=False)
+                self.db.commit()
+            queue.release(keyword, failed=True)
+            return content_id, str(e)[:500] or "Error generando contenido"
+
+        queue.complete(keyword)
+        return content_id, None
+
+
+@job_handler(BATCH_SLOT_JOB)
+def run_batch_slot(payload: Dict[str, Any], run_key: str) -> Dict[str, Any]:
+    """Hueco de concurrencia de un lote: genera elementos hasta vaciarlo"""
+    batch_id = payload["batch_id"]
+    db = SessionLocal()
+    try:
+        service = BatchGenerationService(db)
+        batch = db.get(GenerationBatch, batch_id)
+        if batch is None or batch.status in BatchStatus.FINISHED:
+            return {"batch_id": batch_id, "processed": 0, "status": "skipped"}
+
+        if batch.status == BatchStatus.PENDING:
+            db.query(GenerationBatch).filter(
+                GenerationBatch.id == batch_id,
+                GenerationBatch.status == BatchStatus.PENDING
+            ).update({"status": BatchStatus.RUNNING, "started_at": datetime.utcnow()}, synchronize_session=False)
+            db.commit()
+
+        processed = failed = 0
+        while True:
+            db.refresh(batch)
+            if batch.status == BatchStatus.CANCELLED:
+                break
+
+            item, token = service.claim_item(batch_id, worker_id=run_key)
+            if item is None:
+                break
+
+            try:
+                content_id, error = service.generate_item(batch, item, token)
+            except LeaseLostError:
+                # Otro worker retomó el elemento: su resultado es el que cuenta
+                logger.warning(f"Lote {batch_id}: lease perdido para la keyword {item.keyword_id}")
+                continue
+            except Exception as e:
+                db.rollback()
+                content_id, error = item.content_id, str(e)
+
+            if error:
+                failed += 1
+                logger.warning(f"Lote {batch_id}: falló la keyword {item.keyword_id}: {error[:200]}")
+            service.finish_item(
+                item, token,
+                BatchItemStatus.FAILED if error else BatchItemStatus.COMPLETED,
+                content_id=content_id,
+                error=error
+            )
+            processed += 1
+
+        status = service.finalize(batch_id)
+        return {"batch_id": batch_id, "slot": payload.get("slot"), "processed": processed, "failed": failed, "status": status}
+    finally:
+        db.close()
@@ -0,0 +1,247 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import and_, delete, exists, func, select, true, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.category import Category
+from app.models.content import Content, ContentStatus
+from app.models.content_image import ContentImage
+from app.models.counters import recount_content_counts
+from app.models.generation_batch import GenerationBatchItem
+from app.models.quotas import bump_daily_usage, usage_day
+from app.models.seo_schema import SEOSchema
+from app.models.tag import Tag, content_tags
+from app.services.content_events import content_changed
+from app.utils.validators import validate_content_status_transition
+
+# ============================================================================
+# OPERACIONES MASIVAS SOBRE CONTENIDO
+# ============================================================================
+#
+# Cada operación se resuelve con unas pocas sentencias sobre el conjunto de
+# ids (UPDATE … WHERE id IN, INSERT … SELECT, DELETE … WHERE id IN) dentro
+# de una sola transacción, sin cargar los contenidos en la sesión. Por eso
+# los eventos de sesión no intervienen: los contadores de categorías y
+# etiquetas y el uso diario se actualizan aquí explícitamente, y al final
+# se emite un único evento de cambio (app.services.content_events).
+
+STATUS_ACTIONS = {
+    "publish": ContentStatus.PUBLISHED,
+    "unpublish": ContentStatus.DRAFT,
+}
+ACTIONS = tuple(STATUS_ACTIONS) + ("set_category", "add_tags", "remove_tags", "delete")
+
+
+def add_tags_stmt(content_ids: Iterable[int], tag_ids: Iterable[int]):
+    """INSERT … SELECT de las parejas contenido-etiqueta que aún no existan"""
+    content_ids = list(content_ids)
+    tag_ids = list(tag_ids)
+    existing = exists().where(and_(
+        content_tags.c.content_id == Content.id,
+        content_tags.c.tag_id == Tag.id
+    ))
+    # Producto cartesiano explícito: todas las parejas de los dos conjuntos
+    pairs = (
+        select(Content.id, Tag.id)
+        .select_from(Content)
+        .join(Tag, true())
+        .where(Content.id.in_(content_ids), Tag.id.in_(tag_ids), ~existing)
+    )
+    return content_tags.insert().from_select(["content_id", "tag_id"], pairs)
+
+
+class ContentBulkService:
+    """Publicar, despublicar, recategorizar, etiquetar o eliminar contenido en bloque"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _select_targets(
+        self,
+        user_id: int,
+        content_ids: Optional[List[int]] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Any]:
+        """Filas (id, status, category_id, published_at) del usuario que cumplen ids/filtros"""
+        if not content_ids and not filters:
+            raise ValueError("Indica una lista de ids o un filtro")
+
+        query = self.db.query(
+            Content.id, Content.status, Content.category_id, Content.published_at
+        ).filter(Content.user_id == user_id)
+
+        if content_ids:
+            query = query.filter(Content.id.in_(set(content_ids)))
+        filters = filters or {}
+        if filters.get("status"):
+            query = query.filter(Content.status == ContentStatus(filters["status"]))
+        if filters.get("category_id"):
+            query = query.filter(Content.category_id == filters["category_id"])
+        if filters.get("keyword_id"):
+            query = query.filter(Content.keyword_id == filters["keyword_id"])
+        if filters.get("tag_id"):
+            query = query.filter(Content.tags.any(Tag.id == filters["tag_id"]))
+        if filters.get("created_from"):
+            query = query.filter(Content.created_at >= filters["created_from"])
+        if filters.get("created_to"):
+            query = query.filter(Content.created_at < filters["created_to"])
+
+        rows = query.limit(settings.CONTENT_BULK_MAX_ITEMS + 1).all()
+        if len(rows) > settings.CONTENT_BULK_MAX_ITEMS:
+            raise ValueError(
+                f"La operación afecta a más de {settings.CONTENT_BULK_MAX_ITEMS} contenidos; acota el filtro"
+            )
+        return rows
+
+    def apply(
+        self,
+        user_id: int,
+        action: str,
+        content_ids: Optional[List[int]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        category_id: Optional[int] = None,
+        tag_ids: Optional[List[int]] = None
+    ) -> Dict[str, Any]:
+        """
+        Aplicar una operación a un conjunto de contenidos del usuario.
+
+        Returns:
+            Dict con los ids modificados, los omitidos (con el motivo) y el evento emitido
+        """
+        if action not in ACTIONS:
+            raise ValueError(f"Acción no válida: '{action}'. Permitidas: {', '.join(ACTIONS)}")
+
+        rows = self._select_targets(user_id, content_ids, filters)
+        skipped: List[Dict[str, Any]] = []
+        if content_ids:
+            found = {row.id for row in rows}
+            skipped.extend({"id": i, "reason": "no encontrado"} for i in sorted(set(content_ids) - found))
+
+        try:
+            if action in STATUS_ACTIONS:
+                affected = self._change_status(user_id, rows, STATUS_ACTIONS[action], skipped)
+            elif action == "set_category":
+                affected = self._set_category(rows, category_id)
+            elif action in ("add_tags", "remove_tags"):
+                affected = self._change_tags(rows, tag_ids, add=action == "add_tags")
+            else:
+                affected = self._delete(rows)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        # Solo cambia el sitio público si se ha tocado contenido publicado
+        affects_site = action in STATUS_ACTIONS or any(
+            row.status == ContentStatus.PUBLISHED for row in rows if row.id in affected
+        )
+        event = content_changed(action, affected, affects_site=affects_site)
+
+        return {
+            "action": action,
+            "matched": len(rows),
+            "updated": len(affected),
+            "updated_ids": sorted(affected),
+            "skipped": skipped,
+            "event": event
+        }
+
+    # ------------------------------------------------------------------
+    # Operaciones
+    # ------------------------------------------------------------------
+
+    def _change_status(self, user_id: int, rows: List[Any], target: ContentStatus, skipped: List[Dict[str, Any]]) -> Set[int]:
+        valid: List[Any] = []
+        for row in rows:
+            current = row.status.value if row.status else ContentStatus.DRAFT.value
+            if validate_content_status_transition(current, target.value):
+                valid.append(row)
+            else:
+                skipped.append({"id": row.id, "reason": f"transición no permitida: {current} -> {target.value}"})
+
+        ids = {row.id for row in valid}
+        if not ids:
+            return ids
+
+        now = datetime.utcnow()
+        values = {"status": target, "updated_at": now}
+        if target == ContentStatus.PUBLISHED:
+            values["published_at"] = func.coalesce(Content.published_at, now)
+        self.db.execute(
+            update(Content).where(Content.id.in_(ids)).values(values)
+            .execution_options(synchronize_session=False)
+        )
+
+        # Primeras publicaciones: cuentan en el uso diario (app.models.quotas)
+        first_published = sum(1 for row in valid if row.published_at is None)
+        if target == ContentStatus.PUBLISHED and first_published:
+            bump_daily_usage(self.db.connection(), user_id, usage_day(now), published=first_published)
+        return ids
+
+    def _set_category(self, rows: List[Any], category_id: Optional[int]) -> Set[int]:
+        if category_id is not None and self.db.get(Category, category_id) is None:
+            raise ValueError("Categoría no encontrada")
+
+        ids = {row.id for row in rows if row.category_id != category_id}
+        if not ids:
+            return ids
+
+        self.db.execute(
+            update(Content).where(Content.id.in_(ids))
+            .values(category_id=category_id, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        previous = {row.category_id for row in rows if row.id in ids}
+        recount_content_counts(self.db.connection(), previous | {category_id})
+        return ids
+
+    def _change_tags(self, rows: List[Any], tag_ids: Optional[List[int]], add: bool) -> Set[int]:
+        tag_ids = sorted(set(tag_ids or []))
+        if not tag_ids:
+            raise ValueError("Indica al menos una etiqueta")
+        ids = {row.id for row in rows}
+        if not ids:
+            return ids
+
+        if add:
+            found = {row.id for row in self.db.query(Tag.id).filter(Tag.id.in_(tag_ids))}
+            if len(found) != len(tag_ids):
+                raise ValueError(f"Etiquetas no encontradas: {sorted(set(tag_ids) - found)}")
+            self.db.execute(add_tags_stmt(ids, tag_ids))
+        else:
+            self.db.execute(
+                delete(content_tags).where(
+                    content_tags.c.content_id.in_(ids),
+                    content_tags.c.tag_id.in_(tag_ids)
+                )
+            )
+        self.db.execute(
+            update(Content).where(Content.id.in_(ids)).values(updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        recount_content_counts(self.db.connection(), tag_ids=tag_ids)
+        return ids
+
+    def _delete(self, rows: List[Any]) -> Set[int]:
+        ids = {row.id for row in rows}
+        if not ids:
+            return ids
+
+        tag_ids = [
+            row.tag_id for row in
+            self.db.query(content_tags.c.tag_id).filter(content_tags.c.content_id.in_(ids)).distinct()
+        ]
+        # Filas dependientes primero (no todas las bases aplican ON DELETE)
+        self.db.execute(delete(content_tags).where(content_tags.c.content_id.in_(ids)))
+        self.db.execute(delete(ContentImage).where(ContentImage.content_id.in_(ids)).execution_options(synchronize_session=False))
+        self.db.execute(delete(SEOSchema).where(SEOSchema.content_id.in_(ids)).execution_options(synchronize_session=False))
+        self.db.execute(
+            update(GenerationBatchItem).where(GenerationBatchItem.content_id.in_(ids))
+            .values(content_id=None).execution_options(synchronize_session=False)
+        )
+        self.db.execute(delete(Content).where(Content.id.in_(ids)).execution_options(synchronize_session=False))
+
+        recount_content_counts(self.db.connection(), {row.category_id for row in rows}, tag_ids)
+        return ids
@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.scheduled_job import JobStatus
+from app.services.job_scheduler import get_job_store, job_handler, notify_dispatcher
+from app.utils.logging import get_logger
+from app.utils.pagination import invalidate_count_cache
+
+logger = get_logger(__name__)
+
+# ============================================================================
+# EVENTO DE CAMBIO DE CONTENIDO
+# ============================================================================
+#
+# Tras un cambio masivo (app.services.content_bulk) se emite un único
+# evento: se descartan los totales cacheados de los listados y, si el
+# cambio afecta al sitio público, se programa una regeneración del sitio
+# estático. La regeneración es un trabajo del dispatcher con clave fija,
+# así que los cambios seguidos se agrupan en una sola ejecución; los que
+# llegan mientras se regenera dejan pedida otra, que el dispatcher lanza
+# al terminar la actual (JobStore.enqueue con el trabajo en RUNNING).
+
+SITE_REBUILD_JOB = "site_rebuild"
+SITE_REBUILD_KEY = "site:rebuild"
+
+
+def schedule_site_rebuild(reason: str) -> Optional[Dict[str, Any]]:
+    """
+    Programar la regeneración del sitio (o reutilizar la ya pendiente).
+
+    Si hay una en curso, puede no incluir este cambio: queda pedida una
+    nueva para cuando termine.
+    """
+    store = get_job_store()
+    job = store.get(SITE_REBUILD_KEY)
+    if job is not None and job["status"] == JobStatus.PENDING:
+        return job
+
+    job = store.enqueue(
+        SITE_REBUILD_JOB,
+        run_at=datetime.utcnow() + timedelta(seconds=settings.SITE_REBUILD_DELAY_SECONDS),
+        payload={"reason": reason},
+        idempotency_key=SITE_REBUILD_KEY,
+        replace=True
+    )
+    notify_dispatcher()
+    return job
+
+
+def content_changed(action: str, content_ids: Iterable[int], affects_site: bool = True) -> Dict[str, Any]:
+    """
+    Notificar un cambio de contenido ya confirmado.
+
+    Args:
+        action: Operación realizada (publish, delete, ...)
+        content_ids: Contenidos afectados
+        affects_site: Si el cambio toca contenido visible en el sitio público
+
+    Returns:
+        Dict con el resumen del evento (incluido el trabajo de regeneración)
+    """
+    content_ids = list(content_ids)
+    invalidate_count_cache()
+
+    rebuild = None
+    if affects_site and content_ids and settings.SITE_REBUILD_ON_CHANGE:
+        try:
+            rebuild = schedule_site_rebuild(f"{action}:{len(content_ids)}")
+        except Exception as e:
+            # El cambio ya está confirmado; la regeneración puede lanzarse a mano
+            logger.error(f"Error programando la regeneración del sitio: {str(e)}")
+
+    logger.info(f"Contenido modificado: {action} ({len(content_ids)} elementos)")
+    return {
+        "action": action,
+        "count": len(content_ids),
+        "site_rebuild_at": (rebuild.get("rerun_at") or rebuild["next_execution"]) if rebuild else None
+    }
+
+
+@job_handler(SITE_REBUILD_JOB)
+def rebuild_site(payload: Dict[str, Any], run_key: str) -> Dict[str, Any]:
+    """Regenerar el sitio estático completo"""
+    from app.services.publication_engine import PublicationEngine
+
+    db = SessionLocal()
+    try:
+        return PublicationEngine(db).generate_full_site()
+    finally:
+        db.close()
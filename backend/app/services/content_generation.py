@@ -0,0 +1,311 @@
+import traceback
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.models.content import Content, ContentStatus
+from app.models.image_config import ImageConfig
+from app.models.keyword import Keyword
+from app.models.user import User
+from app.services.keyword_queue import KeywordQueue, LeaseHeartbeat, LeaseLostError
+from app.services.quota_service import QuotaService
+from app.utils.helpers import calculate_reading_time, extract_excerpt, generate_slug
+from app.utils.logging import get_logger
+from app.utils.slugs import assign_unique_slug
+
+logger = get_logger(__name__)
+
+# ============================================================================
+# GENERACIÓN DE UN CONTENIDO (TEXTO + IMÁGENES)
+# ============================================================================
+#
+# Flujo común de /content/generate, los lotes y el scheduler. El contenido
+# ya existe (en estado GENERATING) y la keyword la tiene reclamada quien
+# llama, a través de KeywordQueue; mientras se genera, un LeaseHeartbeat
+# renueva los leases y, si alguno se pierde, no se guarda nada más.
+
+DEFAULT_IMAGE_CONFIG = {
+    "num_images": 2,
+    "style": "realistic",
+    "include_featured": True,
+    "custom_prompt": None
+}
+
+
+def check_auto_image_generation(user_id: int, keyword_id: int, db: Session) -> bool:
+    """
+    Verifica si la generación automática de imágenes está habilitada
+    """
+    try:
+        # Verificar configuración global del usuario
+        global_config = db.query(ImageConfig).filter(
+            ImageConfig.user_id == user_id,
+            ImageConfig.keyword_id.is_(None)
+        ).first()
+
+        if global_config:
+            return global_config.auto_generate
+        else:
+            # Por defecto, la generación automática está habilitada
+            return True
+    except Exception as e:
+        logger.error(f"Error checking auto image generation: {e}")
+        return False
+
+
+def get_image_config_for_content(user_id: int, keyword_id: int, db: Session) -> dict:
+    """
+    Obtiene la configuración de imágenes para el contenido
+    """
+    try:
+        # Buscar configuración específica de la keyword
+        keyword_config = db.query(ImageConfig).filter(
+            ImageConfig.user_id == user_id,
+            ImageConfig.keyword_id == keyword_id
+        ).first()
+
+        # Buscar configuración global del usuario
+        global_config = db.query(ImageConfig).filter(
+            ImageConfig.user_id == user_id,
+            ImageConfig.keyword_id.is_(None)
+        ).first()
+
+        # Configuración por defecto
+        config = dict(DEFAULT_IMAGE_CONFIG)
+
+        # Aplicar configuración global si existe
+        if global_config:
+            config["num_images"] = global_config.images_per_content
+            config["style"] = global_config.image_style.value
+            config["include_featured"] = global_config.include_featured
+
+        # Aplicar configuración específica de keyword si existe (tiene prioridad)
+        if keyword_config:
+            if keyword_config.keyword_count is not None:
+                config["num_images"] = keyword_config.keyword_count
+            if keyword_config.keyword_style is not None:
+                config["style"] = keyword_config.keyword_style.value
+            if keyword_config.custom_prompt is not None:
+                config["custom_prompt"] = keyword_config.custom_prompt
+
+        return config
+    except Exception as e:
+        logger.error(f"Error getting image config: {e}")
+        return dict(DEFAULT_IMAGE_CONFIG)
+
+
+def keyword_heartbeat(queue: KeywordQueue, keyword: Keyword, extra=None) -> LeaseHeartbeat:
+    """
+    Heartbeat del lease de una keyword reclamada con `queue`; `extra(db)`
+    renueva además otro lease (p. ej. el del elemento de un lote).
+    """
+    token = queue.lease_token(keyword)
+    keyword_id = keyword.id
+
+    def renew(db: Session) -> bool:
+        renewed = KeywordQueue.renew_lease(db, keyword_id, token)
+        if extra is not None:
+            renewed = extra(db) and renewed
+        return renewed
+
+    # Sesiones del hilo del heartbeat sobre la misma base de datos que la del trabajo
+    return LeaseHeartbeat(renew, session_factory=sessionmaker(bind=queue.db.get_bind()))
+
+
+class ContentGenerationService:
+    """Generar el texto y las imágenes de un contenido ya creado"""
+
+    def __init__(self, db: Session, clients=None):
+        self.db = db
+        self.clients = clients
+
+    def create_placeholder(self, keyword: Keyword, user: User) -> Content:
+        """
+        Crear (con flush, sin commit) el contenido en GENERATING que se
+        rellenará después, dentro de la cuota diaria del usuario.
+
+        Debe ser la primera escritura de la transacción. El flush suma el
+        contenido al uso del día y la comprobación se hace en esa misma
+        transacción; si supera el límite se deshace todo y se lanza
+        ValueError con el mensaje de cuota.
+        """
+        quota = QuotaService(self.db)
+        quota.check_daily_limit(user)
+
+        base_title = f"Generando contenido para: {keyword.keyword}"
+        content = Content(
+            title=base_title,
+            content="",
+            status=ContentStatus.GENERATING,
+            keyword_id=keyword.id,
+            user_id=user.id
+        )
+        # Sin SAVEPOINT: el alta y el uso sumado en el flush se deshacen juntos si falla la cuota
+        assign_unique_slug(self.db, content, generate_slug(base_title), savepoint=False)
+        try:
+            quota.enforce_daily_limit(user)
+        except ValueError:
+            self.db.rollback()
+            raise
+        return content
+
+    async def generate(
+        self,
+        content: Content,
+        keyword: Keyword,
+        user: User,
+        provider: str = "auto",
+        content_type: str = "article",
+        additional_keyword_ids: Optional[List[int]] = None,
+        heartbeat: Optional[LeaseHeartbeat] = None,
+        images: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """
+        Rellenar `content` con el texto generado y sus imágenes.
+
+        `images` fuerza o desactiva las imágenes; por defecto se sigue la
+        configuración de imágenes del usuario.
+
+        Lanza la excepción del proveedor si falla el texto (los errores de
+        imágenes no invalidan el artículo) y LeaseLostError si el lease se
+        perdió antes de guardar.
+        """
+        from app.services.content_generator import ContentGenerator
+
+        # FASE 1: Generar contenido de texto
+        logger.info(f"Generando texto para la keyword: {keyword.keyword} (contenido {content.id})")
+        generator = ContentGenerator(user, clients=self.clients)
+
+        original_keyword = keyword.keyword
+        if additional_keyword_ids:
+            # Incluir las keywords relacionadas en el contexto del prompt (sin guardarlas)
+            related = self.db.query(Keyword.keyword).filter(Keyword.id.in_(additional_keyword_ids)).all()
+            keyword_context = ", ".join([original_keyword] + [row.keyword for row in related])
+            keyword.keyword = f"{original_keyword} (relacionado con: {keyword_context})"
+        try:
+            generated = await generator.generate_content(keyword, provider, content_type)
+        finally:
+            keyword.keyword = original_keyword
+
+        new_title = generated.get("title", f"Artículo sobre {original_keyword}")
+        new_content = generated.get("content", "")
+
+        if heartbeat is not None:
+            heartbeat.check()
+        content.title = new_title
+        assign_unique_slug(self.db, content, generate_slug(new_title))
+        content.content = new_content
+        content.excerpt = extract_excerpt(new_content)
+        content.meta_description = generated.get("meta_description", extract_excerpt(new_content, 160))
+        content.word_count = len(new_content.split())
+        content.reading_time = calculate_reading_time(new_content)
+        content.status = ContentStatus.DRAFT
+        content.focus_keyword = original_keyword
+
+        # Actualizar campos Schema.org
+        content.author_name = generated.get("author_name", "Redactor IA")
+        content.publisher_name = generated.get("publisher_name", "Mi Sitio Web")
+        content.schema_type = generated.get("schema_type", "Article")
+        content.article_section = generated.get("article_section", "General")
+        self.db.commit()
+        logger.info(f"Contenido actualizado: {new_title} ({content.word_count} palabras)")
+
+        # FASE 2: Imágenes, si la generación automática está habilitada
+        images_generated = 0
+        if images is None:
+            images = check_auto_image_generation(user.id, keyword.id, self.db)
+        if images:
+            images_generated = self._generate_images(content, user, keyword, heartbeat)
+        else:
+            logger.info("Generación automática de imágenes deshabilitada")
+
+        return {
+            "success": True,
+            "content_id": content.id,
+            "title": content.title,
+            "word_count": content.word_count,
+            "images_generated": images_generated
+        }
+
+    def _generate_images(self, content: Content, user: User, keyword: Keyword, heartbeat: Optional[LeaseHeartbeat]) -> int:
+        """Imágenes del artículo e imagen destacada; los errores solo se registran"""
+        from app.services.image_generator import ImageGenerator
+
+        # Cambiar estado para indicar que se están generando imágenes
+        content.status = ContentStatus.GENERATING
+        self.db.commit()
+
+        generated_images = []
+        try:
+            image_generator = ImageGenerator(self.db, clients=self.clients)
+            image_config = get_image_config_for_content(user.id, keyword.id, self.db)
+
+            logger.info(f"Generando {image_config.get('num_images', 2)} imágenes para el contenido...")
+            generated_images = image_generator.generate_images_for_content(content.id, image_config.get("num_images", 2))
+
+            if generated_images and image_config.get("include_featured", True):
+                if not image_generator.generate_featured_image(content.id):
+                    logger.warning("No se pudo generar la imagen destacada")
+            elif not generated_images:
+                logger.warning("No se generaron imágenes")
+        except LeaseLostError:
+            raise
+        except Exception as img_error:
+            # No fallar todo el proceso por errores de imágenes
+            self.db.rollback()
+            logger.error(f"Error generando imágenes: {str(img_error)}\n{traceback.format_exc()}")
+
+        if heartbeat is not None:
+            heartbeat.check()
+        # Restaurar estado final del contenido
+        content.status = ContentStatus.DRAFT
+        self.db.commit()
+        return len(generated_images or [])
+
+
+async def generate_content_task(
+    content_id: int,
+    keyword_id: int,
+    user_id: int,
+    provider: str,
+    content_type: str,
+    additional_keyword_ids: Optional[List[int]] = None
+):
+    """Tarea en segundo plano para generar contenido e imágenes (/content/generate)"""
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        content = db.get(Content, content_id)
+        user = db.get(User, user_id)
+        if content is None or user is None:
+            logger.error(f"Datos faltantes: content={content}, user={user}")
+            return
+
+        queue = KeywordQueue(db)
+        keyword = queue.claim_keyword(keyword_id, worker_id=f"content:{content_id}")
+        if keyword is None:
+            content.status = ContentStatus.FAILED
+            content.content = "La keyword se está generando en otro proceso"
+            db.commit()
+            return
+
+        try:
+            with keyword_heartbeat(queue, keyword) as heartbeat:
+                await ContentGenerationService(db).generate(
+                    content, keyword, user, provider, content_type, additional_keyword_ids, heartbeat
+                )
+            queue.complete(keyword)
+            logger.info(f"Generación completada exitosamente para: {keyword.keyword}")
+        except LeaseLostError:
+            db.rollback()
+            logger.warning(f"Lease perdido generando el contenido {content_id}; no se guarda el resultado")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error generando contenido: {str(e)}\n{traceback.format_exc()}")
+            content.status = ContentStatus.FAILED
+            content.content = f"Error generando contenido: {str(e)}"
+            db.commit()
+            queue.release(keyword, failed=True)
+    finally:
+        db.close()
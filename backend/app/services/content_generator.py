@@ -9,10 +9,12 @@ from app.models.keyword import Keyword
 class ContentGenerator:
     """Generador de contenido usando OpenAI y DeepSeek"""
     
-    def __init__(self, user: User):
+    def __init__(self, user: User, clients=None):
         self.user = user
         self.openai_api_key = user.api_key_openai or getattr(settings, 'OPENAI_API_KEY', None)
         self.deepseek_api_key = user.api_key_deepseek or getattr(settings, 'DEEPSEEK_API_KEY', None)
+        # Pool de clientes del proceso (workers); sin él se crea un cliente por llamada
+        self.clients = clients
     
     async def generate_content_openai(self, keyword: Keyword, content_type: str = "article") -> Dict[str, str]:
         """Generar contenido usando OpenAI GPT"""
@@ -20,7 +22,10 @@ class ContentGenerator:
             raise ValueError("API key de OpenAI no configurada")
         
         # Usar la nueva API de OpenAI
-        client = openai.AsyncOpenAI(api_key=self.openai_api_key)
+        if self.clients is not None:
+            client = self.clients.openai_async(self.openai_api_key)
+        else:
+            client = openai.AsyncOpenAI(api_key=self.openai_api_key)
         
         prompt = self._create_prompt(keyword, content_type)
         
@@ -64,10 +69,12 @@ class ContentGenerator:
         }
         
         try:
-            response = requests.post(
+            http = self.clients.http if self.clients is not None else requests
+            response = http.post(
                 "https://api.deepseek.com/v1/chat/completions",
                 headers=headers,
-                json=payload
+                json=payload,
+                timeout=settings.PROVIDER_HTTP_TIMEOUT_SECONDS
             )
             response.raise_for_status()
             
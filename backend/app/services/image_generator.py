@@ -18,26 +18,32 @@ logger = get_logger(__name__)
 class ImageGenerator:
     """Generador de imágenes con IA para contenido de brujería usando Gemini y OpenAI"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, clients=None):
         self.db = db
         self.openai_client = None
         self.gemini_client = None
         self.default_provider = settings.DEFAULT_IMAGE_PROVIDER
         
-        # Inicializar cliente OpenAI si hay API key
+        # Inicializar cliente OpenAI si hay API key (del pool del proceso si lo hay)
         if hasattr(settings, 'OPENAI_API_KEY') and settings.OPENAI_API_KEY:
             try:
-                self.openai_client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
-                logger.info("OpenAI client initialized successfully")
+                if clients is not None:
+                    self.openai_client = clients.openai_sync(settings.OPENAI_API_KEY)
+                else:
+                    self.openai_client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
+                    logger.info("OpenAI client initialized successfully")
             except Exception as e:
                 logger.error(f"Error initializing OpenAI client: {e}")
         
         # Inicializar cliente Gemini si hay API key
         if hasattr(settings, 'GEMINI_API_KEY') and settings.GEMINI_API_KEY:
             try:
-                genai.configure(api_key=settings.GEMINI_API_KEY)
-                self.gemini_client = genai.GenerativeModel(settings.GEMINI_MODEL)
-                logger.info("Gemini client initialized successfully")
+                if clients is not None:
+                    self.gemini_client = clients.gemini_model(settings.GEMINI_API_KEY, settings.GEMINI_MODEL)
+                else:
+                    genai.configure(api_key=settings.GEMINI_API_KEY)
+                    self.gemini_client = genai.GenerativeModel(settings.GEMINI_MODEL)
+                    logger.info("Gemini client initialized successfully")
             except Exception as e:
                 logger.error(f"Error initializing Gemini client: {e}")
     
@@ -0,0 +1,672 @@
+import asyncio
+import heapq
+import importlib
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.models.scheduled_job import JobStatus, ScheduledJob, ScheduledJobRun
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# ============================================================================
+# MOTOR DE TRABAJOS PROGRAMADOS PERSISTENTES
+# ============================================================================
+#
+# El estado vive en las tablas scheduled_jobs / scheduled_job_runs, no en la
+# memoria de un proceso: cualquier número de workers puede ejecutar el
+# dispatcher a la vez. Cada worker reclama los trabajos vencidos con un lease
+# (SELECT ... FOR UPDATE SKIP LOCKED en PostgreSQL + UPDATE condicional), los
+# ejecuta en su pool de hilos y renueva el lease mientras trabajan. Si un
+# worker muere, su lease caduca y otro retoma el trabajo: la ejecución es
+# "al menos una vez", y la clave `run_key` de cada ejecución permite a los
+# handlers (y al propio motor) no repetir efectos ya completados. Un trabajo
+# cuyo lease caduca en todos sus intentos pasa a DEAD en vez de reclamarse
+# indefinidamente.
+
+INTERVAL_DELTAS = {
+    "5min": timedelta(minutes=5),
+    "15min": timedelta(minutes=15),
+    "30min": timedelta(minutes=30),
+    "hourly": timedelta(hours=1),
+    "daily": timedelta(days=1),
+    "twicedaily": timedelta(hours=12),
+    "twice_daily": timedelta(hours=12),
+    "weekly": timedelta(weeks=1),
+}
+
+# Espera de reintentos: RETRY_BASE_SECONDS * 2^(intento-1), con tope
+RETRY_BASE_SECONDS = 60
+RETRY_MAX_SECONDS = 3600
+
+# Módulos que registran handlers; el dispatcher los importa al arrancar
+HANDLER_MODULES = ("app.services.scheduler_service", "app.services.batch_generation", "app.services.content_events")
+
+
+def compute_next_execution(
+    interval: Optional[str],
+    schedule_time: Optional[str] = None,
+    after: Optional[datetime] = None
+) -> datetime:
+    """
+    Siguiente ejecución de un intervalo posterior a `after` (ahora por defecto).
+
+    Con intervalo diario y `schedule_time` (HH:MM, UTC) se programa a esa
+    hora; los demás intervalos suman su duración. Las ejecuciones perdidas
+    mientras no había workers no se recuperan una a una.
+    """
+    after = after or datetime.utcnow()
+
+    if interval == "daily" and schedule_time:
+        hour, minute = map(int, schedule_time.split(":"))
+        next_exec = after.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if next_exec <= after:
+            next_exec += timedelta(days=1)
+        return next_exec
+
+    return after + INTERVAL_DELTAS.get(interval, timedelta(hours=1))
+
+
+# ============================================================================
+# REGISTRO DE HANDLERS
+# ============================================================================
+
+_handlers: Dict[str, Callable[..., Any]] = {}
+
+
+def job_handler(job_type: str):
+    """
+    Registrar la función que ejecuta un tipo de trabajo.
+
+    El handler recibe `(payload, run_key)` y devuelve un dict con el
+    resultado; puede ser síncrono o `async def`. Se ejecuta en un hilo del
+    dispatcher, nunca en el event loop de la API.
+    """
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        _handlers[job_type] = func
+        return func
+    return decorator
+
+
+def get_job_handler(job_type: str) -> Optional[Callable[..., Any]]:
+    """Handler registrado para un tipo de trabajo"""
+    return _handlers.get(job_type)
+
+
+# ============================================================================
+# ALMACÉN DE TRABAJOS
+# ============================================================================
+
+class JobStore:
+    """Operaciones sobre scheduled_jobs; cada método usa su propia sesión"""
+
+    def __init__(self, session_factory):
+        self.session_factory = session_factory
+
+    @staticmethod
+    def run_key(job: Dict[str, Any]) -> str:
+        """Clave de idempotencia de la ejecución que representa el trabajo"""
+        return f"{job['id']}:{job['scheduled_for']}"
+
+    @staticmethod
+    def _row_run_key(row: ScheduledJob) -> str:
+        return f"{row.id}:{row.scheduled_for.isoformat()}"
+
+    @staticmethod
+    def _claimable(now: datetime):
+        """Vencidos, o reclamados por un worker cuyo lease ha caducado (con intentos restantes)"""
+        return or_(
+            and_(ScheduledJob.status == JobStatus.PENDING, ScheduledJob.next_execution <= now),
+            and_(
+                ScheduledJob.status == JobStatus.RUNNING,
+                ScheduledJob.lease_expires_at < now,
+                ScheduledJob.attempts < ScheduledJob.max_attempts
+            ),
+        )
+
+    @staticmethod
+    def _exhausted(now: datetime):
+        """Lease caducado en el último intento: el worker cayó en todos"""
+        return and_(
+            ScheduledJob.status == JobStatus.RUNNING,
+            ScheduledJob.lease_expires_at < now,
+            ScheduledJob.attempts >= ScheduledJob.max_attempts
+        )
+
+    @staticmethod
+    def _snapshot(job: ScheduledJob, lease_token: Optional[str] = None) -> Dict[str, Any]:
+        data = job.to_dict()
+        data["payload"] = job.payload or {}
+        data["lease_token"] = lease_token
+        return data
+
+    def enqueue(
+        self,
+        job_type: str,
+        run_at: Optional[datetime] = None,
+        payload: Optional[Dict[str, Any]] = None,
+        user_id: Optional[int] = None,
+        interval: Optional[str] = None,
+        schedule_time: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
+        max_attempts: Optional[int] = None,
+        replace: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Crear un trabajo. Si ya existe uno con la misma `idempotency_key` se
+        devuelve ese; con `replace` se actualiza su programación y se
+        reactiva. Si está ejecutándose conserva su lease y la nueva
+        ejecución queda en `rerun_at` (la más cercana, si se pide varias
+        veces): al terminar la actual vuelve a PENDING para ese momento.
+        """
+        run_at = run_at or datetime.utcnow()
+        max_attempts = max_attempts or settings.SCHEDULER_MAX_ATTEMPTS
+
+        with self.session_factory() as db:
+            job = None
+            if idempotency_key:
+                job = db.query(ScheduledJob).filter(ScheduledJob.idempotency_key == idempotency_key).first()
+
+            if job is not None and not replace:
+                return self._snapshot(job)
+
+            if job is None:
+                job = ScheduledJob(job_type=job_type, idempotency_key=idempotency_key)
+                db.add(job)
+
+            job.user_id = user_id
+            job.payload = payload or {}
+            job.interval = interval
+            job.schedule_time = schedule_time
+            job.max_attempts = max_attempts
+            if job.status == JobStatus.RUNNING:
+                if job.rerun_at is None or run_at < job.rerun_at:
+                    job.rerun_at = run_at
+            else:
+                job.status = JobStatus.PENDING
+                job.next_execution = job.scheduled_for = run_at
+                job.attempts = 0
+                job.last_error = None
+                job.rerun_at = None
+
+            try:
+                db.commit()
+            except IntegrityError:
+                # Otra petición creó la misma clave a la vez
+                db.rollback()
+                job = db.query(ScheduledJob).filter(ScheduledJob.idempotency_key == idempotency_key).one()
+            return self._snapshot(job)
+
+    def cancel(self, idempotency_key: str) -> bool:
+        """Cancelar un trabajo; una ejecución en curso termina pero no se reprograma"""
+        with self.session_factory() as db:
+            updated = db.query(ScheduledJob).filter(
+                ScheduledJob.idempotency_key == idempotency_key,
+                ScheduledJob.status.in_([JobStatus.PENDING, JobStatus.RUNNING])
+            ).update({"status": JobStatus.CANCELLED, "rerun_at": None}, synchronize_session=False)
+            db.commit()
+            return bool(updated)
+
+    def get(self, idempotency_key: str) -> Optional[Dict[str, Any]]:
+        """Trabajo por clave"""
+        with self.session_factory() as db:
+            job = db.query(ScheduledJob).filter(ScheduledJob.idempotency_key == idempotency_key).first()
+            return job.to_dict() if job else None
+
+    def upcoming(self, limit: int = 50) -> List[Tuple[datetime, int]]:
+        """
+        Próximos despertares del dispatcher: (momento, id) de los trabajos
+        pendientes más cercanos y de los leases que caducan antes.
+        """
+        with self.session_factory() as db:
+            entries = db.query(ScheduledJob.next_execution, ScheduledJob.id).filter(
+                ScheduledJob.status == JobStatus.PENDING
+            ).order_by(ScheduledJob.next_execution).limit(limit).all()
+            entries += db.query(ScheduledJob.lease_expires_at, ScheduledJob.id).filter(
+                ScheduledJob.status == JobStatus.RUNNING
+            ).order_by(ScheduledJob.lease_expires_at).limit(limit).all()
+            return [(when, job_id) for when, job_id in entries if when is not None]
+
+    def claim_due(self, worker_id: str, limit: int, lease_seconds: int) -> List[Dict[str, Any]]:
+        """
+        Reclamar hasta `limit` trabajos vencidos para este worker.
+
+        En PostgreSQL FOR UPDATE SKIP LOCKED reparte las filas entre workers
+        sin esperas; el UPDATE repite la condición, así que en motores sin
+        SKIP LOCKED (SQLite) dos workers tampoco reclaman la misma fila.
+        """
+        now = datetime.utcnow()
+        token = f"{worker_id}:{uuid.uuid4().hex[:12]}"
+        self._dead_letter(now)
+
+        with self.session_factory() as db:
+            ids = [row.id for row in db.query(ScheduledJob.id).filter(
+                self._claimable(now)
+            ).order_by(ScheduledJob.next_execution).limit(limit).with_for_update(skip_locked=True)]
+            if not ids:
+                db.rollback()
+                return []
+
+            db.query(ScheduledJob).filter(
+                ScheduledJob.id.in_(ids), self._claimable(now)
+            ).update({
+                "status": JobStatus.RUNNING,
+                "lease_owner": token,
+                "lease_expires_at": now + timedelta(seconds=lease_seconds),
+                "attempts": ScheduledJob.attempts + 1,
+                "last_run_at": now,
+            }, synchronize_session=False)
+            db.commit()
+
+            jobs = db.query(ScheduledJob).filter(ScheduledJob.lease_owner == token).all()
+            return [self._snapshot(job, token) for job in jobs]
+
+    def _dead_letter(self, now: datetime) -> int:
+        """
+        Pasar a DEAD los trabajos cuyo lease caducó sin intentos restantes.
+
+        Un fallo controlado pasa por fail(); estos son los que tumban al
+        worker en cada intento, y reclamarlos de nuevo solo tumbaría a otro.
+        Quedan fuera de la cola hasta que se reprogramen (enqueue con replace).
+        """
+        with self.session_factory() as db:
+            rows = db.query(ScheduledJob).filter(self._exhausted(now)).with_for_update(skip_locked=True).all()
+            for row in rows:
+                error = f"Lease caducado en {row.attempts} intentos (último worker: {row.lease_owner})"
+                db.query(ScheduledJobRun).filter(ScheduledJobRun.run_key == self._row_run_key(row)).update({
+                    "status": JobStatus.DEAD,
+                    "error": error,
+                    "finished_at": now,
+                }, synchronize_session=False)
+                row.status = JobStatus.DEAD
+                row.last_error = error
+                self._release(row)
+                logger.error(f"Trabajo {row.id} ({row.job_type}) movido a DEAD: {error}")
+            db.commit()
+            return len(rows)
+
+    def renew_lease(self, job: Dict[str, Any], lease_seconds: int) -> bool:
+        """Extender el lease; False si otro worker se ha quedado el trabajo"""
+        with self.session_factory() as db:
+            updated = db.query(ScheduledJob).filter(
+                ScheduledJob.id == job["id"],
+                ScheduledJob.lease_owner == job["lease_token"]
+            ).update({
+                "lease_expires_at": datetime.utcnow() + timedelta(seconds=lease_seconds)
+            }, synchronize_session=False)
+            db.commit()
+            return bool(updated)
+
+    def begin_run(self, job: Dict[str, Any], worker_id: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """
+        Registrar el inicio de una ejecución.
+
+        Devuelve `(True, resultado)` si esa ejecución ya se completó (el
+        worker anterior cayó antes de liberar el trabajo) y no debe repetirse.
+        """
+        run_key = self.run_key(job)
+        with self.session_factory() as db:
+            run = db.query(ScheduledJobRun).filter(ScheduledJobRun.run_key == run_key).first()
+            if run is not None and run.status == JobStatus.COMPLETED:
+                return True, run.result
+
+            if run is None:
+                db.add(ScheduledJobRun(job_id=job["id"], run_key=run_key, worker_id=worker_id))
+            else:
+                run.status = JobStatus.RUNNING
+                run.worker_id = worker_id
+                run.attempts += 1
+                run.error = None
+                run.started_at = datetime.utcnow()
+                run.finished_at = None
+
+            try:
+                db.commit()
+            except IntegrityError:
+                db.rollback()
+                raise RuntimeError(f"La ejecución {run_key} ya está registrada por otro worker")
+            return False, None
+
+    @staticmethod
+    def run_checkpoint(db, run_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Progreso guardado por el handler para `run_key` (ver save_checkpoint).
+
+        Sobrevive a los reintentos de la misma ejecución: si el worker cayó
+        a mitad, el siguiente intento retoma lo que ya estaba hecho.
+        """
+        row = db.query(ScheduledJobRun.result).filter(ScheduledJobRun.run_key == run_key).first()
+        return row.result if row is not None else None
+
+    @staticmethod
+    def save_checkpoint(db, run_key: str, data: Dict[str, Any]) -> bool:
+        """
+        Guardar el progreso de una ejecución en la sesión del handler, sin
+        commit: se confirma en la misma transacción que los efectos que
+        describe (y se deshace con ellos).
+        """
+        updated = db.query(ScheduledJobRun).filter(ScheduledJobRun.run_key == run_key).update(
+            {"result": json.loads(json.dumps(data, default=str))}, synchronize_session=False
+        )
+        return bool(updated)
+
+    def _owned_job(self, db, job: Dict[str, Any]) -> Optional[ScheduledJob]:
+        return db.query(ScheduledJob).filter(
+            ScheduledJob.id == job["id"],
+            ScheduledJob.lease_owner == job["lease_token"]
+        ).with_for_update().first()
+
+    def _finish_run(self, db, job: Dict[str, Any], status: str, result=None, error=None) -> None:
+        values = {"status": status, "error": error, "finished_at": datetime.utcnow()}
+        if status == JobStatus.COMPLETED:
+            values["result"] = result
+        # Un fallo conserva el progreso guardado para el reintento
+        db.query(ScheduledJobRun).filter(ScheduledJobRun.run_key == self.run_key(job)).update(
+            values, synchronize_session=False
+        )
+
+    @staticmethod
+    def _release(row: ScheduledJob) -> None:
+        row.lease_owner = None
+        row.lease_expires_at = None
+
+    @staticmethod
+    def _advance(row: ScheduledJob, now: datetime) -> None:
+        """Pasar un trabajo recurrente a su siguiente ejecución"""
+        row.status = JobStatus.PENDING
+        row.next_execution = row.scheduled_for = compute_next_execution(row.interval, row.schedule_time, now)
+        row.attempts = 0
+
+    @staticmethod
+    def _rerun(row: ScheduledJob) -> bool:
+        """Programar la ejecución pedida mientras corría la actual, si la hay"""
+        if row.rerun_at is None:
+            return False
+        row.status = JobStatus.PENDING
+        row.next_execution = row.scheduled_for = row.rerun_at
+        row.attempts = 0
+        row.rerun_at = None
+        return True
+
+    def complete(self, job: Dict[str, Any], result: Optional[Dict[str, Any]] = None) -> None:
+        """Marcar la ejecución como completada y reprogramar o cerrar el trabajo"""
+        now = datetime.utcnow()
+        with self.session_factory() as db:
+            self._finish_run(db, job, JobStatus.COMPLETED, result=result)
+
+            row = self._owned_job(db, job)
+            if row is None:
+                # Lease perdido: otro worker ya gestiona el trabajo
+                logger.warning(f"Trabajo {job['id']} completado sin lease vigente")
+            else:
+                # Un trabajo cancelado durante la ejecución sigue cancelado
+                if row.status == JobStatus.RUNNING and not self._rerun(row):
+                    if row.interval:
+                        self._advance(row, now)
+                    else:
+                        row.status = JobStatus.COMPLETED
+                row.last_result = result
+                row.last_error = None
+                self._release(row)
+            db.commit()
+
+    def fail(self, job: Dict[str, Any], error: str) -> None:
+        """
+        Registrar un fallo: reintenta con espera exponencial (misma
+        ejecución, mismo run_key) hasta max_attempts; después pasa a la
+        ejecución pedida durante esta (`rerun_at`), si la hay; si no, un
+        trabajo recurrente salta a su siguiente ejecución y uno único queda
+        fallido.
+        """
+        now = datetime.utcnow()
+        with self.session_factory() as db:
+            self._finish_run(db, job, JobStatus.FAILED, error=error)
+
+            row = self._owned_job(db, job)
+            if row is not None:
+                if row.status == JobStatus.RUNNING:
+                    if row.attempts < row.max_attempts:
+                        delay = min(RETRY_BASE_SECONDS * 2 ** (row.attempts - 1), RETRY_MAX_SECONDS)
+                        row.status = JobStatus.PENDING
+                        row.next_execution = now + timedelta(seconds=delay)
+                    elif not self._rerun(row):
+                        if row.interval:
+                            self._advance(row, now)
+                        else:
+                            row.status = JobStatus.FAILED
+                row.last_error = error
+                self._release(row)
+            db.commit()
+
+
+# ============================================================================
+# DISPATCHER
+# ============================================================================
+
+class JobDispatcher:
+    """
+    Bucle que reclama y ejecuta trabajos vencidos.
+
+    Mantiene un min-heap con los próximos vencimientos leídos de la base de
+    datos y duerme hasta el primero (o como máximo `max_idle` segundos, para
+    ver trabajos creados por otros procesos). `notify()` lo despierta antes.
+    """
+
+    MIN_WAIT_SECONDS = 0.5
+
+    def __init__(
+        self,
+        store: JobStore,
+        worker_id: Optional[str] = None,
+        max_workers: int = 2,
+        lease_seconds: int = 900,
+        max_idle: float = 30.0,
+        lookahead: int = 50
+    ):
+        self.store = store
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.max_workers = max_workers
+        self.lease_seconds = lease_seconds
+        self.max_idle = max_idle
+        self.lookahead = lookahead
+
+        self._heap: List[Tuple[datetime, int]] = []
+        self._inflight: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+
+        self.stats = {"executed": 0, "failed": 0, "skipped": 0}
+
+    # ---- ciclo de vida ----
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        for module in HANDLER_MODULES:
+            importlib.import_module(module)
+
+        self._stopping.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job-worker")
+        self._thread = threading.Thread(target=self._loop, name="job-dispatcher", daemon=True)
+        self._thread.start()
+        logger.info(f"Dispatcher de trabajos iniciado ({self.worker_id}, {self.max_workers} hilos)")
+
+    def stop(self, wait: bool = True) -> None:
+        """Detener el bucle; los trabajos en curso terminan (o su lease caduca)"""
+        self._stopping.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=self.max_idle)
+        if self._executor:
+            self._executor.shutdown(wait=wait)
+        logger.info(f"Dispatcher de trabajos detenido ({self.worker_id})")
+
+    def notify(self) -> None:
+        """Despertar el bucle (p. ej. tras encolar un trabajo)"""
+        self._wake.set()
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            inflight = [job["id"] for job in self._inflight.values()]
+        return {
+            "worker_id": self.worker_id,
+            "running": bool(self._thread and self._thread.is_alive()),
+            "inflight": inflight,
+            "next_wakeup": self._heap[0][0].isoformat() if self._heap else None,
+            **self.stats
+        }
+
+    # ---- bucle ----
+
+    def run_once(self) -> int:
+        """Reclamar y lanzar trabajos vencidos según los hilos libres"""
+        with self._lock:
+            free = self.max_workers - len(self._inflight)
+        if free <= 0:
+            return 0
+
+        jobs = self.store.claim_due(self.worker_id, free, self.lease_seconds)
+        for job in jobs:
+            job["renewed_at"] = time.monotonic()
+            with self._lock:
+                self._inflight[job["id"]] = job
+            self._executor.submit(self._execute, job)
+        return len(jobs)
+
+    def _renew_leases(self) -> None:
+        """Renovar los leases en curso cuando ha pasado un tercio de su duración"""
+        now = time.monotonic()
+        with self._lock:
+            jobs = list(self._inflight.values())
+        for job in jobs:
+            if now - job["renewed_at"] >= self.lease_seconds / 3:
+                if self.store.renew_lease(job, self.lease_seconds):
+                    job["renewed_at"] = now
+                else:
+                    logger.warning(f"Lease perdido para el trabajo {job['id']}")
+
+    def _next_timeout(self) -> float:
+        """Segundos hasta el próximo vencimiento conocido (acotado)"""
+        with self._lock:
+            busy = len(self._inflight) >= self.max_workers
+        if busy or not self._heap:
+            timeout = self.max_idle
+        else:
+            timeout = (self._heap[0][0] - datetime.utcnow()).total_seconds()
+        if self._inflight:
+            timeout = min(timeout, self.lease_seconds / 3)
+        return max(self.MIN_WAIT_SECONDS, min(timeout, self.max_idle))
+
+    def _loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                self._renew_leases()
+                self.run_once()
+                heap = self.store.upcoming(self.lookahead)
+                heapq.heapify(heap)
+                self._heap = heap
+                timeout = self._next_timeout()
+            except Exception as e:
+                logger.error(f"Error en el dispatcher de trabajos: {str(e)}")
+                timeout = self.max_idle
+
+            self._wake.wait(timeout)
+            self._wake.clear()
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def _execute(self, job: Dict[str, Any]) -> None:
+        try:
+            handler = get_job_handler(job["job_type"])
+            if handler is None:
+                raise LookupError(f"No hay handler registrado para '{job['job_type']}'")
+
+            done, previous = self.store.begin_run(job, self.worker_id)
+            if done:
+                self.store.complete(job, previous)
+                self._count("skipped")
+                return
+
+            result = handler(job["payload"], run_key=self.store.run_key(job))
+            if asyncio.iscoroutine(result):
+                result = asyncio.run(result)
+            if result is not None and not isinstance(result, dict):
+                result = {"result": result}
+            if result is not None:
+                # Se guarda en una columna JSON: fechas y demás como texto
+                result = json.loads(json.dumps(result, default=str))
+
+            self.store.complete(job, result)
+            self._count("executed")
+
+        except Exception as e:
+            logger.error(f"Error ejecutando trabajo {job['id']} ({job['job_type']}): {str(e)}")
+            self._count("failed")
+            try:
+                self.store.fail(job, str(e))
+            except Exception as store_error:
+                # El lease caducará y otro worker reintentará
+                logger.error(f"No se pudo registrar el fallo del trabajo {job['id']}: {str(store_error)}")
+        finally:
+            with self._lock:
+                self._inflight.pop(job["id"], None)
+            self._wake.set()
+
+
+# ============================================================================
+# INSTANCIA DEL PROCESO
+# ============================================================================
+
+_dispatcher: Optional[JobDispatcher] = None
+
+
+def get_job_store() -> JobStore:
+    from app.core.database import SessionLocal
+    return JobStore(SessionLocal)
+
+
+def start_dispatcher() -> JobDispatcher:
+    """Arrancar el dispatcher de este proceso con la configuración global"""
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = JobDispatcher(
+            get_job_store(),
+            max_workers=settings.SCHEDULER_WORKERS,
+            lease_seconds=settings.SCHEDULER_LEASE_SECONDS,
+            max_idle=settings.SCHEDULER_MAX_IDLE_SECONDS
+        )
+    _dispatcher.start()
+    return _dispatcher
+
+
+def stop_dispatcher() -> None:
+    global _dispatcher
+    if _dispatcher is not None:
+        _dispatcher.stop()
+        _dispatcher = None
+
+
+def notify_dispatcher() -> None:
+    """Despertar el dispatcher local, si este proceso ejecuta uno"""
+    if _dispatcher is not None:
+        _dispatcher.notify()
+
+
+def get_dispatcher() -> Optional[JobDispatcher]:
+    return _dispatcher
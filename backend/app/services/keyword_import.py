@@ -0,0 +1,313 @@
+import csv
+import io
+import json
+import re
+import tempfile
+import unicodedata
+from datetime import datetime
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.keyword import Keyword, KeywordPriority, KeywordStatus
+from app.utils.logging import get_logger
+
+try:
+    import ijson  # Parser JSON incremental (opcional)
+except ImportError:  # pragma: no cover - dependencia opcional
+    ijson = None
+
+logger = get_logger(__name__)
+
+# ============================================================================
+# IMPORTACIÓN MASIVA DE KEYWORDS
+# ============================================================================
+#
+# El archivo se lee por partes (línea a línea en txt/csv; elemento a
+# elemento en json si ijson está instalado) y las keywords se escriben en
+# bloques de `batch_size` con INSERT … ON CONFLICT DO NOTHING de varias
+# filas por sentencia, cada bloque confirmado por separado. Antes de escribir
+# nada se recorre el archivo entero una vez sin tocar la base de datos: un
+# archivo mal formado o demasiado grande se rechaza sin importaciones
+# parciales. Solo se mantiene en memoria el bloque en curso: los duplicados
+# dentro del bloque se descartan al construirlo y el resto (en otros bloques
+# o ya en la base de datos) los descarta el propio INSERT, así que
+# `duplicates` = válidas - insertadas.
+
+MAX_KEYWORD_LENGTH = Keyword.__table__.c.keyword.type.length
+KEYWORD_COLUMNS = ("keyword", "palabra_clave", "palabra clave", "query", "term")
+
+_WHITESPACE = re.compile(r"\s+")
+_PARSE_ERRORS = (UnicodeDecodeError, csv.Error, json.JSONDecodeError) + ((ijson.JSONError,) if ijson else ())
+
+
+def normalize_keyword(value: Any) -> Optional[str]:
+    """Normalizar una keyword (espacios, Unicode, minúsculas); None si no es válida"""
+    if value is None:
+        return None
+    text = unicodedata.normalize("NFKC", str(value))
+    text = _WHITESPACE.sub(" ", text).strip().strip("\"'").strip().lower()
+    if not text or len(text) > MAX_KEYWORD_LENGTH:
+        return None
+    return text
+
+
+def _to_int(value: Any) -> Optional[int]:
+    try:
+        return int(float(str(value).replace(",", ""))) if value not in (None, "") else None
+    except ValueError:
+        return None
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(str(value).replace(",", ".")) if value not in (None, "") else None
+    except ValueError:
+        return None
+
+
+def _to_priority(value: Any) -> Optional[KeywordPriority]:
+    try:
+        return KeywordPriority(str(value).strip().lower()) if value not in (None, "") else None
+    except ValueError:
+        return None
+
+
+class _LimitedReader(io.RawIOBase):
+    """Envoltorio de un archivo binario que falla al superar `limit` bytes"""
+
+    def __init__(self, raw: BinaryIO, limit: int):
+        self.raw = raw
+        self.limit = limit
+        self.read_bytes = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self.raw.read(len(buffer))
+        self.read_bytes += len(data)
+        if self.read_bytes > self.limit:
+            raise ValueError(f"El archivo supera el tamaño máximo ({self.limit} bytes)")
+        buffer[:len(data)] = data
+        return len(data)
+
+
+class KeywordImporter:
+    """Importar keywords desde archivos txt, csv o json"""
+
+    def __init__(self, db: Session, batch_size: Optional[int] = None):
+        self.db = db
+        self.batch_size = batch_size or settings.KEYWORD_IMPORT_BATCH_SIZE
+
+    # ------------------------------------------------------------------
+    # Lectura
+    # ------------------------------------------------------------------
+
+    def _iter_txt(self, text: io.TextIOBase) -> Iterator[Dict[str, Any]]:
+        for line in text:
+            if line.strip() and not line.lstrip().startswith("#"):
+                yield {"keyword": line}
+
+    def _iter_csv(self, text: io.TextIOBase) -> Iterator[Dict[str, Any]]:
+        reader = csv.reader(text)
+        header = next(reader, None)
+        if header is None:
+            return
+
+        columns = [column.strip().lower() for column in header]
+        keyword_column = next((columns.index(name) for name in KEYWORD_COLUMNS if name in columns), None)
+        if keyword_column is None:
+            # Sin cabecera reconocible: la primera columna es la keyword
+            keyword_column = 0
+            columns = []
+            yield {"keyword": header[0] if header else None}
+
+        def column(row: List[str], name: str) -> Optional[str]:
+            if name in columns:
+                index = columns.index(name)
+                return row[index] if index < len(row) else None
+            return None
+
+        for row in reader:
+            if not row:
+                continue
+            yield {
+                "keyword": row[keyword_column] if keyword_column < len(row) else None,
+                "search_volume": column(row, "search_volume") or column(row, "volume"),
+                "difficulty": column(row, "difficulty"),
+                "category": column(row, "category"),
+                "priority": column(row, "priority"),
+            }
+
+    def _iter_json(self, raw: BinaryIO) -> Iterator[Dict[str, Any]]:
+        # Lista de strings u objetos con "keyword"
+        if ijson is not None:
+            items = ijson.items(raw, "item")
+        else:
+            # Sin ijson el documento se carga entero (acotado por MAX_FILE_SIZE)
+            items = json.load(raw)
+            if not isinstance(items, list):
+                raise ValueError("El JSON debe ser una lista de keywords")
+
+        for item in items:
+            if isinstance(item, dict):
+                yield item
+            else:
+                yield {"keyword": item}
+
+    def iter_rows(self, raw: BinaryIO, file_format: str) -> Iterator[Dict[str, Any]]:
+        """Filas crudas del archivo según su formato"""
+        if file_format == "json":
+            return self._iter_json(raw)
+
+        text = io.TextIOWrapper(
+            io.BufferedReader(raw) if isinstance(raw, io.RawIOBase) else raw,
+            encoding="utf-8-sig", errors="replace", newline=""
+        )
+        if file_format == "csv":
+            return self._iter_csv(text)
+        return self._iter_txt(text)
+
+    # ------------------------------------------------------------------
+    # Escritura
+    # ------------------------------------------------------------------
+
+    def _insert_batch(self, rows: List[Dict[str, Any]]) -> int:
+        """Insertar un bloque ignorando las keywords existentes; devuelve las insertadas"""
+        table = Keyword.__table__
+        dialect = self.db.get_bind().dialect.name
+
+        if dialect in ("postgresql", "sqlite"):
+            insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+            # Una sentencia cacheada y ejecutada en lote (insertmanyvalues);
+            # RETURNING cuenta solo las filas realmente insertadas
+            stmt = (
+                insert(table)
+                .on_conflict_do_nothing(index_elements=[table.c.keyword])
+                .returning(table.c.id)
+            )
+            inserted = len(self.db.execute(stmt, rows).all())
+        else:
+            existing = {
+                row.keyword for row in
+                self.db.query(Keyword.keyword).filter(Keyword.keyword.in_([r["keyword"] for r in rows]))
+            }
+            rows = [row for row in rows if row["keyword"] not in existing]
+            if rows:
+                self.db.execute(table.insert(), rows)
+            inserted = len(rows)
+
+        self.db.commit()
+        return inserted
+
+    @staticmethod
+    def _seekable(raw: BinaryIO) -> BinaryIO:
+        """El archivo se lee dos veces: copiarlo a un temporal si no admite seek()"""
+        if raw.seekable():
+            return raw
+        spooled = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+        reader = _LimitedReader(raw, settings.MAX_FILE_SIZE)
+        while True:
+            chunk = reader.read(64 * 1024)
+            if not chunk:
+                break
+            spooled.write(chunk)
+        spooled.seek(0)
+        return spooled
+
+    def validate(self, raw: BinaryIO, file_format: str) -> int:
+        """
+        Recorrer el archivo entero sin escribir; lanza ValueError si está mal
+        formado o supera MAX_FILE_SIZE. Devuelve el número de filas.
+        """
+        rows = 0
+        try:
+            for _ in self.iter_rows(_LimitedReader(raw, settings.MAX_FILE_SIZE), file_format):
+                rows += 1
+        except _PARSE_ERRORS as e:
+            raise ValueError(f"Archivo mal formado (tras {rows} filas): {str(e)}")
+        return rows
+
+    def import_file(
+        self,
+        raw: BinaryIO,
+        filename: str,
+        category: Optional[str] = None,
+        priority: KeywordPriority = KeywordPriority.MEDIUM
+    ) -> Dict[str, Any]:
+        """
+        Importar un archivo de keywords.
+
+        Args:
+            raw: Archivo binario (p. ej. UploadFile.file)
+            filename: Nombre original; su extensión decide el formato
+            category: Categoría por defecto de las keywords sin categoría
+            priority: Prioridad por defecto
+
+        Returns:
+            Dict con total, inserted, duplicates, invalid y batches
+
+        Raises:
+            ValueError: formato no soportado o archivo mal formado o demasiado
+                grande (en ese caso no se importa ninguna keyword)
+        """
+        file_format = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+        if file_format not in settings.ALLOWED_FILE_TYPES:
+            raise ValueError(
+                f"Formato no soportado: '{file_format}'. Permitidos: {', '.join(settings.ALLOWED_FILE_TYPES)}"
+            )
+
+        started = datetime.utcnow()
+        raw = self._seekable(raw)
+        self.validate(raw, file_format)
+        raw.seek(0)
+
+        reader = _LimitedReader(raw, settings.MAX_FILE_SIZE)
+        totals = {"total": 0, "inserted": 0, "duplicates": 0, "invalid": 0, "batches": 0}
+        batch: Dict[str, Dict[str, Any]] = {}
+
+        def flush() -> None:
+            if not batch:
+                return
+            inserted = self._insert_batch(list(batch.values()))
+            totals["inserted"] += inserted
+            totals["duplicates"] += len(batch) - inserted
+            totals["batches"] += 1
+            batch.clear()
+
+        try:
+            for row in self.iter_rows(reader, file_format):
+                totals["total"] += 1
+                keyword = normalize_keyword(row.get("keyword"))
+                if keyword is None:
+                    totals["invalid"] += 1
+                    continue
+                if keyword in batch:
+                    totals["duplicates"] += 1
+                    continue
+
+                now = datetime.utcnow()
+                batch[keyword] = {
+                    "keyword": keyword,
+                    "status": KeywordStatus.PENDING,
+                    "priority": _to_priority(row.get("priority")) or priority,
+                    "search_volume": _to_int(row.get("search_volume")) or 0,
+                    "difficulty": _to_float(row.get("difficulty")) or 0.0,
+                    "category": (str(row.get("category") or "").strip() or category or None),
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                if len(batch) >= self.batch_size:
+                    flush()
+            flush()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        totals["format"] = file_format
+        totals["seconds"] = round((datetime.utcnow() - started).total_seconds(), 3)
+        logger.info(f"Importación de keywords completada: {totals}")
+        return totals
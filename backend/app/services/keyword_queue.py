@@ -0,0 +1,269 @@
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import literal, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.keyword import Keyword, KeywordStatus
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Estado como literal en el SQL para que el planificador use el índice
+# parcial de keywords pendientes (con un parámetro no puede probarlo)
+_PENDING = literal(KeywordStatus.PENDING, Keyword.status.type, literal_execute=True)
+
+# ============================================================================
+# COLA DE KEYWORDS PARA GENERACIÓN CONCURRENTE
+# ============================================================================
+#
+# Reclamar una keyword la pasa a PROCESSING con un lease (`lease_owner`,
+# `lease_expires_at`) en la misma transacción en que se selecciona, así que
+# dos workers nunca generan la misma. En PostgreSQL FOR UPDATE SKIP LOCKED
+# reparte las filas sin esperas; el UPDATE repite la condición de estado
+# para que tampoco haya duplicados en motores sin SKIP LOCKED. Si un worker
+# muere, su lease caduca y la keyword vuelve a la cola. Las generaciones
+# largas renuevan el lease con un LeaseHeartbeat.
+
+
+class KeywordQueue:
+    """Reclamar, renovar y liberar keywords pendientes de generar"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        # Token de lease de cada keyword reclamada por esta instancia; no se
+        # lee de la fila, que puede haber cambiado si otro worker la retomó
+        self._leases: Dict[int, str] = {}
+
+    def reclaim_expired(self) -> int:
+        """Devolver a PENDING las keywords cuyo lease ha caducado"""
+        reclaimed = self.db.query(Keyword).filter(
+            Keyword.status == KeywordStatus.PROCESSING,
+            Keyword.lease_expires_at < datetime.utcnow()
+        ).update({
+            "status": KeywordStatus.PENDING,
+            "lease_owner": None,
+            "lease_expires_at": None
+        }, synchronize_session=False)
+        self.db.commit()
+        if reclaimed:
+            logger.warning(f"{reclaimed} keywords recuperadas de leases caducados")
+        return reclaimed
+
+    def claim(self, worker_id: str, limit: int = 1, lease_seconds: Optional[int] = None) -> List[Keyword]:
+        """
+        Reclamar las `limit` keywords pendientes de mayor prioridad (y más
+        antiguas). Se liberan con `complete` o `release` de esta misma
+        instancia; las que superen el lease sin renovarse vuelven a la cola.
+        """
+        self.reclaim_expired()
+
+        now = datetime.utcnow()
+        token = f"{worker_id}:{uuid.uuid4().hex[:12]}"
+        lease_seconds = lease_seconds or settings.KEYWORD_LEASE_SECONDS
+
+        try:
+            ids = [row.id for row in self.db.query(Keyword.id).filter(
+                Keyword.status == _PENDING
+            ).order_by(
+                Keyword.priority_rank.desc(),
+                Keyword.created_at.asc()
+            ).limit(limit).with_for_update(skip_locked=True)]
+            if not ids:
+                self.db.rollback()
+                return []
+
+            self.db.query(Keyword).filter(
+                Keyword.id.in_(ids),
+                Keyword.status == KeywordStatus.PENDING
+            ).update({
+                "status": KeywordStatus.PROCESSING,
+                "lease_owner": token,
+                "lease_expires_at": now + timedelta(seconds=lease_seconds)
+            }, synchronize_session=False)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        keywords = self.db.query(Keyword).filter(Keyword.lease_owner == token).order_by(
+            Keyword.priority_rank.desc(),
+            Keyword.created_at.asc()
+        ).all()
+        for keyword in keywords:
+            self._leases[keyword.id] = token
+        return keywords
+
+    def claim_one(self, worker_id: str, lease_seconds: Optional[int] = None) -> Optional[Keyword]:
+        """Reclamar la siguiente keyword disponible"""
+        keywords = self.claim(worker_id, 1, lease_seconds)
+        return keywords[0] if keywords else None
+
+    def claim_keyword(self, keyword_id: int, worker_id: str, lease_seconds: Optional[int] = None) -> Optional[Keyword]:
+        """
+        Reclamar una keyword concreta (lotes, generación manual) sea cual sea
+        su estado. Devuelve None si otro worker tiene un lease vigente sobre ella.
+        """
+        now = datetime.utcnow()
+        token = f"{worker_id}:{uuid.uuid4().hex[:12]}"
+        lease_seconds = lease_seconds or settings.KEYWORD_LEASE_SECONDS
+
+        try:
+            claimed = self.db.query(Keyword).filter(
+                Keyword.id == keyword_id,
+                or_(
+                    Keyword.status != KeywordStatus.PROCESSING,
+                    # PROCESSING sin lease: marcada fuera de la cola
+                    Keyword.lease_expires_at.is_(None),
+                    Keyword.lease_expires_at < now
+                )
+            ).update({
+                "status": KeywordStatus.PROCESSING,
+                "lease_owner": token,
+                "lease_expires_at": now + timedelta(seconds=lease_seconds)
+            }, synchronize_session=False)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        if not claimed:
+            return None
+        keyword = self.db.get(Keyword, keyword_id)
+        self._leases[keyword_id] = token
+        return keyword
+
+    def lease_token(self, keyword: Keyword) -> Optional[str]:
+        """Token del lease que esta instancia tiene sobre la keyword"""
+        return self._leases.get(keyword.id)
+
+    @staticmethod
+    def renew_lease(db: Session, keyword_id: int, token: str, lease_seconds: Optional[int] = None) -> bool:
+        """Extender un lease por su token (sin commit); False si ya no es nuestro"""
+        lease_seconds = lease_seconds or settings.KEYWORD_LEASE_SECONDS
+        return bool(db.query(Keyword).filter(
+            Keyword.id == keyword_id,
+            Keyword.lease_owner == token,
+            Keyword.status == KeywordStatus.PROCESSING
+        ).update({
+            "lease_expires_at": datetime.utcnow() + timedelta(seconds=lease_seconds)
+        }, synchronize_session=False))
+
+    def renew(self, keywords: Iterable[Keyword], lease_seconds: Optional[int] = None) -> int:
+        """Extender el lease de keywords en proceso; devuelve cuántas siguen siendo nuestras"""
+        renewed = 0
+        for keyword in keywords:
+            token = self._leases.get(keyword.id)
+            if token is not None:
+                renewed += self.renew_lease(self.db, keyword.id, token, lease_seconds)
+        self.db.commit()
+        return renewed
+
+    def complete(self, keyword: Keyword) -> bool:
+        """Marcar como usada una keyword reclamada"""
+        return self._finish(keyword, {
+            "status": KeywordStatus.COMPLETED,
+            "used_at": datetime.utcnow()
+        })
+
+    def release(self, keyword: Keyword, failed: bool = False) -> bool:
+        """Devolver la keyword a la cola, o marcarla como fallida"""
+        return self._finish(keyword, {
+            "status": KeywordStatus.FAILED if failed else KeywordStatus.PENDING
+        })
+
+    def _finish(self, keyword: Keyword, values: dict) -> bool:
+        token = self._leases.pop(keyword.id, None)
+        if token is None:
+            raise ValueError(f"La keyword {keyword.id} no fue reclamada por esta cola")
+
+        # Solo si el lease sigue siendo nuestro: otro worker pudo retomarla
+        updated = self.db.query(Keyword).filter(
+            Keyword.id == keyword.id,
+            Keyword.lease_owner == token,
+            Keyword.status == KeywordStatus.PROCESSING
+        ).update({
+            **values,
+            "lease_owner": None,
+            "lease_expires_at": None
+        }, synchronize_session=False)
+        self.db.commit()
+        if not updated:
+            logger.warning(f"Lease perdido para la keyword {keyword.id}")
+        return bool(updated)
+
+
+class LeaseLostError(RuntimeError):
+    """Otro worker se ha quedado el trabajo: el resultado no debe registrarse"""
+
+
+class LeaseHeartbeat:
+    """
+    Renovar leases en un hilo mientras dura una generación.
+
+    `renew(db)` recibe una sesión propia del hilo (la del trabajo no es
+    thread-safe) y devuelve False si algún lease se ha perdido; desde ese
+    momento `lost` es True y `check()` lanza LeaseLostError, que el trabajo
+    consulta antes de guardar resultados.
+    """
+
+    def __init__(
+        self,
+        renew: Callable[[Session], bool],
+        interval: Optional[float] = None,
+        session_factory: Optional[Callable[[], Session]] = None
+    ):
+        self.renew = renew
+        # Un tercio del lease: dos renovaciones fallidas aún no lo pierden
+        self.interval = interval or settings.KEYWORD_LEASE_SECONDS / 3
+        self.session_factory = session_factory
+        self._stop = threading.Event()
+        self._lost = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def lost(self) -> bool:
+        return self._lost.is_set()
+
+    def check(self) -> None:
+        if self.lost:
+            raise LeaseLostError("Lease perdido durante la generación")
+
+    def beat(self) -> bool:
+        """Renovar ahora; False si algún lease se ha perdido"""
+        if self.session_factory is None:
+            from app.core.database import SessionLocal
+            self.session_factory = SessionLocal
+        db = self.session_factory()
+        try:
+            renewed = self.renew(db)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            # Error transitorio: se reintenta en el siguiente latido
+            logger.warning(f"No se pudo renovar el lease: {str(e)}")
+            return True
+        finally:
+            db.close()
+        if not renewed:
+            self._lost.set()
+        return renewed
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            if not self.beat():
+                logger.warning("Lease perdido: la generación no registrará su resultado")
+                return
+
+    def __enter__(self) -> "LeaseHeartbeat":
+        self._thread = threading.Thread(target=self._run, name="lease-heartbeat", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
@@ -0,0 +1,299 @@
+import hashlib
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import Integer, case, cast, delete, func, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.landing_page import LandingAnalytics, LandingConversionKey
+from app.utils.hyperloglog import HyperLogLog
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# ============================================================================
+# ANALYTICS DIARIOS DE LANDINGS
+# ============================================================================
+#
+# Hay una fila por (landing, día), con `date` a las 00:00 UTC y una
+# restricción única. Los contadores (vistas, conversiones) se suman con un
+# único INSERT ... ON CONFLICT DO UPDATE: la primera vista del día crea la
+# fila y las demás la incrementan en SQL, sin leerla ni bloquearla antes.
+#
+# Lo que no se puede sumar en SQL (el sketch HyperLogLog de visitantes y
+# los desgloses JSON por fuente, dispositivo y navegador) se acumula en
+# memoria por (landing, día): cada vista solo calcula el registro y el rango
+# de su visitante (O(1)) e incrementa sus contadores. El buffer se vuelca
+# cada LANDING_ANALYTICS_FLUSH_SECONDS o cada LANDING_ANALYTICS_FLUSH_VIEWS
+# vistas, con una lectura, combinación y escritura por landing y día. Las
+# vistas aún no volcadas se pierden si el proceso muere sin pasar por su
+# cierre.
+
+DayKey = Tuple[int, date]
+
+BREAKDOWN_COLUMNS = ("traffic_sources", "device_types", "browser_stats")
+
+
+def day_start(day: date) -> datetime:
+    """Valor de `LandingAnalytics.date` de un día"""
+    return datetime.combine(day, datetime.min.time())
+
+
+def upsert_daily_analytics(
+    db: Session,
+    landing_id: int,
+    day: date,
+    extra: Optional[Dict[str, Any]] = None,
+    **increments: int
+) -> None:
+    """
+    Sumar `increments` (columna=delta) a la fila del día, creándola si no
+    existe. `extra` son expresiones adicionales para la fila ya existente,
+    evaluadas con los valores anteriores al incremento.
+    """
+    table = LandingAnalytics.__table__
+    start = day_start(day)
+    set_ = {column: table.c[column] + delta for column, delta in increments.items()}
+    set_.update(extra or {})
+    set_["updated_at"] = func.now()
+    values = dict(landing_page_id=landing_id, date=start, **increments)
+
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        db.execute(insert(table).values(**values).on_conflict_do_update(
+            index_elements=[table.c.landing_page_id, table.c.date],
+            set_=set_
+        ))
+        return
+
+    where = (table.c.landing_page_id == landing_id) & (table.c.date == start)
+    if db.execute(update(table).where(where).values(set_)).rowcount:
+        return
+    try:
+        with db.begin_nested():
+            db.execute(table.insert().values(**values))
+    except IntegrityError:
+        # Otra transacción creó la fila entre medias
+        db.execute(update(table).where(where).values(set_))
+
+
+def conversion_rate_after_increment():
+    """Tasa de conversión del día (0-100) tras sumar una conversión"""
+    table = LandingAnalytics.__table__
+    conversions = func.coalesce(table.c.conversions, 0) + 1
+    return case(
+        (table.c.page_views > 0, cast(func.round(conversions * 100.0 / table.c.page_views), Integer)),
+        else_=table.c.conversion_rate
+    )
+
+
+def claim_conversion(db: Session, landing_id: int, visitor_id: str, window_seconds: int) -> bool:
+    """
+    Reservar la conversión de un visitante en una landing: True si no
+    había otra contada en los últimos `window_seconds`.
+
+    La clave única (landing, visitante) la decide la base de datos, así que
+    la regla es exacta entre procesos y réplicas. Va en la transacción del
+    incremento: si este falla, la clave tampoco queda reservada.
+    """
+    table = LandingConversionKey.__table__
+    now = datetime.utcnow()
+    cutoff = now - timedelta(seconds=window_seconds)
+    visitor_hash = hashlib.sha256(visitor_id.encode("utf-8")).hexdigest()
+    key = (table.c.landing_page_id == landing_id) & (table.c.visitor_hash == visitor_hash)
+
+    # Las claves caducadas de la landing ya no deduplican nada
+    db.execute(delete(table).where(
+        table.c.landing_page_id == landing_id,
+        table.c.counted_at < cutoff
+    ))
+
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        # Si la clave existe solo se renueva cuando ya caducó; si no, 0 filas
+        result = db.execute(insert(table).values(
+            landing_page_id=landing_id, visitor_hash=visitor_hash, counted_at=now
+        ).on_conflict_do_update(
+            index_elements=[table.c.landing_page_id, table.c.visitor_hash],
+            set_={"counted_at": now},
+            where=table.c.counted_at < cutoff
+        ))
+        return result.rowcount > 0
+
+    if db.execute(update(table).where(key, table.c.counted_at < cutoff).values(counted_at=now)).rowcount:
+        return True
+    try:
+        with db.begin_nested():
+            db.execute(table.insert().values(
+                landing_page_id=landing_id, visitor_hash=visitor_hash, counted_at=now
+            ))
+        return True
+    except IntegrityError:
+        # Ya existe y sigue dentro de la ventana
+        return False
+
+
+class _PendingDay:
+    """Actualizaciones acumuladas de una landing en un día"""
+
+    __slots__ = ("registers", "breakdowns")
+
+    def __init__(self):
+        self.registers: Dict[int, int] = {}
+        self.breakdowns: Dict[str, Dict[str, int]] = {column: {} for column in BREAKDOWN_COLUMNS}
+
+    def add_register(self, index: int, rank: int) -> None:
+        if rank > self.registers.get(index, 0):
+            self.registers[index] = rank
+
+    def merge(self, other: "_PendingDay") -> None:
+        for index, rank in other.registers.items():
+            self.add_register(index, rank)
+        for column, counters in other.breakdowns.items():
+            mine = self.breakdowns[column]
+            for key, count in counters.items():
+                mine[key] = mine.get(key, 0) + count
+
+
+class LandingViewBuffer:
+    """Sketch de visitantes y desgloses de las vistas pendientes de volcar"""
+
+    def __init__(self, flush_seconds: Optional[float] = None, flush_views: Optional[int] = None):
+        self.flush_seconds = settings.LANDING_ANALYTICS_FLUSH_SECONDS if flush_seconds is None else flush_seconds
+        self.flush_views = settings.LANDING_ANALYTICS_FLUSH_VIEWS if flush_views is None else flush_views
+        self._pending: Dict[DayKey, _PendingDay] = {}
+        self._views = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def add(
+        self,
+        landing_id: int,
+        day: date,
+        visitor_id: Optional[str] = None,
+        breakdowns: Optional[Dict[str, str]] = None
+    ) -> None:
+        """
+        Anotar una vista: su visitante y sus valores de desglose
+        (p. ej. {"traffic_sources": "direct", "device_types": "mobile"})
+        """
+        position = HyperLogLog.position(visitor_id) if visitor_id else None
+        with self._lock:
+            pending = self._pending.get((landing_id, day))
+            if pending is None:
+                pending = self._pending[(landing_id, day)] = _PendingDay()
+            if position is not None:
+                pending.add_register(*position)
+            for column, key in (breakdowns or {}).items():
+                counters = pending.breakdowns[column]
+                counters[key] = counters.get(key, 0) + 1
+            self._views += 1
+
+    def due(self) -> bool:
+        """Si toca volcar (por tiempo o por número de vistas)"""
+        with self._lock:
+            if not self._pending:
+                return False
+            return (
+                self._views >= self.flush_views
+                or time.monotonic() - self._last_flush >= self.flush_seconds
+            )
+
+    def _drain(self) -> Dict[DayKey, _PendingDay]:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._views = 0
+            self._last_flush = time.monotonic()
+            return pending
+
+    def _restore(self, pending: Dict[DayKey, _PendingDay]) -> None:
+        """Devolver al buffer lo que no se pudo volcar"""
+        with self._lock:
+            for key, day in pending.items():
+                self._pending.setdefault(key, _PendingDay()).merge(day)
+
+    def flush(self, db: Session) -> int:
+        """
+        Combinar las actualizaciones pendientes con las filas de cada día.
+
+        Cada fila se bloquea (FOR UPDATE en PostgreSQL) solo durante su
+        combinación, una vez por volcado. Devuelve cuántas filas se
+        actualizaron; si falla, las actualizaciones vuelven al buffer.
+        """
+        pending = self._drain()
+        if not pending:
+            return 0
+
+        try:
+            for (landing_id, day), updates in sorted(pending.items()):
+                analytics = _locked_daily_row(db, landing_id, day)
+
+                sketch = HyperLogLog.from_bytes(analytics.visitor_sketch)
+                changed = False
+                for index, rank in updates.registers.items():
+                    changed = sketch.apply(index, rank) or changed
+                if changed:
+                    analytics.visitor_sketch = sketch.to_bytes()
+                    analytics.unique_visitors = sketch.count()
+
+                for column, counters in updates.breakdowns.items():
+                    if counters:
+                        # Reasignar el dict para que SQLAlchemy detecte el cambio en la columna JSON
+                        merged = dict(getattr(analytics, column) or {})
+                        for key, count in counters.items():
+                            merged[key] = merged.get(key, 0) + count
+                        setattr(analytics, column, merged)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            self._restore(pending)
+            logger.error(f"Error volcando las vistas de landings: {str(e)}")
+            raise
+        return len(pending)
+
+    def flush_if_due(self, db: Session) -> int:
+        """Volcar si toca; los errores solo se registran (la vista ya está contada)"""
+        if not self.due():
+            return 0
+        try:
+            return self.flush(db)
+        except Exception:
+            return 0
+
+
+def _locked_daily_row(db: Session, landing_id: int, day: date) -> LandingAnalytics:
+    """Fila de analytics de la landing en `day` (creada si falta), bloqueada hasta el commit"""
+    start = day_start(day)
+    query = db.query(LandingAnalytics).filter(
+        LandingAnalytics.landing_page_id == landing_id,
+        LandingAnalytics.date == start
+    ).with_for_update()
+    analytics = query.first()
+    if analytics is None:
+        upsert_daily_analytics(db, landing_id, day)
+        analytics = query.one()
+    return analytics
+
+
+# Buffer del proceso (cada worker de la API tiene el suyo)
+landing_view_buffer = LandingViewBuffer()
+
+
+def flush_landing_views() -> None:
+    """Volcar las vistas pendientes al cerrar el proceso"""
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        landing_view_buffer.flush(db)
+    except Exception:
+        pass  # Ya registrado en flush()
+    finally:
+        db.close()
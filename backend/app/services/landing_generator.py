@@ -1,8 +1,13 @@
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from sqlalchemy.orm import Session
 import json
 import re
 from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemLoader, Template, select_autoescape
+from markupsafe import Markup
 
 from app.models.user import User
 from app.models.landing_page import LandingPage
@@ -21,6 +26,54 @@ try:
 except ImportError:
     requests = None
 
+# ============================================================================
+# RENDERIZADO DE LANDINGS
+# ============================================================================
+#
+# La página y el CSS del tema son plantillas Jinja (app/templates/landing)
+# compiladas una vez por proceso. El CSS solo depende de la paleta de
+# colores, así que se genera una vez por paleta y se reutiliza entre
+# landings; el HTML se renderiza con el CSS ya hecho.
+
+LANDING_TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates"
+
+DEFAULT_COLORS = {
+    "primary": "#4F46E5",
+    "secondary": "#7C3AED",
+    "accent": "#F59E0B",
+    "text": "#1F2937",
+    "bg": "#F9FAFB",
+    "bg_secondary": "#F3F4F6"
+}
+PALETTE_KEYS = tuple(DEFAULT_COLORS)
+
+_landing_env = Environment(
+    loader=FileSystemLoader(str(LANDING_TEMPLATES_DIR)),
+    autoescape=select_autoescape(['html', 'xml']),
+    trim_blocks=True,
+    lstrip_blocks=True,
+    auto_reload=False
+)
+
+
+@lru_cache(maxsize=None)
+def _get_landing_template(name: str) -> Template:
+    """Plantilla compilada (se carga y compila en el primer uso del proceso)"""
+    return _landing_env.get_template(name)
+
+
+def theme_palette(content_data: Dict[str, Any]) -> Tuple[str, ...]:
+    """Paleta del contenido generado, completada con los colores por defecto"""
+    colors = content_data.get('custom_colors') or {}
+    return tuple(str(colors.get(key) or DEFAULT_COLORS[key]) for key in PALETTE_KEYS)
+
+
+@lru_cache(maxsize=256)
+def render_theme_css(palette: Tuple[str, ...]) -> str:
+    """CSS del tema para una paleta (memoizado: las landings con la misma paleta lo comparten)"""
+    return _get_landing_template("landing/theme.css").render(colors=dict(zip(PALETTE_KEYS, palette)))
+
+
 class LandingPageGenerator:
     """
     Generador de landing pages optimizadas con IA
@@ -103,9 +156,8 @@ class LandingPageGenerator:
             theme_category=theme_category
         )
         
-        # Generar CSS optimizado
-        print(f"🎨 Generando CSS optimizado para tema: {theme_category}")
-        css_content = self._generate_optimized_css(theme_category)
+        # CSS del tema (el mismo que va embebido en el HTML; memoizado por paleta)
+        css_content = self._generate_optimized_css(content_data)
         
         # Generar JavaScript mínimo
         print(f"⚡ Generando JavaScript funcional...")
@@ -548,220 +600,18 @@ Formato de respuesta en JSON:
         clean_phone = re.sub(r'[^0-9+]', '', phone_number)
         whatsapp_url = f"https://wa.me/{clean_phone.replace('+', '')}"
         
-        # Generar CSS optimizado con colores personalizados
-        css_content = self._generate_optimized_css(content_data)
-        
-        # Generar separadores SVG si están habilitados
+        # Separador SVG (el mismo marcado entre todas las secciones)
         separator_svg = self._generate_separator_svg(separator_style) if include_separators else ""
         
-        # Construir navegación responsiva
-        nav_class = "responsive-nav" if responsive_menu else "standard-nav"
-        
-        # Obtener CTAs dinámicamente
-        cta_buttons = content_data.get('cta_buttons', ['Contáctanos ahora', 'Solicita información'])
-        
-        # Construir HTML completo
-        html = f"""
-<!DOCTYPE html>
-<html lang="es">
-<head>
-  <meta charset="UTF-8">
-  <meta name="viewport" content="width=device-width, initial-scale=1.0">
-  <meta name="description" content="{content_data['meta_description']}">
-  <meta name="robots" content="index, follow">
-  <title>{content_data['seo_title']}</title>
-  <style>
-{css_content}
-  </style>
-</head>
-<body>
-
-  <!-- Hero Section -->
-  <section class="hero">
-    <div class="container">
-      <h1>{content_data['title']}</h1>
-      <p class="hook">{content_data['hook_question']}</p>
-      <p class="intro">{content_data['intro_text']}</p>
-      <a href="{whatsapp_url}" class="cta cta-primary" target="_blank">{cta_buttons[0]}</a>
-    </div>
-  </section>
-
-  {separator_svg}
-
-  <!-- Servicios Section -->
-  <section id="servicios">
-    <div class="container">
-      <h2>Nuestros Servicios</h2>
-      <div class="benefits-grid">
-"""
-        
-        # Agregar servicios/beneficios dinámicamente
-        for benefit in content_data['benefits']:
-            html += f"""
-        <div class="benefit-item">
-          <div class="benefit-icon">✨</div>
-          <h3>{benefit}</h3>
-        </div>
-"""
-        
-        html += "      </div>\n    </div>\n  </section>\n\n"
-        
-        # Agregar slider de categorías si está habilitado
-        if include_sliders and content_data.get('slider_categories'):
-            html += f"""
-  {separator_svg}
-
-  <!-- Slider de Categorías -->
-  <section class="slider-section">
-    <div class="container">
-      <h2>Especialidades</h2>
-      <div class="slider-container">
-"""
-            for category in content_data['slider_categories']:
-                html += f'        <div class="slider-item">{category}</div>\n'
-            
-            html += "      </div>\n    </div>\n  </section>\n\n"
-        
-        # Agregar párrafos informativos
-        if content_data.get('info_paragraphs'):
-            html += f"""
-  {separator_svg}
-
-  <!-- Información Adicional -->
-  <section class="info-section">
-    <div class="container">
-      <h2>¿Por qué elegirnos?</h2>
-"""
-            for paragraph in content_data['info_paragraphs']:
-                html += f"      <p>{paragraph}</p>\n"
-            
-            html += "    </div>\n  </section>\n\n"
-        
-        # Sección Quién Soy
-        html += f"""
-  {separator_svg}
-
-  <!-- Quién Soy -->
-  <section class="about-section">
-    <div class="container">
-      <h2>Quién Soy</h2>
-      <p>{content_data['about_me']}</p>
-      
-      <!-- Habilidades -->
-      <div class="skills-grid">
-"""
-        
-        # Agregar habilidades
-        for skill in content_data.get('skills', []):
-            html += f"""
-        <div class="skill-item">
-          <div class="skill-icon">🎯</div>
-          <h4>{skill}</h4>
-        </div>
-"""
-        
-        html += "      </div>\n    </div>\n  </section>\n\n"
-        
-        # CTA Section intermedia
-        if len(cta_buttons) > 1:
-            html += f"""
-  {separator_svg}
-
-  <!-- CTA Intermedia -->
-  <section class="cta-section">
-    <div class="container">
-      <h2>¡No esperes más!</h2>
-      <a href="{whatsapp_url}" class="cta cta-secondary" target="_blank">{cta_buttons[1]}</a>
-    </div>
-  </section>
-
-"""
-        
-        # Testimonios
-        if content_data.get('testimonials'):
-            html += f"""
-  {separator_svg}
-
-  <!-- Testimonios -->
-  <section class="testimonials">
-    <div class="container">
-      <h2>Lo que dicen nuestros clientes</h2>
-      <div class="testimonials-grid">
-"""
-            
-            for testimonial in content_data['testimonials']:
-                stars = "⭐" * testimonial.get('rating', 5)
-                html += f"""
-        <div class="testimonial-item">
-          <div class="stars">{stars}</div>
-          <p>"{testimonial['text']}"</p>
-          <cite>- {testimonial['name']}</cite>
-        </div>
-"""
-            
-            html += "      </div>\n    </div>\n  </section>\n\n"
-        
-        # CTAs adicionales si hay más de 2
-        for i, cta in enumerate(cta_buttons[2:], 3):
-            html += f"""
-  {separator_svg}
-
-  <!-- CTA {i} -->
-  <section class="cta-section">
-    <div class="container">
-      <h2>¡Actúa ahora!</h2>
-      <a href="{whatsapp_url}" class="cta cta-primary" target="_blank">{cta}</a>
-    </div>
-  </section>
-
-"""
-        
-        # Servicios adicionales si existen
-        if content_data.get('additional_services'):
-            html += f"""
-  {separator_svg}
-
-  <!-- Servicios Adicionales -->
-  <section class="additional-services">
-    <div class="container">
-      <h2>Servicios Adicionales</h2>
-      <ul>
-"""
-            for service in content_data['additional_services']:
-                html += f"        <li>{service}</li>\n"
-            
-            html += "      </ul>\n    </div>\n  </section>\n\n"
-        
-        # Contacto y Footer
-        html += f"""
-  {separator_svg}
-
-  <!-- Contacto -->
-  <section id="contacto">
-    <div class="container">
-      <h2>Contáctanos</h2>
-      <p>WhatsApp: {phone_number}</p>
-      <p>Email: contacto@tuweb.com</p>
-      <a href="{whatsapp_url}" class="cta cta-primary" target="_blank">{cta_buttons[0]}</a>
-    </div>
-  </section>
-
-  <!-- WhatsApp Fixed Button -->
-  <a href="{whatsapp_url}" class="whatsapp-fixed" target="_blank">
-    📱
-  </a>
-
-  <footer>
-    <div class="container">
-      <p>&copy; 2025 Tu Marca. Todos los derechos reservados.</p>
-    </div>
-  </footer>
-
-</body>
-</html>
-"""
-        
-        return html
+        return _get_landing_template("landing/page.html").render(
+            page=content_data,
+            css=Markup(self._generate_optimized_css(content_data)),
+            separator=Markup(separator_svg),
+            whatsapp_url=whatsapp_url,
+            phone_number=phone_number,
+            cta_buttons=content_data.get('cta_buttons') or ['Contáctanos ahora', 'Solicita información'],
+            include_sliders=include_sliders
+        )
     
     def _generate_separator_svg(self, style: str) -> str:
         """
@@ -802,647 +652,7 @@ Formato de respuesta en JSON:
         """
         Genera CSS optimizado usando los colores personalizados de la IA
         """
-        
-        # Usar colores personalizados de la IA o fallback
-        if 'custom_colors' in content_data and content_data['custom_colors']:
-            colors = content_data['custom_colors']
-        else:
-            # Fallback a colores por defecto
-            colors = {
-                "primary": "#4F46E5",
-                "secondary": "#7C3AED",
-                "accent": "#F59E0B",
-                "text": "#1F2937",
-                "bg": "#F9FAFB",
-                "bg_secondary": "#F3F4F6"
-            }
-        
-        # Asegurar que todos los colores necesarios estén presentes
-        default_colors = {
-            "primary": "#4F46E5",
-            "secondary": "#7C3AED",
-            "accent": "#F59E0B",
-            "text": "#1F2937",
-            "bg": "#F9FAFB",
-            "bg_secondary": "#F3F4F6"
-        }
-        
-        for key, default_value in default_colors.items():
-            if key not in colors:
-                colors[key] = default_value
-        
-        # Los colores ya están configurados arriba con los valores personalizados de la IA
-        
-        return f"""
-/* Reset y base */
-* {{
-    margin: 0;
-    padding: 0;
-    box-sizing: border-box;
-}}
-
-body {{
-    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-    line-height: 1.6;
-    color: {colors['text']};
-    background-color: {colors['bg']};
-    margin: 0;
-    padding: 0;
-}}
-
-/* Container */
-.container {{
-    max-width: 1200px;
-    margin: 0 auto;
-    padding: 0 1rem;
-}}
-
-/* Hero Section */
-.hero {{
-    background: linear-gradient(135deg, {colors['primary']}, {colors['secondary']});
-    color: white;
-    padding: 4rem 0;
-    text-align: center;
-}}
-
-.hero h1 {{
-    font-size: 3rem;
-    margin-bottom: 1rem;
-    font-weight: 700;
-}}
-
-.hero .hook {{
-    font-size: 1.5rem;
-    margin-bottom: 1.5rem;
-    opacity: 0.9;
-}}
-
-.hero .intro {{
-    font-size: 1.1rem;
-    max-width: 600px;
-    margin: 0 auto 2rem;
-    opacity: 0.9;
-}}
-
-/* Sections */
-section {{
-    padding: 4rem 0;
-}}
-
-section h2 {{
-    font-size: 2.5rem;
-    text-align: center;
-    margin-bottom: 3rem;
-    color: {colors['primary']};
-}}
-
-section p {{
-    margin-bottom: 1rem;
-    line-height: 1.6;
-}}
-
-/* Benefits Grid */
-.benefits-grid {{
-    display: grid;
-    grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-    gap: 2rem;
-    margin-top: 2rem;
-}}
-
-.benefit-item {{
-    background: white;
-    padding: 2rem;
-    border-radius: 12px;
-    box-shadow: 0 4px 20px rgba(0,0,0,0.1);
-    text-align: center;
-    transition: transform 0.3s ease;
-}}
-
-.benefit-item:hover {{
-    transform: translateY(-5px);
-}}
-
-.benefit-icon {{
-    font-size: 2rem;
-    color: {colors['accent']};
-    margin-bottom: 1rem;
-}}
-
-.benefit-item h3 {{
-    color: {colors['primary']};
-    margin-bottom: 1rem;
-}}
-
-/* CTA Buttons */
-.cta {{
-    display: inline-block;
-    padding: 1rem 2rem;
-    text-decoration: none;
-    border-radius: 8px;
-    font-weight: bold;
-    margin: 0.5rem;
-    transition: all 0.3s ease;
-    cursor: pointer;
-}}
-
-.cta-primary {{
-    background: {colors['primary']};
-    color: white;
-    font-size: 1.1rem;
-    padding: 16px 32px;
-    margin-top: 2rem;
-}}
-
-.cta-secondary {{
-    background: {colors['secondary']};
-    color: white;
-}}
-
-.cta:hover, .cta-primary:hover, .cta-secondary:hover {{
-    transform: translateY(-2px);
-    box-shadow: 0 4px 15px rgba(0,0,0,0.2);
-    color: white;
-    text-decoration: none;
-}}
-
-/* CTA Section */
-.cta-section {{
-    background: {colors.get('bg_secondary', colors['bg'])};
-    text-align: center;
-}}
-
-/* Skills Grid */
-.skills-grid {{
-    display: grid;
-    grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-    gap: 1.5rem;
-    margin-top: 2rem;
-}}
-
-.skill-item {{
-    background: white;
-    padding: 1.5rem;
-    border-radius: 8px;
-    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-    text-align: center;
-}}
-
-.skill-icon {{
-    font-size: 1.5rem;
-    color: {colors['accent']};
-    margin-bottom: 0.5rem;
-}}
-
-/* Slider */
-.slider-section {{
-    background: {colors.get('bg_secondary', colors['bg'])};
-}}
-
-.slider-container {{
-    display: flex;
-    gap: 1rem;
-    overflow-x: auto;
-    padding: 1rem 0;
-}}
-
-.slider-item {{
-    background: white;
-    padding: 1rem 2rem;
-    border-radius: 8px;
-    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-    white-space: nowrap;
-    min-width: 200px;
-    text-align: center;
-    font-weight: 600;
-    color: {colors['primary']};
-}}
-
-/* Testimonials */
-.testimonials {{
-    background: {colors.get('bg_secondary', colors['bg'])};
-}}
-
-.testimonials-grid {{
-    display: grid;
-    grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
-    gap: 2rem;
-}}
-
-.testimonial-item {{
-    background: white;
-    padding: 2rem;
-    border-radius: 12px;
-    box-shadow: 0 4px 20px rgba(0,0,0,0.1);
-}}
-
-.stars {{
-    color: {colors['accent']};
-    font-size: 1.2rem;
-    margin-bottom: 1rem;
-}}
-
-.testimonial-item cite {{
-    display: block;
-    margin-top: 1rem;
-    font-style: normal;
-    font-weight: 600;
-    color: {colors['primary']};
-}}
-
-/* Separadores */
-.separator {{
-    width: 100%;
-    overflow: hidden;
-    line-height: 0;
-}}
-
-.separator svg {{
-    position: relative;
-    display: block;
-    width: calc(100% + 1.3px);
-    height: 60px;
-    fill: {colors['primary']};
-}}
-
-/* Additional Services */
-.additional-services ul {{
-    list-style: none;
-    padding: 0;
-    max-width: 600px;
-    margin: 0 auto;
-}}
-
-.additional-services li {{
-    background: white;
-    padding: 1rem;
-    margin-bottom: 0.5rem;
-    border-radius: 8px;
-    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-    border-left: 4px solid {colors['primary']};
-}}
-
-/* Info Section */
-.info-section {{
-    background: white;
-}}
-
-.info-section p {{
-    max-width: 800px;
-    margin: 0 auto 1.5rem;
-    text-align: center;
-    font-size: 1.1rem;
-}}
-
-/* About Section */
-.about-section {{
-    background: {colors.get('bg_secondary', colors['bg'])};
-}}
-
-.about-section p {{
-    max-width: 800px;
-    margin: 0 auto 2rem;
-    text-align: center;
-    font-size: 1.1rem;
-}}
-
-/* Footer */
-footer {{
-    background: #1F2937;
-    color: white;
-    text-align: center;
-    padding: 2rem 0;
-}}
-
-footer a {{
-    color: {colors['accent']};
-    text-decoration: none;
-}}
-
-/* WhatsApp Fixed Button */
-.whatsapp-fixed {{
-    position: fixed;
-    bottom: 20px;
-    right: 20px;
-    background: #25D366;
-    color: white;
-    width: 60px;
-    height: 60px;
-    border-radius: 50%;
-    display: flex;
-    align-items: center;
-    justify-content: center;
-    box-shadow: 0 4px 20px rgba(37, 211, 102, 0.4);
-    z-index: 1000;
-    transition: all 0.3s ease;
-    text-decoration: none;
-    font-size: 1.5rem;
-}}
-
-.whatsapp-fixed:hover {{
-    transform: scale(1.1);
-    box-shadow: 0 6px 25px rgba(37, 211, 102, 0.6);
-    color: white;
-    text-decoration: none;
-}}
-
-/* Responsive */
-@media (max-width: 768px) {{
-    .hero h1 {{
-        font-size: 2rem;
-    }}
-    
-    .hero .hook {{
-        font-size: 1.2rem;
-    }}
-    
-    section h2 {{
-        font-size: 2rem;
-    }}
-    
-    .container {{
-        padding: 0 15px;
-    }}
-    
-    .benefits-grid, .testimonials-grid {{
-        grid-template-columns: 1fr;
-    }}
-    
-    .skills-grid {{
-        grid-template-columns: repeat(auto-fit, minmax(150px, 1fr));
-    }}
-    
-    .slider-container {{
-        justify-content: flex-start;
-    }}
-}}
-
-/* Servicios legacy support */
-#servicios ul {{
-    list-style: none;
-    padding: 0;
-}}
-
-#servicios li {{
-    background: white;
-    border-left: 4px solid {colors['primary']};
-    padding: 1rem;
-    margin-bottom: 0.5rem;
-    border-radius: 4px;
-}}
-
-/* CTA Button */
-.cta {{
-    display: inline-block;
-    background: {colors['primary']};
-    color: white;
-    padding: 1rem 2rem;
-    text-decoration: none;
-    border-radius: 8px;
-    font-weight: bold;
-    margin-top: 1rem;
-    transition: background-color 0.3s ease;
-}}
-
-.cta:hover {{
-    background: {colors['secondary']};
-    color: white;
-    text-decoration: none;
-}}
-
-/* Footer */
-footer {{
-    background: {colors['text']};
-    color: white;
-    text-align: center;
-    padding: 2rem 0;
-    margin-top: 3rem;
-}}
-
-/* Responsive */
-@media (max-width: 768px) {{
-    header h1 {{
-        font-size: 1.5rem;
-    }}
-    
-    main {{
-        padding: 1rem;
-    }}
-    
-    nav a {{
-        display: block;
-        margin: 0.5rem 0;
-    }}
-}}
-
-.cta-primary {{
-    background: {colors['primary']};
-    color: white;
-    font-size: 1.1rem;
-    padding: 16px 32px;
-    margin-top: 2rem;
-}}
-
-.cta-secondary {{
-    background: {colors['secondary']};
-    color: white;
-}}
-
-.cta-button:hover, .cta-primary:hover, .cta-secondary:hover {{
-    transform: translateY(-2px);
-    box-shadow: 0 4px 15px rgba(0,0,0,0.2);
-}}
-
-/* Hero Section */
-.hero {{
-    background: linear-gradient(135deg, {colors['primary']}, {colors['secondary']});
-    color: white;
-    padding: 4rem 0;
-    text-align: center;
-}}
-
-.hero h1 {{
-    font-size: 3rem;
-    margin-bottom: 1rem;
-    font-weight: 700;
-}}
-
-.hero .hook {{
-    font-size: 1.5rem;
-    margin-bottom: 1.5rem;
-    opacity: 0.9;
-}}
-
-.hero .intro {{
-    font-size: 1.1rem;
-    max-width: 600px;
-    margin: 0 auto 2rem;
-    opacity: 0.9;
-}}
-
-/* Sections */
-section {{
-    padding: 4rem 0;
-}}
-
-section h2 {{
-    font-size: 2.5rem;
-    text-align: center;
-    margin-bottom: 3rem;
-    color: {colors['primary']};
-}}
-
-/* Benefits Grid */
-.benefits-grid {{
-    display: grid;
-    grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-    gap: 2rem;
-    margin-top: 2rem;
-}}
-
-.benefit-item {{
-    background: white;
-    padding: 2rem;
-    border-radius: 12px;
-    box-shadow: 0 4px 20px rgba(0,0,0,0.1);
-    text-align: center;
-    transition: transform 0.3s ease;
-}}
-
-.benefit-item:hover {{
-    transform: translateY(-5px);
-}}
-
-.benefit-icon {{
-    font-size: 2rem;
-    color: {colors['accent']};
-    margin-bottom: 1rem;
-}}
-
-.benefit-item h3 {{
-    color: {colors['primary']};
-    margin-bottom: 1rem;
-}}
-
-/* CTA Section */
-.cta-section {{
-    background: {colors['bg']};
-    text-align: center;
-}}
-
-/* Skills Grid */
-.skills-grid {{
-    display: grid;
-    grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-    gap: 1.5rem;
-}}
-
-.skill-item {{
-    background: white;
-    padding: 1.5rem;
-    border-radius: 8px;
-    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-    text-align: center;
-}}
-
-.skill-icon {{
-    font-size: 1.5rem;
-    color: {colors['accent']};
-    margin-bottom: 0.5rem;
-}}
-
-/* Testimonials */
-.testimonials {{
-    background: {colors['bg']};
-}}
-
-.testimonials-grid {{
-    display: grid;
-    grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
-    gap: 2rem;
-}}
-
-.testimonial-item {{
-    background: white;
-    padding: 2rem;
-    border-radius: 12px;
-    box-shadow: 0 4px 20px rgba(0,0,0,0.1);
-}}
-
-.stars {{
-    color: {colors['accent']};
-    font-size: 1.2rem;
-    margin-bottom: 1rem;
-}}
-
-.testimonial-item cite {{
-    display: block;
-    margin-top: 1rem;
-    font-style: normal;
-    font-weight: 600;
-    color: {colors['primary']};
-}}
-
-/* Footer */
-footer {{
-    background: {colors['text']};
-    color: white;
-    text-align: center;
-    padding: 2rem 0;
-}}
-
-footer a {{
-    color: {colors['accent']};
-    text-decoration: none;
-}}
-
-/* WhatsApp Fixed Button */
-.whatsapp-fixed {{
-    position: fixed;
-    bottom: 20px;
-    right: 20px;
-    background: #25D366;
-    color: white;
-    width: 60px;
-    height: 60px;
-    border-radius: 50%;
-    display: flex;
-    align-items: center;
-    justify-content: center;
-    box-shadow: 0 4px 20px rgba(37, 211, 102, 0.4);
-    z-index: 1000;
-    transition: all 0.3s ease;
-    text-decoration: none;
-}}
-
-.whatsapp-fixed:hover {{
-    transform: scale(1.1);
-    box-shadow: 0 6px 25px rgba(37, 211, 102, 0.6);
-}}
-
-/* Responsive */
-@media (max-width: 768px) {{
-    .hero h1 {{
-        font-size: 2rem;
-    }}
-    
-    .hero .hook {{
-        font-size: 1.2rem;
-    }}
-    
-    section h2 {{
-        font-size: 2rem;
-    }}
-    
-    .container {{
-        padding: 0 15px;
-    }}
-    
-    nav .container {{
-        flex-direction: column;
-        gap: 1rem;
-    }}
-}}
-"""
+        return render_theme_css(theme_palette(content_data))
     
     def _generate_minimal_js(self, phone_number: str) -> str:
         """
@@ -1,14 +1,28 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, asc
+from sqlalchemy import and_, or_, desc, asc, func, case
 from datetime import datetime, timedelta
 import json
 import re
 from slugify import slugify
 
-from app.models.landing_page import LandingPage, LandingTemplate, LandingAnalytics, LandingSEOConfig
+from app.models.landing_page import LandingPage, LandingTemplate, LandingAnalytics, LandingSEOConfig, LandingUserStats
 from app.models.user import User
+from app.core.config import settings
 from app.core.exceptions import ValidationError, NotFoundError
+from app.services.landing_analytics import (
+    claim_conversion,
+    conversion_rate_after_increment,
+    landing_view_buffer,
+    upsert_daily_analytics,
+)
+from app.utils.hyperloglog import merge_sketches
+from app.utils.pagination import paginate
+from app.utils.projections import landing_summary
+from app.utils.slugs import allocate_slug, assign_unique_slug
+
+# Número de landings del ranking del dashboard
+TOP_PAGES_LIMIT = 5
 
 # ============================================================================
 # SERVICIO PRINCIPAL PARA LANDING PAGES
@@ -35,14 +49,9 @@ class LandingPageService:
         if not user:
             raise NotFoundError("Usuario no encontrado")
         
-        # Generar slug único
-        base_slug = slugify(landing_data.get("title", "landing-page"))
-        slug = self._generate_unique_slug(base_slug)
-        
         # Crear la landing page
         landing_page = LandingPage(
             title=landing_data.get("title"),
-            slug=slug,
             description=landing_data.get("description"),
             html_content=landing_data.get("html_content"),
             css_content=landing_data.get("css_content"),
@@ -55,7 +64,14 @@ class LandingPageService:
             template_id=landing_data.get("template_id")
         )
         
-        self.db.add(landing_page)
+        # Slug único (reintenta si otra petición se queda el mismo a la vez)
+        assign_unique_slug(self.db, landing_page, slugify(landing_data.get("title", "landing-page")))
+        self._apply_stats_delta(
+            user_id,
+            total_landing_pages=1,
+            active_landing_pages=1 if landing_page.is_active else 0,
+            published_landing_pages=1 if landing_page.is_published else 0
+        )
         self.db.commit()
         self.db.refresh(landing_page)
         
@@ -80,19 +96,41 @@ class LandingPageService:
         """
         Obtener todas las landing pages de un usuario
         """
-        return self.db.query(LandingPage).filter(
-            LandingPage.user_id == user_id
-        ).order_by(desc(LandingPage.created_at)).offset(skip).limit(limit).all()
+        landing_pages, _ = self.paginate_landing_pages_by_user(user_id, limit=limit, skip=skip)
+        return landing_pages
+    
+    def paginate_landing_pages_by_user(
+        self,
+        user_id: int,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        skip: int = 0
+    ) -> Tuple[List[LandingPage], Optional[str]]:
+        """
+        Landing pages de un usuario, más recientes primero, paginadas por cursor
+        (sin cargar HTML/CSS/JS). Devuelve (landing pages, cursor de la página siguiente)
+        """
+        query = self.db.query(LandingPage).options(*landing_summary()).filter(LandingPage.user_id == user_id)
+        return paginate(
+            query,
+            [(LandingPage.created_at, True), (LandingPage.id, True)],
+            limit,
+            cursor=cursor,
+            skip=skip
+        )
     
     def update_landing_page(self, landing_id: int, user_id: int, update_data: Dict[str, Any]) -> LandingPage:
         """
         Actualizar una landing page
         """
         landing_page = self.get_landing_page(landing_id, user_id)
+        was_active, was_published = bool(landing_page.is_active), bool(landing_page.is_published)
         
         # Actualizar campos permitidos
         for field, value in update_data.items():
-            if hasattr(landing_page, field) and field not in ['id', 'user_id', 'created_at']:
+            if hasattr(landing_page, field) and field not in [
+                'id', 'user_id', 'created_at', 'total_views', 'total_conversions'
+            ]:
                 setattr(landing_page, field, value)
         
         # Si se actualiza el título, regenerar slug
@@ -101,6 +139,12 @@ class LandingPageService:
             if base_slug != landing_page.slug:
                 landing_page.slug = self._generate_unique_slug(base_slug, exclude_id=landing_id)
         
+        self.db.flush()
+        self._apply_stats_delta(
+            user_id,
+            active_landing_pages=int(bool(landing_page.is_active)) - int(was_active),
+            published_landing_pages=int(bool(landing_page.is_published)) - int(was_published)
+        )
         self.db.commit()
         self.db.refresh(landing_page)
         
@@ -111,8 +155,17 @@ class LandingPageService:
         Eliminar una landing page
         """
         landing_page = self.get_landing_page(landing_id, user_id)
+        deltas = {
+            "total_landing_pages": -1,
+            "active_landing_pages": -1 if landing_page.is_active else 0,
+            "published_landing_pages": -1 if landing_page.is_published else 0,
+            "total_visits": -(landing_page.total_views or 0),
+            "total_conversions": -(landing_page.total_conversions or 0)
+        }
         
         self.db.delete(landing_page)
+        self.db.flush()
+        self._apply_stats_delta(user_id, **deltas)
         self.db.commit()
         
         return True
@@ -122,10 +175,14 @@ class LandingPageService:
         Publicar una landing page
         """
         landing_page = self.get_landing_page(landing_id, user_id)
+        was_published = bool(landing_page.is_published)
         
         landing_page.is_published = True
         landing_page.published_at = datetime.utcnow()
         
+        self.db.flush()
+        if not was_published:
+            self._apply_stats_delta(user_id, published_landing_pages=1)
         self.db.commit()
         self.db.refresh(landing_page)
         
@@ -136,9 +193,13 @@ class LandingPageService:
         Despublicar una landing page
         """
         landing_page = self.get_landing_page(landing_id, user_id)
+        was_published = bool(landing_page.is_published)
         
         landing_page.is_published = False
         
+        self.db.flush()
+        if was_published:
+            self._apply_stats_delta(user_id, published_landing_pages=-1)
         self.db.commit()
         self.db.refresh(landing_page)
         
@@ -296,40 +357,53 @@ class LandingPageService:
     
     def record_page_view(self, landing_id: int, visitor_data: Dict[str, Any]) -> bool:
         """
-        Registrar una vista de página
+        Registrar una vista de página.
+        
+        Las vistas del día se suman con un upsert atómico sobre la fila
+        (landing, día), sin bloquearla; el visitante y los desgloses van al
+        buffer del proceso, que los combina con la fila por lotes
+        (landing_analytics).
         """
         today = datetime.utcnow().date()
+        upsert_daily_analytics(self.db, landing_id, today, page_views=1)
         
-        # Buscar o crear registro de analytics para hoy
-        analytics = self.db.query(LandingAnalytics).filter(
-            and_(
-                LandingAnalytics.landing_page_id == landing_id,
-                LandingAnalytics.date >= today,
-                LandingAnalytics.date < today + timedelta(days=1)
-            )
-        ).first()
-        
-        if not analytics:
-            analytics = LandingAnalytics(
-                landing_page_id=landing_id,
-                date=datetime.utcnow(),
-                traffic_sources={},
-                device_types={},
-                browser_stats={}
-            )
-            self.db.add(analytics)
+        # Contadores acumulados de la landing y del resumen del usuario
+        self._increment_landing_totals(landing_id, LandingPage.total_views, total_visits=1)
+        self.db.commit()
         
-        # Incrementar vistas
-        analytics.page_views += 1
+        # Visitantes únicos (registro HyperLogLog, O(1)) y estadísticas de tráfico
+        visitor_id = visitor_data.get('visitor_id')
+        landing_view_buffer.add(
+            landing_id,
+            today,
+            str(visitor_id) if visitor_id else None,
+            {
+                "traffic_sources": visitor_data.get('source', 'direct'),
+                "device_types": visitor_data.get('device', 'desktop'),
+                "browser_stats": visitor_data.get('browser', 'unknown')
+            }
+        )
+        landing_view_buffer.flush_if_due(self.db)
+        return True
+    
+    def record_conversion(self, landing_id: int, visitor_id: str) -> bool:
+        """
+        Registrar una conversión (formulario, clic en WhatsApp, etc.).
         
-        # Actualizar estadísticas de tráfico
-        source = visitor_data.get('source', 'direct')
-        device = visitor_data.get('device', 'desktop')
-        browser = visitor_data.get('browser', 'unknown')
+        Cuenta una por visitante y landing dentro de
+        LANDING_CONVERSION_DEDUP_SECONDS; devuelve False si ya estaba contada.
+        """
+        if not claim_conversion(self.db, landing_id, visitor_id, settings.LANDING_CONVERSION_DEDUP_SECONDS):
+            self.db.rollback()
+            return False
         
-        analytics.traffic_sources[source] = analytics.traffic_sources.get(source, 0) + 1
-        analytics.device_types[device] = analytics.device_types.get(device, 0) + 1
-        analytics.browser_stats[browser] = analytics.browser_stats.get(browser, 0) + 1
+        # La tasa del día se calcula en el mismo UPDATE, con los valores de la fila
+        upsert_daily_analytics(
+            self.db, landing_id, datetime.utcnow().date(),
+            extra={"conversion_rate": conversion_rate_after_increment()},
+            conversions=1
+        )
+        self._increment_landing_totals(landing_id, LandingPage.total_conversions, total_conversions=1)
         
         self.db.commit()
         return True
@@ -349,9 +423,10 @@ class LandingPageService:
             )
         ).all()
         
-        total_views = sum(a.page_views for a in analytics)
-        total_visitors = sum(a.unique_visitors for a in analytics)
-        avg_bounce_rate = sum(a.bounce_rate for a in analytics) / len(analytics) if analytics else 0
+        total_views = sum(a.page_views or 0 for a in analytics)
+        # Los visitantes únicos no se pueden sumar día a día: se combinan los sketches
+        total_visitors = merge_sketches(a.visitor_sketch for a in analytics).count()
+        avg_bounce_rate = sum(a.bounce_rate or 0 for a in analytics) / len(analytics) if analytics else 0
         
         return {
             "total_views": total_views,
@@ -369,6 +444,126 @@ class LandingPageService:
             ]
         }
     
+    def get_unique_visitors(self, landing_ids: List[int], start_date: datetime, end_date: Optional[datetime] = None) -> int:
+        """
+        Estimar visitantes únicos de un conjunto de landing pages en una ventana de tiempo
+        """
+        query = self.db.query(LandingAnalytics.visitor_sketch).filter(
+            and_(
+                LandingAnalytics.landing_page_id.in_(landing_ids),
+                LandingAnalytics.date >= start_date
+            )
+        )
+        if end_date:
+            query = query.filter(LandingAnalytics.date < end_date)
+        
+        return merge_sketches(row.visitor_sketch for row in query).count()
+    
+    # ========================================================================
+    # MÉTODOS PARA ESTADÍSTICAS DEL DASHBOARD
+    # ========================================================================
+    
+    def get_dashboard_stats(self, user_id: int) -> Dict[str, Any]:
+        """
+        Obtener el resumen precalculado de landings del usuario (una sola fila)
+        """
+        stats = self.db.query(LandingUserStats).filter(LandingUserStats.user_id == user_id).first()
+        if not stats:
+            stats = self.rebuild_user_stats(user_id)
+            self.db.commit()
+        
+        visits = stats.total_visits or 0
+        conversions = stats.total_conversions or 0
+        
+        return {
+            "total_landing_pages": stats.total_landing_pages,
+            "active_landing_pages": stats.active_landing_pages,
+            "published_landing_pages": stats.published_landing_pages,
+            "total_visits": visits,
+            "total_conversions": conversions,
+            "conversion_rate": round(conversions * 100 / visits, 2) if visits else 0.0,
+            "top_pages": self._query_top_pages(user_id),
+            "updated_at": (stats.updated_at or stats.created_at).isoformat() if (stats.updated_at or stats.created_at) else None
+        }
+    
+    def rebuild_user_stats(self, user_id: int) -> LandingUserStats:
+        """
+        Recalcular desde cero el resumen de un usuario (inicialización o reparación)
+        """
+        totals = self.db.query(
+            func.count(LandingPage.id),
+            func.sum(case((LandingPage.is_active == True, 1), else_=0)),
+            func.sum(case((LandingPage.is_published == True, 1), else_=0)),
+            func.coalesce(func.sum(LandingPage.total_views), 0),
+            func.coalesce(func.sum(LandingPage.total_conversions), 0)
+        ).filter(LandingPage.user_id == user_id).one()
+        
+        stats = self.db.query(LandingUserStats).filter(LandingUserStats.user_id == user_id).first()
+        if not stats:
+            stats = LandingUserStats(user_id=user_id)
+            self.db.add(stats)
+        
+        stats.total_landing_pages = totals[0] or 0
+        stats.active_landing_pages = totals[1] or 0
+        stats.published_landing_pages = totals[2] or 0
+        stats.total_visits = totals[3] or 0
+        stats.total_conversions = totals[4] or 0
+        
+        self.db.flush()
+        return stats
+    
+    def _apply_stats_delta(self, user_id: int, **deltas: int) -> bool:
+        """
+        Aplicar incrementos atómicos al resumen del usuario.
+        
+        Devuelve False si el resumen no existía y se ha reconstruido (en ese caso
+        la reconstrucción ya incluye el cambio que se acaba de hacer flush).
+        """
+        values = {
+            getattr(LandingUserStats, field): getattr(LandingUserStats, field) + delta
+            for field, delta in deltas.items() if delta
+        }
+        query = self.db.query(LandingUserStats).filter(LandingUserStats.user_id == user_id)
+        if values:
+            updated = query.update(values, synchronize_session=False)
+        else:
+            updated = query.with_entities(LandingUserStats.id).first() is not None
+        
+        if not updated:
+            self.rebuild_user_stats(user_id)
+            return False
+        return True
+    
+    def _increment_landing_totals(self, landing_id: int, column, **stats_deltas: int) -> None:
+        """
+        Incrementar un total de la landing y el del resumen de su usuario
+        con UPDATE atómicos (sin leer ni reescribir las filas)
+        """
+        self.db.query(LandingPage).filter(LandingPage.id == landing_id).update(
+            {column: column + 1},
+            synchronize_session=False
+        )
+        self.db.flush()
+        user_id = self.db.query(LandingPage.user_id).filter(LandingPage.id == landing_id).scalar()
+        if user_id is not None:
+            self._apply_stats_delta(user_id, **stats_deltas)
+    
+    def _query_top_pages(self, user_id: int) -> List[Dict[str, Any]]:
+        """
+        Consultar las landings con más visitas del usuario (recorre el índice
+        (user_id, total_views), así que no hace falta guardar el ranking)
+        """
+        rows = self.db.query(
+            LandingPage.id, LandingPage.title, LandingPage.slug, LandingPage.total_views
+        ).filter(
+            LandingPage.user_id == user_id
+        ).order_by(desc(LandingPage.total_views), desc(LandingPage.id)).limit(TOP_PAGES_LIMIT).all()
+        
+        return [
+            {"id": row.id, "title": row.title, "slug": row.slug, "views": row.total_views or 0}
+            for row in rows
+        ]
+    
     # ========================================================================
     # MÉTODOS AUXILIARES
     # ========================================================================
@@ -377,19 +572,7 @@ class LandingPageService:
         """
         Generar un slug único para una landing page
         """
-        slug = base_slug
-        counter = 1
-        
-        while True:
-            query = self.db.query(LandingPage).filter(LandingPage.slug == slug)
-            if exclude_id:
-                query = query.filter(LandingPage.id != exclude_id)
-            
-            if not query.first():
-                return slug
-            
-            slug = f"{base_slug}-{counter}"
-            counter += 1
+        return allocate_slug(self.db, LandingPage, base_slug, exclude_id=exclude_id)
     
     def get_landing_page_by_slug(self, slug: str) -> LandingPage:
         """
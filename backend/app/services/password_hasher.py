@@ -0,0 +1,126 @@
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Optional, Tuple
+
+from passlib.context import CryptContext
+
+from app.core.config import settings
+from app.core.exceptions import RateLimitError, ServiceUnavailableError
+
+# ============================================================================
+# POOL ACOTADO PARA HASHING DE CONTRASEÑAS (BCRYPT)
+# ============================================================================
+
+
+class PasswordHasher:
+    """
+    Ejecuta las operaciones de bcrypt en un pool de hilos dedicado y acotado.
+
+    bcrypt libera el GIL, así que unos pocos hilos bastan para aprovechar la
+    CPU sin bloquear el event loop ni ocupar el threadpool de FastAPI. Si hay
+    más de `max_pending` operaciones en curso o en cola, la nueva solicitud
+    se rechaza de inmediato con 429 en lugar de acumularse: una ráfaga de
+    logins no puede degradar el resto del tráfico. Si una operación no
+    termina en `timeout` segundos se responde 503.
+
+    Las rutas async usan `averify_and_update`/`ahash`, que esperan sin
+    ocupar ningún hilo; la API síncrona queda para las rutas `def`.
+    """
+
+    def __init__(
+        self,
+        context: CryptContext,
+        max_workers: int = 2,
+        max_pending: int = 32,
+        timeout: float = 10.0,
+    ):
+        self.context = context
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._rejected = 0
+        self._completed = 0
+
+    def _submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """Encolar una operación respetando el límite de profundidad de la cola"""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise RateLimitError("Demasiadas solicitudes de autenticación, inténtelo de nuevo en unos segundos")
+            self._pending += 1
+
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, _future: Optional[Future]) -> None:
+        with self._lock:
+            self._pending -= 1
+            self._completed += 1
+
+    def _timed_out(self) -> ServiceUnavailableError:
+        return ServiceUnavailableError("El servicio de autenticación está saturado, inténtelo de nuevo en unos segundos")
+
+    def _wait(self, future: Future) -> Any:
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise self._timed_out()
+
+    async def _await(self, future: Future) -> Any:
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            raise self._timed_out()
+
+    # --- API síncrona (rutas def, que ya se ejecutan fuera del event loop) ---
+
+    def verify_and_update(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verificar la contraseña y, si el hash usa parámetros obsoletos,
+        devolver también el nuevo hash a guardar.
+        """
+        return self._wait(self._submit(self.context.verify_and_update, password, hashed))
+
+    def hash(self, password: str) -> str:
+        """Generar hash de contraseña"""
+        return self._wait(self._submit(self.context.hash, password))
+
+    # --- API asíncrona (rutas async def: login y registro) ---
+
+    async def averify_and_update(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        return await self._await(self._submit(self.context.verify_and_update, password, hashed))
+
+    async def ahash(self, password: str) -> str:
+        return await self._await(self._submit(self.context.hash, password))
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "completed": self._completed,
+            "rejected": self._rejected
+        }
+
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
+
+password_hasher = PasswordHasher(
+    pwd_context,
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    timeout=settings.PASSWORD_HASH_TIMEOUT
+)
@@ -0,0 +1,114 @@
+import hashlib
+import threading
+from typing import Any, Dict, Optional
+
+import openai
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# ============================================================================
+# CLIENTES DE PROVEEDORES REUTILIZABLES
+# ============================================================================
+#
+# Crear un cliente de OpenAI o una sesión HTTP abre conexiones TLS nuevas;
+# un pool por proceso las reutiliza entre tareas. Los clientes se indexan por
+# API key (cada usuario puede tener la suya). Los clientes async quedan
+# ligados al event loop en que se usan por primera vez: quien use este pool
+# debe ejecutar sus corrutinas siempre en el mismo loop (ver
+# app.tasks.worker_resources).
+
+
+def _key_id(api_key: str) -> str:
+    """Identificador de una API key que no la expone en logs ni métricas"""
+    return hashlib.sha256(api_key.encode()).hexdigest()[:12]
+
+
+class ProviderClientPool:
+    """Sesión HTTP y clientes de OpenAI/Gemini compartidos por un proceso"""
+
+    def __init__(self, pool_maxsize: int = 10, timeout: float = 120.0):
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._http: Optional[requests.Session] = None
+        self._clients: Dict[tuple, Any] = {}
+        self.created = 0
+        self.reused = 0
+
+    @property
+    def http(self) -> requests.Session:
+        """Sesión HTTP con keep-alive y pool de conexiones"""
+        with self._lock:
+            if self._http is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.pool_maxsize, pool_maxsize=self.pool_maxsize)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._http = session
+                self.created += 1
+            else:
+                self.reused += 1
+            return self._http
+
+    def _get_or_create(self, kind: str, api_key: str, factory, *extra) -> Any:
+        key = (kind, _key_id(api_key)) + extra
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = factory()
+                self._clients[key] = client
+                self.created += 1
+            else:
+                self.reused += 1
+            return client
+
+    def openai_async(self, api_key: str) -> "openai.AsyncOpenAI":
+        return self._get_or_create(
+            "openai_async", api_key,
+            lambda: openai.AsyncOpenAI(api_key=api_key, timeout=self.timeout)
+        )
+
+    def openai_sync(self, api_key: str) -> "openai.OpenAI":
+        return self._get_or_create(
+            "openai", api_key,
+            lambda: openai.OpenAI(api_key=api_key, timeout=self.timeout)
+        )
+
+    def gemini_model(self, api_key: str, model: str) -> Any:
+        def factory():
+            import google.generativeai as genai
+            genai.configure(api_key=api_key)
+            return genai.GenerativeModel(model)
+        return self._get_or_create("gemini", api_key, factory, model)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            clients: Dict[str, int] = {}
+            for kind, *_ in self._clients:
+                clients[kind] = clients.get(kind, 0) + 1
+            return {
+                "http_session": self._http is not None,
+                "clients": clients,
+                "created": self.created,
+                "reused": self.reused
+            }
+
+    def close(self) -> None:
+        """Cerrar conexiones (al terminar el proceso)"""
+        with self._lock:
+            if self._http is not None:
+                self._http.close()
+                self._http = None
+            for client in self._clients.values():
+                close = getattr(client, "close", None)
+                # Los clientes async se cierran con su loop
+                if close is not None and not isinstance(client, openai.AsyncOpenAI):
+                    try:
+                        close()
+                    except Exception as e:
+                        logger.warning(f"Error cerrando cliente de proveedor: {str(e)}")
+            self._clients.clear()
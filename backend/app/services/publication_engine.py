@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import List, Dict, Optional, Any
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import and_, desc
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 from app.models.content import Content, ContentStatus
@@ -9,6 +9,7 @@ from app.models.tag import Tag
 from app.models.keyword import Keyword
 from app.models.seo_schema import SEOSchema
 from app.utils.logging import get_logger
+from app.utils.projections import content_summary
 from app.core.config import settings
 import os
 import json
@@ -204,7 +205,7 @@ class PublicationEngine:
     def _generate_homepage(self):
         """Generar página de inicio"""
         # Obtener contenido destacado
-        featured_posts = self.db.query(Content).filter(
+        featured_posts = self.db.query(Content).options(*content_summary()).filter(
             Content.status == ContentStatus.PUBLISHED
         ).order_by(desc(Content.created_at)).limit(6).all()
         
@@ -245,7 +246,7 @@ class PublicationEngine:
         # Posts relacionados (misma categoría)
         related_posts = []
         if category:
-            related_posts = self.db.query(Content).filter(
+            related_posts = self.db.query(Content).options(*content_summary()).filter(
                 and_(
                     Content.category_id == category.id,
                     Content.id != post.id,
@@ -283,7 +284,9 @@ class PublicationEngine:
     def _generate_category_page(self, category: Category):
         """Generar página de categoría"""
         # Obtener posts de la categoría
-        posts = self.db.query(Content).filter(
+        posts = self.db.query(Content).options(
+            *content_summary(), selectinload(Content.tags), selectinload(Content.images)
+        ).filter(
             and_(
                 Content.category_id == category.id,
                 Content.status == ContentStatus.PUBLISHED
@@ -312,9 +315,12 @@ class PublicationEngine:
     def _generate_tag_page(self, tag: Tag):
         """Generar página de tag"""
         # Obtener posts del tag
-        posts = [content for content in tag.content_items 
-                if content.status == ContentStatus.PUBLISHED]
-        posts.sort(key=lambda x: x.created_at, reverse=True)
+        posts = self.db.query(Content).options(
+            *content_summary(), selectinload(Content.category), selectinload(Content.images)
+        ).join(Content.tags).filter(
+            Tag.id == tag.id,
+            Content.status == ContentStatus.PUBLISHED
+        ).order_by(desc(Content.created_at)).all()
         
         context = {
             "tag": tag,
@@ -379,7 +385,12 @@ class PublicationEngine:
     
     def _generate_sitemap(self):
         """Generar sitemap XML"""
-        posts = self.db.query(Content).filter(
+        posts = self.db.query(Content).options(
+            *content_summary(preview=False),
+            selectinload(Content.keyword),
+            selectinload(Content.tags),
+            selectinload(Content.images)
+        ).filter(
             Content.status == ContentStatus.PUBLISHED
         ).order_by(desc(Content.updated_at)).all()
         
@@ -401,8 +412,8 @@ class PublicationEngine:
             f.write(xml_content)
     
     def _generate_rss_feed(self):
-        """Generar feed RSS"""
-        posts = self.db.query(Content).filter(
+        """Generar feed RSS (incluye el cuerpo completo)"""
+        posts = self.db.query(Content).options(selectinload(Content.images)).filter(
             Content.status == ContentStatus.PUBLISHED
         ).order_by(desc(Content.created_at)).limit(20).all()
         
@@ -477,7 +488,7 @@ Sitemap: https://tu-dominio.com/sitemap.xml"""
         from collections import defaultdict
         
         # Obtener todos los posts publicados
-        posts = self.db.query(Content).filter(
+        posts = self.db.query(Content).options(*content_summary(), selectinload(Content.tags)).filter(
             Content.status == ContentStatus.PUBLISHED
         ).order_by(desc(Content.created_at)).all()
         
@@ -548,7 +559,7 @@ Sitemap: https://tu-dominio.com/sitemap.xml"""
         """Generar página de error 404"""
         # Obtener contenido para la página 404
         popular_categories = self.db.query(Category).limit(5).all()
-        recent_posts = self.db.query(Content).filter(
+        recent_posts = self.db.query(Content).options(*content_summary(preview=False)).filter(
             Content.status == ContentStatus.PUBLISHED
         ).order_by(desc(Content.created_at)).limit(5).all()
         
@@ -0,0 +1,61 @@
+from datetime import date
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.quotas import usage_day
+from app.models.user import User
+from app.models.user_usage import UserDailyUsage
+
+# ============================================================================
+# CUOTAS DIARIAS DE CONTENIDO
+# ============================================================================
+#
+# El uso del día lo mantiene app.models.quotas al hacer flush de cada
+# Content nuevo. Para aplicar el límite sin carreras: comprobar antes de
+# empezar (falla rápido, sin trabajo inútil) y volver a comprobar después
+# del flush, cuando el incremento propio ya está hecho y la fila bloqueada
+# hasta el commit; si se ha superado, el llamador hace rollback.
+
+
+class QuotaService:
+    """Consultar y aplicar el límite diario de contenido de un usuario"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_usage(self, user_id: int, day: Optional[date] = None) -> Dict[str, Any]:
+        """Contenido generado y publicado por el usuario en el día (hoy por defecto)"""
+        day = day or usage_day()
+        row = self.db.query(
+            UserDailyUsage.generated_count, UserDailyUsage.published_count
+        ).filter(
+            UserDailyUsage.user_id == user_id,
+            UserDailyUsage.day == day
+        ).first()
+
+        return {
+            "generated_today": row.generated_count if row else 0,
+            "published_today": row.published_count if row else 0,
+            "date": day.isoformat()
+        }
+
+    def check_daily_limit(self, user: User) -> int:
+        """
+        Comprobar que el usuario aún puede generar contenido hoy.
+
+        Devuelve cuántos le quedan; lanza ValueError si ya no le queda ninguno.
+        """
+        generated = self.get_usage(user.id)["generated_today"]
+        if generated >= user.daily_limit:
+            raise ValueError(f"Has alcanzado tu límite diario de contenido ({user.daily_limit})")
+        return user.daily_limit - generated
+
+    def enforce_daily_limit(self, user: User) -> None:
+        """
+        Comprobación definitiva tras el flush del contenido nuevo (que ya
+        está contado). Lanza ValueError si el límite se ha superado.
+        """
+        generated = self.get_usage(user.id)["generated_today"]
+        if generated > user.daily_limit:
+            raise ValueError(f"Has alcanzado tu límite diario de contenido ({user.daily_limit})")
@@ -1,14 +1,20 @@
 import asyncio
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Any
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import and_, or_
 from app.models.keyword import Keyword, KeywordStatus
 from app.models.content import Content, ContentStatus
 from app.models.user import User
-from app.services.content_generator import ContentGenerator
-from app.services.image_generator import ImageGenerator
+from app.services.content_generation import ContentGenerationService, keyword_heartbeat
+from app.services.keyword_queue import KeywordQueue, LeaseLostError
+from app.services.quota_service import QuotaService
+from app.services.content_bulk import ContentBulkService
+from app.services.job_scheduler import JobStore, compute_next_execution, get_job_store, job_handler, notify_dispatcher
+from app.models.scheduled_job import JobStatus
+from app.core.database import SessionLocal
 from app.utils.logging import get_logger
+from app.utils.projections import content_summary
 from app.core.config import settings
 import json
 from enum import Enum
@@ -24,16 +30,21 @@ class ScheduleInterval(str, Enum):
     TWICE_DAILY = "twicedaily"
     WEEKLY = "weekly"
 
+# Tipo de trabajo persistente de la generación programada (ver job_scheduler)
+SCHEDULED_GENERATION_JOB = "scheduled_generation"
+
 class SchedulerService:
     """Servicio de programación automática para generación de contenido"""
     
     def __init__(self, db: Session):
         self.db = db
-        self.image_generator = ImageGenerator(db)
-        self.is_running = False
-        self.current_task = None
+    
+    @staticmethod
+    def _job_key(user_id: int) -> str:
+        """Clave del trabajo programado de un usuario (uno por usuario)"""
+        return f"scheduler:user:{user_id}"
         
-    async def configure_scheduler(self, user_id: int, config: Dict[str, Any]) -> Dict[str, Any]:
+    def configure_scheduler(self, user_id: int, config: Dict[str, Any]) -> Dict[str, Any]:
         """Configurar el programador automático"""
         try:
             # Validar configuración
@@ -64,6 +75,11 @@ class SchedulerService:
             # Guardar configuración
             self._save_scheduler_config(user_id, validated_config)
             
+            # Si ya estaba activo, reprogramar el trabajo con el nuevo intervalo
+            saved_config = self._get_scheduler_config(user_id)
+            if saved_config and saved_config["status"] == "active":
+                self._schedule_job(user_id, saved_config["interval"], saved_config.get("schedule_time"))
+            
             logger.info(f"Scheduler configurado para usuario {user_id}")
             
             return validated_config
@@ -103,18 +119,16 @@ class SchedulerService:
                 "status": "active"
             }
             
-            # Aquí normalmente guardarías en una tabla de configuración
-            # Por ahora lo mantenemos en memoria/cache
             self._save_scheduler_config(user_id, scheduler_config)
             
-            self.is_running = True
+            job = self._schedule_job(user_id, validated_config["interval"], validated_config.get("schedule_time"))
             
             logger.info(f"Scheduler iniciado para usuario {user_id} con intervalo {validated_config['interval']}")
             
             return {
                 "status": "started",
                 "config": scheduler_config,
-                "next_execution": self._calculate_next_execution(validated_config["interval"], validated_config.get("schedule_time"))
+                "next_execution": job["next_execution"]
             }
             
         except Exception as e:
@@ -131,7 +145,8 @@ class SchedulerService:
                 config["stopped_at"] = datetime.utcnow().isoformat()
                 self._save_scheduler_config(user_id, config)
             
-            self.is_running = False
+            # Una ejecución en curso termina, pero no se reprograma
+            get_job_store().cancel(self._job_key(user_id))
             
             logger.info(f"Scheduler detenido para usuario {user_id}")
             
@@ -158,86 +173,142 @@ class SchedulerService:
             # Obtener estadísticas del día
             today_stats = self._get_today_generation_stats(user_id)
             
-            # Calcular próxima ejecución
-            next_execution = None
-            if config["status"] == "active":
-                next_execution = self._calculate_next_execution(
-                    config["interval"], 
-                    config.get("schedule_time")
-                )
+            # El estado de ejecución sale del trabajo persistente, compartido por todos los workers
+            job = get_job_store().get(self._job_key(user_id))
+            active = job is not None and job["status"] in (JobStatus.PENDING, JobStatus.RUNNING)
+            running = job is not None and job["status"] == JobStatus.RUNNING
+            
+            current_task = None
+            if running:
+                current_task = {
+                    "job_id": job["id"],
+                    "started_at": job["last_run_at"],
+                    "worker": job["lease_owner"],
+                    "attempt": job["attempts"],
+                    "lease_expires_at": job["lease_expires_at"],
+                    "status": "generating"
+                }
             
             return {
                 "status": config["status"],
-                "is_running": self.is_running and config["status"] == "active",
+                "is_running": running,
                 "config": config,
                 "today_stats": today_stats,
-                "next_execution": next_execution,
-                "current_task": self.current_task
+                "next_execution": job["next_execution"] if active else None,
+                "last_execution": job["last_run_at"] if job else config.get("last_execution"),
+                "last_error": job["last_error"] if job else None,
+                "current_task": current_task
             }
             
         except Exception as e:
             logger.error(f"Error obteniendo estado del scheduler: {str(e)}")
             raise
     
-    async def execute_scheduled_generation(self, user_id: int) -> Dict[str, Any]:
-        """Ejecutar generación programada"""
+    async def execute_scheduled_generation(self, user_id: int, run_key: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Ejecutar generación programada.
+
+        Con `run_key` (ejecuciones del dispatcher) el contenido creado y su
+        keyword se guardan como progreso de la ejecución en la misma
+        transacción que el contenido: un reintento tras la caída del worker
+        retoma ese contenido en lugar de reclamar otra keyword y gastar
+        otra unidad de la cuota, y si ya estaba generado no lo repite.
+        """
+        current_task = None
+        keyword = None
+        keyword_queue = KeywordQueue(self.db)
+        worker_id = f"scheduler:user:{user_id}"
         try:
             config = self._get_scheduler_config(user_id)
             if not config or config["status"] != "active":
                 return {"status": "skipped", "reason": "Scheduler no activo"}
             
-            # Verificar límites diarios
-            today_stats = self._get_today_generation_stats(user_id)
-            max_daily = config["max_posts_per_day"]
+            user = self.db.query(User).filter(User.id == user_id).first()
+            if not user:
+                raise ValueError(f"Usuario {user_id} no encontrado")
             
-            if today_stats["generated_today"] >= max_daily:
-                return {
-                    "status": "skipped", 
-                    "reason": f"Límite diario alcanzado ({max_daily})"
-                }
+            checkpoint = JobStore.run_checkpoint(self.db, run_key) if run_key else None
+            content = self.db.get(Content, checkpoint["content_id"]) if checkpoint else None
             
-            # Obtener keyword disponible
-            keyword = self._get_next_available_keyword(user_id)
-            if not keyword:
-                return {
-                    "status": "skipped", 
-                    "reason": "No hay keywords disponibles"
-                }
+            if content is not None:
+                # Reintento de una ejecución que ya creó su contenido
+                keyword = keyword_queue.claim_keyword(checkpoint["keyword_id"], worker_id)
+                if not keyword:
+                    raise RuntimeError(f"La keyword {checkpoint['keyword_id']} la está generando otro worker")
+                logger.info(f"Ejecución {run_key}: se retoma el contenido {content.id}")
+            else:
+                # Verificar límites diarios
+                today_stats = self._get_today_generation_stats(user_id)
+                max_daily = config["max_posts_per_day"]
+                
+                if today_stats["generated_today"] >= max_daily:
+                    return {
+                        "status": "skipped", 
+                        "reason": f"Límite diario alcanzado ({max_daily})"
+                    }
+                
+                # Reclamar keyword disponible (otros workers no la tomarán mientras dure el lease)
+                keyword = keyword_queue.claim_one(worker_id=worker_id)
+                if not keyword:
+                    return {
+                        "status": "skipped", 
+                        "reason": "No hay keywords disponibles"
+                    }
+                
+                try:
+                    content = ContentGenerationService(self.db).create_placeholder(keyword, user)
+                except ValueError as e:
+                    # Cuota diaria del usuario agotada
+                    keyword_queue.release(keyword)
+                    keyword = None
+                    return {"status": "skipped", "reason": str(e)}
+                if run_key:
+                    JobStore.save_checkpoint(self.db, run_key, {
+                        "content_id": content.id,
+                        "keyword_id": keyword.id,
+                        "keyword": keyword.keyword
+                    })
+                self.db.commit()
             
             # Marcar tarea como en progreso
-            self.current_task = {
+            current_task = {
                 "keyword_id": keyword.id,
                 "keyword": keyword.keyword,
+                "content_id": content.id,
                 "started_at": datetime.utcnow().isoformat(),
                 "status": "generating"
             }
             
-            # Generar contenido
-            content_settings = config.get("content_settings", {})
-            generation_result = await self._generate_content_with_settings(
-                keyword, user_id, content_settings
-            )
-            
-            # Generar imágenes si está habilitado
-            if config.get("generate_images", True) and generation_result["success"]:
-                try:
-                    images = self.image_generator.generate_images_for_content(
-                        generation_result["content_id"], 
-                        num_images=content_settings.get("num_images", 2)
-                    )
-                    generation_result["images_generated"] = len(images)
-                except Exception as e:
-                    logger.warning(f"Error generando imágenes: {str(e)}")
-                    generation_result["images_generated"] = 0
+            # Generar contenido (salvo que el intento anterior ya lo dejara generado)
+            if content.status in (ContentStatus.GENERATING, ContentStatus.FAILED):
+                generation_result = await self._generate_content_with_settings(
+                    keyword_queue, content, keyword, user, config
+                )
+            else:
+                generation_result = {
+                    "success": True,
+                    "content_id": content.id,
+                    "title": content.title,
+                    "word_count": content.word_count,
+                    "resumed": True
+                }
             
             # Publicar automáticamente si está configurado
             if config.get("auto_publish", False) and generation_result["success"]:
-                self._auto_publish_content(generation_result["content_id"])
-                generation_result["auto_published"] = True
+                generation_result["auto_published"] = self._auto_publish_content(
+                    generation_result["content_id"], user_id
+                )
+            
+            # Liberar la keyword: usada si se generó, fallida si no
+            if generation_result["success"]:
+                keyword_queue.complete(keyword)
+            else:
+                keyword_queue.release(keyword, failed=True)
+            keyword = None
             
             # Actualizar tarea
-            self.current_task["status"] = "completed" if generation_result["success"] else "failed"
-            self.current_task["completed_at"] = datetime.utcnow().isoformat()
+            current_task["status"] = "completed" if generation_result["success"] else "failed"
+            current_task["completed_at"] = datetime.utcnow().isoformat()
             
             # Log del resultado
             if generation_result["success"]:
@@ -248,15 +319,19 @@ class SchedulerService:
             return {
                 "status": "completed" if generation_result["success"] else "failed",
                 "result": generation_result,
-                "keyword_used": keyword.keyword,
+                "keyword_used": current_task["keyword"],
+                "task": current_task,
                 "execution_time": datetime.utcnow().isoformat()
             }
             
         except Exception as e:
             logger.error(f"Error en ejecución programada: {str(e)}")
-            if self.current_task:
-                self.current_task["status"] = "error"
-                self.current_task["error"] = str(e)
+            if current_task:
+                logger.error(f"Tarea fallida: {current_task}")
+            if keyword is not None:
+                # Devolver la keyword a la cola para el reintento
+                self.db.rollback()
+                keyword_queue.release(keyword)
             raise
     
     def _validate_scheduler_config(self, config: Dict[str, Any]) -> Dict[str, Any]:
@@ -285,124 +360,73 @@ class SchedulerService:
         
         return config
     
+    def _schedule_job(self, user_id: int, interval: str, schedule_time: Optional[str] = None) -> Dict[str, Any]:
+        """Crear o reprogramar el trabajo recurrente persistente del usuario"""
+        next_execution = compute_next_execution(interval, schedule_time)
+        job = get_job_store().enqueue(
+            SCHEDULED_GENERATION_JOB,
+            run_at=next_execution,
+            payload={"user_id": user_id},
+            user_id=user_id,
+            interval=interval,
+            schedule_time=schedule_time,
+            idempotency_key=self._job_key(user_id),
+            replace=True
+        )
+        notify_dispatcher()
+        return job
+    
     def _calculate_next_execution(self, interval: str, schedule_time: Optional[str] = None) -> str:
         """Calcular próxima ejecución basada en el intervalo"""
-        now = datetime.utcnow()
-        
-        if interval == ScheduleInterval.FIVE_MINUTES:
-            next_exec = now + timedelta(minutes=5)
-        elif interval == ScheduleInterval.FIFTEEN_MINUTES:
-            next_exec = now + timedelta(minutes=15)
-        elif interval == ScheduleInterval.THIRTY_MINUTES:
-            next_exec = now + timedelta(minutes=30)
-        elif interval == ScheduleInterval.HOURLY:
-            next_exec = now + timedelta(hours=1)
-        elif interval == ScheduleInterval.DAILY:
-            if schedule_time:
-                # Programar para hora específica del día siguiente
-                hour, minute = map(int, schedule_time.split(":"))
-                next_exec = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
-                if next_exec <= now:
-                    next_exec += timedelta(days=1)
-            else:
-                next_exec = now + timedelta(days=1)
-        elif interval == ScheduleInterval.TWICE_DAILY:
-            # Ejecutar cada 12 horas
-            next_exec = now + timedelta(hours=12)
-        elif interval == ScheduleInterval.WEEKLY:
-            next_exec = now + timedelta(weeks=1)
-        else:
-            next_exec = now + timedelta(hours=1)  # Default
-        
-        return next_exec.isoformat()
+        return compute_next_execution(interval, schedule_time).isoformat()
     
     def _get_today_generation_stats(self, user_id: int) -> Dict[str, Any]:
-        """Obtener estadísticas de generación del día actual"""
-        today = datetime.utcnow().date()
-        
-        generated_today = self.db.query(Content).filter(
-            and_(
-                Content.user_id == user_id,
-                Content.created_at >= today,
-                Content.created_at < today + timedelta(days=1)
-            )
-        ).count()
-        
-        published_today = self.db.query(Content).filter(
-            and_(
-                Content.user_id == user_id,
-                Content.status == ContentStatus.PUBLISHED,
-                Content.published_at >= today,
-                Content.published_at < today + timedelta(days=1)
-            )
-        ).count()
-        
-        return {
-            "generated_today": generated_today,
-            "published_today": published_today,
-            "date": today.isoformat()
-        }
+        """Obtener estadísticas de generación del día actual (contador de uso diario)"""
+        return QuotaService(self.db).get_usage(user_id)
     
-    def _get_next_available_keyword(self, user_id: int) -> Optional[Keyword]:
-        """Obtener la siguiente keyword disponible con mayor prioridad"""
-        return self.db.query(Keyword).filter(
-            Keyword.status == KeywordStatus.PENDING
-        ).order_by(
-            Keyword.priority.desc(),
-            Keyword.created_at.asc()
-        ).first()
-    
-    async def _generate_content_with_settings(self, keyword: Keyword, user_id: int, settings: Dict[str, Any]) -> Dict[str, Any]:
-        """Generar contenido con configuraciones específicas"""
+    async def _generate_content_with_settings(
+        self, keyword_queue: KeywordQueue, content: Content, keyword: Keyword, user: User, config: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Generar el texto (y las imágenes, si el scheduler las tiene activas)
+        de un contenido ya creado, renovando el lease que `keyword_queue`
+        tiene sobre la keyword.
+
+        ContentGenerator no admite longitud ni estilo por petición: de
+        `content_settings` solo se aplica el tipo de contenido.
+        """
+        content_settings = config.get("content_settings") or {}
         try:
-            # Obtener el usuario
-            user = self.db.query(User).filter(User.id == user_id).first()
-            if not user:
-                raise ValueError(f"Usuario {user_id} no encontrado")
-            
-            # Crear ContentGenerator con el usuario correcto
-            content_generator = ContentGenerator(user)
-            
-            # Configuración por defecto
-            default_settings = {
-                "word_count": 800,
-                "content_type": "post",
-                "writing_style": "profesional",
-                "include_meta_description": True,
-                "auto_interlinking": True
-            }
-            
-            # Combinar con configuraciones del usuario
-            final_settings = {**default_settings, **settings}
-            
-            # Generar contenido
-            result = await content_generator.generate_content(
-                keyword_id=keyword.id,
-                user_id=user_id,
-                word_count=final_settings["word_count"],
-                content_type=final_settings["content_type"],
-                writing_style=final_settings["writing_style"]
-            )
-            
-            return result
-            
+            with keyword_heartbeat(keyword_queue, keyword) as heartbeat:
+                return await ContentGenerationService(self.db).generate(
+                    content,
+                    keyword,
+                    user,
+                    provider=content_settings.get("provider", "auto"),
+                    content_type=content_settings.get("content_type", "article"),
+                    heartbeat=heartbeat,
+                    images=config.get("generate_images", True)
+                )
+        except LeaseLostError:
+            # Otro worker tiene la keyword: que el dispatcher reintente la ejecución
+            raise
         except Exception as e:
+            self.db.rollback()
             logger.error(f"Error generando contenido programado: {str(e)}")
+            content.status = ContentStatus.FAILED
+            content.content = f"Error generando contenido: {str(e)}"
+            self.db.commit()
             return {
                 "success": False,
+                "content_id": content.id,
                 "error": str(e)
             }
     
-    def _auto_publish_content(self, content_id: int) -> bool:
-        """Publicar contenido automáticamente"""
+    def _auto_publish_content(self, content_id: int, user_id: int) -> bool:
+        """Publicar contenido automáticamente (mismo camino que la publicación masiva)"""
         try:
-            content = self.db.query(Content).filter(Content.id == content_id).first()
-            if content:
-                content.status = ContentStatus.PUBLISHED
-                content.published_at = datetime.utcnow()
-                self.db.commit()
-                return True
-            return False
+            result = ContentBulkService(self.db).apply(user_id, "publish", content_ids=[content_id])
+            return result["updated"] == 1
             
         except Exception as e:
             logger.error(f"Error publicando automáticamente: {str(e)}")
@@ -419,14 +443,16 @@ class SchedulerService:
             ).first()
             
             if scheduler_config:
-                # Actualizar configuración existente
+                # Actualizar configuración existente (conserva el estado si no se indica)
                 scheduler_config.update_from_dict(config)
-                scheduler_config.status = "configured"
+                if "status" not in config and scheduler_config.status in (None, "not_configured"):
+                    scheduler_config.status = "configured"
             else:
                 # Crear nueva configuración
                 scheduler_config = SchedulerConfig(user_id=user_id)
                 scheduler_config.update_from_dict(config)
-                scheduler_config.status = "configured"
+                if "status" not in config:
+                    scheduler_config.status = "configured"
                 self.db.add(scheduler_config)
             
             self.db.commit()
@@ -465,7 +491,7 @@ class SchedulerService:
             available_keywords = self.db.query(Keyword).filter(
                 Keyword.status == KeywordStatus.PENDING
             ).order_by(
-                Keyword.priority.desc(),
+                Keyword.priority_rank.desc(),
                 Keyword.created_at.asc()
             ).limit(20).all()
             
@@ -566,7 +592,9 @@ class SchedulerService:
         """Obtener logs del scheduler"""
         try:
             # Obtener contenido generado recientemente por el usuario
-            recent_content = self.db.query(Content).filter(
+            recent_content = self.db.query(Content).options(
+                *content_summary(preview=False), selectinload(Content.keyword)
+            ).filter(
                 Content.user_id == user_id
             ).order_by(
                 Content.created_at.desc()
@@ -590,7 +618,7 @@ class SchedulerService:
             logger.error(f"Error obteniendo logs del scheduler: {str(e)}")
             return []
     
-    async def get_statistics(self, user_id: int, days: int = 30) -> Dict[str, Any]:
+    def get_statistics(self, user_id: int, days: int = 30) -> Dict[str, Any]:
         """Obtener estadísticas del scheduler"""
         try:
             # Calcular fecha de inicio
@@ -662,4 +690,28 @@ class SchedulerService:
                 "last_execution": None,
                 "next_execution": None,
                 "error": str(e)
-            }
\ No newline at end of file
+            }
+
+
+@job_handler(SCHEDULED_GENERATION_JOB)
+def run_scheduled_generation(payload: Dict[str, Any], run_key: str) -> Dict[str, Any]:
+    """Ejecución programada de un usuario; la lanza el dispatcher de trabajos"""
+    from app.models.scheduler_config import SchedulerConfig
+    
+    user_id = payload["user_id"]
+    db = SessionLocal()
+    try:
+        result = asyncio.run(SchedulerService(db).execute_scheduled_generation(user_id, run_key=run_key))
+        
+        scheduler_config = db.query(SchedulerConfig).filter(SchedulerConfig.user_id == user_id).first()
+        if scheduler_config:
+            scheduler_config.last_execution = datetime.utcnow()
+            scheduler_config.next_execution = compute_next_execution(
+                scheduler_config.interval, scheduler_config.schedule_time
+            )
+            db.commit()
+        
+        logger.info(f"Ejecución programada {run_key}: {result.get('status')}")
+        return result
+    finally:
+        db.close()
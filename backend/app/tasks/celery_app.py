@@ -6,7 +6,7 @@ celery_app = Celery(
     "autopublicador",
     broker=settings.REDIS_URL,
     backend=settings.REDIS_URL,
-    include=["app.tasks.content_tasks"]
+    include=["app.tasks.content_tasks", "app.tasks.pipeline_tasks", "app.tasks.worker_resources"]
 )
 
 # Configuración de Celery
@@ -24,15 +24,18 @@ celery_app.conf.update(
 )
 
 # Configuración de rutas de tareas
+# Cada etapa del pipeline tiene su cola para escalarla con su propia
+# concurrencia, p. ej.:
+#   celery -A app.tasks.celery_app worker -Q content_queue,content_text,content_post,content_publish -c 8
+#   celery -A app.tasks.celery_app worker -Q content_images -c 2
 celery_app.conf.task_routes = {
     "app.tasks.content_tasks.generate_content_task": "content_queue",
-    "app.tasks.content_tasks.reset_daily_limits": "maintenance_queue",
+    "app.tasks.pipeline_tasks.generate_text_stage": "content_text",
+    "app.tasks.pipeline_tasks.post_process_stage": "content_post",
+    "app.tasks.pipeline_tasks.generate_images_stage": "content_images",
+    "app.tasks.pipeline_tasks.publish_stage": "content_publish",
 }
 
 # Configuración de tareas periódicas
-celery_app.conf.beat_schedule = {
-    "reset-daily-limits": {
-        "task": "app.tasks.content_tasks.reset_daily_limits",
-        "schedule": 86400.0,  # Cada 24 horas
-    },
-}
\ No newline at end of file
+# Las cuotas diarias se llevan por día (user_daily_usage) y no necesitan reset
+celery_app.conf.beat_schedule = {}
@@ -0,0 +1,245 @@
+from datetime import datetime
+from typing import List, Optional
+
+from celery import chain, group
+
+from app.tasks.celery_app import celery_app
+from app.tasks.worker_resources import get_resources
+from app.core.database import SessionLocal
+from app.models.content import Content, ContentStatus
+from app.models.content_image import ContentImage
+from app.models.keyword import Keyword, KeywordStatus
+from app.models.user import User
+from app.services.content_generator import ContentGenerator
+from app.utils.helpers import generate_slug, extract_excerpt
+from app.utils.slugs import assign_unique_slug
+import structlog
+
+logger = structlog.get_logger()
+
+# ============================================================================
+# PIPELINE DE GENERACIÓN POR ETAPAS
+# ============================================================================
+#
+#   texto -> post-proceso -> ( publicación | imágenes )
+#
+# Cada etapa es una tarea independiente en su propia cola (ver task_routes
+# en celery_app), de modo que cada una escala con su propia concurrencia y
+# un proveedor de imágenes lento no frena la generación de texto. Las
+# etapas reciben y devuelven el `content_id` y son idempotentes: si Celery
+# las reintenta (o repite tras caerse un worker con acks_late) comprueban
+# lo ya hecho y solo rehacen lo que falta. La publicación no espera a las
+# imágenes: el artículo queda listo con el texto y las imágenes se añaden
+# cuando terminan. Los clientes de los proveedores, el event loop y las
+# cachés los aporta el proceso del worker (ver worker_resources).
+
+STAGE_RETRY_COUNTDOWN = 60
+
+
+def _mark_failed(content_id: int, stage: str, error: Exception) -> None:
+    """Dejar contenido y keyword en estado fallido tras agotar los reintentos"""
+    db = SessionLocal()
+    try:
+        content = db.get(Content, content_id)
+        if content is None:
+            return
+        content.status = ContentStatus.FAILED
+        content.content = f"Error en la etapa '{stage}': {str(error)}"
+        if content.keyword_id:
+            db.query(Keyword).filter(Keyword.id == content.keyword_id).update(
+                {"status": KeywordStatus.FAILED}, synchronize_session=False
+            )
+        db.commit()
+    finally:
+        db.close()
+
+
+def _retry_or_fail(task, content_id: int, stage: str, error: Exception):
+    logger.error("Error en etapa del pipeline", stage=stage, content_id=content_id, error=str(error))
+    if task.request.retries >= task.max_retries:
+        _mark_failed(content_id, stage, error)
+        raise error
+    raise task.retry(exc=error, countdown=STAGE_RETRY_COUNTDOWN)
+
+
+@celery_app.task(bind=True, acks_late=True, max_retries=3)
+def generate_text_stage(
+    self,
+    content_id: int,
+    provider: str = "auto",
+    content_type: str = "article",
+    additional_keyword_ids: Optional[List[int]] = None
+) -> int:
+    """Etapa 1: generar título, cuerpo y meta descripción con IA"""
+    db = SessionLocal()
+    try:
+        content = db.get(Content, content_id)
+        if content is None:
+            raise ValueError(f"Contenido {content_id} no encontrado")
+
+        # Idempotente: el texto ya se generó en un intento anterior
+        if content.content and content.status != ContentStatus.FAILED:
+            return content_id
+
+        keyword = db.get(Keyword, content.keyword_id)
+        user = db.get(User, content.user_id)
+        if keyword is None or user is None:
+            raise ValueError("No se encontraron la keyword o el usuario del contenido")
+
+        keyword.status = KeywordStatus.PROCESSING
+        content.status = ContentStatus.GENERATING
+        db.commit()
+
+        resources = get_resources()
+        generator = ContentGenerator(user, clients=resources.clients)
+        original_keyword = keyword.keyword
+        if additional_keyword_ids:
+            # Incluir las keywords relacionadas en el contexto del prompt (sin guardarlas)
+            related = db.query(Keyword.keyword).filter(Keyword.id.in_(additional_keyword_ids)).all()
+            keyword_context = ", ".join([original_keyword] + [row.keyword for row in related])
+            keyword.keyword = f"{original_keyword} (relacionado con: {keyword_context})"
+        try:
+            generated = resources.run(generator.generate_content(keyword, provider, content_type))
+        finally:
+            keyword.keyword = original_keyword
+
+        body = generated.get("content", "")
+        if not body:
+            raise ValueError("El proveedor devolvió un contenido vacío")
+
+        content.title = generated.get("title", f"Artículo sobre {original_keyword}")
+        content.content = body
+        content.meta_description = generated.get("meta_description")
+        content.focus_keyword = original_keyword
+        content.author_name = generated.get("author_name", "Redactor IA")
+        content.publisher_name = generated.get("publisher_name", "Mi Sitio Web")
+        content.schema_type = generated.get("schema_type", "Article")
+        content.article_section = generated.get("article_section", "General")
+        db.commit()
+
+        logger.info("Texto generado", content_id=content_id, title=content.title[:50])
+        return content_id
+
+    except Exception as e:
+        db.rollback()
+        _retry_or_fail(self, content_id, "texto", e)
+    finally:
+        db.close()
+
+
+@celery_app.task(bind=True, acks_late=True, max_retries=3)
+def post_process_stage(self, content_id: int) -> int:
+    """Etapa 2: slug definitivo, extracto, meta descripción y campos Schema.org"""
+    db = SessionLocal()
+    try:
+        content = db.get(Content, content_id)
+        if content is None:
+            raise ValueError(f"Contenido {content_id} no encontrado")
+
+        # Todo se deriva del texto: repetir la etapa da el mismo resultado
+        assign_unique_slug(db, content, generate_slug(content.title))
+        content.excerpt = content.excerpt or extract_excerpt(content.content)
+        content.meta_description = content.meta_description or extract_excerpt(content.content, 160)
+        content.meta_title = content.meta_title or content.title[:60]
+        content.schema_type = content.schema_type or "Article"
+        # word_count y reading_time los recalcula el modelo al cambiar el cuerpo
+        db.commit()
+        return content_id
+
+    except Exception as e:
+        db.rollback()
+        _retry_or_fail(self, content_id, "post-proceso", e)
+    finally:
+        db.close()
+
+
+@celery_app.task(bind=True, acks_late=True, max_retries=3)
+def generate_images_stage(self, content_id: int) -> int:
+    """Etapa 3: imágenes del artículo e imagen destacada (solo las que falten)"""
+    from app.services.content_generation import check_auto_image_generation
+    from app.services.image_generator import ImageGenerator
+
+    db = SessionLocal()
+    try:
+        content = db.get(Content, content_id)
+        if content is None or not check_auto_image_generation(content.user_id, content.keyword_id, db):
+            return content_id
+
+        resources = get_resources()
+        image_config = resources.get_image_config(content.user_id, content.keyword_id, db)
+        existing = db.query(ContentImage.is_featured).filter(ContentImage.content_id == content_id).all()
+        regular = sum(1 for row in existing if not row.is_featured)
+        has_featured = any(row.is_featured for row in existing)
+
+        image_generator = ImageGenerator(db, clients=resources.clients)
+        missing = image_config.get("num_images", 2) - regular
+        if missing > 0:
+            image_generator.generate_images_for_content(content_id, missing)
+        if image_config.get("include_featured", True) and not has_featured:
+            image_generator.generate_featured_image(content_id)
+
+        logger.info("Imágenes generadas", content_id=content_id, generated=max(missing, 0))
+        return content_id
+
+    except Exception as e:
+        db.rollback()
+        logger.error("Error en etapa del pipeline", stage="imágenes", content_id=content_id, error=str(e))
+        if self.request.retries >= self.max_retries:
+            # Las imágenes no invalidan el artículo, que ya está publicado o en borrador
+            return content_id
+        raise self.retry(exc=e, countdown=STAGE_RETRY_COUNTDOWN)
+    finally:
+        db.close()
+
+
+@celery_app.task(bind=True, acks_late=True, max_retries=3)
+def publish_stage(self, content_id: int, auto_publish: bool = False) -> int:
+    """Etapa 4: dejar el artículo en borrador (o publicado) y cerrar la keyword"""
+    db = SessionLocal()
+    try:
+        content = db.get(Content, content_id)
+        if content is None:
+            raise ValueError(f"Contenido {content_id} no encontrado")
+
+        if content.status == ContentStatus.GENERATING:
+            if auto_publish:
+                content.status = ContentStatus.PUBLISHED
+                content.published_at = content.published_at or datetime.utcnow()
+            else:
+                content.status = ContentStatus.DRAFT
+        if content.keyword_id:
+            db.query(Keyword).filter(Keyword.id == content.keyword_id).update({
+                "status": KeywordStatus.COMPLETED,
+                "used_at": datetime.utcnow()
+            }, synchronize_session=False)
+        db.commit()
+
+        logger.info("Contenido listo", content_id=content_id, status=content.status.value)
+        return content_id
+
+    except Exception as e:
+        db.rollback()
+        _retry_or_fail(self, content_id, "publicación", e)
+    finally:
+        db.close()
+
+
+def build_content_pipeline(
+    content_id: int,
+    provider: str = "auto",
+    content_type: str = "article",
+    additional_keyword_ids: Optional[List[int]] = None,
+    auto_publish: bool = False
+):
+    """Firma Celery del pipeline completo para un contenido en estado GENERATING"""
+    return chain(
+        generate_text_stage.si(content_id, provider, content_type, additional_keyword_ids or []),
+        post_process_stage.s(),
+        group(publish_stage.s(auto_publish), generate_images_stage.s()),
+    )
+
+
+def start_content_pipeline(content_id: int, **options) -> str:
+    """Encolar el pipeline y devolver el id de la tarea de Celery"""
+    result = build_content_pipeline(content_id, **options).apply_async()
+    return result.id
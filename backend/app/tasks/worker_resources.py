@@ -0,0 +1,254 @@
+import asyncio
+import importlib
+import json
+import os
+import socket
+import threading
+import time
+from typing import Any, Awaitable, Dict, List, Optional, TypeVar
+
+from celery.signals import task_postrun, worker_process_init, worker_process_shutdown
+from celery.worker.control import inspect_command
+
+from app.core.config import settings
+from app.core.database import async_engine, engine
+from app.core.db_config import get_pool_metrics
+from app.services.provider_clients import ProviderClientPool
+from app.utils.cache import TTLCache
+import structlog
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - dependencia opcional
+    redis = None
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+# ============================================================================
+# RECURSOS POR PROCESO DE LOS WORKERS DE CELERY
+# ============================================================================
+#
+# Cada proceso hijo del worker (prefork) prepara una sola vez lo que las
+# tareas necesitan: conexiones a la base de datos propias del proceso,
+# clientes de los proveedores de IA con keep-alive, un event loop
+# persistente para las llamadas async y cachés locales. Las tareas los
+# toman prestados con `get_resources()` en lugar de crearlos en cada
+# ejecución.
+#
+# Estadísticas en vivo:
+#   celery -A app.tasks.celery_app inspect resource_stats
+# Con el pool prefork los comandos de control los atiende el proceso
+# principal del worker, que no ejecuta tareas: cada hijo publica sus cifras
+# en Redis (REDIS_URL, el broker) cada WORKER_STATS_INTERVAL_SECONDS, con
+# una clave por pid que caduca si el hijo muere, y el principal agrega las
+# de sus hijos. Con `-P threads` (o `-P solo`) las tareas corren en el
+# proceso principal y se añaden sus propias cifras.
+
+STATS_KEY_PREFIX = "worker_resources"
+
+
+def _stats_key(parent_pid: int, pid: Any) -> str:
+    """Clave de las estadísticas de un proceso hijo (agrupadas por worker)"""
+    return f"{STATS_KEY_PREFIX}:{socket.gethostname()}:{parent_pid}:{pid}"
+
+
+def _stats_client():
+    if redis is None:
+        return None
+    return redis.Redis.from_url(settings.REDIS_URL, socket_timeout=2, socket_connect_timeout=2)
+
+
+class WorkerResources:
+    """Recursos compartidos por las tareas de un proceso del worker"""
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self.started_at = time.time()
+        self.clients = ProviderClientPool(
+            pool_maxsize=settings.WORKER_HTTP_POOL_SIZE,
+            timeout=settings.PROVIDER_HTTP_TIMEOUT_SECONDS
+        )
+        # Configuración de imágenes por (usuario, keyword): se consulta en cada artículo
+        self.image_configs = TTLCache(maxsize=1024, ttl=settings.WORKER_CACHE_TTL_SECONDS)
+        self.tasks_run = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stats_client = None
+        self._stats_key: Optional[str] = None
+        self._stats_stop = threading.Event()
+        self._stats_thread: Optional[threading.Thread] = None
+
+    def run(self, coro: Awaitable[T]) -> T:
+        """
+        Ejecutar una corrutina en el event loop persistente del proceso.
+
+        El loop vive en un hilo propio y no se cierra entre tareas, así que
+        los clientes async del pool conservan sus conexiones abiertas; sirve
+        igual con `-P threads`, donde varias tareas lo usan a la vez.
+        """
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever, name="worker-event-loop", daemon=True
+                )
+                self._loop_thread.start()
+            loop = self._loop
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    def get_image_config(self, user_id: int, keyword_id: Optional[int], db) -> Dict[str, Any]:
+        """Configuración de imágenes de un contenido, cacheada durante el TTL"""
+        from app.services.content_generation import get_image_config_for_content
+
+        key = (user_id, keyword_id)
+        config = self.image_configs.get(key)
+        if config is None:
+            config = get_image_config_for_content(user_id, keyword_id, db)
+            self.image_configs.set(key, config)
+        return config
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pid": self.pid,
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "tasks_run": self.tasks_run,
+            "db_pool": get_pool_metrics(engine),
+            "provider_clients": self.clients.stats(),
+            "image_config_cache": self.image_configs.stats(),
+            "event_loop": self._loop is not None and not self._loop.is_closed()
+        }
+
+    def publish_stats(self) -> None:
+        """Publicar las estadísticas del proceso hijo para el proceso principal"""
+        ttl = max(1, int(settings.WORKER_STATS_INTERVAL_SECONDS * 3))
+        try:
+            self._stats_client.set(self._stats_key, json.dumps(self.stats(), default=str), ex=ttl)
+        except Exception as e:
+            logger.warning("No se pudieron publicar las estadísticas del worker", pid=self.pid, error=str(e))
+
+    def start_stats_publisher(self) -> None:
+        """Publicar las estadísticas periódicamente (procesos hijos del pool prefork)"""
+        self._stats_client = _stats_client()
+        if self._stats_client is None:
+            logger.warning("Paquete 'redis' no disponible: resource_stats no verá este proceso", pid=self.pid)
+            return
+        self._stats_key = _stats_key(os.getppid(), self.pid)
+
+        def publish_loop():
+            while True:
+                self.publish_stats()
+                if self._stats_stop.wait(settings.WORKER_STATS_INTERVAL_SECONDS):
+                    break
+
+        self._stats_thread = threading.Thread(target=publish_loop, name="worker-stats", daemon=True)
+        self._stats_thread.start()
+
+    def close(self) -> None:
+        if self._stats_thread is not None:
+            self._stats_stop.set()
+            self._stats_thread.join(timeout=5)
+            try:
+                self._stats_client.delete(self._stats_key)
+            except Exception:
+                pass  # La clave caduca sola
+        self.clients.close()
+        with self._lock:
+            loop, thread = self._loop, self._loop_thread
+            self._loop = self._loop_thread = None
+        if loop is not None and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(loop.shutdown_asyncgens(), loop).result(timeout=5)
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=5)
+            loop.close()
+
+
+_resources: Optional[WorkerResources] = None
+_resources_lock = threading.Lock()
+
+
+def get_resources() -> WorkerResources:
+    """Recursos del proceso actual (se crean al primer uso si no hubo worker_process_init)"""
+    global _resources
+    with _resources_lock:
+        if _resources is None or _resources.pid != os.getpid():
+            _resources = WorkerResources()
+        return _resources
+
+
+# Módulos pesados que usan las etapas: se importan al arrancar cada hijo
+WARM_UP_MODULES = (
+    "app.services.content_generation",
+    "app.services.content_generator",
+    "app.services.image_generator",
+)
+
+
+@worker_process_init.connect
+def init_worker_process(**kwargs):
+    """Preparar los recursos del proceso hijo recién creado"""
+    # Las conexiones heredadas del padre no se comparten: el hijo abre las suyas
+    engine.dispose(close=False)
+    async_engine.sync_engine.dispose(close=False)
+
+    resources = get_resources()
+    resources.start_stats_publisher()
+
+    # Importar de antemano los módulos pesados que usan las etapas
+    for module in WARM_UP_MODULES:
+        importlib.import_module(module)
+
+    logger.info("Recursos del worker preparados", pid=resources.pid)
+
+
+@worker_process_shutdown.connect
+def shutdown_worker_process(**kwargs):
+    global _resources
+    with _resources_lock:
+        resources, _resources = _resources, None
+    if resources is not None:
+        resources.close()
+        logger.info("Recursos del worker liberados", pid=resources.pid, tasks_run=resources.tasks_run)
+
+
+@task_postrun.connect
+def count_task_run(**kwargs):
+    if _resources is not None:
+        _resources.tasks_run += 1
+
+
+def read_child_stats(parent_pid: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Estadísticas publicadas por los procesos hijos de un worker (este por defecto)"""
+    client = _stats_client()
+    if client is None:
+        return []
+    keys = sorted(client.scan_iter(match=_stats_key(parent_pid or os.getpid(), "*")))
+    if not keys:
+        return []
+    return [json.loads(value) for value in client.mget(keys) if value is not None]
+
+
+@inspect_command(name="resource_stats")
+def resource_stats(state, **kwargs) -> Dict[str, Any]:
+    """Estadísticas de los recursos de cada proceso del worker, y sus totales"""
+    try:
+        processes = read_child_stats()
+        error = None
+    except Exception as e:
+        processes, error = [], str(e)
+    if _resources is not None and _resources.pid == os.getpid():
+        # -P threads / -P solo: las tareas se ejecutan en este proceso
+        processes.append(_resources.stats())
+
+    result = {
+        "processes": processes,
+        "totals": {
+            "processes": len(processes),
+            "tasks_run": sum(process["tasks_run"] for process in processes)
+        }
+    }
+    if error:
+        result["error"] = error
+    return result
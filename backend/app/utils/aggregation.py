@@ -0,0 +1,61 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import func, select
+
+# ============================================================================
+# AGREGACIONES POR GRUPO (CONTEOS Y TOP-N EN UNA SOLA CONSULTA)
+# ============================================================================
+
+
+def grouped_count_stmt(group_column: Any, count_column: Any, *criteria: Any, ids: Optional[Iterable[Any]] = None):
+    """
+    select() con (grupo, conteo) para todos los grupos en una sola consulta.
+
+    `ids` limita los grupos (p. ej. las categorías de la página actual);
+    `criteria` son filtros adicionales (p. ej. solo contenido publicado).
+    """
+    stmt = select(group_column, func.count(count_column)).where(*criteria).group_by(group_column)
+    if ids is not None:
+        stmt = stmt.where(group_column.in_(list(ids)))
+    return stmt
+
+
+def grouped_counts(db: Any, group_column: Any, count_column: Any, *criteria: Any, ids: Optional[Iterable[Any]] = None) -> Dict[Any, int]:
+    """Ejecutar `grouped_count_stmt` con una Session síncrona: {grupo: conteo}"""
+    if ids is not None:
+        ids = list(ids)
+        if not ids:
+            return {}
+    return dict(db.execute(grouped_count_stmt(group_column, count_column, *criteria, ids=ids)).all())
+
+
+def top_n_per_group_stmt(model: Any, partition_column: Any, order_by: Sequence[Any], n: int, *criteria: Any):
+    """
+    select() de las `n` primeras filas de `model` por cada valor de
+    `partition_column`, con ROW_NUMBER() sobre una subconsulta.
+
+    Sustituye una consulta con LIMIT por grupo; el resultado sale ordenado
+    por `order_by` y se reparte con `group_rows`.
+    """
+    ranked = (
+        select(
+            model.id,
+            func.row_number().over(partition_by=partition_column, order_by=list(order_by)).label("position")
+        )
+        .where(partition_column.isnot(None), *criteria)
+        .subquery()
+    )
+    return (
+        select(model)
+        .join(ranked, ranked.c.id == model.id)
+        .where(ranked.c.position <= n)
+        .order_by(*order_by)
+    )
+
+
+def group_rows(rows: Iterable[Any], attribute: str) -> Dict[Any, List[Any]]:
+    """Agrupar filas por el valor de un atributo, conservando el orden"""
+    grouped: Dict[Any, List[Any]] = {}
+    for row in rows:
+        grouped.setdefault(getattr(row, attribute), []).append(row)
+    return grouped
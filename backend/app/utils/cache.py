@@ -0,0 +1,141 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - dependencia opcional
+    redis = None
+
+# ============================================================================
+# CACHÉ LRU CON EXPIRACIÓN (EN MEMORIA DEL PROCESO)
+# ============================================================================
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Caché LRU acotada con expiración por entrada.
+
+    Es segura entre hilos (las rutas síncronas de FastAPI se ejecutan en un
+    threadpool). Cada worker tiene su propia instancia, por lo que el TTL
+    acota cuánto puede tardar un cambio en verse en los demás procesos.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING or item[1] <= now:
+                if item is not _MISSING:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+# ============================================================================
+# VERSIÓN COMPARTIDA (INVALIDACIÓN ENTRE PROCESOS)
+# ============================================================================
+
+class VersionKey:
+    """
+    Número de versión que forma parte de las claves de una caché local.
+
+    `bump()` la incrementa y las entradas anteriores dejan de encontrarse
+    (caducan solas por TTL). Con `redis_url` la versión es una clave de
+    Redis (INCR) compartida por todos los workers; cada proceso la relee
+    como mucho cada `refresh` segundos. Sin Redis, o si falla, la versión
+    es local al proceso y los demás solo ven el cambio cuando caduca el TTL.
+    """
+
+    def __init__(self, name: str, redis_url: Optional[str] = None, refresh: float = 1.0):
+        self.name = name
+        self.refresh = refresh
+        self._local = 0
+        self._value: Any = 0
+        self._read_at = float("-inf")
+        self._lock = threading.Lock()
+        self._client = None
+        if redis_url:
+            if redis is None:
+                raise RuntimeError("El paquete 'redis' es necesario para compartir la versión de la caché")
+            self._client = redis.Redis.from_url(redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+    @property
+    def shared(self) -> bool:
+        return self._client is not None
+
+    def peek(self) -> Any:
+        """Versión leída recientemente, o None si hay que releerla"""
+        if time.monotonic() - self._read_at < self.refresh:
+            return self._value
+        return None
+
+    def get(self) -> Any:
+        value = self.peek()
+        if value is not None:
+            return value
+        value = self._local
+        if self._client is not None:
+            try:
+                value = f"r{int(self._client.get(self.name) or 0)}"
+            except Exception:
+                # Redis no disponible: versión local hasta que vuelva
+                value = f"l{self._local}"
+        with self._lock:
+            self._value, self._read_at = value, time.monotonic()
+        return value
+
+    def bump(self) -> Any:
+        with self._lock:
+            self._local += 1
+            value = self._local
+        if self._client is not None:
+            try:
+                value = f"r{int(self._client.incr(self.name))}"
+            except Exception:
+                value = f"l{self._local}"
+        with self._lock:
+            self._value, self._read_at = value, time.monotonic()
+        return value
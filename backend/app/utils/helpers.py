@@ -2,6 +2,7 @@ import re
 import unicodedata
 from sqlalchemy.orm import Session
 from app.models.content import Content
+from app.utils.slugs import allocate_slug
 
 def generate_slug(text: str) -> str:
     """
@@ -30,7 +31,7 @@ def generate_slug(text: str) -> str:
 
 def generate_unique_slug(db: Session, title: str, content_id: int = None) -> str:
     """
-    Genera un slug único verificando que no exista en la base de datos.
+    Genera un slug único para un contenido (una sola consulta por prefijo).
     
     Args:
         db: Sesión de base de datos
@@ -40,31 +41,7 @@ def generate_unique_slug(db: Session, title: str, content_id: int = None) -> str
     Returns:
         str: Slug único
     """
-    base_slug = generate_slug(title)
-    slug = base_slug
-    counter = 1
-    
-    while True:
-        # Verificar si el slug ya existe
-        query = db.query(Content).filter(Content.slug == slug)
-        
-        # Si estamos actualizando, excluir el contenido actual
-        if content_id:
-            query = query.filter(Content.id != content_id)
-        
-        existing = query.first()
-        
-        if not existing:
-            return slug
-        
-        # Si existe, agregar un número al final
-        slug = f"{base_slug}-{counter}"
-        counter += 1
-        
-        # Evitar bucle infinito
-        if counter > 1000:
-            import uuid
-            return f"{base_slug}-{str(uuid.uuid4())[:8]}"
+    return allocate_slug(db, Content, generate_slug(title), exclude_id=content_id)
 
 def calculate_reading_time(content: str) -> int:
     """
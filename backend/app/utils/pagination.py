@@ -0,0 +1,202 @@
+import asyncio
+import json
+import base64
+import hashlib
+from datetime import date, datetime
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from fastapi import Response
+from sqlalchemy import and_, or_
+
+from app.core.config import settings
+from app.core.exceptions import ValidationError
+from app.utils.cache import TTLCache, VersionKey
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# ============================================================================
+# PAGINACIÓN POR CURSOR (KEYSET)
+# ============================================================================
+
+# Una clave de ordenación es (columna, descendente). La última debe ser única
+# (normalmente el id) para que el orden sea total.
+SortKey = Tuple[Any, bool]
+
+# Conteos aproximados: se reutilizan durante unos segundos entre solicitudes
+_count_cache = TTLCache(maxsize=2048, ttl=30.0)
+
+
+def _create_count_version() -> VersionKey:
+    """Versión de los conteos: en Redis si está configurado (compartida entre workers)"""
+    if settings.COUNT_CACHE_BACKEND.lower() == "redis":
+        try:
+            return VersionKey("cache:counts:version", settings.REDIS_URL)
+        except Exception as e:
+            logger.error(f"Versión compartida de conteos no disponible, se usa la local: {str(e)}")
+    return VersionKey("cache:counts:version")
+
+
+# Forma parte de la clave de cada conteo; invalidate_count_cache() la incrementa
+_count_version = _create_count_version()
+
+
+def _count_key(compiled: Any, version: Any) -> str:
+    return hashlib.sha1(
+        f"{version}|{compiled}|{sorted(compiled.params.items(), key=str)}".encode("utf-8")
+    ).hexdigest()
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if hasattr(value, "value"):  # Enum
+        return value.value
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Cursor opaco (base64 URL-safe) con los valores de ordenación de la última fila"""
+    payload = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """Decodificar un cursor; lanza ValidationError si está malformado"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != size:
+            raise ValueError("tamaño de cursor incorrecto")
+        return [_decode_value(v) for v in values]
+    except (ValueError, TypeError):
+        raise ValidationError("Cursor de paginación inválido")
+
+
+def _after(keys: Sequence[SortKey], values: Sequence[Any]):
+    """
+    Condición "fila posterior al cursor" para un orden por varias columnas:
+    (a > va) OR (a = va AND b > vb) OR ... respetando la dirección de cada una
+    """
+    clauses = []
+    for i, (column, descending) in enumerate(keys):
+        equal_prefix = [keys[j][0] == values[j] for j in range(i)]
+        comparison = column < values[i] if descending else column > values[i]
+        clauses.append(and_(*equal_prefix, comparison))
+    return or_(*clauses)
+
+
+def apply_keyset(query: Any, keys: Sequence[SortKey], cursor: Optional[str], limit: int) -> Any:
+    """
+    Aplicar orden, cursor y límite a una Query o a un select().
+
+    Se pide una fila de más para saber si hay página siguiente; usar
+    `split_page` sobre el resultado.
+    """
+    if cursor:
+        query = query.filter(_after(keys, decode_cursor(cursor, len(keys))))
+    order = [column.desc() if descending else column.asc() for column, descending in keys]
+    return query.order_by(*order).limit(limit + 1)
+
+
+def split_page(rows: Sequence[Any], keys: Sequence[SortKey], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """Separar la fila extra y construir el cursor de la página siguiente"""
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+
+    page = rows[:limit]
+    last = page[-1]
+    return page, encode_cursor([getattr(last, column.key) for column, _ in keys])
+
+
+def keyset_paginate(query: Any, keys: Sequence[SortKey], cursor: Optional[str], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """Ejecutar una Query ORM paginada por cursor: devuelve (filas, siguiente cursor)"""
+    return split_page(apply_keyset(query, keys, cursor, limit).all(), keys, limit)
+
+
+def paginate(
+    query: Any,
+    keys: Sequence[SortKey],
+    limit: int,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Paginar por cursor; `skip` se mantiene para clientes antiguos (OFFSET).
+
+    Ambos modos devuelven el cursor de la página siguiente, así que un
+    cliente puede pasar a cursores desde cualquier página.
+    """
+    if cursor or not skip:
+        return keyset_paginate(query, keys, cursor, limit)
+
+    order = [column.desc() if descending else column.asc() for column, descending in keys]
+    return split_page(query.order_by(*order).offset(skip).limit(limit + 1).all(), keys, limit)
+
+
+def cached_count(query: Any, count: Optional[Callable[[], int]] = None, ttl: Optional[float] = None) -> int:
+    """
+    Total aproximado de una Query, cacheado unos segundos por SQL + parámetros.
+
+    Evita repetir un COUNT completo en cada página; `count` permite pasar
+    una función propia (p. ej. para sesiones asíncronas).
+    """
+    compiled = query.statement.compile() if hasattr(query, "statement") else query.compile()
+    key = _count_key(compiled, _count_version.get())
+
+    total = _count_cache.get(key)
+    if total is None:
+        total = count() if count else query.order_by(None).count()
+        _count_cache.set(key, total, ttl=ttl)
+    return total
+
+
+def invalidate_count_cache() -> None:
+    """
+    Descartar los totales cacheados (tras cambios masivos).
+
+    Incrementa la versión de los conteos: con COUNT_CACHE_BACKEND=redis
+    todos los workers dejan de usar los totales anteriores.
+    """
+    _count_version.bump()
+    _count_cache.clear()
+
+
+async def acached_count(db: Any, stmt: Any, ttl: Optional[float] = None) -> int:
+    """Versión de `cached_count` para un select() ejecutado con AsyncSession"""
+    from sqlalchemy import func, select
+
+    compiled = stmt.compile()
+    version = _count_version.peek()
+    if version is None:
+        # Releer la versión (Redis) sin bloquear el event loop
+        version = await asyncio.to_thread(_count_version.get)
+    key = _count_key(compiled, version)
+
+    total = _count_cache.get(key)
+    if total is None:
+        total = (await db.execute(
+            select(func.count()).select_from(stmt.order_by(None).subquery())
+        )).scalar_one()
+        _count_cache.set(key, total, ttl=ttl)
+    return total
+
+
+def set_pagination_headers(response: Response, next_cursor: Optional[str], total: Optional[int] = None) -> None:
+    """Exponer el cursor siguiente (y el total si se pidió) en las cabeceras de la respuesta"""
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if total is not None:
+        response.headers["X-Total-Count"] = str(total)
@@ -0,0 +1,45 @@
+from typing import Any, List
+
+from sqlalchemy import func
+from sqlalchemy.orm import defer, load_only, with_expression
+
+from app.models.content import Content, PREVIEW_LENGTH
+from app.models.landing_page import LandingPage
+
+# ============================================================================
+# PROYECCIONES PARA LISTADOS (SIN COLUMNAS TEXT PESADAS)
+# ============================================================================
+
+# Columnas que usan los listados de contenido: portadas, archivo, relacionados,
+# sitemap, logs... El cuerpo completo (`content`) solo se carga en el detalle.
+CONTENT_SUMMARY_COLUMNS = (
+    Content.id, Content.title, Content.slug, Content.excerpt,
+    Content.meta_title, Content.meta_description, Content.focus_keyword,
+    Content.featured_image_url, Content.featured_image_alt,
+    Content.status, Content.content_type, Content.template_theme,
+    Content.is_featured, Content.is_indexed,
+    Content.word_count, Content.reading_time,
+    Content.keyword_id, Content.user_id, Content.category_id,
+    Content.created_at, Content.updated_at, Content.published_at, Content.scheduled_at,
+)
+
+# HTML/CSS/JS generados: solo hacen falta al servir o editar una landing
+LANDING_HEAVY_COLUMNS = (LandingPage.html_content, LandingPage.css_content, LandingPage.js_content)
+
+
+def content_summary(*extra_columns: Any, preview: bool = True) -> List[Any]:
+    """
+    Opciones de carga para listar Content sin el cuerpo.
+
+    Con `preview` se calcula en SQL `preview_text` (los primeros
+    PREVIEW_LENGTH caracteres), suficiente para extractos en plantillas.
+    """
+    options = [load_only(*CONTENT_SUMMARY_COLUMNS, *extra_columns)]
+    if preview:
+        options.append(with_expression(Content.preview_text, func.substr(Content.content, 1, PREVIEW_LENGTH)))
+    return options
+
+
+def landing_summary() -> List[Any]:
+    """Opciones de carga para listar landing pages sin HTML/CSS/JS"""
+    return [defer(column) for column in LANDING_HEAVY_COLUMNS]
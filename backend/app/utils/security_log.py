@@ -0,0 +1,404 @@
+import os
+import json
+import time
+import logging
+import logging.handlers
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl  # Bloqueo entre procesos (no disponible en Windows)
+except ImportError:  # pragma: no cover - plataforma sin fcntl
+    fcntl = None
+
+# ============================================================================
+# LOG DE SEGURIDAD ESTRUCTURADO (JSON LINES) CON ÍNDICE AUXILIAR
+# ============================================================================
+
+# Campos extra que se copian del LogRecord al registro JSON
+EXTRA_FIELDS = ("ip", "event", "method", "path", "status", "duration_ms")
+
+# Número máximo de IPs distintas que se guardan por bloque del índice;
+# si se supera, el bloque se marca como "cualquier IP"
+MAX_IPS_PER_BLOCK = 256
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formatear cada registro como una línea JSON"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "timestamp": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "ts": round(record.created, 3),
+            "logger": record.name,
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        for field in EXTRA_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                data[field] = value
+        return json.dumps(data, ensure_ascii=False)
+
+
+def index_path(log_path: str) -> str:
+    """Ruta del índice auxiliar de un archivo de log"""
+    return f"{log_path}.idx"
+
+
+def lock_path(log_path: str) -> str:
+    """Ruta del archivo de bloqueo compartido por los procesos que escriben el log"""
+    return f"{log_path}.lock"
+
+
+class _LogFileLock:
+    """
+    Bloqueo exclusivo entre procesos (flock sobre `<archivo>.lock`).
+
+    Serializa la ampliación del índice y la rotación cuando varios procesos
+    (workers de uvicorn, Celery) escriben en el mismo log. Sin fcntl
+    (Windows) solo protege a los hilos del proceso, que ya serializa el
+    propio handler.
+    """
+
+    def __init__(self, log_path: str):
+        self.path = lock_path(log_path)
+        self._file = None
+
+    def __enter__(self):
+        if fcntl is not None:
+            self._file = open(self.path, "a")
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._file is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+
+
+def _last_indexed_offset(log_path: str) -> int:
+    """Fin del último bloque indexado (0 si no hay índice)"""
+    idx = index_path(log_path)
+    if not os.path.exists(idx):
+        return 0
+    last = 0
+    with open(idx, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                last = json.loads(line)["end"]
+            except (ValueError, KeyError):
+                continue
+    return last
+
+
+def extend_index(log_path: str, block_size: int = 500, partial: bool = False) -> int:
+    """
+    Indexar las líneas completas añadidas al log desde el último bloque indexado.
+
+    El índice se calcula a partir del contenido del archivo, no de lo que
+    escribió cada proceso: los bloques son siempre contiguos y sin solapes
+    aunque varios procesos escriban a la vez, y tras un reinicio sin cierre
+    limpio se recupera lo que quedó sin indexar. Con `partial` también se
+    indexa el último bloque incompleto. Llamar con el bloqueo del log tomado.
+
+    Returns:
+        int: Bloques añadidos al índice
+    """
+    if not os.path.exists(log_path):
+        return 0
+    start = _last_indexed_offset(log_path)
+    size = os.path.getsize(log_path)
+    if start > size:
+        # El archivo se truncó o se sustituyó sin rotar el índice: se rehace
+        os.remove(index_path(log_path))
+        start = 0
+    if start >= size:
+        return 0
+
+    entries = []
+    block = None
+    offset = start
+    with open(log_path, "rb") as f:
+        f.seek(start)
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break  # Línea a medio escribir: se indexará más adelante
+            if block is None:
+                block = {"start": offset, "count": 0, "ts_min": None, "ts_max": None, "ips": set()}
+            offset += len(raw)
+            block["count"] += 1
+
+            record = parse_log_line(raw.decode("utf-8", errors="replace"))
+            ts = record.get("ts")
+            if isinstance(ts, (int, float)):
+                block["ts_min"] = ts if block["ts_min"] is None else min(block["ts_min"], ts)
+                block["ts_max"] = ts if block["ts_max"] is None else max(block["ts_max"], ts)
+            ip = record.get("ip")
+            if ip and block["ips"] is not None:
+                block["ips"].add(ip)
+                if len(block["ips"]) > MAX_IPS_PER_BLOCK:
+                    block["ips"] = None
+
+            if block["count"] >= block_size:
+                block["end"] = offset
+                entries.append(block)
+                block = None
+
+    if block is not None and partial:
+        block["end"] = offset
+        entries.append(block)
+
+    if entries:
+        with open(index_path(log_path), "a", encoding="utf-8") as f:
+            for entry in entries:
+                entry["ips"] = sorted(entry["ips"]) if entry["ips"] is not None else None
+                f.write(json.dumps(entry) + "\n")
+    return len(entries)
+
+
+class IndexedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Handler de archivo con rotación por tamaño y por tiempo que mantiene un
+    índice auxiliar (`<archivo>.idx`).
+
+    Cada bloque de `block_size` registros tiene en el índice una línea con
+    su rango de bytes, su rango de timestamps y las IPs que aparecen en él,
+    lo que permite filtrar por tiempo o IP leyendo solo los bloques útiles.
+    El índice se amplía leyendo el propio archivo desde el último bloque
+    indexado (ver `extend_index`), con un bloqueo de archivo compartido, así
+    que varios procesos pueden escribir en el mismo log.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        max_bytes: int = 50 * 1024 * 1024,
+        backup_count: int = 10,
+        rotation_interval: int = 86400,
+        block_size: int = 500,
+    ):
+        os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+        self.setFormatter(JsonLinesFormatter())
+
+        self.rotation_interval = rotation_interval
+        self.rollover_at = self._compute_rollover(time.time())
+        self.block_size = block_size
+        self._file_lock = _LogFileLock(self.baseFilename)
+        self._pending = 0
+
+        # Recuperar lo que quedó sin indexar (p. ej. tras un reinicio sin cierre limpio)
+        self._extend_index()
+
+    def _compute_rollover(self, now: float) -> float:
+        if not self.rotation_interval:
+            return float("inf")
+        return (now // self.rotation_interval + 1) * self.rotation_interval
+
+    def _extend_index(self, partial: bool = False) -> None:
+        with self._file_lock:
+            extend_index(self.baseFilename, self.block_size, partial=partial)
+        self._pending = 0
+
+    def shouldRollover(self, record: logging.LogRecord) -> int:
+        if super().shouldRollover(record):
+            return 1
+        return 1 if record.created >= self.rollover_at else 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            logging.FileHandler.emit(self, record)
+            self._pending += 1
+            if self._pending >= self.block_size:
+                self.flush()
+                self._extend_index()
+        except Exception:
+            self.handleError(record)
+
+    def _rotated_by_other_process(self) -> bool:
+        """El archivo abierto ya no es `baseFilename` (otro proceso rotó)"""
+        if self.stream is None or not os.path.exists(self.baseFilename):
+            return self.stream is not None
+        return os.fstat(self.stream.fileno()).st_ino != os.stat(self.baseFilename).st_ino
+
+    def doRollover(self) -> None:
+        with self._file_lock:
+            if self._rotated_by_other_process():
+                # Basta con abrir el archivo nuevo; rotar otra vez perdería el recién creado
+                self.stream.close()
+                self.stream = self._open()
+            else:
+                if self.stream is not None:
+                    self.stream.flush()
+                extend_index(self.baseFilename, self.block_size, partial=True)
+                super().doRollover()
+
+                # Rotar los índices igual que los archivos de log
+                if self.backupCount > 0:
+                    for i in range(self.backupCount - 1, 0, -1):
+                        source = index_path(f"{self.baseFilename}.{i}")
+                        if os.path.exists(source):
+                            os.replace(source, index_path(f"{self.baseFilename}.{i + 1}"))
+                    if os.path.exists(index_path(self.baseFilename)):
+                        os.replace(index_path(self.baseFilename), index_path(f"{self.baseFilename}.1"))
+                elif os.path.exists(index_path(self.baseFilename)):
+                    os.remove(index_path(self.baseFilename))
+
+        self.rollover_at = self._compute_rollover(time.time())
+        self._pending = 0
+
+    def close(self) -> None:
+        self.acquire()
+        try:
+            if self.stream is not None:
+                self.stream.flush()
+                self._extend_index(partial=True)
+        except Exception:
+            pass
+        finally:
+            self.release()
+        super().close()
+
+
+# ============================================================================
+# LECTURA EFICIENTE DEL LOG
+# ============================================================================
+
+def parse_log_line(line: str) -> Dict[str, Any]:
+    """Convertir una línea del log en diccionario (admite el formato de texto antiguo)"""
+    line = line.strip()
+    try:
+        record = json.loads(line)
+        if isinstance(record, dict):
+            return record
+    except ValueError:
+        pass
+
+    parts = line.split(" - ")
+    if len(parts) >= 4:
+        return {"timestamp": parts[0], "logger": parts[1], "level": parts[2], "message": " - ".join(parts[3:])}
+    return {"timestamp": "", "logger": "unknown", "level": "INFO", "message": line}
+
+
+class SecurityLogReader:
+    """
+    Lector del log de seguridad que nunca carga el archivo completo.
+
+    `tail` lee el archivo desde el final en bloques hasta reunir N registros.
+    `query` usa el índice auxiliar para saltar los bloques que no pueden
+    contener registros del rango de tiempo o de la IP pedidos.
+    """
+
+    def __init__(self, log_path: str, backup_count: int = 10):
+        self.log_path = log_path
+        self.backup_count = backup_count
+
+    def _log_files(self) -> List[str]:
+        """Archivos de log, del más reciente al más antiguo"""
+        files = [self.log_path] + [f"{self.log_path}.{i}" for i in range(1, self.backup_count + 1)]
+        return [path for path in files if os.path.exists(path)]
+
+    @staticmethod
+    def _reverse_lines(path: str, start: int = 0, end: Optional[int] = None) -> Iterator[str]:
+        """Iterar las líneas de un rango de bytes desde el final hacia el principio"""
+        with open(path, "rb") as f:
+            position = end if end is not None else f.seek(0, os.SEEK_END)
+            remainder = b""
+            while position > start:
+                size = min(READ_CHUNK_SIZE, position - start)
+                position -= size
+                f.seek(position)
+                lines = (f.read(size) + remainder).split(b"\n")
+                remainder = lines.pop(0)
+                for line in reversed(lines):
+                    if line.strip():
+                        yield line.decode("utf-8", errors="replace")
+            if remainder.strip():
+                yield remainder.decode("utf-8", errors="replace")
+
+    def tail(self, lines: int = 100) -> List[Dict[str, Any]]:
+        """Últimos N registros en orden cronológico"""
+        records = []
+        for path in self._log_files():
+            for line in self._reverse_lines(path):
+                records.append(parse_log_line(line))
+                if len(records) >= lines:
+                    return list(reversed(records))
+        return list(reversed(records))
+
+    @staticmethod
+    def _load_index(path: str) -> List[Dict[str, Any]]:
+        entries = []
+        idx = index_path(path)
+        if os.path.exists(idx):
+            with open(idx, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        continue
+        return entries
+
+    def _regions(self, path: str) -> List[Tuple[int, int, Optional[Dict[str, Any]]]]:
+        """Regiones del archivo (más reciente primero): bloques indexados + cola sin indexar"""
+        entries = self._load_index(path)
+        size = os.path.getsize(path)
+        indexed_end = entries[-1]["end"] if entries else 0
+
+        regions = []
+        if size > indexed_end:
+            regions.append((indexed_end, size, None))
+        for entry in reversed(entries):
+            regions.append((entry["start"], entry["end"], entry))
+        return regions
+
+    def query(
+        self,
+        limit: int = 100,
+        ip: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        level: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Registros más recientes que cumplen los filtros, en orden cronológico"""
+        since_ts = since.timestamp() if since else None
+        until_ts = until.timestamp() if until else None
+        level = level.upper() if level else None
+
+        results = []
+        for path in self._log_files():
+            for start, end, entry in self._regions(path):
+                if entry is not None and entry.get("ts_min") is not None:
+                    if until_ts is not None and entry["ts_min"] > until_ts:
+                        continue
+                    if since_ts is not None and entry["ts_max"] < since_ts:
+                        # Los bloques anteriores son todavía más antiguos
+                        return list(reversed(results))
+                if entry is not None and ip and entry.get("ips") is not None and ip not in entry["ips"]:
+                    continue
+
+                for line in self._reverse_lines(path, start, end):
+                    record = parse_log_line(line)
+                    ts = record.get("ts")
+                    if ts is not None:
+                        if until_ts is not None and ts > until_ts:
+                            continue
+                        if since_ts is not None and ts < since_ts:
+                            continue
+                    if ip and record.get("ip") != ip:
+                        continue
+                    if level and record.get("level") != level:
+                        continue
+
+                    results.append(record)
+                    if len(results) >= limit:
+                        return list(reversed(results))
+
+        return list(reversed(results))
+
@@ -0,0 +1,104 @@
+from typing import Optional, Set
+
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+# ============================================================================
+# ASIGNACIÓN DE SLUGS ÚNICOS
+# ============================================================================
+#
+# En lugar de probar `base`, `base-1`, `base-2`… con una consulta cada uno,
+# se leen de una vez los slugs existentes que empiezan por `base` (búsqueda
+# por prefijo sobre el índice único de `slug`) y se elige en memoria el
+# primer sufijo libre. Entre la lectura y el INSERT otra transacción puede
+# quedarse el mismo slug: la restricción UNIQUE lo detecta y se reintenta
+# una vez con los slugs ya actualizados. Sirve para cualquier modelo con
+# columnas `id` y `slug` (Content, Category, Tag, LandingPage).
+
+# Espacio reservado para el sufijo numérico ("-123") en columnas cortas
+_SUFFIX_ROOM = 6
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _fit_base(model, base_slug: str) -> str:
+    """Recortar la base para que quepa con su sufijo en la columna"""
+    max_length = getattr(model.__table__.c.slug.type, "length", None)
+    if max_length and len(base_slug) > max_length - _SUFFIX_ROOM:
+        base_slug = base_slug[:max_length - _SUFFIX_ROOM].rstrip("-")
+    return base_slug
+
+
+def allocate_slug(db: Session, model, base_slug: str, exclude_id: Optional[int] = None) -> str:
+    """
+    Devolver `base_slug` o el primer `base_slug-N` libre para `model`.
+
+    Args:
+        db: Sesión de base de datos
+        model: Modelo con columna `slug` única
+        base_slug: Slug ya normalizado
+        exclude_id: Registro a ignorar (el propio, al actualizar)
+
+    Returns:
+        str: Slug libre en el momento de la consulta
+    """
+    base_slug = _fit_base(model, base_slug)
+    query = db.query(model.slug).filter(or_(
+        model.slug == base_slug,
+        model.slug.like(f"{_escape_like(base_slug)}-%", escape="\\")
+    ))
+    if exclude_id is not None:
+        query = query.filter(model.id != exclude_id)
+    existing = {row.slug for row in query}
+
+    if base_slug not in existing:
+        return base_slug
+
+    prefix = f"{base_slug}-"
+    taken: Set[int] = set()
+    for slug in existing:
+        suffix = slug[len(prefix):]
+        if slug.startswith(prefix) and suffix.isdigit():
+            taken.add(int(suffix))
+
+    counter = 1
+    while counter in taken:
+        counter += 1
+    return f"{prefix}{counter}"
+
+
+def assign_unique_slug(db: Session, obj, base_slug: str, retries: int = 1, savepoint: bool = True) -> str:
+    """
+    Asignar a `obj` un slug libre y hacer flush (alta o cambio de slug).
+
+    Si el flush choca con la restricción única porque otra transacción
+    tomó el mismo slug, se vuelve a calcular y se reintenta `retries`
+    veces; el segundo fallo se propaga.
+
+    Con `savepoint=False` el flush no va en un SAVEPOINT y el choque deshace
+    la transacción entera antes del reintento: solo vale para un alta que
+    sea la primera escritura de la transacción. Así el llamador puede
+    deshacer el alta después (en SQLite, el RELEASE de un SAVEPOINT sin
+    transacción previa la confirma).
+    """
+    model = type(obj)
+    for attempt in range(retries + 1):
+        obj.slug = allocate_slug(db, model, base_slug, exclude_id=obj.id)
+        try:
+            if savepoint:
+                with db.begin_nested():
+                    db.add(obj)
+                    db.flush()
+            else:
+                db.add(obj)
+                db.flush()
+            return obj.slug
+        except IntegrityError:
+            if not savepoint:
+                db.rollback()
+            if attempt >= retries:
+                raise
+    return obj.slug
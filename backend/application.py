@@ -45,6 +45,7 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "X-Total-Count"],  # Paginación por cursor
     )
 
     # Rutas para archivos estáticos (frontend y assets)
@@ -73,6 +74,25 @@ def create_app() -> FastAPI:
     from app.api.v1.router import api_router
     app_instance.include_router(api_router, prefix=settings.API_V1_STR)
 
+    # Dispatcher de trabajos programados en este proceso (opcional: puede
+    # ejecutarse aparte con run_scheduler.py; varios procesos no se pisan)
+    if settings.ENABLE_SCHEDULER:
+        from app.services.job_scheduler import start_dispatcher, stop_dispatcher
+
+        @app_instance.on_event("startup")
+        def start_job_dispatcher():
+            start_dispatcher()
+
+        @app_instance.on_event("shutdown")
+        def stop_job_dispatcher():
+            stop_dispatcher()
+
+    # Visitantes de landings aún en memoria: se vuelcan antes de salir
+    @app_instance.on_event("shutdown")
+    def flush_landing_analytics():
+        from app.services.landing_analytics import flush_landing_views
+        flush_landing_views()
+
     # Endpoint para la raíz del sitio (sirve el index.html)
     @app_instance.get("/", response_class=HTMLResponse)
     async def read_root(request: Request, db: Session = Depends(get_db)):
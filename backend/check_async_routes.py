@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Verificar que ninguna ruta `async def` reciba una sesión síncrona.
+
+Una ruta async que declara `Depends(get_db)` o `Depends(get_read_db)` ejecuta
+E/S síncrona de base de datos dentro del event loop. Este script analiza el
+código (AST, sin importar la aplicación) y termina con código 1 si encuentra
+alguna; en ese caso hay que usar `get_async_db`/`get_async_read_db` o
+declarar la ruta con `def`.
+
+Uso:
+    python check_async_routes.py                 # main.py y app/api/v1
+    python check_async_routes.py app/api/v1      # archivos o directorios
+"""
+
+import ast
+import os
+import sys
+
+SYNC_SESSION_DEPENDENCIES = {"get_db", "get_read_db"}
+ROUTE_DECORATORS = {"get", "post", "put", "patch", "delete", "api_route"}
+DEFAULT_TARGETS = ["main.py", "app/api/v1"]
+
+
+def is_route(node: ast.AsyncFunctionDef) -> bool:
+    for decorator in node.decorator_list:
+        if isinstance(decorator, ast.Call) and isinstance(decorator.func, ast.Attribute):
+            if decorator.func.attr in ROUTE_DECORATORS:
+                return True
+    return False
+
+
+def sync_dependencies(node: ast.AsyncFunctionDef):
+    """Nombres de dependencias de sesión síncrona usadas en los parámetros"""
+    defaults = node.args.defaults + [d for d in node.args.kw_defaults if d is not None]
+    for default in defaults:
+        if (
+            isinstance(default, ast.Call)
+            and isinstance(default.func, ast.Name)
+            and default.func.id == "Depends"
+            and default.args
+            and isinstance(default.args[0], ast.Name)
+            and default.args[0].id in SYNC_SESSION_DEPENDENCIES
+        ):
+            yield default.args[0].id
+
+
+def check_file(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.AsyncFunctionDef) and is_route(node):
+            for dependency in sync_dependencies(node):
+                yield f"{path}:{node.lineno}: ruta async '{node.name}' usa Depends({dependency})"
+
+
+def iter_python_files(targets):
+    for target in targets:
+        if os.path.isdir(target):
+            for root, _, files in os.walk(target):
+                for name in sorted(files):
+                    if name.endswith(".py"):
+                        yield os.path.join(root, name)
+        else:
+            yield target
+
+
+def main(argv) -> int:
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    targets = argv or [os.path.join(base_dir, t) for t in DEFAULT_TARGETS]
+
+    errors = [error for path in iter_python_files(targets) for error in check_file(path)]
+    for error in errors:
+        print(error)
+
+    if errors:
+        print(f"\n❌ {len(errors)} ruta(s) async con sesión síncrona")
+        return 1
+
+    print("✅ Ninguna ruta async usa sesiones síncronas")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -24,31 +24,38 @@ app.include_router(publication_router, prefix="/site", tags=["sitio-público"])
 
 # Ruta para mostrar todas las categorías
 @app.get("/categoria/", response_class=HTMLResponse)
-async def categorias_list(request: Request, db: Session = Depends(get_db)):
+async def categorias_list(request: Request, db: AsyncSession = Depends(get_async_read_db)):
     """Página que muestra todas las categorías con artículos recientes"""
+    from sqlalchemy import select
     from app.models.category import Category
-    from app.models.content import Content
+    from app.models.content import Content, ContentStatus
+    from app.utils.aggregation import grouped_count_stmt, top_n_per_group_stmt, group_rows
+    from app.utils.projections import content_summary
     
     try:
         # Obtener todas las categorías
-        categories = db.query(Category).all()
+        categories = (await db.execute(select(Category))).scalars().all()
         
-        # Para cada categoría, obtener 3 artículos recientes
-        categories_with_posts = []
-        for category in categories:
-            recent_posts = db.query(Content).filter(
-                Content.category_id == category.id,
-                Content.status == "published"
-            ).order_by(Content.created_at.desc()).limit(3).all()
-            
-            categories_with_posts.append({
+        # Total de artículos publicados por categoría en una sola consulta
+        totals = dict((await db.execute(grouped_count_stmt(
+            Content.category_id, Content.id, Content.status == ContentStatus.PUBLISHED
+        ))).all())
+        
+        # Los 3 artículos más recientes de cada categoría en una sola consulta
+        recent = (await db.execute(top_n_per_group_stmt(
+            Content, Content.category_id, [Content.created_at.desc()], 3,
+            Content.status == ContentStatus.PUBLISHED
+        ).options(*content_summary()))).scalars().all()
+        recent_by_category = group_rows(recent, "category_id")
+        
+        categories_with_posts = [
+            {
                 "category": category,
-                "recent_posts": recent_posts,
-                "total_posts": db.query(Content).filter(
-                    Content.category_id == category.id,
-                    Content.status == "published"
-                ).count()
-            })
+                "recent_posts": recent_by_category.get(category.id, []),
+                "total_posts": totals.get(category.id, 0)
+            }
+            for category in categories
+        ]
         
         context = {
             "request": request,
@@ -67,14 +74,26 @@ async def categorias_list(request: Request, db: Session = Depends(get_db)):
 
 # Ruta para categorías en español
 @app.get("/categoria/{slug}", response_class=HTMLResponse)
-async def categoria_detail(slug: str, request: Request, db: Session = Depends(get_db), page: int = 1):
+async def categoria_detail(
+    slug: str,
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db),
+    page: int = 1,
+    cursor: Optional[str] = None
+):
     """Página de categoría en español"""
+    from sqlalchemy import select
+    from sqlalchemy.orm import selectinload
     from app.models.category import Category
     from app.models.content import Content
+    from app.utils.pagination import apply_keyset, split_page, acached_count
+    from app.utils.projections import content_summary
     
     try:
         # Buscar la categoría por slug
-        category = db.query(Category).filter(Category.slug == slug).first()
+        category = (await db.execute(
+            select(Category).where(Category.slug == slug)
+        )).scalars().first()
         
         if not category:
             raise HTTPException(status_code=404, detail="Categoría no encontrada")
@@ -84,13 +103,25 @@ async def categoria_detail(slug: str, request: Request, db: Session = Depends(ge
         offset = (page - 1) * per_page
         
         # Posts de la categoría
-        posts_query = db.query(Content).filter(
+        posts_query = select(Content).where(
             Content.category_id == category.id,
             Content.status == "published"
         )
         
-        total_posts = posts_query.count()
-        posts = posts_query.order_by(Content.created_at.desc()).offset(offset).limit(per_page).all()
+        total_posts = await acached_count(db, posts_query)
+        
+        # "Siguiente" navega por cursor (coste constante); los saltos a una
+        # página concreta siguen usando OFFSET
+        keys = [(Content.created_at, True), (Content.id, True)]
+        if cursor:
+            paged_query = apply_keyset(posts_query, keys, cursor, per_page)
+        else:
+            paged_query = apply_keyset(posts_query, keys, None, per_page).offset(offset)
+        
+        # La plantilla muestra imágenes y etiquetas de cada post: se cargan por adelantado
+        posts, next_cursor = split_page((await db.execute(
+            paged_query.options(*content_summary(), selectinload(Content.images), selectinload(Content.tags))
+        )).scalars().all(), keys, per_page)
         
         # Calcular paginación
         total_pages = (total_posts + per_page - 1) // per_page
@@ -98,9 +129,9 @@ async def categoria_detail(slug: str, request: Request, db: Session = Depends(ge
         has_next = page < total_pages
         
         # Categorías relacionadas
-        related_categories = db.query(Category).filter(
-            Category.id != category.id
-        ).limit(6).all()
+        related_categories = (await db.execute(
+            select(Category).where(Category.id != category.id).limit(6)
+        )).scalars().all()
         
         # Crear objeto de paginación compatible con la plantilla
         class Pagination:
@@ -138,7 +169,8 @@ async def categoria_detail(slug: str, request: Request, db: Session = Depends(ge
             "total_posts": total_posts,
             "base_url": str(request.base_url).rstrip('/'),
             "canonical_url": f"{str(request.base_url).rstrip('/')}/categoria/{slug}",
-            "pagination": pagination
+            "pagination": pagination,
+            "next_cursor": next_cursor
         }
         
         return templates.TemplateResponse("category.html", context)
@@ -405,18 +437,24 @@ def extract_first_image_from_content(content_html: str) -> str:
     return None
 
 @app.get("/inicio/", response_class=HTMLResponse)
-async def home_page(request: Request, db: Session = Depends(get_db)):
+async def home_page(request: Request, db: AsyncSession = Depends(get_async_read_db)):
     """Página de inicio esotérica con artículos recientes"""
+    from sqlalchemy import select
+    from sqlalchemy.orm import selectinload
     from app.models.category import Category
     from app.api.v1.visual_config import load_config
     
     # Cargar configuración visual
     visual_config = load_config()
     
-    # Obtener artículos según la configuración
-    recent_articles = db.query(Content).filter(
-        Content.status == "published"
-    ).order_by(Content.created_at.desc()).limit(visual_config.articlesCount).all()
+    # Obtener artículos según la configuración (con su categoría para la plantilla)
+    recent_articles = (await db.execute(
+        select(Content)
+        .where(Content.status == "published")
+        .options(selectinload(Content.category))
+        .order_by(Content.created_at.desc())
+        .limit(visual_config.articlesCount)
+    )).scalars().all()
     
     # Procesar artículos para agregar imagen de respaldo
     for article in recent_articles:
@@ -431,7 +469,7 @@ async def home_page(request: Request, db: Session = Depends(get_db)):
             article.featured_image = article.featured_image_url
     
     # Obtener categorías para el menú de navegación
-    categories = db.query(Category).limit(10).all()
+    categories = (await db.execute(select(Category).limit(10))).scalars().all()
     
     return templates.TemplateResponse("home.html", {
         "request": request,
@@ -451,14 +489,31 @@ async def landing_page():
     return RedirectResponse(url="/inicio/", status_code=302)
 
 @app.get("/landing/{slug}", response_class=HTMLResponse)
-async def get_public_landing_page(slug: str, request: Request, db: Session = Depends(get_db)):
+def get_public_landing_page(
+    slug: str,
+    request: Request,
+    db: Session = Depends(get_db),
+    read_db: Session = Depends(get_read_db)
+):
     """Mostrar landing page pública por slug"""
     try:
         from app.services.landing_service import LandingPageService
         
-        service = LandingPageService(db)
-        landing_page = service.get_landing_page_by_slug(slug)
-        
+        # La landing se lee de una réplica; el registro de la vista se escribe en el primario
+        landing_page = LandingPageService(read_db).get_landing_page_by_slug(slug)
+
+        # Registrar la vista; el visitante se identifica por IP + user agent para el conteo de únicos
+        try:
+            client_ip = request.client.host if request.client else "unknown"
+            user_agent = request.headers.get("user-agent", "")
+            LandingPageService(db).record_page_view(landing_page.id, {
+                "visitor_id": f"{client_ip}|{user_agent}",
+                "source": request.headers.get("referer") and "referral" or "direct",
+                "device": "mobile" if "mobile" in user_agent.lower() else "desktop"
+            })
+        except Exception:
+            db.rollback()
+
         # Si tiene HTML personalizado, usarlo directamente
         if landing_page.html_content and landing_page.html_content.strip():
             html_content = landing_page.html_content
@@ -504,23 +559,75 @@ async def get_public_landing_page(slug: str, request: Request, db: Session = Dep
     except Exception as e:
         raise HTTPException(status_code=404, detail="Landing page no encontrada")
 
+# Limitador de las conversiones públicas (se crea en el primer uso, dentro del event loop)
+_conversion_limiter = None
+
+def _get_conversion_limiter():
+    global _conversion_limiter
+    if _conversion_limiter is None:
+        from app.middleware.rate_limit import create_rate_limiter
+        _conversion_limiter = create_rate_limiter()
+    return _conversion_limiter
+
+def _record_landing_conversion(slug: str, visitor_id: str) -> bool:
+    """Registrar la conversión en su propia sesión (se ejecuta en el threadpool)"""
+    from app.core.database import SessionLocal
+    from app.services.landing_service import LandingPageService
+    
+    db = SessionLocal()
+    try:
+        service = LandingPageService(db)
+        # Solo landings publicadas y activas
+        landing_page = service.get_landing_page_by_slug(slug)
+        return service.record_conversion(landing_page.id, visitor_id)
+    finally:
+        db.close()
+
+@app.post("/landing/{slug}/conversion")
+async def track_landing_conversion(slug: str, request: Request):
+    """Registrar una conversión (clic en CTA/WhatsApp) de una landing pública"""
+    from starlette.concurrency import run_in_threadpool
+    from app.core.config import settings
+    from app.core.exceptions import NotFoundError
+    
+    client_ip = request.client.host if request.client else "unknown"
+    visitor_id = f"{client_ip}|{request.headers.get('user-agent', '')}"
+    
+    if await _get_conversion_limiter().hit(f"landing-conversion-ip:{client_ip}", [(settings.LANDING_CONVERSIONS_PER_IP_HOUR, 3600)]):
+        raise HTTPException(status_code=429, detail="Demasiadas conversiones desde esta IP")
+    
+    # Una conversión por visitante y landing dentro de la ventana (clave única en BD);
+    # las repetidas no cuentan
+    try:
+        counted = await run_in_threadpool(_record_landing_conversion, slug, visitor_id)
+    except NotFoundError:
+        raise HTTPException(status_code=404, detail="Landing page no encontrada")
+    return {"success": True, "counted": counted}
+
 @app.get("/content/{slug}", response_class=HTMLResponse, response_model=None)
-async def get_public_content(slug: str, request: Request, db: Session = Depends(get_db)) -> HTMLResponse:
+async def get_public_content(slug: str, request: Request, db: AsyncSession = Depends(get_async_read_db)) -> HTMLResponse:
     """Servir contenido público por slug usando el sistema de templates"""
+    from sqlalchemy import select
+    from sqlalchemy.orm import selectinload
     from app.models.category import Category
-    from app.models.tag import Tag
     
-    # Buscar contenido por slug que esté publicado
-    content_item = db.query(Content).filter(
-        Content.slug == slug,
-        Content.status == "published"
-    ).first()
+    # Buscar contenido por slug que esté publicado, con las relaciones que usa la plantilla
+    content_item = (await db.execute(
+        select(Content)
+        .where(Content.slug == slug, Content.status == "published")
+        .options(
+            selectinload(Content.category),
+            selectinload(Content.tags),
+            selectinload(Content.keyword),
+            selectinload(Content.images)
+        )
+    )).scalars().first()
     
     if not content_item:
         raise HTTPException(status_code=404, detail="Contenido no encontrado")
     
     # Obtener datos necesarios para el template
-    categories = db.query(Category).limit(10).all()
+    categories = (await db.execute(select(Category).limit(10))).scalars().all()
     category = content_item.category
     tags = content_item.tags
     keyword = content_item.keyword
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Ejecutar el dispatcher de trabajos programados como proceso independiente.
+
+Los trabajos viven en la base de datos y se reclaman con leases, así que
+pueden ejecutarse tantas instancias como se quiera (y además de la API con
+ENABLE_SCHEDULER=true) sin duplicar ejecuciones.
+
+Uso:
+    python run_scheduler.py
+    python run_scheduler.py --workers 4
+"""
+
+import os
+import sys
+import signal
+import argparse
+import threading
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.config import settings
+from app.services.job_scheduler import JobDispatcher, get_job_store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dispatcher de trabajos programados")
+    parser.add_argument("--workers", type=int, default=settings.SCHEDULER_WORKERS,
+                        help="Hilos que ejecutan trabajos")
+    parser.add_argument("--lease-seconds", type=int, default=settings.SCHEDULER_LEASE_SECONDS)
+    parser.add_argument("--max-idle", type=float, default=settings.SCHEDULER_MAX_IDLE_SECONDS)
+    args = parser.parse_args()
+
+    dispatcher = JobDispatcher(
+        get_job_store(),
+        max_workers=args.workers,
+        lease_seconds=args.lease_seconds,
+        max_idle=args.max_idle
+    )
+
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopping.set())
+    signal.signal(signal.SIGINT, lambda *_: stopping.set())
+
+    dispatcher.start()
+    print(f"✅ Dispatcher en marcha ({dispatcher.worker_id}); Ctrl+C para detener")
+    stopping.wait()
+    dispatcher.stop()
+    print("🛑 Dispatcher detenido")
+
+
+if __name__ == "__main__":
+    main()
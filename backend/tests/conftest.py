@@ -0,0 +1,29 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401  (registra modelos y eventos de sesión)
+from app.core.database import Base
+from app.core.db_config import build_engine_options, configure_engine
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Base de datos SQLite temporal con el esquema de los modelos"""
+    url = f"sqlite:///{tmp_path / 'test.db'}"
+    engine = configure_engine(create_engine(url, **build_engine_options(url)), "test")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(bind=engine, autoflush=False)
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
@@ -0,0 +1,149 @@
+import pytest
+
+from app.models.content import Content, ContentStatus
+from app.models.generation_batch import BatchItemStatus, GenerationBatch, GenerationBatchItem
+from app.models.keyword import Keyword, KeywordStatus
+from app.models.user import User
+from app.services import batch_generation
+from app.services.batch_generation import BatchGenerationService
+from app.services.content_generation import ContentGenerationService
+from app.services.keyword_queue import KeywordQueue, LeaseLostError
+
+
+@pytest.fixture
+def batch(db):
+    user = User(email="ana@example.com", username="ana", hashed_password="x", daily_limit=10)
+    keywords = [Keyword(keyword=f"tarot {i}") for i in range(2)]
+    db.add_all([user, *keywords])
+    db.flush()
+    batch = GenerationBatch(user_id=user.id, settings={}, concurrency=1, total_items=len(keywords))
+    batch.items = [GenerationBatchItem(keyword_id=k.id, position=i) for i, k in enumerate(keywords)]
+    db.add(batch)
+    db.commit()
+    return batch
+
+
+def _fake_generate(calls, before_save=None):
+    async def generate(self, content, keyword, user, provider="auto", content_type="article",
+                       additional_keyword_ids=None, heartbeat=None):
+        calls.append(keyword.id)
+        # Durante la generación la keyword está reclamada en la cola
+        assert keyword.status == KeywordStatus.PROCESSING and keyword.lease_owner
+        if before_save is not None:
+            before_save(self.db, heartbeat)
+        heartbeat.check()
+        content.content = f"Artículo sobre {keyword.keyword}"
+        content.status = ContentStatus.DRAFT
+        self.db.commit()
+        return {"success": True, "content_id": content.id}
+    return generate
+
+
+def test_generate_item_claims_keyword_through_queue(db, batch, monkeypatch):
+    calls = []
+    monkeypatch.setattr(ContentGenerationService, "generate", _fake_generate(calls))
+    service = BatchGenerationService(db)
+
+    item, token = service.claim_item(batch.id, worker_id="slot-0")
+    content_id, error = service.generate_item(batch, item, token)
+
+    assert error is None
+    assert calls == [item.keyword_id]
+    keyword = db.get(Keyword, item.keyword_id)
+    assert keyword.status == KeywordStatus.COMPLETED
+    assert keyword.lease_owner is None
+    assert db.get(Content, content_id).status == ContentStatus.DRAFT
+
+
+def test_generate_item_skips_keyword_leased_elsewhere(db, batch, monkeypatch):
+    calls = []
+    monkeypatch.setattr(ContentGenerationService, "generate", _fake_generate(calls))
+    service = BatchGenerationService(db)
+
+    item, token = service.claim_item(batch.id, worker_id="slot-0")
+    assert KeywordQueue(db).claim_keyword(item.keyword_id, worker_id="scheduler") is not None
+
+    content_id, error = service.generate_item(batch, item, token)
+
+    assert calls == []
+    assert content_id is None
+    assert "otro proceso" in error
+
+
+def test_lost_item_lease_is_not_recorded(db, session_factory, batch, monkeypatch):
+    def steal_item(db_, heartbeat):
+        # Otro worker retoma el elemento; el siguiente latido lo detecta
+        with session_factory() as other:
+            other.query(GenerationBatchItem).update({"lease_owner": "otro-worker"})
+            other.commit()
+        assert heartbeat.beat() is False
+
+    monkeypatch.setattr(ContentGenerationService, "generate", _fake_generate([], before_save=steal_item))
+    service = BatchGenerationService(db)
+    item, token = service.claim_item(batch.id, worker_id="slot-0")
+
+    with pytest.raises(LeaseLostError):
+        service.generate_item(batch, item, token)
+
+    db.rollback()  # nueva transacción: ver lo escrito por otras sesiones
+    assert db.get(GenerationBatchItem, item.id).lease_owner == "otro-worker"
+    content = db.query(Content).filter(Content.keyword_id == item.keyword_id).one()
+    assert content.status == ContentStatus.GENERATING
+
+
+def test_batch_slot_generates_every_item(db, session_factory, batch, monkeypatch):
+    calls = []
+    monkeypatch.setattr(ContentGenerationService, "generate", _fake_generate(calls))
+    monkeypatch.setattr(batch_generation, "SessionLocal", session_factory)
+
+    result = batch_generation.run_batch_slot({"batch_id": batch.id, "slot": 0}, run_key="job:1")
+
+    assert result["processed"] == 2 and result["failed"] == 0
+    db.rollback()  # nueva transacción: ver lo escrito por otras sesiones
+    statuses = {item.status for item in db.query(GenerationBatchItem)}
+    assert statuses == {BatchItemStatus.COMPLETED}
+
+
+def test_item_fails_with_quota_error_without_counting_usage(db, batch, monkeypatch):
+    from app.services.quota_service import QuotaService
+
+    calls = []
+    monkeypatch.setattr(ContentGenerationService, "generate", _fake_generate(calls))
+    user = db.get(User, batch.user_id)
+    user.daily_limit = 1
+    db.commit()
+    service = BatchGenerationService(db)
+
+    first, first_token = service.claim_item(batch.id, worker_id="slot-0")
+    assert service.generate_item(batch, first, first_token)[1] is None
+
+    second, second_token = service.claim_item(batch.id, worker_id="slot-0")
+    content_id, error = service.generate_item(batch, second, second_token)
+
+    assert content_id is None
+    assert "límite diario" in error
+    assert calls == [first.keyword_id]
+    assert QuotaService(db).get_usage(user.id)["generated_today"] == 1
+    assert db.get(Keyword, second.keyword_id).status == KeywordStatus.PENDING
+
+
+def test_quota_is_enforced_after_the_usage_increment(db, batch, monkeypatch):
+    """Dos workers que pasan la comprobación previa a la vez: el segundo se deshace"""
+    from app.services.quota_service import QuotaService
+
+    monkeypatch.setattr(ContentGenerationService, "generate", _fake_generate([]))
+    monkeypatch.setattr(QuotaService, "check_daily_limit", lambda self, user: 1)
+    user = db.get(User, batch.user_id)
+    user.daily_limit = 1
+    db.commit()
+    service = BatchGenerationService(db)
+
+    results = []
+    for _ in range(2):
+        item, token = service.claim_item(batch.id, worker_id="slot-0")
+        results.append(service.generate_item(batch, item, token))
+
+    assert results[0][1] is None
+    assert "límite diario" in results[1][1]
+    assert db.query(Content).count() == 1
+    assert QuotaService(db).get_usage(user.id)["generated_today"] == 1
@@ -0,0 +1,85 @@
+import pytest
+
+from app.core.config import settings
+from app.models.scheduled_job import JobStatus
+from app.services import content_events
+from app.services.job_scheduler import JobStore
+from app.utils import pagination
+from app.utils.cache import VersionKey
+
+
+@pytest.fixture
+def store(session_factory, monkeypatch):
+    store = JobStore(session_factory)
+    monkeypatch.setattr(content_events, "get_job_store", lambda: store)
+    monkeypatch.setattr(settings, "SITE_REBUILD_DELAY_SECONDS", 0)
+    return store
+
+
+def test_changes_before_rebuild_are_coalesced(store):
+    first = content_events.schedule_site_rebuild("publish:1")
+    second = content_events.schedule_site_rebuild("delete:3")
+
+    assert second["id"] == first["id"]
+    assert second["next_execution"] == first["next_execution"]
+
+
+def test_change_during_rebuild_schedules_another(store):
+    content_events.schedule_site_rebuild("publish:1")
+    job = store.claim_due("worker", limit=1, lease_seconds=60)[0]
+
+    # Cambios mientras se regenera: quedan pedidos, una sola vez
+    during = content_events.schedule_site_rebuild("publish:2")
+    content_events.schedule_site_rebuild("delete:1")
+    assert during["status"] == JobStatus.RUNNING and during["rerun_at"]
+
+    store.complete(job, {"pages": 1})
+    after = store.get(content_events.SITE_REBUILD_KEY)
+    assert after["status"] == JobStatus.PENDING
+    assert after["next_execution"] == during["rerun_at"]
+    assert after["rerun_at"] is None
+
+    # La regeneración siguiente, sin cambios nuevos, cierra el trabajo
+    job = store.claim_due("worker", limit=1, lease_seconds=60)[0]
+    store.complete(job, {"pages": 1})
+    assert store.get(content_events.SITE_REBUILD_KEY)["status"] == JobStatus.COMPLETED
+
+
+class _SharedRedis:
+    """Lo mínimo de Redis que usa VersionKey, compartido entre instancias"""
+
+    def __init__(self):
+        self.values = {}
+
+    def get(self, name):
+        return self.values.get(name)
+
+    def incr(self, name):
+        self.values[name] = self.values.get(name, 0) + 1
+        return self.values[name]
+
+
+def test_version_bump_is_seen_by_other_processes():
+    shared = _SharedRedis()
+    worker_a, worker_b = VersionKey("counts", refresh=0), VersionKey("counts", refresh=0)
+    worker_a._client = worker_b._client = shared
+
+    before = worker_b.get()
+    worker_a.bump()
+    assert worker_b.get() != before
+
+
+def test_invalidate_count_cache_changes_count_keys(db):
+    from app.models.keyword import Keyword
+
+    calls = []
+    query = db.query(Keyword)
+
+    def count():
+        calls.append(1)
+        return len(calls)
+
+    assert pagination.cached_count(query, count) == 1
+    assert pagination.cached_count(query, count) == 1
+    pagination.invalidate_count_cache()
+    assert pagination.cached_count(query, count) == 2
@@ -0,0 +1,18 @@
+from sqlalchemy import inspect
+
+from app.models.content import Content
+from app.utils.projections import content_summary
+
+
+def test_preview_never_lazy_loads_the_body(db):
+    db.add(Content(title="Tarot", slug="tarot", content="Cuerpo del artículo"))
+    db.commit()
+    db.expunge_all()
+
+    summary = db.query(Content).options(*content_summary()).one()
+    assert summary.preview == "Cuerpo del artículo"
+    db.expunge_all()
+
+    listed = db.query(Content).options(*content_summary(preview=False)).one()
+    assert listed.preview == ""
+    assert "content" in inspect(listed).unloaded
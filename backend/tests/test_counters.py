@@ -0,0 +1,70 @@
+from app.models.category import Category
+from app.models.content import Content
+from app.models.tag import Tag
+
+
+def _content(title: str, **kwargs) -> Content:
+    return Content(title=title, slug=title.lower().replace(" ", "-"), content="...", **kwargs)
+
+
+def _categories(db):
+    first = Category(name="Tarot", slug="tarot")
+    second = Category(name="Runas", slug="runas")
+    db.add_all([first, second])
+    db.commit()
+    return first, second
+
+
+def test_new_and_deleted_content_update_category_count(db):
+    tarot, _ = _categories(db)
+    post = _content("Post uno", category_id=tarot.id)
+    db.add_all([post, _content("Post dos", category=tarot)])
+    db.commit()
+    assert tarot.content_count == 2
+
+    db.delete(post)
+    db.commit()
+    assert tarot.content_count == 1
+
+
+def test_reassign_category_id_after_commit(db):
+    tarot, runas = _categories(db)
+    post = _content("Post uno", category_id=tarot.id)
+    db.add(post)
+    db.commit()
+
+    # Tras el commit el contenido está expirado: el valor anterior no está en memoria
+    post.category_id = runas.id
+    db.commit()
+
+    assert tarot.content_count == 0
+    assert runas.content_count == 1
+
+
+def test_reassign_category_relationship_after_commit(db):
+    tarot, runas = _categories(db)
+    post = _content("Post uno", category=tarot)
+    db.add(post)
+    db.commit()
+
+    post.category = runas
+    db.commit()
+
+    assert tarot.content_count == 0
+    assert runas.content_count == 1
+
+
+def test_tag_counts_follow_collection_changes(db):
+    magia, luna = Tag(name="Magia", slug="magia"), Tag(name="Luna", slug="luna")
+    post = _content("Post uno", tags=[magia])
+    db.add_all([post, luna])
+    db.commit()
+    assert (magia.content_count, luna.content_count) == (1, 0)
+
+    post.tags = [luna]
+    db.commit()
+    assert (magia.content_count, luna.content_count) == (0, 1)
+
+    db.delete(post)
+    db.commit()
+    assert luna.content_count == 0
@@ -0,0 +1,122 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.content import Content, ContentStatus
+from app.models.keyword import Keyword, KeywordStatus
+from app.models.scheduled_job import JobStatus, ScheduledJob, ScheduledJobRun
+from app.models.scheduler_config import SchedulerConfig
+from app.models.user import User
+from app.services.content_generation import ContentGenerationService
+from app.services.job_scheduler import JobStore
+from app.services.keyword_queue import LeaseLostError
+from app.services.quota_service import QuotaService
+from app.services.scheduler_service import SCHEDULED_GENERATION_JOB, SchedulerService
+
+
+@pytest.fixture
+def store(session_factory):
+    return JobStore(session_factory)
+
+
+def _expire_lease(db, job_id):
+    db.query(ScheduledJob).filter(ScheduledJob.id == job_id).update(
+        {"lease_expires_at": datetime.utcnow() - timedelta(seconds=1)}
+    )
+    db.commit()
+
+
+def test_expired_lease_is_reclaimed_until_max_attempts_then_dead(db, store):
+    job = store.enqueue("test", run_at=datetime.utcnow() - timedelta(seconds=1), max_attempts=2)
+
+    for attempt in (1, 2):
+        claimed = store.claim_due(f"worker-{attempt}", limit=1, lease_seconds=60)
+        assert [c["attempts"] for c in claimed] == [attempt]
+        store.begin_run(claimed[0], f"worker-{attempt}")
+        # El worker cae sin completar ni registrar el fallo
+        _expire_lease(db, job["id"])
+
+    assert store.claim_due("worker-3", limit=1, lease_seconds=60) == []
+    row = db.get(ScheduledJob, job["id"])
+    assert row.status == JobStatus.DEAD
+    assert row.lease_owner is None
+    run = db.query(ScheduledJobRun).filter(ScheduledJobRun.job_id == job["id"]).one()
+    assert run.status == JobStatus.DEAD
+
+    # Reprogramarlo lo devuelve a la cola
+    revived = store.enqueue("test", run_at=datetime.utcnow() - timedelta(seconds=1), replace=True)
+    assert revived["status"] == JobStatus.PENDING
+
+
+def test_failure_keeps_checkpoint_for_retry(db, store):
+    store.enqueue("test", run_at=datetime.utcnow() - timedelta(seconds=1))
+    job = store.claim_due("worker", limit=1, lease_seconds=60)[0]
+    store.begin_run(job, "worker")
+    run_key = store.run_key(job)
+
+    assert JobStore.save_checkpoint(db, run_key, {"content_id": 7})
+    db.commit()
+    store.fail(job, "boom")
+
+    db.rollback()
+    assert JobStore.run_checkpoint(db, run_key) == {"content_id": 7}
+
+
+@pytest.fixture
+def scheduled(db, store):
+    user = User(email="ana@example.com", username="ana", hashed_password="x", daily_limit=10)
+    keyword = Keyword(keyword="tarot del amor")
+    db.add_all([user, keyword])
+    db.flush()
+    db.add(SchedulerConfig(user_id=user.id, interval="daily", max_posts_per_day=5,
+                           generate_images=False, status="active"))
+    db.commit()
+
+    store.enqueue(SCHEDULED_GENERATION_JOB, run_at=datetime.utcnow() - timedelta(seconds=1),
+                  payload={"user_id": user.id}, user_id=user.id, interval="daily")
+    job = store.claim_due("worker", limit=1, lease_seconds=60)[0]
+    store.begin_run(job, "worker")
+    # Cerrar la lectura abierta al acceder a user.id: el handler parte de una sesión nueva
+    db.rollback()
+    return user, keyword, store.run_key(job)
+
+
+def _fake_generate(calls, fail=False):
+    async def generate(self, content, keyword, user, provider="auto", content_type="article",
+                       additional_keyword_ids=None, heartbeat=None, images=None):
+        calls.append(content.id)
+        if fail:
+            raise LeaseLostError("lease perdido")
+        content.content = "Texto"
+        content.status = ContentStatus.DRAFT
+        self.db.commit()
+        return {"success": True, "content_id": content.id, "title": content.title}
+    return generate
+
+
+def test_retry_resumes_content_of_the_same_run(db, scheduled, monkeypatch):
+    user, keyword, run_key = scheduled
+    calls = []
+
+    # Primer intento: se crea el contenido y el worker pierde la ejecución
+    monkeypatch.setattr(ContentGenerationService, "generate", _fake_generate(calls, fail=True))
+    with pytest.raises(LeaseLostError):
+        asyncio.run(SchedulerService(db).execute_scheduled_generation(user.id, run_key=run_key))
+    db.rollback()
+    checkpoint = JobStore.run_checkpoint(db, run_key)
+    assert checkpoint["keyword_id"] == keyword.id
+
+    # Reintento: mismo contenido, sin otra unidad de cuota
+    monkeypatch.setattr(ContentGenerationService, "generate", _fake_generate(calls))
+    result = asyncio.run(SchedulerService(db).execute_scheduled_generation(user.id, run_key=run_key))
+    assert result["status"] == "completed"
+    assert calls == [checkpoint["content_id"], checkpoint["content_id"]]
+    assert db.query(Content).count() == 1
+    assert QuotaService(db).get_usage(user.id)["generated_today"] == 1
+    assert db.get(Keyword, keyword.id).status == KeywordStatus.COMPLETED
+
+    # Una ejecución ya generada no se repite
+    result = asyncio.run(SchedulerService(db).execute_scheduled_generation(user.id, run_key=run_key))
+    assert result["result"]["resumed"] is True
+    assert len(calls) == 2
@@ -0,0 +1,26 @@
+import io
+
+import pytest
+
+from app.core.config import settings
+from app.models.keyword import Keyword
+from app.services.keyword_import import KeywordImporter
+
+
+def test_rejected_file_imports_nothing(db, monkeypatch):
+    content = b"".join(f"keyword {i}\n".encode() for i in range(5000))
+    monkeypatch.setattr(settings, "MAX_FILE_SIZE", len(content) - 1)
+
+    # El límite se supera en el último bloque: no debe quedar ninguno confirmado
+    with pytest.raises(ValueError):
+        KeywordImporter(db, batch_size=100).import_file(io.BytesIO(content), "keywords.txt")
+    assert db.query(Keyword).count() == 0
+
+
+def test_import_counts_duplicates_across_batches(db):
+    content = "Tarot\ntarot \nhoróscopo\n\nHORÓSCOPO\nluna\n".encode("utf-8")
+
+    totals = KeywordImporter(db, batch_size=2).import_file(io.BytesIO(content), "keywords.txt")
+
+    assert (totals["total"], totals["inserted"], totals["duplicates"]) == (5, 3, 2)
+    assert db.query(Keyword).count() == 3
@@ -0,0 +1,125 @@
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, text
+
+from app.models.keyword import Keyword, KeywordPriority, KeywordStatus
+from app.services.keyword_queue import KeywordQueue, LeaseHeartbeat
+
+
+def _add_keywords(db, *specs):
+    """specs: (keyword, prioridad, minutos de antigüedad)"""
+    now = datetime.utcnow()
+    db.add_all([
+        Keyword(keyword=name, priority=priority, created_at=now - timedelta(minutes=age))
+        for name, priority, age in specs
+    ])
+    db.commit()
+
+
+def test_claim_orders_by_priority_rank_then_age(db):
+    _add_keywords(
+        db,
+        ("media-nueva", KeywordPriority.MEDIUM, 1),
+        ("baja", KeywordPriority.LOW, 30),
+        ("alta", KeywordPriority.HIGH, 2),
+        ("media-antigua", KeywordPriority.MEDIUM, 10),
+    )
+
+    claimed = KeywordQueue(db).claim("worker-1", limit=4)
+
+    assert [k.keyword for k in claimed] == ["alta", "media-antigua", "media-nueva", "baja"]
+    assert all(k.status == KeywordStatus.PROCESSING for k in claimed)
+
+
+def test_claims_do_not_overlap(session_factory):
+    with session_factory() as db:
+        _add_keywords(db, *[(f"kw-{i}", KeywordPriority.MEDIUM, i) for i in range(4)])
+
+    with session_factory() as first_db, session_factory() as second_db:
+        first = KeywordQueue(first_db).claim("worker-1", limit=3)
+        second = KeywordQueue(second_db).claim("worker-2", limit=3)
+
+        assert len(first) == 3
+        assert len(second) == 1
+        assert not {k.id for k in first} & {k.id for k in second}
+
+
+def test_expired_lease_returns_to_queue_and_old_owner_loses_it(session_factory):
+    with session_factory() as db:
+        _add_keywords(db, ("kw", KeywordPriority.HIGH, 0))
+
+    with session_factory() as first_db, session_factory() as second_db:
+        first_queue = KeywordQueue(first_db)
+        keyword = first_queue.claim_one("worker-1", lease_seconds=60)
+        first_db.query(Keyword).update({"lease_expires_at": datetime.utcnow() - timedelta(seconds=1)})
+        first_db.commit()
+
+        second_queue = KeywordQueue(second_db)
+        retaken = second_queue.claim_one("worker-2")
+        assert retaken is not None and retaken.id == keyword.id
+
+        # El primer worker ya no puede renovar ni cerrar la keyword
+        assert first_queue.renew([keyword]) == 0
+        assert first_queue.complete(keyword) is False
+        assert second_queue.complete(retaken) is True
+
+    with session_factory() as db:
+        assert db.get(Keyword, keyword.id).status == KeywordStatus.COMPLETED
+
+
+def test_renew_extends_lease(db):
+    _add_keywords(db, ("kw", KeywordPriority.LOW, 0))
+    queue = KeywordQueue(db)
+    keyword = queue.claim_one("worker-1", lease_seconds=5)
+    before = keyword.lease_expires_at
+
+    assert queue.renew([keyword], lease_seconds=600) == 1
+    db.refresh(keyword)
+    assert keyword.lease_expires_at > before
+
+
+def test_claim_uses_pending_priority_index(engine, db):
+    _add_keywords(db, *[
+        (f"kw-{i}", list(KeywordPriority)[i % 3], i) for i in range(300)
+    ])
+    db.query(Keyword).filter(Keyword.id % 3 != 0).update(
+        {"status": KeywordStatus.COMPLETED}, synchronize_session=False
+    )
+    db.commit()
+    db.execute(text("ANALYZE"))
+
+    plans = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def explain(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith("SELECT keywords.id") and "ORDER BY" in statement:
+            plans.append(cursor.connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall())
+
+    KeywordQueue(db).claim("worker-1", limit=5)
+
+    details = " ".join(row[-1] for row in plans[0])
+    assert "ix_keywords_pending_priority_created_at" in details
+    assert "TEMP B-TREE" not in details
+
+
+def test_heartbeat_renews_lease_in_background(session_factory):
+    with session_factory() as db:
+        _add_keywords(db, ("kw", KeywordPriority.MEDIUM, 0))
+        queue = KeywordQueue(db)
+        keyword = queue.claim_one("worker-1", lease_seconds=5)
+        token, before = queue.lease_token(keyword), keyword.lease_expires_at
+
+        renewals = []
+
+        def renew(session):
+            renewals.append(KeywordQueue.renew_lease(session, keyword.id, token, lease_seconds=600))
+            return renewals[-1]
+
+        with LeaseHeartbeat(renew, interval=0.01, session_factory=session_factory) as heartbeat:
+            while not renewals:
+                time.sleep(0.01)
+
+        assert renewals[0] is True and not heartbeat.lost
+        db.rollback()  # nueva transacción: ver lo escrito por otras sesiones
+        assert db.get(Keyword, keyword.id).lease_expires_at > before
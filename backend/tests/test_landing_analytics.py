@@ -0,0 +1,107 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.landing_page import LandingAnalytics, LandingConversionKey, LandingPage
+from app.models.user import User
+from app.services.landing_analytics import (
+    LandingViewBuffer,
+    claim_conversion,
+    conversion_rate_after_increment,
+    day_start,
+    upsert_daily_analytics,
+)
+from app.utils.hyperloglog import HyperLogLog
+
+
+@pytest.fixture
+def landing(db):
+    user = User(email="ana@example.com", username="ana", hashed_password="x")
+    db.add(user)
+    db.flush()
+    landing = LandingPage(title="Tarot", slug="tarot", user_id=user.id)
+    db.add(landing)
+    db.commit()
+    return landing
+
+
+def test_buffered_visitors_match_direct_sketch(db, landing):
+    buffer = LandingViewBuffer(flush_seconds=3600, flush_views=10000)
+    today = datetime.utcnow().date()
+    visitors = [f"10.0.0.{i % 50}|agent" for i in range(200)]
+    for visitor in visitors:
+        buffer.add(landing.id, today, visitor)
+
+    # Nada se escribe hasta el volcado
+    assert not buffer.due()
+    assert db.query(LandingAnalytics).count() == 0
+
+    assert buffer.flush(db) == 1
+    row = db.query(LandingAnalytics).one()
+    expected = HyperLogLog()
+    expected.update(visitors)
+    assert row.visitor_sketch == expected.to_bytes()
+    assert row.unique_visitors == expected.count()
+
+
+def test_flush_merges_into_existing_sketch(db, landing):
+    buffer = LandingViewBuffer(flush_seconds=3600, flush_views=2)
+    today = datetime.utcnow().date()
+
+    buffer.add(landing.id, today, "a")
+    buffer.flush(db)
+    buffer.add(landing.id, today, "b")
+    buffer.add(landing.id, today, "a")
+    assert buffer.due()
+    buffer.flush_if_due(db)
+
+    row = db.query(LandingAnalytics).one()
+    assert row.unique_visitors == 2
+
+
+def test_upsert_counts_into_a_single_row_per_day(db, landing):
+    today = datetime.utcnow().date()
+    for _ in range(3):
+        upsert_daily_analytics(db, landing.id, today, page_views=1)
+    upsert_daily_analytics(db, landing.id, today,
+                           extra={"conversion_rate": conversion_rate_after_increment()},
+                           conversions=1)
+    db.commit()
+
+    row = db.query(LandingAnalytics).one()
+    assert row.date.replace(tzinfo=None) == day_start(today)
+    assert (row.page_views, row.conversions, row.conversion_rate) == (3, 1, 33)
+
+
+def test_flush_adds_breakdowns_to_the_counted_row(db, landing):
+    buffer = LandingViewBuffer(flush_seconds=3600, flush_views=10000)
+    today = datetime.utcnow().date()
+    for device in ("mobile", "mobile", "desktop"):
+        upsert_daily_analytics(db, landing.id, today, page_views=1)
+        db.commit()
+        buffer.add(landing.id, today, breakdowns={"device_types": device, "traffic_sources": "direct"})
+    buffer.flush(db)
+    buffer.add(landing.id, today, breakdowns={"device_types": "mobile"})
+    buffer.flush(db)
+
+    row = db.query(LandingAnalytics).one()
+    assert row.page_views == 3
+    assert row.device_types == {"mobile": 3, "desktop": 1}
+    assert row.traffic_sources == {"direct": 3}
+
+
+def test_conversion_counts_once_per_visitor_and_window(db, landing):
+    assert claim_conversion(db, landing.id, "10.0.0.1|agent", 3600)
+    db.commit()
+    assert not claim_conversion(db, landing.id, "10.0.0.1|agent", 3600)
+    assert claim_conversion(db, landing.id, "10.0.0.2|agent", 3600)
+    db.commit()
+
+    # Pasada la ventana vuelve a contar, con una sola clave por visitante
+    db.query(LandingConversionKey).update(
+        {"counted_at": datetime.utcnow() - timedelta(hours=2)}
+    )
+    db.commit()
+    assert claim_conversion(db, landing.id, "10.0.0.1|agent", 3600)
+    db.commit()
+    assert db.query(LandingConversionKey).count() == 1
@@ -0,0 +1,80 @@
+"""
+Planes de ejecución de las consultas más frecuentes: cada una debe usar un
+índice en lugar de recorrer la tabla completa.
+
+- SQLite: EXPLAIN QUERY PLAN; falla si aparece "SCAN <tabla>" sin índice.
+- PostgreSQL: EXPLAIN (FORMAT JSON) con enable_seqscan desactivado, para
+  comprobar que existe un índice utilizable aunque las tablas sean pequeñas.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, text
+
+from app.models.content import Content, ContentStatus
+from app.models.keyword import Keyword, KeywordPriority, KeywordStatus
+from app.models.landing_page import LandingAnalytics
+
+SINCE = datetime(2024, 1, 1)
+
+# (nombre, tabla, consulta) de cada acceso frecuente
+HOT_QUERIES = [
+    ("contenido publicado reciente", "content",
+     select(Content.id).where(Content.status == ContentStatus.PUBLISHED)
+     .order_by(Content.created_at.desc()).limit(10)),
+    ("contenido por estado", "content",
+     select(Content.id).where(Content.status == ContentStatus.DRAFT)
+     .order_by(Content.created_at.desc()).limit(20)),
+    ("contenido publicado de una categoría", "content",
+     select(Content.id).where(Content.category_id == 1, Content.status == ContentStatus.PUBLISHED)
+     .order_by(Content.created_at.desc()).limit(12)),
+    ("contenido de un usuario", "content",
+     select(Content.id).where(Content.user_id == 1)
+     .order_by(Content.created_at.desc()).limit(20)),
+    ("cola de keywords pendientes", "keywords",
+     select(Keyword.id).where(Keyword.status == KeywordStatus.PENDING)
+     .order_by(Keyword.priority, Keyword.created_at).limit(10)),
+    ("keywords por estado y prioridad", "keywords",
+     select(Keyword.id).where(Keyword.status == KeywordStatus.COMPLETED, Keyword.priority == KeywordPriority.HIGH)
+     .order_by(Keyword.created_at.desc()).limit(20)),
+    ("leases de keywords caducados", "keywords",
+     select(Keyword.id).where(Keyword.status == KeywordStatus.PROCESSING, Keyword.lease_expires_at < SINCE)),
+    ("analytics de una landing por rango de fechas", "landing_analytics",
+     select(LandingAnalytics.id).where(
+         LandingAnalytics.landing_page_id == 1,
+         LandingAnalytics.date >= SINCE,
+         LandingAnalytics.date < SINCE + timedelta(days=30)
+     )),
+]
+
+
+def _explain_sqlite(connection, sql, table):
+    details = [row[-1] for row in connection.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+    full_scan = any(d.startswith(f"SCAN {table}") and "USING" not in d for d in details)
+    return details, full_scan
+
+
+def _plan_nodes(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+def _explain_postgresql(connection, sql, table):
+    connection.execute(text("SET LOCAL enable_seqscan = off"))
+    plan = connection.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()[0]["Plan"]
+    nodes = list(_plan_nodes(plan))
+    details = [f"{n['Node Type']} {n.get('Relation Name', '')} {n.get('Index Name', '')}".strip() for n in nodes]
+    full_scan = any(n["Node Type"] == "Seq Scan" and n.get("Relation Name") == table for n in nodes)
+    return details, full_scan
+
+
+@pytest.mark.parametrize("name, table, query", HOT_QUERIES, ids=[q[0] for q in HOT_QUERIES])
+def test_hot_query_uses_an_index(engine, name, table, query):
+    explain = {"sqlite": _explain_sqlite, "postgresql": _explain_postgresql}[engine.dialect.name]
+    sql = str(query.compile(engine, compile_kwargs={"literal_binds": True}))
+
+    with engine.connect() as connection, connection.begin():
+        details, full_scan = explain(connection, sql, table)
+
+    assert not full_scan, f"{name} recorre {table} completa: {details}"
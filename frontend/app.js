@@ -2718,7 +2718,7 @@ function displayContentList(contentList) {
     contentList.forEach(content => {
         const statusBadge = getStatusBadge(content.status);
         const categoryName = content.category ? content.category.name : 'Sin categoría';
-        const excerpt = content.excerpt || (content.content ? content.content.substring(0, 150) + '...' : 'Sin contenido');
+        const excerpt = content.excerpt || (content.preview ? content.preview.substring(0, 150) + '...' : 'Sin contenido');
         
         // Add dynamic border class based on status
         const cardClass = content.status === 'published' ? 'card h-100 border-success' : 'card h-100';